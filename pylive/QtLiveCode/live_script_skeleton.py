@@ -5,6 +5,10 @@ from PySide6.QtGui import *
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
 
+import numpy as np
+
+from pylive.qt_components.frame_view import FrameView
+
 
 class Placeholder(QLabel):
 	def __init__(self, text, parent=None):
@@ -53,6 +57,7 @@ class LiveScriptWindow(QWidget):
 		### Layout ###
 		self._editor = QPlainTextEdit("[Editor]")
 		self._preview = Placeholder("[Preview]")
+		self._display_widget:QWidget|None = None # the preview created by display, reused by the next display
 		self._terminal = Placeholder("[Terminal]")
 
 		self.splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -196,13 +201,28 @@ class LiveScriptWindow(QWidget):
 		return QSize(1200,600)
 
 	def display(self, data:Any):
+		# reuse the preview widget created here, frames displayed in a loop stream into the same FrameView.
+		# widgets passed in are never changed
+		own = self._preview if self._preview is self._display_widget else None
 		match data:
+			case QWidget() if data is self._preview:
+				pass
 			case QWidget():
 				widget = cast(QWidget, data)
 				self.setPreview(widget)
+			case np.ndarray() | QImage() if isinstance(own, FrameView):
+				own.setFrame(data)
+			case np.ndarray() | QImage():
+				frame_view = FrameView()
+				frame_view.setFrame(data)
+				self.setPreview(frame_view)
+				self._display_widget = frame_view
+			case _ if type(own) is QLabel:
+				own.setText(f"{data}")
 			case _:
 				message_label = QLabel(f"{data}")
 				self.setPreview(message_label)
+				self._display_widget = message_label
 
 
 
@@ -6,7 +6,7 @@ from PySide6.QtGui import *
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
 
-from pylive.QtLiveApp.live_script_skeleton import LiveScriptWindow, Placeholder
+from pylive.QtLiveCode.live_script_skeleton import LiveScriptWindow, Placeholder
 from pylive.QtScriptEditor.components.textedit_completer import (
     TextEditCompleter,
 )
@@ -24,76 +24,129 @@ from pylive.QtScriptEditor.components.async_jedi_completer import (
     AsyncJediCompleter,
 )
 from pylive.QtTerminal.terminal_with_exec import Terminal
-from pylive.QtLiveApp.document_file_link import DocumentFileLink
+from pylive.QtTerminal.kernel import Kernel
+from pylive.QtLiveCode.document_file_link import DocumentFileLink
 
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-from pylive.QtScriptEditor.cell_support import Cell, split_cells, cell_at_line
+from pylive.QtScriptEditor.cell_support import (
+    Cell,
+    CellIndex,
+    CellDataflow,
+    split_cells,
+    cell_at_line,
+)
 
 from dataclasses import dataclass
 
 
+class _DocumentLines(Sequence[str]):
+    """the lines of a QTextDocument, without copying the whole text"""
+
+    def __init__(self, document: QTextDocument):
+        self._document = document
+
+    def __len__(self) -> int:
+        return self._document.blockCount()
+
+    def __getitem__(self, lineno: int) -> str:  # type: ignore
+        if not 0 <= lineno < self._document.blockCount():
+            raise IndexError(lineno)
+        return self._document.findBlockByNumber(lineno).text()
+
+    def __iter__(self) -> Iterator[str]:
+        block = self._document.firstBlock()
+        while block.isValid():
+            yield block.text()
+            block = block.next()
+
+
 class ScriptEditWithCells(ScriptEdit):
     cellsContentChanged = Signal(list)  # List[int]
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        self._cells = []
-        self.textChanged.connect(lambda: self.updateCells())
-        self.updateCells()
+        self._cell_index = CellIndex(self.toPlainText())
+        self._cell_labels: dict[str, str] = dict()  # stripped cell content -> bar label
+        self._block_count = self.document().blockCount()
+        self.document().contentsChange.connect(self._onContentsChange)
+        self.updateBars()
 
-    def updateCells(self):
+    def _onContentsChange(self, position: int, chars_removed: int, chars_added: int):
         ### Cells support ###
-        cells = split_cells(self.toPlainText(), strip=True)
-
-        # find changed cells
-        indexes_changed = []
-        from itertools import zip_longest
-
-        for i, cell in enumerate(cells):
-            current = self._cells[i] if i < len(self._cells) else None
-            if current != cell:
-                if (
-                    current is None
-                    or current.content.strip() != cell.content.strip()
-                ):
-                    indexes_changed.append(i)
-
-        # update
-        self._cells = cells
-        self.cellsContentChanged.emit(sorted(indexes_changed))
-
-        # update cell bars
+        # only the edited cells are split again
+        doc = self.document()
+        block_count = doc.blockCount()
+        end = min(position + chars_added, doc.characterCount() - 1)
+        first_line = doc.findBlock(position).blockNumber()
+        new_last_line = doc.findBlock(end).blockNumber()
+        old_last_line = new_last_line - (block_count - self._block_count)
+        self._block_count = block_count
+
+        indexes_changed = self._cell_index.update(
+            _DocumentLines(doc), first_line, old_last_line, new_last_line
+        )
+        self.updateBars()
+        if indexes_changed:
+            self.cellsContentChanged.emit(indexes_changed)
+
+    def updateBars(self):
         self.lineNumberArea.clearBars()
-        for cell in cells:
+        for cell in self._cell_index.cells():
+            content = cell.content.rstrip()
             self.lineNumberArea.insertBar(
-                cell.lineno, cell.lineno + cell.lineCount() - 1
+                cell.lineno,
+                cell.lineno + content.count("\n"),
+                label=self._cell_labels.get(content.strip()),
             )
 
+    def setCellLabel(self, idx: int, label: str | None):
+        """show a label on the cell bar, until the cell content changes"""
+        content = self.cell(idx).content.strip()
+        if label:
+            self._cell_labels[content] = label
+        else:
+            self._cell_labels.pop(content, None)
+        self.updateBars()
+
+    def cells(self) -> List[Cell]:
+        return self._cell_index.cells()
+
     def cell(self, idx: int) -> Cell:
-        cell = self._cells[idx]
+        cell = self._cell_index.cells()[idx]
         assert isinstance(cell, Cell)
         return cell
 
     def cellCount(self):
-        return len(self._cells)
+        return len(self._cell_index.cells())
 
     def cellAtCursor(self):
         cursor = self.textCursor()
 
         blockNumber = cursor.blockNumber()  # 0 index
-        return cell_at_line(self._cells, blockNumber + 1)
+        return cell_at_line(self._cell_index.cells(), blockNumber + 1)
 
 
 import ast
+import time
 from pathlib import Path
 
 
+def format_duration(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds*1000:.0f}ms"
+    return f"{seconds:.1f}s"
+
+
 class LiveScriptWithExec(LiveScriptWindow):
+    # run the script in a kernel process, instead of the gui thread.
+    # display() in the kernel can show data and numpy arrays, but no QWidgets
+    USE_KERNEL = False
+
     @override
     def setupUI(self):
         super().setupUI()
@@ -107,16 +160,32 @@ class LiveScriptWithExec(LiveScriptWindow):
 
         terminal.setContext({"__name__": "__live__"})
 
+        ### Kernel ###
+        self._cell_requests: dict[int, int] = dict()  # kernel request id -> cell index
+        if self.USE_KERNEL:
+            kernel = Kernel(self)
+            terminal.setKernel(kernel)
+            kernel.displayed.connect(self.display)
+            kernel.finished.connect(self._onCellFinished)
+            kernel.busyChanged.connect(
+                lambda busy: self.statusBar().showMessage("running..." if busy else "ready")
+            )
+
         ### Script Editor
         editor = ScriptEditWithCells()
         self.setEditor(editor)
+        if self.USE_KERNEL:
+            editor.linter.setKnownNames({"display"})
+        self._dataflow = CellDataflow()
         self.editor().cellsContentChanged.connect(
-            lambda indexes: self.execute_cells(indexes)
+            lambda indexes: self.execute_cells(
+                self._dataflow.cellsToRun(self.editor().cells(), indexes)
+            )
         )
 
         ### File link
         self.fileLink = DocumentFileLink(editor.document())
-        self.fileLink.filePathChanged.connect(self.updateWindowTitle)
+        self.fileLink.filepathChanged.connect(self.updateWindowTitle)
         editor.document().modificationChanged.connect(self.updateWindowTitle)
 
         ### File Menu ###
@@ -130,6 +199,11 @@ class LiveScriptWithExec(LiveScriptWindow):
         restart_action.triggered.connect(lambda: self.restart())
         self.menuBar().addAction(restart_action)
 
+        if kernel := terminal.kernel():
+            interrupt_action = QAction("interrupt", self)
+            interrupt_action.triggered.connect(lambda: kernel.interrupt())
+            self.menuBar().addAction(interrupt_action)
+
         ### update widet title
         self.updateWindowTitle()
 
@@ -140,13 +214,21 @@ class LiveScriptWithExec(LiveScriptWindow):
         import os
         import sys
 
+        if kernel := cast(Terminal, self.terminal()).kernel():
+            # fresh namespace, without reloading the ui
+            kernel.restart()
+            self._dataflow.clear()
+            self._cell_requests.clear()
+            self.execute_cells([cell.idx for cell in self.editor().cells()])
+            return
+
         print("ARGTV:", sys.argv)
-        if self.fileLink.filepath:
+        if self.fileLink.filepath():
             argv = [arg for arg in sys.argv]
             if len(argv) > 1:
-                argv[1] = self.fileLink.filepath
+                argv[1] = self.fileLink.filepath()
             else:
-                argv.append(self.fileLink.filepath)
+                argv.append(self.fileLink.filepath())
             os.execl(sys.executable, os.path.abspath(__file__), *argv)
         else:
             os.execl(sys.executable, os.path.abspath(__file__), *sys.argv)
@@ -158,7 +240,7 @@ class LiveScriptWithExec(LiveScriptWindow):
             if keypress.key() in {Qt.Key.Key_Return, Qt.Key.Key_Enter}:
                 if keypress.modifiers() == Qt.KeyboardModifier.ShiftModifier:
                     if cell := self.editor().cellAtCursor():
-                        self.execute_cells([cell])
+                        self.execute_cells([cell.idx])
                     return True
 
         return super().eventFilter(watched, event)
@@ -168,37 +250,41 @@ class LiveScriptWithExec(LiveScriptWindow):
         return cast(ScriptEditWithCells, super().editor())
 
     def execute_cells(self, indexes: List[int]):
+        """execute cells in order, and show their run time on the cell bars"""
         self.editor().linter.clear()
+        terminal = cast(Terminal, self.terminal())
+        terminal.clear()
         for cell_idx in indexes:
             logger.info(f"execute_cell: {cell_idx}")
-
-            # first_line = self.editor().cell(cell).split("\n")[0]
+            cell = self.editor().cell(cell_idx)
 
             # prepend empty lines, so when an exception occures, the linnumber will match the while script lines
-            cell_line_offset = 0
-            for i in range(cell_idx):
-                cell_source = self.editor().cell(cell_idx).content
-                line_count = len(cell_source.split("\n"))
-                cell_line_offset += line_count
-            cell_source = self.editor().cell(cell_idx).content
-            cell_source = "\n" * cell_line_offset + cell_source
-
-            logger.info("executing code...")
-
-            terminal = cast(Terminal, self.terminal())
-            terminal.clear()
+            cell_source = "\n" * (cell.lineno - 1) + cell.content
 
             if cell_source.strip():
                 self._current_cell = cell_idx
-                terminal.execute(cell_source)
-            self.statusBar().showMessage(f"cells executed {indexes}")
-
-            logger.info("code executed!")
+                start_time = time.perf_counter()
+                request_id = terminal.execute(cell_source)
+                self._dataflow.executed(cell)
+                if request_id is None:
+                    elapsed = time.perf_counter() - start_time
+                    self.editor().setCellLabel(cell_idx, format_duration(elapsed))
+                else:
+                    # runs in the kernel, see _onCellFinished
+                    self._cell_requests[request_id] = cell_idx
+        self.statusBar().showMessage(f"cells executed {indexes}")
+
+        logger.info("code executed!")
+
+    def _onCellFinished(self, request_id: int, elapsed: float):
+        cell_idx = self._cell_requests.pop(request_id, None)
+        if cell_idx is not None and cell_idx < self.editor().cellCount():
+            self.editor().setCellLabel(cell_idx, format_duration(elapsed))
 
     def updateWindowTitle(self):
         file_title = "untitled"
-        if self.fileLink.filepath:
-            file_title = Path(self.fileLink.filepath).name
+        if self.fileLink.filepath():
+            file_title = Path(self.fileLink.filepath()).name
 
         modified_mark = ""
         if self.editor().document().isModified():
@@ -224,6 +310,10 @@ if __name__ == "__main__":
     log_format = "%(levelname)s: %(message)s"
     logging.basicConfig(level=logging.INFO, format=log_format)
 
+    if "--kernel" in sys.argv:
+        sys.argv.remove("--kernel")
+        LiveScriptWithExec.USE_KERNEL = True
+
     # create livecsript app
     app = QApplication(sys.argv)
 
@@ -242,7 +332,7 @@ if __name__ == "__main__":
             '''\
             #%% setup
             from PySide6.QtWidgets import *
-            from pylive.QtLiveApp import display
+            from pylive.QtLiveCode import display
 
             #%% update
             print(f"Print this {42} to the console!")
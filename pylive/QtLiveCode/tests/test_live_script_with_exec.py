@@ -0,0 +1,111 @@
+import unittest
+from typing import *
+from textwrap import dedent
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+from pylive.QtLiveCode.live_script_with_exec import LiveScriptWithExec, ScriptEditWithCells
+
+app = QApplication.instance() or QApplication([])
+
+SCRIPT = dedent("""\
+	#%% setup
+	x = 1
+
+	#%% use
+	y = x + 1
+
+	#%% other
+	z = 3
+	""")
+
+
+def replace_line(editor:QPlainTextEdit, lineno:int, text:str):
+	"""replace a line with a single edit, like typing over a selection"""
+	cursor = QTextCursor(editor.document().findBlockByNumber(lineno))
+	cursor.select(QTextCursor.SelectionType.LineUnderCursor)
+	cursor.insertText(text)
+
+def shutdown(editor:ScriptEditWithCells):
+	"""stop the worker threads of the editor"""
+	editor.linter.engine.shutdown()
+	editor.completer.service.shutdown()
+
+
+class TestScriptEditWithCells(unittest.TestCase):
+	def make_editor(self)->ScriptEditWithCells:
+		editor = ScriptEditWithCells()
+		self.addCleanup(shutdown, editor)
+		return editor
+
+	def test_edited_cell_changed(self):
+		editor = self.make_editor()
+		editor.setPlainText(SCRIPT)
+		self.assertEqual(editor.cellCount(), 3)
+
+		changed:list[list[int]] = []
+		editor.cellsContentChanged.connect(changed.append)
+		replace_line(editor, 4, "y = x + 2")
+		self.assertEqual(changed, [[1]])
+		self.assertEqual(editor.cell(1).lineno, 4)
+
+	def test_cell_label(self):
+		editor = self.make_editor()
+		editor.setPlainText(SCRIPT)
+		editor.setCellLabel(0, "1ms")
+		self.assertEqual(editor._cell_labels, {editor.cell(0).content.strip(): "1ms"})
+		editor.setCellLabel(0, None)
+		self.assertEqual(editor._cell_labels, {})
+
+
+class TestLiveScriptWithExec(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.window = LiveScriptWithExec.instance()
+
+	@classmethod
+	def tearDownClass(cls):
+		shutdown(cls.window.editor())
+		cls.window.terminal().input_completer.service.shutdown()
+
+	def setUp(self):
+		self.executed:list[list[int]] = []
+		execute_cells = LiveScriptWithExec.execute_cells
+		def spy(indexes:List[int]):
+			self.executed.append(list(indexes))
+			execute_cells(self.window, indexes)
+		self.window.execute_cells = spy
+		self.window.editor().setPlainText(SCRIPT)
+		self.executed.clear()
+
+	def tearDown(self):
+		del self.window.execute_cells
+
+	def test_dependents_run_again(self):
+		replace_line(self.window.editor(), 1, "x = 5")
+		self.assertEqual(self.executed, [[0, 1]], "the 'other' cell does not read x")
+		self.assertEqual(self.window.terminal().context()["y"], 6)
+
+	def test_cell_run_time(self):
+		self.window.execute_cells([2])
+		label = self.window.editor()._cell_labels[self.window.editor().cell(2).content.strip()]
+		self.assertTrue(label.endswith("ms"))
+
+	def test_display_does_not_change_caller_labels(self):
+		label = QLabel("caller")
+		self.window.display(label)
+		self.window.display("text")
+		self.assertEqual(label.text(), "caller")
+		self.assertIsNot(self.window.preview(), label)
+
+		self.window.display("more text")
+		created = self.window.preview()
+		self.window.display("again")
+		self.assertIs(self.window.preview(), created, "labels created by display are reused")
+		self.assertEqual(created.text(), "again")
+
+
+if __name__ == "__main__":
+	unittest.main()
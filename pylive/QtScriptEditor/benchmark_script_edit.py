@@ -0,0 +1,299 @@
+"""
+Keystroke latency benchmark for ScriptEdit.
+
+Replays typing, pasting, scrolling and number-drag sessions on generated scripts,
+with the editor components toggled on and off, and reports the p50/p99 latency of
+each event: from sending the event, until it is handled and the editor is painted.
+
+configurations:
+    all          every component
+    none         a bare ScriptEdit, without the components below
+    only:<name>  a single component, its cost is the difference to 'none'
+
+components: highlighter, completer, number_editor, line_numbers, linter, cells
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python -m pylive.QtScriptEditor.benchmark_script_edit --lines 1000 10000 50000 --output baseline.json
+    QT_QPA_PLATFORM=offscreen python -m pylive.QtScriptEditor.benchmark_script_edit --compare baseline.json
+"""
+
+from typing import *
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtTest import QTest
+
+from pylive.QtScriptEditor.script_edit import ScriptEdit
+
+COMPONENTS = ["highlighter", "completer", "number_editor", "line_numbers", "linter", "cells"]
+SESSIONS = ["typing", "paste", "scroll", "number_drag"]
+
+
+### Scripts ###
+CELL_TEMPLATE = """\
+# %% cell {i}
+import math
+
+def compute_{i}(x, scale=1.5):
+    \"\"\"scale and offset x\"\"\"
+    values = [x * scale + n for n in range(12)]
+    return sum(values) / len(values)
+
+class Shape{i}:
+    def __init__(self, width=120, height=80):
+        self.width = width
+        self.height = height
+
+    def area(self):
+        return self.width * self.height * math.pi / 4
+
+result_{i} = compute_{i}(42) + Shape{i}(-30, 250).area()
+print(f"cell {i}: {{result_{i}:.2f}}")
+
+"""
+
+
+def make_script(lines:int)->str:
+    """a script of cells with functions, classes and numbers"""
+    cell_lines = CELL_TEMPLATE.count("\n")
+    return "".join(CELL_TEMPLATE.format(i=i) for i in range(max(1, lines // cell_lines)))
+
+
+### Editor ###
+def create_editor(components:Collection[str])->ScriptEdit:
+    """a ScriptEdit, with the components not listed disconnected"""
+    if "cells" in components:
+        from pylive.QtLiveCode.live_script_with_exec import ScriptEditWithCells
+        editor = ScriptEditWithCells()
+    else:
+        editor = ScriptEdit()
+
+    if "highlighter" not in components:
+        editor.updateRequest.disconnect(editor._updateVisibleBlocks)
+        editor.highlighter.setDocument(None) # type: ignore
+
+    if "completer" not in components:
+        completer = editor.completer
+        editor.removeEventFilter(completer)
+        editor.document().contentsChange.disconnect(completer._onContentsChange)
+        editor.textChanged.disconnect() # only the completer listens to textChanged
+        completer.service.shutdown()
+
+    if "number_editor" not in components:
+        editor.viewport().removeEventFilter(editor.number_editor)
+
+    if "line_numbers" not in components:
+        editor.lineNumberArea.hide()
+
+    if "linter" not in components and editor.linter.engine:
+        editor.linter._lint_timer.timeout.disconnect()
+        editor.linter.engine.shutdown()
+
+    return editor
+
+
+def shutdown_editor(editor:ScriptEdit):
+    editor.completer.service.shutdown()
+    if editor.linter.engine:
+        editor.linter.engine.shutdown()
+    editor.close()
+    editor.deleteLater()
+
+
+### Sessions ###
+Event = Callable[[], None]
+
+
+def _move_cursor(editor:ScriptEdit, position:int):
+    cursor = editor.textCursor()
+    cursor.setPosition(min(position, editor.document().characterCount()-1))
+    editor.setTextCursor(cursor)
+    editor.ensureCursorVisible()
+
+
+def typing_session(editor:ScriptEdit, rng:random.Random)->Iterable[Event]:
+    """type a few lines of code in the middle of the script, key by key"""
+    block = editor.document().findBlockByNumber(editor.document().blockCount()//2)
+    _move_cursor(editor, block.position() + block.length() - 1)
+    text = "\nvalue = compute_0(x, 42) + shape.area()\nif value > 10:\n    print(value)"
+    for char in text:
+        if char == "\n":
+            yield lambda: QTest.keyClick(editor, Qt.Key.Key_Return)
+        else:
+            yield lambda char=char: QTest.keyClicks(editor, char)
+
+
+def paste_session(editor:ScriptEdit, rng:random.Random)->Iterable[Event]:
+    """paste a cell at random places"""
+    chunk = CELL_TEMPLATE.format(i="pasted")
+    for i in range(20):
+        def paste():
+            block = editor.document().findBlockByNumber(rng.randrange(editor.document().blockCount()))
+            _move_cursor(editor, block.position())
+            editor.insertPlainText(chunk)
+        yield paste
+
+
+def scroll_session(editor:ScriptEdit, rng:random.Random)->Iterable[Event]:
+    """scroll down page by page, then jump around"""
+    scrollbar = editor.verticalScrollBar()
+    for i in range(50):
+        yield lambda: scrollbar.setValue(scrollbar.value() + scrollbar.pageStep())
+    for i in range(50):
+        yield lambda: scrollbar.setValue(rng.randrange(scrollbar.maximum()+1))
+
+
+def number_drag_session(editor:ScriptEdit, rng:random.Random)->Iterable[Event]:
+    """hover along a line with numbers, then drag a number up and down"""
+    viewport = editor.viewport()
+
+    def send(event_type:QEvent.Type, pos:QPointF, button:Qt.MouseButton=Qt.MouseButton.NoButton, buttons:Qt.MouseButton=Qt.MouseButton.NoButton):
+        event = QMouseEvent(event_type, pos, viewport.mapToGlobal(pos), button, buttons, Qt.KeyboardModifier.NoModifier)
+        QApplication.sendEvent(viewport, event)
+
+    document = editor.document()
+    block = document.find("Shape0(-30, 250)").block()
+    _move_cursor(editor, block.position())
+    line_rect = editor.blockBoundingGeometry(block).translated(editor.contentOffset())
+    y = line_rect.center().y()
+    number_x = editor.cursorRect(QTextCursor(document.find("250", block.position()))).left() - 4
+
+    for x in range(0, int(number_x), 4):
+        yield lambda x=x: send(QEvent.Type.MouseMove, QPointF(x, y))
+    yield lambda: send(QEvent.Type.MouseMove, QPointF(number_x, y))
+    yield lambda: send(QEvent.Type.MouseButtonPress, QPointF(number_x, y), Qt.MouseButton.LeftButton, Qt.MouseButton.LeftButton)
+    for i in range(60):
+        dy = (i if i < 30 else 60 - i) * 2
+        yield lambda dy=dy: send(QEvent.Type.MouseMove, QPointF(number_x, y - dy), Qt.MouseButton.NoButton, Qt.MouseButton.LeftButton)
+    yield lambda: send(QEvent.Type.MouseButtonRelease, QPointF(number_x, y), Qt.MouseButton.LeftButton, Qt.MouseButton.NoButton)
+
+
+SESSION_FACTORIES:dict[str, Callable[[ScriptEdit, random.Random], Iterable[Event]]] = {
+    "typing": typing_session,
+    "paste": paste_session,
+    "scroll": scroll_session,
+    "number_drag": number_drag_session,
+}
+
+
+### Measure ###
+def percentile(values:Sequence[float], q:float)->float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered)-1, int(q * len(ordered)))]
+
+
+def replay(editor:ScriptEdit, session:str, seed:int=0)->list[float]:
+    """run the session, return the latency of each event in milliseconds"""
+    app = QApplication.instance()
+    assert app
+    latencies = []
+    for event in SESSION_FACTORIES[session](editor, random.Random(seed)):
+        start = time.perf_counter()
+        event()
+        app.processEvents()
+        editor.viewport().repaint()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        # keep the completion popup from taking the next keys
+        if editor.completer.popup().isVisible():
+            editor.completer.popup().hide()
+    return latencies
+
+
+def configurations(names:Collection[str]|None=None)->dict[str, set[str]]:
+    configs = {"all": set(COMPONENTS), "none": set()}
+    configs |= {f"only:{component}": {component} for component in COMPONENTS}
+    return {name: components for name, components in configs.items() if not names or name in names}
+
+
+def run(lines:Sequence[int], sessions:Sequence[str], configs:dict[str, set[str]], seed:int=0)->dict:
+    """{lines: {session: {config: {"p50", "p99", "mean", "events"}}}}"""
+    app = QApplication.instance()
+    assert app
+    results:dict = {}
+    for line_count in lines:
+        script = make_script(line_count)
+        for session in sessions:
+            for config, components in configs.items():
+                editor = create_editor(components)
+                editor.resize(900, 700)
+                editor.setPlainText(script)
+                editor.show()
+                app.processEvents()
+
+                latencies = replay(editor, session, seed)
+                shutdown_editor(editor)
+                app.processEvents()
+
+                results.setdefault(str(line_count), {}).setdefault(session, {})[config] = {
+                    "p50": percentile(latencies, 0.5),
+                    "p99": percentile(latencies, 0.99),
+                    "mean": statistics.fmean(latencies),
+                    "events": len(latencies),
+                }
+                stats = results[str(line_count)][session][config]
+                print(f"{line_count:>6} lines  {session:<12} {config:<20} p50 {stats['p50']:7.2f}ms  p99 {stats['p99']:7.2f}ms")
+    return results
+
+
+def compare(results:dict, baseline:dict, tolerance:float)->list[str]:
+    """the measurements slower than the baseline by more than tolerance times"""
+    regressions = []
+    for line_count, sessions in results.items():
+        for session, configs in sessions.items():
+            for config, stats in configs.items():
+                try:
+                    base = baseline["results"][line_count][session][config]
+                except KeyError:
+                    continue
+                for key in ("p50", "p99"):
+                    # ignore sub-millisecond noise
+                    if stats[key] > max(base[key], 1.0) * tolerance:
+                        regressions.append(f"{line_count} lines {session} {config} {key}: {base[key]:.2f}ms -> {stats[key]:.2f}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ScriptEdit keystroke latency benchmark")
+    parser.add_argument("--lines", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--sessions", nargs="+", choices=SESSIONS, default=SESSIONS)
+    parser.add_argument("--configs", nargs="+", help="eg.: all none only:highlighter. default: all of them")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as a json baseline")
+    parser.add_argument("--compare", help="a json baseline to check the results against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    results = run(args.lines, args.sessions, configurations(args.configs), args.seed)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "platform": QGuiApplication.platformName(),
+                "python": sys.version.split()[0],
+                "results": results
+            }, file, indent=2)
+        print(f"baseline written to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
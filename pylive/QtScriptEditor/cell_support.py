@@ -1,7 +1,13 @@
 from typing import *
 
 import re
+import ast
+import bisect
+import builtins
 from dataclasses import dataclass
+from pylive.utils.evaluate_python import UnboundedNameFinder
+
+_BUILTIN_NAMES = set(dir(builtins))
 
 @dataclass
 class Cell:
@@ -12,30 +18,33 @@ class Cell:
 	def lineCount(self):
 		return len(self.content.split("\n"))
 
+CELL_PATTERN = r"#\s*%%" # Define a regex pattern to match the cell markers (`# %%`)
+
+
+def _scan_line(line:str, scope:Literal["TEXT", "DOCSTRING"])->tuple[bool, Literal["TEXT", "DOCSTRING"]]:
+	"""returns if the line is a cell heading, and the scope after the line"""
+	code = line.split("#")[-1]
+	CodeHasDocstring = code.count('"""')%2==1 or code.count("'''")%2==1
+	if CodeHasDocstring and scope !="DOCSTRING":
+		# Enter multiline DOCSTRING
+		scope = "DOCSTRING"
+	elif CodeHasDocstring and scope == "DOCSTRING":
+		# Exit multiline DOCSTRING
+		scope = "TEXT"
+
+	CodeIsHeading = bool(re.match(CELL_PATTERN, line.lstrip())) and scope == "TEXT"
+	return CodeIsHeading, scope
+
+
 def split_cells(script:str, strip=False)->List[Cell]:
 	"""
 	returns a dict where the key is the first line,
 	and the value si the cell content
 	"""
-	cell_pattern = r"#\s*%%" # Define a regex pattern to match the cell markers (`# %%`)
-	
 	cells:List[Cell] = []
-	Scope="TEXT"
+	Scope:Literal["TEXT", "DOCSTRING"]="TEXT"
 	for i, line in enumerate(script.split("\n")):
-
-		code = line.split("#")[-1]
-		CodeHasDocstring = code.count('"""')%2==1 or code.count("'''")%2==1
-		if CodeHasDocstring and Scope !="DOCSTRING":
-			# Enter multiline DOCSTRING
-			Scope = "DOCSTRING"
-		elif CodeHasDocstring and Scope == "DOCSTRING":
-			# Exit multiline DOCSTRING
-			Scope = "TEXT"
-
-		CodeIsEmpty = False if len(code)>0 else True
-		CodeIsComment= line.lstrip() and line.lstrip()[0] == "#"
-		CodeIsHeading = re.match(cell_pattern, line.lstrip()) and Scope == "TEXT"
-
+		CodeIsHeading, Scope = _scan_line(line, Scope)
 
 		if CodeIsHeading or i==0:
 			cells.append(Cell(len(cells), i+1, line))
@@ -47,12 +56,134 @@ def split_cells(script:str, strip=False)->List[Cell]:
 			cell.content = cell.content.strip()
 	return [cell for cell in cells]
 
+
 def cell_at_line(cells:List[Cell], lineno:int)->Cell|None:
 	for cell in cells:
 		if lineno>=cell.lineno and lineno<=cell.lineno+cell.lineCount()-1:
 			return cell
 	return None
 
+
+class CellIndex:
+	"""
+	The cells of a script, updated incrementally.
+
+	an edit only re-splits the lines from the cell containing the edit,
+	until the first unchanged cell heading after the edit.
+	the cells after that are kept, with their line numbers shifted.
+	"""
+	def __init__(self, script:str=""):
+		self._cells:List[Cell] = split_cells(script)
+
+	def cells(self)->List[Cell]:
+		return self._cells
+
+	def update(self, lines:Sequence[str], first_line:int, old_last_line:int, new_last_line:int)->List[int]:
+		"""
+		lines: the lines of the script after the edit
+		first_line, old_last_line, new_last_line: the edited lines, 0 based, before and after the edit.
+		returns the indexes of the cells with changed content
+		"""
+		if not self._cells or len(lines) == 0:
+			self._cells = split_cells("\n".join(lines))
+			return [cell.idx for cell in self._cells]
+
+		delta = new_last_line - old_last_line
+		old_starts = {cell.lineno-1: cell.idx for cell in self._cells}
+
+		# start at the cell before the edit, in case the edit removed a heading
+		first_cell = max(0, self._cellIndexAtLine(first_line)-1)
+		start = self._cells[first_cell].lineno-1
+
+		# re-split until the first unchanged heading after the edit
+		new_cells:List[Cell] = []
+		resume:int|None = None # old index of the first kept cell
+		Scope:Literal["TEXT", "DOCSTRING"] = "TEXT"
+		for i in range(start, len(lines)):
+			line = lines[i]
+			CodeIsHeading, Scope = _scan_line(line, Scope)
+			if CodeIsHeading and i > new_last_line and (i-delta) in old_starts and old_starts[i-delta] > first_cell:
+				resume = old_starts[i-delta]
+				break
+			if CodeIsHeading or i==0 or not new_cells:
+				new_cells.append(Cell(first_cell+len(new_cells), i+1, line))
+			else:
+				new_cells[-1].content+=f"\n{line}"
+
+		old_cells = self._cells[first_cell:resume] if resume is not None else self._cells[first_cell:]
+		kept = self._cells[resume:] if resume is not None else []
+		shift = len(new_cells) - len(old_cells)
+		kept = [Cell(cell.idx+shift, cell.lineno+delta, cell.content) for cell in kept]
+		self._cells = self._cells[:first_cell] + new_cells + kept
+
+		return [
+			cell.idx for j, cell in enumerate(new_cells)
+			if j >= len(old_cells) or old_cells[j].content.strip() != cell.content.strip()
+		]
+
+	def _cellIndexAtLine(self, line:int)->int:
+		"""index of the cell containing the 0 based line number"""
+		linenos = [cell.lineno-1 for cell in self._cells]
+		return max(0, bisect.bisect_right(linenos, line)-1)
+
+
+def cell_names(source:str)->tuple[set[str], set[str]]:
+	"""the global names a cell defines, and the names it reads from the cells before it"""
+	try:
+		tree = ast.parse(source)
+	except SyntaxError:
+		return set(), set()
+	finder = UnboundedNameFinder()
+	finder.visit(tree)
+	reads = set(finder.unbounded_names) - _BUILTIN_NAMES
+	return set(finder.defined_names), reads
+
+
+class CellDataflow:
+	"""
+	Which cells to re-execute after an edit.
+
+	a cell runs, when it was changed, when it reads a name
+	defined by a cell that runs before it, or when it defines such a name itself,
+	so the names keep the value the script order gives them.
+	"""
+	def __init__(self):
+		self._names_cache:dict[str, tuple[set[str], set[str]]] = dict()
+		self._defines:dict[int, set[str]] = dict() # cell index -> names defined when it last ran
+
+	def names(self, cell:Cell)->tuple[set[str], set[str]]:
+		source = cell.content.strip()
+		try:
+			return self._names_cache[source]
+		except KeyError:
+			names = cell_names(source)
+			self._names_cache[source] = names
+			return names
+
+	def cellsToRun(self, cells:Sequence[Cell], changed:Iterable[int])->List[int]:
+		"""the changed cells and their downstream dependents, in script order"""
+		changed = set(changed)
+		if not changed:
+			return []
+		dirty:set[str] = set()
+		run:List[int] = []
+		for cell in cells[min(changed):]:
+			defines, reads = self.names(cell)
+			if cell.idx in changed or reads & dirty or defines & dirty:
+				run.append(cell.idx)
+				# names the cell no longer defines are dirty too
+				dirty |= defines | self._defines.get(cell.idx, set())
+		return run
+
+	def executed(self, cell:Cell):
+		"""record the names defined by an executed cell"""
+		defines, reads = self.names(cell)
+		self._defines[cell.idx] = defines
+
+	def clear(self):
+		self._defines.clear()
+
+
 if __name__ == "__main__":
 	from textwrap import dedent
 	from PySide6.QtCore import *
@@ -91,7 +222,7 @@ if __name__ == "__main__":
 	editor.setPlainText(dedent('''\
 #%% setup
 from PySide6.QtWidgets import *
-from pylive.QtLiveApp import display
+from pylive.QtLiveCode import display
 
 #%% update
 print(f"Print this {28} to the console!")
@@ -3,92 +3,73 @@ from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 from typing import *
-import jedi
-from traitlets.utils import text  # Import the Jedi library
-
 
 from pylive.QtScriptEditor.components.jedi_completer import JediCompleter
+from pylive.QtScriptEditor.components.jedi_completion_service import JediCompletionService
 
 import time
 import logging
 logger = logging.getLogger(__name__)
 
 
-class JediWorkerTask(QObject, QRunnable):
-	"""Encapsulates the rope task for the QThreadPool."""
-	finished = Signal(list)
-	exceptionThrown = Signal(Exception)
-
-	def __init__(self, source_code: str, line: int, column:int):
-		QObject.__init__(self)
-		QRunnable.__init__(self)
-		self.source_code = source_code
-		self.line = line
-		self.column = column
-		logger.info("start jedi task")
-
-	def run(self):
-		"""Perform the jedi code assist task and invoke the callback."""
-		# Check and print the thread details
-		# make sure the current 
-		app = QCoreApplication.instance()
-		IsSeperateThread = app and QThread.currentThread() != app.thread()
-		if not IsSeperateThread:
-			logger.warning("warning: RopeTask does not run in a seperate thread")
-
-		try:
-			script = jedi.Script(code=self.source_code, path="<string>")
-			completions = script.complete(line=self.line, column=self.column)
-			self.finished.emit(completions)
-
-		except Exception as e:
-			self.exceptionThrown.emit(e)
-
 class AsyncJediCompleter(JediCompleter):
-	def __init__(self, textedit: QTextEdit | QPlainTextEdit):
+	""" completes with a JediCompletionService, off the gui thread.
+	typing is debounced, and results for outdated text are dropped """
+	def __init__(self, textedit: QTextEdit | QPlainTextEdit | QLineEdit):
 		super().__init__(textedit)
-		self._thread_pool = QThreadPool.globalInstance()
-		self._active_tasks:List[JediWorkerTask] = []
-		self.destroyed.connect(self.cancellAllTasks())
-
-		# self.model().modelReset.connect(lambda: self.updateCompletionWidgets())
+		self.service = JediCompletionService(parent=self)
+		self.service.completionsReady.connect(self._update_completion_model)
+		self.service.signaturesReady.connect(self._update_hint)
+		self.service.exceptionThrown.connect(lambda e: logger.warning(f"Error in requestCompletions: {e}"))
+
+		# keep the service document in sync with the edits, instead of sending the whole text on every keystroke
+		if isinstance(textedit, (QPlainTextEdit, QTextEdit)):
+			self.service.setSource(textedit.toPlainText())
+			textedit.document().contentsChange.connect(self._onContentsChange)
+
+	def _onContentsChange(self, position:int, chars_removed:int, chars_added:int):
+		textedit = cast(QPlainTextEdit, self.widget())
+		doc = textedit.document()
+		document_length = doc.characterCount()-1 # without the last paragraph separator
+		cursor = QTextCursor(doc)
+		cursor.setPosition(min(position, document_length))
+		cursor.setPosition(min(position+chars_added, document_length), QTextCursor.MoveMode.KeepAnchor)
+		text = cursor.selectedText().replace("\u2029", "\n").replace("\u2028", "\n")
+		if not self.service.applyChange(position, chars_removed, text) or len(self.service.source()) != document_length:
+			# setPlainText reports changes including the last paragraph separator
+			self.service.setSource(textedit.toPlainText())
 
 	def requestCompletions(self):
 		logger.info('requestCompletions...')
-		# cancel previous tasks
-		self.cancellAllTasks()
 		
 		# get cursor info
-		def get_cursor_info()->Tuple[str, str, int, int]:
+		def get_cursor_info()->Tuple[str, int, int]:
 			match self.widget():
-				case QPlainTextEdit():
+				case QPlainTextEdit() | QTextEdit():
 					textedit = cast(QPlainTextEdit, self.widget())
-					source_code = textedit.toPlainText()
 					cursor = QTextCursor(textedit.textCursor())
 					lineno = cursor.blockNumber() + 1  # PySide6 line numbers are 0-based
 					columnno = cursor.columnNumber()  # Current position within the line
 					cursor.movePosition(QTextCursor.MoveOperation.StartOfLine, QTextCursor.MoveMode.KeepAnchor)
 					line_text = cursor.selectedText()
-
-					return source_code, line_text, lineno, columnno
+					return line_text, lineno, columnno
 				case QLineEdit():
 					lineedit = cast(QLineEdit, self.widget())
-					lineno = 1
-					columnno = lineedit.cursorPosition()
-					source_code = lineedit.text()
-					line_text = lineedit.text()
-					return source_code, line_text, lineno, columnno
+					self.service.setSource(lineedit.text())
+					return lineedit.text(), 1, lineedit.cursorPosition()
 				case _:
 					raise ValueError(f"widget shoudl be either a QPlainTextEdit or a QLineEdit, got: {self.widget()}")
 
-		source_code, line_text, lineno, columnno = get_cursor_info()
+		line_text, lineno, columnno = get_cursor_info()
 		# get completions from jedi
-		if line_text.split(" ")[-1].isidentifier() or line_text.endswith("."):
-			jedi_task = JediWorkerTask(source_code, lineno, columnno)
-			jedi_task.finished.connect(lambda completions:
-				self._update_completion_model([completion.name for completion in completions]))
-			self._active_tasks.append(jedi_task)
-			self._thread_pool.start(jedi_task)
+		complete = line_text.split(" ")[-1].isidentifier() or line_text.endswith(".")
+		self.service.requestCompletions(lineno, columnno, complete=complete)
+
+	def _update_hint(self, signatures:List[str]):
+		if signatures:
+			self.showHint(signatures[0])
+		else:
+			self.hint_label.hide()
 
 	def _update_completion_model(self, completions:List[str]):
 		try:
@@ -103,11 +84,12 @@ class AsyncJediCompleter(JediCompleter):
 			self.hint_label.hide()
 
 	def cancellAllTasks(self):
-		"""Cancel all running tasks by tracking task status."""
-		self._active_tasks.clear()  # Clear the list of active tasks
+		"""Drop pending requests, and the results of the running one."""
+		self.service.cancel()
 
 
 if __name__ == "__main__":
+	import jedi
 	def hello(x:int):
 		pass
 
@@ -0,0 +1,406 @@
+from typing import *
+from PySide6.QtCore import *
+import builtins
+import time
+import ast
+
+from pylive.QtScriptEditor.cell_support import split_cells
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class Diagnostic(NamedTuple):
+    lineno: int # 1-based, in the document
+    column: int # 0-based, in characters
+    end_column: int|None # None: to the end of the line
+    severity: Literal["error", "warning"]
+    message: str
+    code: Literal["syntax-error", "undefined-name", "unused-import"]
+
+
+MODULE_NAMES = {"__name__", "__file__", "__doc__", "__builtins__", "__spec__", "__loader__", "__package__", "__annotations__"}
+BUILTIN_NAMES = set(dir(builtins)) | MODULE_NAMES
+
+
+### Cell analysis ###
+class _Name(NamedTuple):
+    name: str
+    lineno: int # 1-based, in the cell
+    column: int # characters
+    end_column: int
+
+
+class CellSummary(NamedTuple):
+    """what a cell means for the rest of the document. cached by the cell content"""
+    diagnostics: tuple[Diagnostic, ...] # found within the cell, lines relative to the cell
+    defines: frozenset[str] # module level names
+    loads: frozenset[str] # module level names read, also names the cell defines itself
+    free_loads: tuple[_Name, ...] # module level names read, but not defined in the cell
+    imports: tuple[_Name, ...] # module level imports
+    defines_unknown: bool # a star import, or the cell does not parse
+
+
+class _Scope:
+    def __init__(self, kind:Literal["module", "class", "function", "comprehension"], parent:Optional['_Scope']):
+        self.kind = kind
+        self.parent = parent
+        self.bindings: set[str] = set()
+        self.globals: set[str] = set()
+        self.loads: list[_Name] = []
+        self.imports: list[_Name] = []
+        self.used: set[str] = set() # bindings read from this scope or nested scopes
+
+
+class _ScopeAnalyzer(ast.NodeVisitor):
+    """
+    collects bindings and reads per scope, in one pass.
+    reads are resolved after the pass, so functions can use names bound later in the cell
+    """
+    def __init__(self, lines:list[str]):
+        self.lines = lines
+        self.module = _Scope("module", None)
+        self.scope = self.module
+        self.scopes = [self.module]
+        self.star_import = False
+
+    ### Helpers ###
+    def _column(self, lineno:int, byte_column:int)->int:
+        """ast columns are utf-8 byte offsets"""
+        line = self.lines[lineno-1] if 0 < lineno <= len(self.lines) else ""
+        if line.isascii():
+            return byte_column
+        return len(line.encode("utf-8")[:byte_column].decode("utf-8", errors="ignore"))
+
+    def _name(self, name:str, node:ast.AST)->_Name:
+        column = self._column(node.lineno, node.col_offset) # type: ignore
+        return _Name(name, node.lineno, column, column+len(name)) # type: ignore
+
+    def _push(self, kind)->_Scope:
+        scope = _Scope(kind, self.scope)
+        self.scopes.append(scope)
+        self.scope = scope
+        return scope
+
+    def _pop(self):
+        assert self.scope.parent
+        self.scope = self.scope.parent
+
+    def _bind(self, name:str, scope:_Scope|None=None):
+        scope = scope or self.scope
+        if name in scope.globals:
+            scope = self.module
+        scope.bindings.add(name)
+
+    def _load(self, name:str, node:ast.AST):
+        self.scope.loads.append(self._name(name, node))
+
+    ### Names ###
+    def visit_Name(self, node:ast.Name):
+        if isinstance(node.ctx, ast.Load):
+            self._load(node.id, node)
+        else:
+            self._bind(node.id)
+
+    def visit_AugAssign(self, node:ast.AugAssign):
+        if isinstance(node.target, ast.Name):
+            self._load(node.target.id, node.target)
+        self.generic_visit(node)
+
+    def visit_NamedExpr(self, node:ast.NamedExpr):
+        self.visit(node.value)
+        scope = self.scope
+        while scope.kind == "comprehension" and scope.parent:
+            scope = scope.parent
+        self._bind(node.target.id, scope)
+
+    def visit_Global(self, node:ast.Global):
+        self.scope.globals.update(node.names)
+
+    def visit_Nonlocal(self, node:ast.Nonlocal):
+        pass # bound in the enclosing function
+
+    def visit_ExceptHandler(self, node:ast.ExceptHandler):
+        if node.name:
+            self._bind(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchAs(self, node:ast.MatchAs):
+        if node.name:
+            self._bind(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchStar(self, node:ast.MatchStar):
+        if node.name:
+            self._bind(node.name)
+
+    def visit_MatchMapping(self, node:ast.MatchMapping):
+        if node.rest:
+            self._bind(node.rest)
+        self.generic_visit(node)
+
+    ### Imports ###
+    def visit_Import(self, node:ast.Import):
+        for alias in node.names:
+            name = alias.asname or alias.name.split(".")[0]
+            self._bind(name)
+            self.scope.imports.append(self._name(name, alias))
+
+    def visit_ImportFrom(self, node:ast.ImportFrom):
+        for alias in node.names:
+            if alias.name == "*":
+                self.star_import = True
+                continue
+            name = alias.asname or alias.name
+            self._bind(name)
+            if node.module != "__future__":
+                self.scope.imports.append(self._name(name, alias))
+
+    ### Scopes ###
+    def _visit_arguments(self, args:ast.arguments):
+        """defaults and annotations, evaluated in the enclosing scope"""
+        for default in [*args.defaults, *args.kw_defaults]:
+            if default:
+                self.visit(default)
+        for arg in [*args.posonlyargs, *args.args, args.vararg, *args.kwonlyargs, args.kwarg]:
+            if arg and arg.annotation:
+                self.visit(arg.annotation)
+
+    def _bind_arguments(self, args:ast.arguments):
+        for arg in [*args.posonlyargs, *args.args, args.vararg, *args.kwonlyargs, args.kwarg]:
+            if arg:
+                self._bind(arg.arg)
+
+    def visit_FunctionDef(self, node:ast.FunctionDef|ast.AsyncFunctionDef):
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self._visit_arguments(node.args)
+        if node.returns:
+            self.visit(node.returns)
+        self._bind(node.name)
+        self._push("function")
+        self._bind_arguments(node.args)
+        if self.scope.parent and self.scope.parent.kind == "class":
+            self._bind("__class__")
+        for statement in node.body:
+            self.visit(statement)
+        self._pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node:ast.Lambda):
+        self._visit_arguments(node.args)
+        self._push("function")
+        self._bind_arguments(node.args)
+        self.visit(node.body)
+        self._pop()
+
+    def visit_ClassDef(self, node:ast.ClassDef):
+        for expr in [*node.decorator_list, *node.bases, *node.keywords]:
+            self.visit(expr)
+        self._push("class")
+        self._bind("__module__")
+        self._bind("__qualname__")
+        for statement in node.body:
+            self.visit(statement)
+        self._pop()
+        self._bind(node.name)
+
+    def _visit_comprehension(self, node:ast.ListComp|ast.SetComp|ast.GeneratorExp|ast.DictComp, elements:list[ast.expr]):
+        generators = node.generators
+        # the first iterable is evaluated in the enclosing scope
+        self.visit(generators[0].iter)
+        self._push("comprehension")
+        for i, generator in enumerate(generators):
+            if i > 0:
+                self.visit(generator.iter)
+            self.visit(generator.target)
+            for condition in generator.ifs:
+                self.visit(condition)
+        for element in elements:
+            self.visit(element)
+        self._pop()
+
+    def visit_ListComp(self, node:ast.ListComp):
+        self._visit_comprehension(node, [node.elt])
+
+    visit_SetComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node:ast.DictComp):
+        self._visit_comprehension(node, [node.key, node.value])
+
+    ### Resolve ###
+    def _resolve(self, scope:_Scope, name:str)->_Scope|None:
+        """the scope binding a name read in scope. None: not bound in the cell"""
+        if name in scope.globals:
+            return self.module if name in self.module.bindings else None
+        current: _Scope|None = scope
+        while current:
+            # class scopes are only visible from their own body
+            if (current is scope or current.kind != "class") and name in current.bindings:
+                return current
+            current = current.parent
+        return None
+
+    def summary(self)->CellSummary:
+        diagnostics: list[Diagnostic] = []
+        module_loads: set[str] = set()
+        free_loads: list[_Name] = []
+        for scope in self.scopes:
+            for load in scope.loads:
+                binding = self._resolve(scope, load.name)
+                if binding is not None:
+                    binding.used.add(load.name)
+                if binding is None or binding is self.module:
+                    module_loads.add(load.name)
+                if binding is None:
+                    free_loads.append(load)
+
+        # unused imports inside functions and classes are known from the cell alone
+        for scope in self.scopes[1:]:
+            for imported in scope.imports:
+                if imported.name not in scope.used:
+                    diagnostics.append(_unused_import(imported, 0))
+
+        return CellSummary(
+            diagnostics=tuple(diagnostics),
+            defines=frozenset(self.module.bindings),
+            loads=frozenset(module_loads),
+            free_loads=tuple(free_loads),
+            imports=tuple(self.module.imports),
+            defines_unknown=self.star_import
+        )
+
+
+def _unused_import(imported:_Name, line_offset:int)->Diagnostic:
+    return Diagnostic(imported.lineno+line_offset, imported.column, imported.end_column, "warning", f"'{imported.name}' imported but unused", "unused-import")
+
+
+def analyze_cell(source:str)->CellSummary:
+    """syntax errors, and the names a cell defines and reads. lines are relative to the cell"""
+    lines = source.split("\n")
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as err:
+        lineno = err.lineno or 1
+        column = max(0, (err.offset or 1) - 1)
+        diagnostic = Diagnostic(lineno, column, None, "error", str(err.msg), "syntax-error")
+        # the cell can still be using and defining names, dont report them meanwhile
+        return CellSummary((diagnostic,), frozenset(), frozenset(), (), (), defines_unknown=True)
+
+    analyzer = _ScopeAnalyzer(lines)
+    analyzer.visit(tree)
+    return analyzer.summary()
+
+
+def check_cells(cells:Sequence[tuple[int, str]], known_names:Collection[str]=(), cache:dict[str, CellSummary]|None=None)->list[Diagnostic]:
+    """
+    diagnostics for cells given as (first line number, content) pairs.
+    cells are analyzed one by one, and cached by content. names resolve across cells,
+    like in a module: a name defined in any cell is defined.
+    """
+    cache = cache if cache is not None else dict()
+    summaries = []
+    for lineno, content in cells:
+        if (summary:=cache.get(content)) is None:
+            summary = cache[content] = analyze_cell(content)
+        summaries.append((lineno, summary))
+
+    defined = set(BUILTIN_NAMES) | set(known_names)
+    loaded = set()
+    defines_unknown = False
+    for lineno, summary in summaries:
+        defined |= summary.defines
+        loaded |= summary.loads
+        defines_unknown |= summary.defines_unknown
+
+    diagnostics: list[Diagnostic] = []
+    for lineno, summary in summaries:
+        offset = lineno - 1
+        diagnostics += [diagnostic._replace(lineno=diagnostic.lineno+offset) for diagnostic in summary.diagnostics]
+        if not defines_unknown:
+            diagnostics += [
+                Diagnostic(load.lineno+offset, load.column, load.end_column, "error", f"undefined name '{load.name}'", "undefined-name")
+                for load in summary.free_loads if load.name not in defined
+            ]
+        diagnostics += [_unused_import(imported, offset) for imported in summary.imports if imported.name not in loaded]
+    return diagnostics
+
+
+### Engine ###
+class _DiagnosticsWorker(QObject):
+    finished = Signal(int, list) # generation, list[Diagnostic]
+
+    def __init__(self):
+        super().__init__()
+        self.cache: dict[str, CellSummary] = dict()
+        self.latest_generation = 0 # set by the engine, from the main thread
+
+    @Slot(int, str, object)
+    def run(self, generation:int, source:str, known_names:frozenset[str]):
+        if generation != self.latest_generation:
+            return # a newer request is already queued
+        start_time = time.perf_counter()
+        cells = [(cell.lineno, cell.content) for cell in split_cells(source)]
+        diagnostics = check_cells(cells, known_names, self.cache)
+
+        # keep only the cells of the current document
+        contents = {content for lineno, content in cells}
+        for content in [content for content in self.cache if content not in contents]:
+            del self.cache[content]
+        logger.debug(f"diagnostics took: {(time.perf_counter()-start_time)*1000:.1f}ms")
+        self.finished.emit(generation, diagnostics)
+
+
+class DiagnosticsEngine(QObject):
+    """
+    Checks python source in a worker thread: syntax errors, undefined names and unused imports.
+
+    - the source is checked cell by cell (see cell_support), unchanged cells are cached
+    - results of outdated requests are dropped
+    """
+    diagnosticsReady = Signal(list) # list[Diagnostic]
+
+    _requested = Signal(int, str, object)
+
+    def __init__(self, parent:QObject|None=None):
+        super().__init__(parent=parent)
+        self._generation = 0
+        self._known_names: frozenset[str] = frozenset()
+
+        self._thread = QThread()
+        self._worker = _DiagnosticsWorker()
+        self._worker.moveToThread(self._thread)
+        self._requested.connect(self._worker.run)
+        self._worker.finished.connect(self._onFinished)
+        self._thread.start()
+
+        # a QThread must not be deleted while running
+        thread = self._thread
+        self.destroyed.connect(lambda: (thread.quit(), thread.wait()))
+        if app:=QCoreApplication.instance():
+            app.aboutToQuit.connect(self.shutdown)
+
+    def shutdown(self):
+        self._generation += 1
+        self._worker.latest_generation = self._generation
+        if self._thread.isRunning():
+            self._thread.quit()
+            self._thread.wait()
+
+    def setKnownNames(self, names:Iterable[str]):
+        """names defined outside the source, eg.: by the execution namespace"""
+        self._known_names = frozenset(names)
+
+    def analyze(self, source:str)->int:
+        """request diagnostics for source. returns the request generation"""
+        self._generation += 1
+        self._worker.latest_generation = self._generation
+        self._requested.emit(self._generation, source, self._known_names)
+        return self._generation
+
+    def _onFinished(self, generation:int, diagnostics:list[Diagnostic]):
+        if generation != self._generation:
+            return
+        self.diagnosticsReady.emit(diagnostics)
@@ -3,8 +3,6 @@ from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 from typing import *
-import jedi
-from traitlets.utils import text  # Import the Jedi library
 
 from pylive.QtScriptEditor.components.textedit_completer import TextEditCompleter
 
@@ -37,7 +35,8 @@ class JediCompleter(TextEditCompleter):
 		cursor.movePosition(QTextCursor.MoveOperation.StartOfLine, QTextCursor.MoveMode.KeepAnchor)
 		line_text = cursor.selectedText()
 		
-		# get completion from jedi
+		# get completion from jedi, one Script for both signatures and completions
+		import jedi # loaded on the first completion
 		script = jedi.Script(code=source_code, path="<string>")
 		if self.showArgumentHints(script, line, column):
 			return
@@ -45,7 +44,6 @@ class JediCompleter(TextEditCompleter):
 		if line_text.split(" ")[-1].isidentifier() or line_text.endswith("."):
 			try:
 				# Use Jedi to get completions
-				script = jedi.Script(code=source_code, path="<string>")
 				completions = script.complete(line=line, column=column)
 				
 				# Update proposals in the model
@@ -59,7 +57,7 @@ class JediCompleter(TextEditCompleter):
 				self.hint_label.hide()
 		logger.info(f"jedi completion took: {(time.time()-start_time)*1000} milliseconds")
 
-	def showArgumentHints(self, script: jedi.Script, line: int, column: int)->bool:
+	def showArgumentHints(self, script: 'jedi.Script', line: int, column: int)->bool:
 		try:
 			call_signatures = script.get_signatures(line=line, column=column)
 			if call_signatures:
@@ -67,17 +65,7 @@ class JediCompleter(TextEditCompleter):
 				signature = call_signatures[0]
 				func_name = signature.name
 				params = ", ".join([f"{param.name}" for param in signature.params])
-
-				# Format and display the hint
-				hint_text = f"{func_name}({params})"
-				self.hint_label.setText(hint_text)
-
-				# Position the hint near the cursor
-				cursor_rect = self.widget().cursorRect()
-				global_pos = self.widget().mapToGlobal(cursor_rect.bottomLeft())
-				self.hint_label.move(global_pos)
-				self.hint_label.adjustSize()
-				self.hint_label.show()
+				self.showHint(f"{func_name}({params})")
 				return True
 			else:
 				self.hint_label.hide()
@@ -87,6 +75,16 @@ class JediCompleter(TextEditCompleter):
 			self.hint_label.hide()
 			return False
 
+	def showHint(self, hint_text:str):
+		self.hint_label.setText(hint_text)
+
+		# Position the hint near the cursor
+		cursor_rect = self.widget().cursorRect()
+		global_pos = self.widget().mapToGlobal(cursor_rect.bottomLeft())
+		self.hint_label.move(global_pos)
+		self.hint_label.adjustSize()
+		self.hint_label.show()
+
 	@override
 	def insertCompletion(self, completion):
 		"""
@@ -102,80 +100,8 @@ class JediCompleter(TextEditCompleter):
 		textedit.setTextCursor(tc)
 
 
-class JediWorkerTask(QObject, QRunnable):
-	"""Encapsulates the rope task for the QThreadPool."""
-	finished = Signal(list)
-	exceptionThrown = Signal(Exception)
-
-	def __init__(self, source_code: str, line: int, column:int):
-		QObject.__init__(self)
-		QRunnable.__init__(self)
-		self.source_code = source_code
-		self.line = line
-		self.column = column
-
-	def run(self):
-		"""Perform the jedi code assist task and invoke the callback."""
-		# Check and print the thread details
-		# make sure the current 
-		app = QCoreApplication.instance()
-		IsSeperateThread = app and QThread.currentThread() != app.thread()
-		if not IsSeperateThread:
-			print("warning: RopeTask does not run in a seperate thread")
-
-		try:
-			script = jedi.Script(code=self.source_code, path="<string>")
-			completions = script.complete(line=self.line, column=self.column)
-			self.finished.emit(completions)
-
-		except Exception as e:
-			self.exceptionThrown.emit(e)
-
-class AsyncJediCompleter(JediCompleter):
-	def __init__(self, textedit: QTextEdit | QPlainTextEdit):
-		super().__init__(textedit)
-		self._active_tasks:List[JediWorkerTask] = []
-		self.destroyed.connect(self.cancellAllTasks())
-
-		# self.model().modelReset.connect(lambda: self.updateCompletionWidgets())
-		
-
-	def requestCompletions(self):
-		# cancel previous tasks
-		self.cancellAllTasks()
-
-		# get cursor info
-		textedit = cast(QPlainTextEdit, self.widget())
-		source_code = textedit.toPlainText()
-		cursor = QTextCursor(textedit.textCursor())
-		line = cursor.blockNumber() + 1  # PySide6 line numbers are 0-based
-		column = cursor.columnNumber()  # Current position within the line
-		cursor.movePosition(QTextCursor.MoveOperation.StartOfLine, QTextCursor.MoveMode.KeepAnchor)
-		line_text = cursor.selectedText()
-
-		# get completions ffrom jedi
-		if line_text.split(" ")[-1].isidentifier() or line_text.endswith("."):
-			jedi_task = JediWorkerTask(source_code, line, column)
-			jedi_task.finished.connect(lambda completions:
-				self._update_completion_model(completions))
-
-	def _update_completion_model(self, completions:List[str]):
-		try:
-			# Update proposals in the model
-			string_list_model = cast(QStringListModel, self.model())
-			string_list_model.setStringList([completion for completion in completions])
-
-		except Exception as e:
-			print(f"Error in requestCompletions: {e}")
-			string_list_model = cast(QStringListModel, self.model())
-			string_list_model.setStringList([])
-			self.hint_label.hide()
-
-	def cancellAllTasks(self):
-		"""Cancel all running tasks by tracking task status."""
-		self._active_tasks.clear()  # Clear the list of active tasks
-
 if __name__ == "__main__":
+	import jedi
 	def hello(x:int):
 		pass
 
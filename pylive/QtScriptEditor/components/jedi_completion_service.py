@@ -0,0 +1,202 @@
+from PySide6.QtCore import *
+from typing import *
+from collections import deque
+import bisect
+import time
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class CompletionRequest(NamedTuple):
+	generation:int
+	source:str
+	line:int   # 1-based
+	column:int # 0-based
+	complete:bool # False: only signatures are requested
+	requested_at:float
+
+
+class CompletionResult(NamedTuple):
+	generation:int
+	completions:list[str]
+	signatures:list[str] # eg.: "func(a, b)"
+	elapsed:float # seconds spent in jedi
+	requested_at:float
+
+
+class _JediWorker(QObject):
+	""" runs jedi in the service thread, with a persistent project and environment """
+	finished = Signal(object) # CompletionResult
+	exceptionThrown = Signal(Exception)
+
+	def __init__(self, project:Optional['jedi.Project'], project_path:str, path:str):
+		super().__init__()
+		self.project = project
+		self.project_path = project_path
+		self.environment:Optional['jedi.api.environment.InterpreterEnvironment'] = None
+		self.path = path
+		self.latest_generation = 0 # set by the service, from the main thread
+
+	def _load(self):
+		""" jedi is imported in the worker thread, the gui starts without it """
+		import jedi
+		if self.project is None:
+			self.project = jedi.Project(self.project_path)
+		if self.environment is None:
+			self.environment = jedi.InterpreterEnvironment()
+
+	@Slot()
+	def warmup(self):
+		""" load jedi, the builtins and the parser grammar, before the first keystroke """
+		start_time = time.perf_counter()
+		import jedi
+		try:
+			self._load()
+			jedi.Script(code="import builtins\nbuiltins.", path=self.path, project=self.project, environment=self.environment).complete(2, 9)
+		except Exception as err:
+			logger.warning(f"jedi warmup failed: {err}")
+		logger.info(f"jedi warmup took: {(time.perf_counter()-start_time)*1000:.0f} milliseconds")
+
+	@Slot(object)
+	def run(self, request:CompletionRequest):
+		if request.generation != self.latest_generation:
+			# a newer request is already queued
+			return
+
+		start_time = time.perf_counter()
+		import jedi
+		try:
+			self._load()
+			# one Script for both signatures and completions.
+			# a fixed path lets parso reuse the previous parse tree, and only reparse the changed lines
+			script = jedi.Script(code=request.source, path=self.path, project=self.project, environment=self.environment)
+			signatures = [
+				f"{signature.name}({', '.join(param.name for param in signature.params)})"
+				for signature in script.get_signatures(line=request.line, column=request.column)
+			]
+			completions = []
+			if request.complete and request.generation == self.latest_generation:
+				completions = [completion.name for completion in script.complete(line=request.line, column=request.column)]
+		except Exception as err:
+			self.exceptionThrown.emit(err)
+			return
+
+		self.finished.emit(CompletionResult(request.generation, completions, signatures, time.perf_counter()-start_time, request.requested_at))
+
+
+class JediCompletionService(QObject):
+	""" Completion service for a single document.
+
+	- jedi runs in a worker thread with a persistent jedi.Project and environment,
+	  warmed up when the service starts
+	- the document is kept up to date incrementally (see applyChange)
+	- requests are debounced, and tagged with a generation number.
+	  stale requests are skipped, and stale results are dropped.
+	- latencies from request to result are recorded, see latencyHistogram
+	"""
+	completionsReady = Signal(list) # list[str]
+	signaturesReady = Signal(list) # list[str]
+	exceptionThrown = Signal(Exception)
+
+	_requested = Signal(object) # CompletionRequest
+	_warmupRequested = Signal()
+
+	LATENCY_BINS = (5, 10, 20, 50, 100, 200, 500, 1000) # milliseconds
+
+	def __init__(self, project:Optional['jedi.Project']=None, debounce:int=20, parent:QObject|None=None):
+		super().__init__(parent=parent)
+		project_path = str(project.path) if project else QDir.currentPath()
+		self._source = ""
+		self._generation = 0
+		self._pending:tuple[int, int, bool]|None = None
+		self._latencies:deque[float] = deque(maxlen=1000)
+
+		self._debounce_timer = QTimer(self)
+		self._debounce_timer.setSingleShot(True)
+		self._debounce_timer.setInterval(debounce)
+		self._debounce_timer.timeout.connect(self._sendRequest)
+
+		### worker ###
+		self._thread = QThread()
+		self._worker = _JediWorker(project, project_path, f"{project_path}/__jedi_completion_service_{id(self)}__.py")
+		self._worker.moveToThread(self._thread)
+		self._requested.connect(self._worker.run)
+		self._warmupRequested.connect(self._worker.warmup)
+		self._worker.finished.connect(self._onFinished)
+		self._worker.exceptionThrown.connect(self.exceptionThrown)
+		self._thread.start()
+		# warm up once the event loop runs, not to compete with the gui startup
+		QTimer.singleShot(0, self, self._warmupRequested.emit)
+
+		# a QThread must not be deleted while running
+		thread = self._thread
+		self.destroyed.connect(lambda: (thread.quit(), thread.wait()))
+		if app:=QCoreApplication.instance():
+			app.aboutToQuit.connect(self.shutdown)
+
+	def shutdown(self):
+		""" stop the worker thread. waits for the running jedi call to finish """
+		self.cancel()
+		if self._thread.isRunning():
+			self._thread.quit()
+			self._thread.wait()
+
+	### Document ###
+	def source(self)->str:
+		return self._source
+
+	def setSource(self, source:str):
+		self._source = source
+
+	def applyChange(self, position:int, chars_removed:int, text:str)->bool:
+		""" replace chars_removed characters at position with text.
+		returns False if the change does not fit the document; set the full source then """
+		if position + chars_removed > len(self._source):
+			return False
+		self._source = self._source[:position] + text + self._source[position+chars_removed:]
+		return True
+
+	### Requests ###
+	def requestCompletions(self, line:int, column:int, complete:bool=True):
+		""" request completions and signatures at line (1-based), column (0-based),
+		after the debounce interval. results are emitted with completionsReady and signaturesReady"""
+		self._generation += 1
+		self._worker.latest_generation = self._generation
+		self._pending = line, column, complete
+		self._debounce_timer.start()
+
+	def cancel(self):
+		""" drop pending requests and the results of running ones """
+		self._generation += 1
+		self._worker.latest_generation = self._generation
+		self._pending = None
+		self._debounce_timer.stop()
+
+	def _sendRequest(self):
+		if self._pending is None:
+			return
+		line, column, complete = self._pending
+		self._pending = None
+		self._requested.emit(CompletionRequest(self._generation, self._source, line, column, complete, time.perf_counter()))
+
+	def _onFinished(self, result:CompletionResult):
+		if result.generation != self._generation:
+			logger.debug(f"dropped stale completions: {result.generation}/{self._generation}")
+			return
+		self._latencies.append((time.perf_counter() - result.requested_at)*1000)
+		logger.info(f"jedi completion took: {result.elapsed*1000:.0f} milliseconds")
+		self.signaturesReady.emit(result.signatures)
+		self.completionsReady.emit(result.completions)
+
+	### Latency ###
+	def latencies(self)->list[float]:
+		""" milliseconds from sending a request, to receiving its results. the last 1000 requests """
+		return list(self._latencies)
+
+	def latencyHistogram(self, bins:Sequence[float]=LATENCY_BINS)->list[tuple[float, int]]:
+		""" (upper bound in milliseconds, count) pairs. the last bin counts everything above """
+		counts = [0] * (len(bins)+1)
+		for latency in self._latencies:
+			counts[bisect.bisect_left(bins, latency)] += 1
+		return list(zip([*bins, float('inf')], counts))
@@ -33,16 +33,36 @@ class LineNumberArea(QWidget):
 		self._bars = []
 		self.update()
 
-	def insertBar(self, first_line_no:int, last_line_no:int, color:QColor|None=None):
+	def insertBar(self, first_line_no:int, last_line_no:int, color:QColor|None=None, label:str|None=None):
+		"""the label is shown along the bar, and as its tooltip"""
 		if not color:
 			color = self.palette().color(QPalette.ColorRole.Accent)
-		self._bars.append((first_line_no, last_line_no, color))
+		self._bars.append((first_line_no, last_line_no, color, label))
 		self.update()
 
 	def removeBar(self, first_line_no:int, last_line_no:int):
-		self._bars.remove((first_line_no, last_line_no))
+		self._bars = [bar for bar in self._bars if (bar[0], bar[1]) != (first_line_no, last_line_no)]
 		self.update()
 
+	def barAt(self, pos:QPoint)->tuple[int, int, QColor, str|None]|None:
+		line_no = self.editor.cursorForPosition(QPoint(0, pos.y())).blockNumber()+1
+		for bar in self._bars:
+			if bar[0] <= line_no <= bar[1]:
+				return bar
+		return None
+
+	@override
+	def event(self, event:QEvent)->bool:
+		if event.type() == QEvent.Type.ToolTip:
+			help_event = cast(QHelpEvent, event)
+			bar = self.barAt(help_event.pos())
+			if bar and bar[3]:
+				QToolTip.showText(help_event.globalPos(), bar[3], self)
+			else:
+				QToolTip.hideText()
+			return True
+		return super().event(event)
+
 	@override
 	def sizeHint(self)->QSize:
 		return QSize(self.lineNumberAreaWidth(), 0)
@@ -102,7 +122,10 @@ class LineNumberArea(QWidget):
 		
 		painter.setPen(Qt.NoPen)
 		content_offset = self.editor.contentOffset()
-		for begin, end, color in self._bars:
+		label_font = QFont(self.font())
+		label_font.setPointSizeF(self.font().pointSizeF()*0.75)
+		label_metrics = QFontMetrics(label_font)
+		for begin, end, color, label in self._bars:
 			begin_block = self.editor.document().findBlockByLineNumber(begin-1)
 			end_block = self.editor.document().findBlockByLineNumber(end-1)
 
@@ -111,12 +134,24 @@ class LineNumberArea(QWidget):
 
 			color.setAlpha(128)
 			painter.setBrush(color)
-			painter.drawRoundedRect(QRectF(
+			bar_rect = QRectF(
 				content_offset.x(),
 				begin_rect.top()+content_offset.y()+2, 
 				self.width(),
 				end_rect.bottom()-begin_rect.top()-4
-			), 4, 4)
+			)
+			painter.drawRoundedRect(bar_rect, 4, 4)
+
+			# label along the left edge of the bar, when it fits
+			if label and label_metrics.horizontalAdvance(label) < bar_rect.height()-4:
+				painter.save()
+				painter.setFont(label_font)
+				painter.setPen(self.palette().color(QPalette.ColorRole.PlaceholderText))
+				painter.translate(bar_rect.left()+1, bar_rect.bottom()-2)
+				painter.rotate(-90)
+				painter.drawText(0, label_metrics.ascent(), label)
+				painter.restore()
+				painter.setPen(Qt.NoPen)
 
 class TextEditWithLineNumbers(QPlainTextEdit):
 	def __init__(self, parent=None):
@@ -3,6 +3,8 @@ from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
+from pylive.QtScriptEditor.components.diagnostics_engine import DiagnosticsEngine, Diagnostic
+
 
 class LinterLabelItem(QLabel):
     def __init__(self, parent=None):
@@ -35,12 +37,105 @@ class LinterLabelItem(QLabel):
 
 
 class TextEditLinterWidget(QObject):
-    def __init__(self, textedit: QPlainTextEdit):
+    """
+    Shows problems in a QPlainTextEdit.
+
+    - exceptions pushed with lint/lintException, until clear() is called
+    - diagnostics of the DiagnosticsEngine, checked in the background while typing
+
+    underlines are ExtraSelections, the document itself is never formatted
+    """
+    LINT_DELAY = 150 # milliseconds after the last edit
+
+    def __init__(self, textedit: QPlainTextEdit, diagnostics:bool=True):
         super().__init__(textedit)
 
         self.textedit = textedit
         self.labels = []
-        self.underlines = []
+        self._exception_selections: list[QTextEdit.ExtraSelection] = []
+        self._diagnostic_selections: list[QTextEdit.ExtraSelection] = []
+        self.textedit.viewport().installEventFilter(self)
+
+        ### Diagnostics ###
+        self.engine: DiagnosticsEngine|None = None
+        if diagnostics:
+            self.engine = DiagnosticsEngine(parent=self)
+            self.engine.diagnosticsReady.connect(self.setDiagnostics)
+            self._linted_revision = -1
+            self._lint_timer = QTimer(self)
+            self._lint_timer.setSingleShot(True)
+            self._lint_timer.setInterval(self.LINT_DELAY)
+            self._lint_timer.timeout.connect(self._requestDiagnostics)
+            self.textedit.document().contentsChange.connect(lambda position, removed, added: self._lint_timer.start())
+            self._lint_timer.start()
+
+    def setKnownNames(self, names:Iterable[str]):
+        """names defined outside the script, eg.: by the execution namespace"""
+        if self.engine:
+            self.engine.setKnownNames(names)
+            self._linted_revision = -1
+            self._lint_timer.start()
+
+    def _requestDiagnostics(self):
+        assert self.engine
+        document = self.textedit.document()
+        # the highlighter changes formats, without changing the text or the revision
+        if document.revision() == self._linted_revision:
+            return
+        self._linted_revision = document.revision()
+        self.engine.analyze(document.toPlainText())
+
+    def setDiagnostics(self, diagnostics:list[Diagnostic]):
+        self._diagnostic_selections = [
+            self._selection(diagnostic.lineno, diagnostic.column, diagnostic.end_column, diagnostic.message, diagnostic.severity)
+            for diagnostic in diagnostics
+        ]
+        self._updateSelections()
+
+    def diagnostics(self)->list[tuple[int, str]]:
+        """(line number, message) of the diagnostics shown"""
+        return [
+            (selection.cursor.blockNumber()+1, selection.format.toolTip())
+            for selection in self._diagnostic_selections
+        ]
+
+    ### Selections ###
+    def _selection(self, lineno:int, column:int=0, end_column:int|None=None, message:str|None=None, severity:Literal['error', 'warning']='error')->QTextEdit.ExtraSelection:
+        block = self.textedit.document().findBlockByNumber(lineno - 1) # Line numbers are 1-based.
+        cursor = QTextCursor(block)
+        length = block.length()-1
+        cursor.setPosition(block.position() + min(column, length))
+        end = length if end_column is None else min(end_column, length)
+        if end <= column:
+            # nothing to underline at the end of the line, underline the line
+            cursor.setPosition(block.position())
+            end = length
+        cursor.setPosition(block.position() + end, QTextCursor.MoveMode.KeepAnchor)
+
+        fmt = QTextCharFormat()
+        fmt.setUnderlineStyle(QTextCharFormat.UnderlineStyle.SpellCheckUnderline)
+        fmt.setUnderlineColor(QColor(200, 0, 0) if severity == 'error' else QColor(200, 160, 0))
+        if message:
+            fmt.setToolTip(message)
+
+        selection = QTextEdit.ExtraSelection()
+        selection.cursor = cursor # type: ignore
+        selection.format = fmt # type: ignore
+        return selection
+
+    def _updateSelections(self):
+        self.textedit.setExtraSelections(self._exception_selections + self._diagnostic_selections)
+
+    def eventFilter(self, watched:QObject, event:QEvent)->bool:
+        if watched == self.textedit.viewport() and event.type() == QEvent.Type.ToolTip:
+            event = cast(QHelpEvent, event)
+            position = self.textedit.cursorForPosition(event.pos()).position()
+            for selection in self._exception_selections + self._diagnostic_selections:
+                if selection.cursor.selectionStart() <= position <= selection.cursor.selectionEnd() and selection.format.toolTip():
+                    QToolTip.showText(event.globalPos(), selection.format.toolTip(), self.textedit)
+                    return True
+            QToolTip.hideText()
+        return super().eventFilter(watched, event)
 
     def label(self, lineno, message):
         def getLineRect():
@@ -84,41 +179,16 @@ class TextEditLinterWidget(QObject):
 
     def underline(self, lineno, message:str|None=None):
         """Underline a specific line to indicate an error."""
-        block = self.textedit.document().findBlockByLineNumber(lineno - 1)  # Line numbers are 1-based.
+        block = self.textedit.document().findBlockByNumber(lineno - 1)  # Line numbers are 1-based.
         if not block.isValid():
             return
-
-        self.textedit.document().blockSignals(True)
-        fmt = QTextCharFormat()
-        fmt.setUnderlineStyle(QTextCharFormat.UnderlineStyle.SpellCheckUnderline)
-        fmt.setUnderlineColor(QColor(200, 0, 0))
-        if message:
-            fmt.setToolTip(message)
-
-        # Apply formatting to the entire block (line)
-        cursor = QTextCursor(block)
-        # if offset is None:
-        #     cursor.select(QTextCursor.SelectionType.LineUnderCursor)
-        # else:
-            # underline single charater
-        cursor.select(QTextCursor.SelectionType.LineUnderCursor)
-        # cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.MoveAnchor, offset-1)
-        # cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.KeepAnchor, 1)
-        # cursor.movePosition(QTextCursor.MoveOperation.EndOfLine, QTextCursor.MoveMode.KeepAnchor)
-        cursor.setCharFormat(fmt)
-
-        self.textedit.document().blockSignals(False)
+        self._exception_selections.append(self._selection(lineno, message=message))
+        self._updateSelections()
 
     def clear(self):
-        """remove all labels"""
-
-        """Clear all underlines"""
-        self.textedit.document().blockSignals(True)
-        cursor = QTextCursor(self.textedit.document())
-        cursor.select(QTextCursor.SelectionType.Document)
-        format = QTextCharFormat()
-        cursor.setCharFormat(format)
-        self.textedit.document().blockSignals(False)
+        """remove the labels and underlines of the exceptions"""
+        self._exception_selections = []
+        self._updateSelections()
 
         for label in [lbl for lbl in self.labels]:
             label.deleteLater()
@@ -137,6 +207,9 @@ class TextEditLinterWidget(QObject):
             text = str(e.msg)
             if e.lineno:
                 self.lint(e.lineno, e.msg, mode)
+        elif e.__traceback__ is None and isinstance(lineno:=getattr(e, "lineno", None), int):
+            # raised in another process, eg.: a KernelError
+            self.lint(lineno, str(e), mode)
         else:
             tb = traceback.TracebackException.from_exception(e)
             last_frame = tb.stack[-1]
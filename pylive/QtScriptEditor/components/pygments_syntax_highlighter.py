@@ -1,24 +1,23 @@
+from typing import *
 from PySide6.QtWidgets import *
 from PySide6.QtGui import *
 from PySide6.QtCore import *
-from pygments import highlight
+from pygments.lexer import RegexLexer
 from pygments.lexers import PythonLexer
 from pygments.style import Style
-from pygments.token import Token
+from pygments.token import Token, Error, Whitespace, _TokenType
 from pygments.styles import get_style_by_name
-from pygments.formatter import Formatter
-
+import functools
+import time
+import re
 
-class MyFormatter(Formatter):
-	""" Custom Pygments formatter for PyQt highlighting. """
-	def __init__(self, color_scheme: Style):
-		super().__init__()
-		self.color_scheme = color_scheme
-		self.formats = []
 
-		# Build a mapping of Pygments token types to QTextCharFormat
-		self.token_formats = {}
-		for token, style in self.color_scheme:
+class TokenFormats:
+	""" QTextCharFormats of a Pygments style, built once per style.
+	token types missing from the style use the format of their parent token. """
+	def __init__(self, color_scheme: type[Style]):
+		self.formats:dict[_TokenType, QTextCharFormat] = dict()
+		for token, style in color_scheme:
 			text_format = QTextCharFormat()
 			if style['color']:
 				text_format.setForeground(QColor(f"#{style['color']}"))
@@ -28,84 +27,234 @@ class MyFormatter(Formatter):
 				text_format.setFontItalic(True)
 			if style['underline']:
 				text_format.setFontUnderline(True)
-			self.token_formats[token] = text_format
+			self.formats[token] = text_format
 
-	def format(self, tokensource, outfile):
-		""" Process tokens and store formats for later use. """
-		offset = 0
-		for ttype, value in tokensource:
-			length = len(value)
-			char_format = self.token_formats.get(ttype, QTextCharFormat())
+	def __getitem__(self, ttype:_TokenType)->QTextCharFormat:
+		try:
+			return self.formats[ttype]
+		except KeyError:
+			text_format = self[ttype.parent] if ttype.parent is not None else QTextCharFormat()
+			self.formats[ttype] = text_format
+			return text_format
 
-			self.formats.append((offset, length, value, ttype, char_format))
-			offset += length
+
+@functools.cache
+def token_formats(color_scheme: type[Style])->TokenFormats:
+	return TokenFormats(color_scheme)
+
+
+LexerStack = tuple[str, ...]
+
+
+def lex_line(lexer:RegexLexer, text:str, stack:LexerStack=('root',))->tuple[list[tuple[int, _TokenType, str]], LexerStack]:
+	""" tokenize one line, starting from the lexer state stack left by the previous line.
+	returns the tokens, and the state stack at the end of the line.
+
+	Note: this is RegexLexer.get_tokens_unprocessed, which does not return its final stack """
+	tokens = []
+	pos = 0
+	tokendefs = lexer._tokens
+	statestack = list(stack)
+	statetokens = tokendefs[statestack[-1]]
+	while True:
+		for rexmatch, action, new_state in statetokens:
+			m = rexmatch(text, pos)
+			if m:
+				if action is not None:
+					if type(action) is _TokenType:
+						tokens.append( (pos, action, m.group()) )
+					else:
+						tokens.extend(action(lexer, m))
+				pos = m.end()
+				if new_state is not None:
+					if isinstance(new_state, tuple):
+						for state in new_state:
+							if state == '#pop':
+								if len(statestack) > 1:
+									statestack.pop()
+							elif state == '#push':
+								statestack.append(statestack[-1])
+							else:
+								statestack.append(state)
+					elif isinstance(new_state, int):
+						if abs(new_state) >= len(statestack):
+							del statestack[1:]
+						else:
+							del statestack[new_state:]
+					elif new_state == '#push':
+						statestack.append(statestack[-1])
+					statetokens = tokendefs[statestack[-1]]
+				break
+		else:
+			if pos >= len(text):
+				break
+			if text[pos] == '\n':
+				# at EOL, reset state to "root"
+				statestack = ['root']
+				statetokens = tokendefs['root']
+				tokens.append( (pos, Whitespace, '\n') )
+			else:
+				tokens.append( (pos, Error, text[pos]) )
+			pos += 1
+	return tokens, tuple(statestack)
 
 
-import re
 class PygmentsSyntaxHighlighter(QSyntaxHighlighter):
-	def __init__(self, document, color_scheme: str | Style = "dracula"):
+	""" Incremental Pygments highlighter.
+
+	- the lexer state stack at the end of each line is stored as the block state,
+	  so multiline strings highlight correctly, and QSyntaxHighlighter stops
+	  re-highlighting the following lines as soon as their state is unchanged.
+	- highlighting large changes (opening or pasting a long script) is spread over the event loop:
+	  each pass highlights for at most SYNC_BUDGET seconds, the rest is done in IDLE_BUDGET chunks.
+	  visible blocks (see setVisibleBlocks) are always highlighted right away.
+	"""
+	SYNC_BUDGET = 0.02
+	IDLE_BUDGET = 0.008
+
+	def __init__(self, document, color_scheme: str | type[Style] = "dracula"):
 		if not isinstance(document, QTextDocument):
 			raise ValueError(f"Document must be a QTextDocument, got:{document}")
-			
+
+		### lexer state ###
+		self.lexer = PythonLexer()
+		self._stacks:list[LexerStack] = [('root',)]  # block state -> lexer stack
+		self._stack_ids:dict[LexerStack, int] = {('root',): 0}
+
+		### deferred highlighting ###
+		self._deadline:float|None = None
+		self._visible_blocks = range(0)
+		self._pending:tuple[int, int]|None = None # first and last deferred block numbers
+		self._last_block = -1
+
 		super().__init__(document)
 
+		self._budget_timer = QTimer(self)
+		self._budget_timer.setSingleShot(True)
+		self._budget_timer.setInterval(0)
+		self._budget_timer.timeout.connect(self._resetBudget)
+
+		self._idle_timer = QTimer(self)
+		self._idle_timer.setSingleShot(True)
+		self._idle_timer.setInterval(0)
+		self._idle_timer.timeout.connect(self._highlightPending)
+
+		### formats ###
+		self.whitespace_regex = re.compile(r"[ \t]+")
+		self.whitespace_format = QTextCharFormat()
+		self._setFormats(color_scheme)
+
+	def setColorScheme(self, color_scheme: str | type[Style]):
+		self._setFormats(color_scheme)
+		self.rehighlight()
+
+	def _setFormats(self, color_scheme: str | type[Style]):
 		if isinstance(color_scheme, str):
 			color_scheme = get_style_by_name(color_scheme)
-		self.lexer = PythonLexer()
 		self.color_scheme = color_scheme
+		self.formats = token_formats(color_scheme)
 
-		# Regex to detect whitespace
-		self.whitespace_regex = re.compile(r"[ \t]+")
-
-		# Create a QTextCharFormat for whitespace
-		self.whitespace_format = QTextCharFormat()
-		
 		# Retrieve the comment color from the Pygments style
 		pygments_comment_style = self.color_scheme.styles.get(Token.Comment, "#888888")
 		whitespace_color = QColor(pygments_comment_style)
-		
-		# Set transparency
-		whitespace_color.setAlpha(50)  # Adjust alpha value as needed
+		whitespace_color.setAlpha(50)
+		self.whitespace_format = QTextCharFormat()
 		self.whitespace_format.setForeground(whitespace_color)
 
-	def highlightBlock(self, block_text):
-		""" Apply syntax highlighting to a block of text. """
-		# Create the formatter for this block
-		formatter = MyFormatter(self.color_scheme)
-
-		# Use Pygments to tokenize the text and apply formatting
-		highlight(block_text, self.lexer, formatter)
-
-
-		# Apply the formats calculated by the formatter
-		for start, length, text, ttype, char_format in formatter.formats:
-			# print(ttype)
-			# print(f"'{text}'")
-			# print()
+	def setVisibleBlocks(self, first:int, last:int):
+		""" block numbers shown by the editor. these are highlighted first """
+		self._visible_blocks = range(first, last+1)
+		if self._pending is None:
+			return
+		pending_first, pending_last = self._pending
+		doc = self.document()
+		for number in range(max(first, pending_first), min(last, pending_last)+1):
+			self.rehighlightBlock(doc.findBlockByNumber(number))
 
-			self.setFormat(start, length, char_format)
+	def isHighlighting(self)->bool:
+		""" true while deferred blocks wait to be highlighted """
+		return self._pending is not None
 
-			# multiline comment highlitinf workaround, that does not work....
-			# HasTripleQuotes = ttype == Token.Literal.String.Double and text in {'"""', "'''"}
-			# if HasTripleQuotes or self.previousBlockState()>1:
-			# 	print("multiline start")
-			# 	self.setCurrentBlockState(1)
+	def _stateId(self, stack:LexerStack)->int:
+		try:
+			return self._stack_ids[stack]
+		except KeyError:
+			state = len(self._stacks)
+			self._stacks.append(stack)
+			self._stack_ids[stack] = state
+			return state
 
-			# if self.currentBlockState()>0:
-			# 	charformat = QTextCharFormat()
-			# 	charformat.setForeground(QColor("green"))
-			# 	self.setFormat(start, length, charformat)
+	def highlightBlock(self, block_text):
+		""" Apply syntax highlighting to a block of text. """
+		block_number = self.currentBlock().blockNumber()
+		now = time.perf_counter()
+		if self._deadline is None:
+			self._deadline = now + self.SYNC_BUDGET
+			self._budget_timer.start()
+		elif now > self._deadline and block_number not in self._visible_blocks:
+			self._defer(block_number)
+			return
 
+		self._last_block = block_number
+		previous_state = self.previousBlockState()
+		stack = self._stacks[previous_state] if previous_state >= 0 else ('root',)
+		tokens, stack = lex_line(self.lexer, block_text+"\n", stack)
+		self.setCurrentBlockState(self._stateId(stack))
 
-			# if HasTripleQuotes and self.previousBlockState()>1:
-			# 	print("multiline end")
-			# 	self.setCurrentBlockState(0)
+		length = len(block_text)
+		for start, ttype, text in tokens:
+			if start >= length:
+				break
+			if ttype is Token.Text or ttype is Whitespace:
+				continue
+			self.setFormat(start, len(text), self.formats[ttype])
 
 		# Handle whitespace formatting separately
 		for match in self.whitespace_regex.finditer(block_text):
 			start, end = match.span()
 			self.setFormat(start, end - start, self.whitespace_format)
 
+	def _defer(self, block_number:int):
+		# keep the previous formats and state, so QSyntaxHighlighter does not continue
+		# with the next block just because this one was skipped
+		block = self.currentBlock()
+		for format_range in block.layout().formats():
+			self.setFormat(format_range.start, format_range.length, format_range.format)
+		self.setCurrentBlockState(block.userState())
+		if self._pending is None:
+			self._pending = block_number, block_number
+		else:
+			first, last = self._pending
+			self._pending = min(first, block_number), max(last, block_number)
+		self._idle_timer.start()
+
+	def _resetBudget(self):
+		self._deadline = None
+
+	def _highlightPending(self):
+		if self._pending is None:
+			return
+		first, last = self._pending
+		self._pending = None
+		self._deadline = time.perf_counter() + self.IDLE_BUDGET
+		self._budget_timer.start()
+
+		doc = self.document()
+		block = doc.findBlockByNumber(first)
+		while block.isValid() and block.blockNumber() <= last:
+			if time.perf_counter() > self._deadline:
+				self._deferRange(block.blockNumber(), last)
+				break
+			# continues with the following blocks while their state changes
+			self.rehighlightBlock(block)
+			block = doc.findBlockByNumber(max(self._last_block, block.blockNumber())+1)
+
+	def _deferRange(self, first:int, last:int):
+		if self._pending is not None:
+			first, last = min(first, self._pending[0]), max(last, self._pending[1])
+		self._pending = first, last
+		self._idle_timer.start()
+
 
 ### Main Application ###
 if __name__ == "__main__":
@@ -131,9 +280,9 @@ if __name__ == "__main__":
 
 	def set_color_scheme(style_name="dracula"):
 		color_scheme = get_style_by_name(style_name)
-		highlighter = PygmentsSyntaxHighlighter(editor.document(), color_scheme)
+		highlighter.setColorScheme(color_scheme)
 		palette = editor.palette()
-		palette.setColor(QPalette.Base, QColor(f"{color_scheme.background_color}"))
+		palette.setColor(QPalette.ColorRole.Base, QColor(f"{color_scheme.background_color}"))
 		editor.setPalette(palette)
 
 	listwidget.currentItemChanged.connect(lambda current, prev: set_color_scheme(current.text()))
@@ -6,20 +6,12 @@ import re
 
 # components
 from pylive.QtScriptEditor.components.pygments_syntax_highlighter import PygmentsSyntaxHighlighter
-from pylive.QtScriptEditor.components.simple_python_highlighter import SimplePythonHighlighter
 from pylive.QtScriptEditor.components.script_cursor import ScriptCursor
 from pylive.QtScriptEditor.components.textedit_number_editor import TextEditNumberEditor
 
-# code assist
-import rope.base.project
-from rope.contrib import codeassist
-
-from pylive.QtScriptEditor.components.jedi_completer import JediCompleter
 from pylive.QtScriptEditor.components.async_jedi_completer import AsyncJediCompleter
-from pylive.QtScriptEditor.components.textedit_completer import PythonKeywordsCompleter
 from pylive.QtScriptEditor.components.linter_widget import TextEditLinterWidget
 from pylive.QtScriptEditor.components.line_number_area import LineNumberArea
-from pylive.QtScriptEditor.cell_support import Cell, split_cells, cell_at_line
 
 
 
@@ -51,7 +43,9 @@ class ScriptEdit(QPlainTextEdit):
         options = self.document().defaultTextOption() 
         options.setFlags(QTextOption.Flag.ShowTabsAndSpaces)
         self.document().setDefaultTextOption(options)
+        self._visible_blocks = -1, -1
         self.highlighter = PygmentsSyntaxHighlighter(self.document())
+        self.updateRequest.connect(self._updateVisibleBlocks)
         blue3 = QColor.fromHsl(210, 15*255//100, 22*255//100)
         palette = self.palette()
         palette.setColor(QPalette.ColorRole.Base, blue3)  # Light yellow color
@@ -126,6 +120,13 @@ class ScriptEdit(QPlainTextEdit):
         del menu # i am not sure if we need this here in python
 
     ### TEXT EDITING ###
+    def _updateVisibleBlocks(self, rect:QRect, dy:int):
+        first = self.firstVisibleBlock().blockNumber()
+        last = self.cursorForPosition(self.viewport().rect().bottomLeft()).blockNumber()
+        if (first, last) != self._visible_blocks:
+            self._visible_blocks = first, last
+            self.highlighter.setVisibleBlocks(first, last)
+
     def indentUsingSpaces(self):
         return self._indent_using_spaces
 
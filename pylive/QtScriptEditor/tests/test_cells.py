@@ -1,7 +1,8 @@
 import unittest
 from typing import *
-from pylive.QtScriptEditor.cell_support import Cell, cell_at_line, split_cells
+from pylive.QtScriptEditor.cell_support import Cell, cell_at_line, split_cells, CellIndex, CellDataflow, cell_names
 from textwrap import dedent
+import random
 
 
 class TestCellsSplit(unittest.TestCase):
@@ -94,6 +95,70 @@ class TestStrippedCells(unittest.TestCase):
 		self.assertEqual(cell_at_line(cells_stripped, 8), cells_stripped[1])
 
 
+class TestCellIndex(unittest.TestCase):
+	def edit(self, index:CellIndex, lines:list[str], first:int, removed:int, inserted:list[str])->list[str]:
+		new_lines = lines[:first] + inserted + lines[first+removed:]
+		index.update(new_lines, first, first+removed-1, first+len(inserted)-1)
+		self.assertEqual(index.cells(), split_cells("\n".join(new_lines)))
+		return new_lines
+
+	def test_matches_split_cells(self):
+		rng = random.Random(0)
+		pool = ["# %% cell", "x = 1", "", '"""', "print(x)", "#%% other", "y = x"]
+		lines = [rng.choice(pool) for _ in range(40)]
+		index = CellIndex("\n".join(lines))
+		for _ in range(500):
+			first = rng.randrange(len(lines))
+			removed = rng.randrange(0, min(3, len(lines)-first)+1)
+			if removed == len(lines):
+				removed -= 1
+			inserted = [rng.choice(pool) for _ in range(rng.randrange(0, 3))]
+			lines = self.edit(index, lines, first, removed, inserted)
+
+	def test_changed_cells(self):
+		lines = ["# %% a", "x = 1", "# %% b", "y = x", "# %% c", "z = 2"]
+		index = CellIndex("\n".join(lines))
+		lines[3] = "y = x + 1"
+		self.assertEqual(index.update(lines, 3, 3, 3), [1])
+
+
+class TestCellDataflow(unittest.TestCase):
+	def test_downstream_cells(self):
+		cells = split_cells(dedent("""\
+		# %% setup
+		import math
+		data = list(range(10))
+		# %% scale
+		factor = 2
+		# %% result
+		result = [x*factor for x in data]
+		# %% unrelated
+		print(math.pi)
+		# %% report
+		print(result)
+		"""))
+		dataflow = CellDataflow()
+		self.assertEqual(dataflow.cellsToRun(cells, [1]), [1, 2, 4])
+		self.assertEqual(dataflow.cellsToRun(cells, [3]), [3])
+		self.assertEqual(dataflow.cellsToRun(cells, [0]), [0, 2, 3, 4])
+
+	def test_redefined_names_run_again(self):
+		cells = split_cells("# %% a\nx = 1\n# %% b\nx = 2\n# %% c\nprint(x)")
+		self.assertEqual(CellDataflow().cellsToRun(cells, [0]), [0, 1, 2])
+
+	def test_function_locals(self):
+		"""arguments and names bound in a function are not globals of the cell"""
+		self.assertEqual(cell_names("def f(x):\n    return x*k"), ({"f"}, {"k"}))
+		self.assertEqual(cell_names("def f(x):\n    y = x\n    return y"), ({"f"}, set()))
+		self.assertEqual(cell_names("g = lambda a, b=c: a + b"), ({"g"}, {"c"}))
+		self.assertEqual(cell_names("def f():\n    global g\n    g = 1"), ({"f", "g"}, set()))
+		self.assertEqual(cell_names("class A:\n    n = 1\n    def m(self):\n        return n"), ({"A"}, {"n"}))
+
+	def test_function_locals_do_not_run_again(self):
+		cells = split_cells("# %% a\ny = 1\n# %% b\ndef f(y):\n    return y\n# %% c\nprint(f(2))")
+		self.assertEqual(CellDataflow().cellsToRun(cells, [0]), [0])
+
+
 if __name__ == "__main__":
 	unittest.main()
 	
\ No newline at end of file
@@ -0,0 +1,140 @@
+import unittest
+from typing import *
+from textwrap import dedent
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+from pylive.QtScriptEditor.components.diagnostics_engine import DiagnosticsEngine, check_cells, analyze_cell
+from pylive.QtScriptEditor.components.linter_widget import TextEditLinterWidget
+
+app = QApplication.instance() or QApplication([])
+
+
+def codes(diagnostics)->list[tuple[int, str]]:
+	return [(diagnostic.lineno, diagnostic.code) for diagnostic in diagnostics]
+
+
+def wait_for(signal:SignalInstance, timeout:int=5000)->list:
+	""" run the event loop until signal is emitted, return its arguments """
+	loop = QEventLoop()
+	results = []
+	def on_signal(*args):
+		results.append(args)
+		loop.quit()
+	signal.connect(on_signal)
+	QTimer.singleShot(timeout, loop.quit)
+	loop.exec()
+	signal.disconnect(on_signal)
+	assert results, "timed out"
+	return list(results[0])
+
+
+class TestCheckCells(unittest.TestCase):
+	def test_undefined_names_and_unused_imports(self):
+		source = dedent("""\
+		import os
+		import sys
+		def f(a, *args, k=None):
+			return [a + x for x in args] + [y]
+		class C:
+			attr = 1
+			def m(self):
+			    return attr
+		print(sys.argv, f, C)
+		""")
+		diagnostics = check_cells([(1, source)])
+		self.assertEqual(sorted(codes(diagnostics)), [(1, "unused-import"), (4, "undefined-name"), (8, "undefined-name")])
+		undefined = [diagnostic for diagnostic in diagnostics if diagnostic.lineno == 4][0]
+		self.assertEqual(undefined.message, "undefined name 'y'")
+		self.assertEqual(source.split("\n")[3][undefined.column:undefined.end_column], "y")
+
+	def test_scopes(self):
+		source = dedent("""\
+		def outer():
+			value = 1
+			def inner():
+				nonlocal value
+				value += 1
+				return later
+			return inner
+		later = 2
+		def uses_global():
+			global created
+			created = 1
+		print(created, (n:=3), n, [m for m in range(3) if m], {k: v for k, v in {}.items()})
+		try:
+			pass
+		except Exception as err:
+			print(err)
+		match later:
+			case [first, *rest]:
+				print(first, rest)
+		""")
+		self.assertEqual(check_cells([(1, source)]), [])
+
+	def test_names_resolve_across_cells(self):
+		cells = [
+			(1, "# %% imports\nimport numpy as np\n"),
+			(3, "# %% use\nprint(np.zeros(3), undefined)\n")
+		]
+		self.assertEqual(codes(check_cells(cells)), [(4, "undefined-name")])
+		self.assertEqual(codes(check_cells(cells, known_names={"undefined"})), [])
+
+	def test_syntax_errors(self):
+		cells = [(1, "x = (\n"), (3, "print(x, other)\n")]
+		diagnostics = check_cells(cells)
+		# names of a cell that does not parse are unknown, so undefined names are not reported
+		self.assertEqual(codes(diagnostics), [(1, "syntax-error")])
+
+	def test_cache(self):
+		cache = dict()
+		check_cells([(1, "import os\n"), (2, "print(os)\n")], cache=cache)
+		summary = cache["import os\n"]
+		check_cells([(1, "import os\n"), (2, "print(os.path)\n")], cache=cache)
+		self.assertIs(cache["import os\n"], summary)
+
+	def test_unicode_columns(self):
+		summary = analyze_cell("s = 'ő'; print(undefined)")
+		self.assertEqual(summary.free_loads[-1].column, len("s = 'ő'; print("))
+
+
+class TestLinterWidget(unittest.TestCase):
+	def test_diagnostics_are_extra_selections(self):
+		textedit = QPlainTextEdit()
+		linter = TextEditLinterWidget(textedit)
+		assert linter.engine
+		self.addCleanup(linter.engine.shutdown)
+		textedit.setPlainText("import os\nprint(undefined)\n")
+		revision = textedit.document().revision()
+
+		wait_for(linter.engine.diagnosticsReady)
+		self.assertEqual(sorted(linter.diagnostics()), [(1, "'os' imported but unused"), (2, "undefined name 'undefined'")])
+		self.assertEqual(len(textedit.extraSelections()), 2)
+
+		linter.underline(1, "exception")
+		self.assertEqual(len(textedit.extraSelections()), 3)
+		linter.clear()
+		self.assertEqual(len(textedit.extraSelections()), 2)
+
+		# the document is not modified by linting
+		self.assertEqual(textedit.document().revision(), revision)
+
+
+class TestDiagnosticsEngine(unittest.TestCase):
+	def test_stale_results_are_dropped(self):
+		engine = DiagnosticsEngine()
+		self.addCleanup(engine.shutdown)
+		received = []
+		engine.diagnosticsReady.connect(received.append)
+		engine.analyze("print(a)")
+		engine.analyze("print(b)")
+		diagnostics, = wait_for(engine.diagnosticsReady)
+		QCoreApplication.processEvents()
+		self.assertEqual(len(received), 1)
+		self.assertEqual(diagnostics[0].message, "undefined name 'b'")
+
+
+if __name__ == "__main__":
+	unittest.main()
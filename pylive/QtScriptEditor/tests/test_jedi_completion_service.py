@@ -0,0 +1,72 @@
+import unittest
+from typing import *
+from textwrap import dedent
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+from pylive.QtScriptEditor.components.jedi_completion_service import JediCompletionService
+
+app = QApplication.instance() or QApplication([])
+
+
+def wait_for(signal:SignalInstance, timeout:int=10000)->list:
+	""" run the event loop until signal is emitted, return its arguments """
+	loop = QEventLoop()
+	results = []
+	def on_signal(*args):
+		results.append(args)
+		loop.quit()
+	signal.connect(on_signal)
+	QTimer.singleShot(timeout, loop.quit)
+	loop.exec()
+	signal.disconnect(on_signal)
+	assert results, "timed out"
+	return list(results[0])
+
+
+class TestJediCompletionService(unittest.TestCase):
+	def setUp(self):
+		self.service = JediCompletionService(debounce=0)
+
+	def tearDown(self):
+		self.service.shutdown()
+
+	def test_completions_and_signatures(self):
+		self.service.setSource(dedent("""\
+		class Dog:
+			def bark(self, loud): pass
+		Dog().ba"""))
+		self.service.requestCompletions(3, 8)
+		completions, = wait_for(self.service.completionsReady)
+		self.assertIn("bark", completions)
+
+		self.service.setSource("print(")
+		self.service.requestCompletions(1, 6, complete=False)
+		signatures, = wait_for(self.service.signaturesReady)
+		self.assertTrue(signatures[0].startswith("print("))
+
+	def test_stale_requests_are_dropped(self):
+		received = []
+		self.service.completionsReady.connect(received.append)
+		self.service.setSource("import os\nos.pa")
+		self.service.requestCompletions(2, 5)
+		self.service.setSource("import sys\nsys.pa")
+		self.service.requestCompletions(2, 6)
+		wait_for(self.service.completionsReady)
+		QCoreApplication.processEvents()
+		self.assertEqual(len(received), 1)
+		self.assertIn("path", received[0])
+		self.assertNotIn("pardir", received[0])
+		self.assertEqual(sum(count for upper, count in self.service.latencyHistogram()), 1)
+
+	def test_apply_change(self):
+		self.service.setSource("a = 1\nb = 2\n")
+		self.assertTrue(self.service.applyChange(6, 1, "bb"))
+		self.assertEqual(self.service.source(), "a = 1\nbb = 2\n")
+		self.assertFalse(self.service.applyChange(100, 1, "x"))
+
+
+if __name__ == "__main__":
+	unittest.main()
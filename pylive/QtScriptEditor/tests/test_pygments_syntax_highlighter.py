@@ -0,0 +1,102 @@
+import unittest
+from typing import *
+from textwrap import dedent
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+from pygments.lexers import PythonLexer
+from pygments.token import String, Keyword
+from pylive.QtScriptEditor.components.pygments_syntax_highlighter import PygmentsSyntaxHighlighter, lex_line
+
+app = QApplication.instance() or QApplication([])
+
+
+def process_pending(highlighter:PygmentsSyntaxHighlighter):
+	QCoreApplication.processEvents()
+	while highlighter.isHighlighting():
+		QCoreApplication.processEvents()
+
+
+def make_document(text:str="")->QTextDocument:
+	doc = QTextDocument()
+	doc.setDocumentLayout(QPlainTextDocumentLayout(doc)) # highlighting follows the layout, like in a QPlainTextEdit
+	doc.setPlainText(text)
+	return doc
+
+
+def block_colors(doc:QTextDocument, line:int)->list[QColor]:
+	return [format_range.format.foreground().color() for format_range in doc.findBlockByNumber(line).layout().formats()]
+
+
+class TestLexLine(unittest.TestCase):
+	def test_carries_state_across_lines(self):
+		lexer = PythonLexer()
+		tokens, stack = lex_line(lexer, 'x = """start\n')
+		self.assertNotEqual(stack, ('root',))
+		tokens, stack = lex_line(lexer, 'def inside():\n', stack)
+		self.assertTrue(all(ttype in String for pos, ttype, text in tokens))
+		tokens, stack = lex_line(lexer, 'end"""\n', stack)
+		self.assertEqual(stack, ('root',))
+
+
+class TestPygmentsSyntaxHighlighter(unittest.TestCase):
+	def test_multiline_string(self):
+		doc = make_document(dedent('''\
+		x = """
+		def inside():
+		"""
+		def outside():
+		    pass
+		'''))
+		highlighter = PygmentsSyntaxHighlighter(doc)
+		highlighter.rehighlight()
+		string_color = highlighter.formats[String].foreground().color()
+		keyword_color = highlighter.formats[Keyword].foreground().color()
+
+		self.assertEqual(block_colors(doc, 1)[0], string_color)
+		self.assertEqual(block_colors(doc, 3)[0], keyword_color)
+
+	def test_closing_string_updates_following_lines(self):
+		doc = make_document("a = 1\ndef f():\n    pass\n")
+		highlighter = PygmentsSyntaxHighlighter(doc)
+		highlighter.rehighlight()
+		string_color = highlighter.formats[String].foreground().color()
+
+		cursor = QTextCursor(doc)
+		cursor.insertText('"""\n')
+		self.assertEqual(block_colors(doc, 2)[0], string_color)
+
+		cursor.insertText('"""\n')
+		self.assertNotEqual(block_colors(doc, 3)[0], string_color)
+
+	def test_large_document_is_highlighted_in_chunks(self):
+		doc = make_document()
+		highlighter = PygmentsSyntaxHighlighter(doc)
+		highlighter.SYNC_BUDGET = 0.001
+		highlighter.IDLE_BUDGET = 0.001
+		lines = 5000
+		doc.setPlainText("def f(x):\n    return x\n" * (lines//2))
+		self.assertTrue(highlighter.isHighlighting())
+
+		process_pending(highlighter)
+		keyword_color = highlighter.formats[Keyword].foreground().color()
+		for line in range(0, lines, 2):
+			colors = block_colors(doc, line)
+			self.assertTrue(colors, f"line {line} is not highlighted")
+			self.assertEqual(colors[0], keyword_color)
+
+	def test_visible_blocks_are_highlighted_first(self):
+		doc = make_document()
+		highlighter = PygmentsSyntaxHighlighter(doc)
+		highlighter.SYNC_BUDGET = 0.0
+		doc.setPlainText("def f(x):\n    return x\n" * 2000)
+		self.assertTrue(highlighter.isHighlighting())
+		self.assertFalse(block_colors(doc, 3000))
+		highlighter.setVisibleBlocks(3000, 3010)
+		self.assertTrue(block_colors(doc, 3000))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,200 @@
+from typing import *
+
+from PySide6.QtCore import *
+
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+import functools
+import threading
+import pickle
+import signal
+import sys
+import os
+
+from pylive.QtTerminal.kernel_process import kernel_main
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class KernelError(Exception):
+	"""an exception raised in the kernel process"""
+	def __init__(self, type_name:str, message:str, lineno:int|None, traceback:str):
+		super().__init__(f"{type_name}: {message}")
+		self.type_name = type_name
+		self.message = message
+		self.lineno = lineno
+		self.traceback = traceback
+
+
+@functools.cache
+def _shared_array_type()->type:
+	import numpy as np
+	class SharedArray(np.ndarray):
+		"""a numpy array mapped from the kernel's shared memory. keeps the mapping alive"""
+		_shared_memory:shared_memory.SharedMemory|None = None
+	return SharedArray
+
+
+def _attach_shared_memory(name:str)->shared_memory.SharedMemory:
+	try:
+		return shared_memory.SharedMemory(name=name, track=False) # type: ignore # python 3.13+
+	except TypeError:
+		shm = shared_memory.SharedMemory(name=name)
+		# the kernel owns the memory, dont let this process's tracker unlink it
+		resource_tracker.unregister(shm._name, "shared_memory") # type: ignore
+		return shm
+
+
+class _KernelProcess:
+	"""a kernel subprocess, with a thread reading its messages"""
+	def __init__(self, context, on_message:Callable[["_KernelProcess", tuple], None]):
+		self.conn, child_conn = context.Pipe()
+		self.process = context.Process(target=kernel_main, args=(child_conn,), daemon=True, name="pylive-kernel")
+		self.process.start()
+		child_conn.close()
+		self._reader = threading.Thread(target=self._read, args=(on_message,), daemon=True)
+		self._reader.start()
+
+	def _read(self, on_message):
+		while True:
+			try:
+				message = self.conn.recv()
+			except (EOFError, OSError):
+				break
+			on_message(self, message)
+
+	def send(self, message:tuple):
+		self.conn.send(message)
+
+	def terminate(self):
+		if self.process.is_alive():
+			self.process.kill()
+		self.process.join(timeout=1)
+		self.conn.close()
+
+
+class Kernel(QObject):
+	"""
+	Executes code in a subprocess, that owns the execution namespace.
+
+	- stdout and stderr are streamed back while the code runs, the gui stays responsive
+	- interrupt() raises KeyboardInterrupt in the running code, reported by interrupted
+	- restart() swaps in a standby process, that was started in advance
+	- large numpy arrays passed to display() come back through shared memory
+	"""
+	stdoutReceived = Signal(str)
+	stderrReceived = Signal(str)
+	displayed = Signal(object)
+	exceptionThrown = Signal(Exception)
+	interrupted = Signal(int) # request id
+	finished = Signal(int, float) # request id, seconds
+	busyChanged = Signal(bool)
+	restarted = Signal()
+
+	_received = Signal(object, object) # process, message
+
+	def __init__(self, parent:QObject|None=None):
+		super().__init__(parent=parent)
+		self._context = multiprocessing.get_context("spawn")
+		self._received.connect(self._onMessage, Qt.ConnectionType.QueuedConnection)
+		self._request_id = 0
+		self._pending:set[int] = set()
+
+		self._process = self._startProcess()
+		self._standby = self._startProcess()
+
+		if app:=QCoreApplication.instance():
+			app.aboutToQuit.connect(self.shutdown)
+
+	def _startProcess(self)->_KernelProcess:
+		return _KernelProcess(self._context, lambda process, message: self._received.emit(process, message))
+
+	### Execution ###
+	def execute(self, source:str, mode:Literal["exec", "single"]="exec")->int:
+		"""returns the request id, reported by finished"""
+		self._request_id += 1
+		WasBusy = self.isBusy()
+		self._pending.add(self._request_id)
+		self._process.send(("execute", self._request_id, source, mode))
+		if not WasBusy:
+			self.busyChanged.emit(True)
+		return self._request_id
+
+	def isBusy(self)->bool:
+		return bool(self._pending)
+
+	def interrupt(self):
+		if not self.isBusy():
+			return
+		if sys.platform == "win32":
+			# no SIGINT for a subprocess without a console
+			self.restart()
+			return
+		os.kill(self._process.process.pid, signal.SIGINT)
+
+	def restart(self):
+		"""replace the kernel with a fresh namespace"""
+		old = self._process
+		self._process = self._standby
+		self._standby = self._startProcess()
+		threading.Thread(target=old.terminate, daemon=True).start()
+
+		pending, self._pending = self._pending, set()
+		for request_id in sorted(pending):
+			self.finished.emit(request_id, 0.0)
+		if pending:
+			self.busyChanged.emit(False)
+		self.restarted.emit()
+
+	def shutdown(self):
+		for process in (self._process, self._standby):
+			try:
+				process.send(("shutdown",))
+			except (OSError, ValueError):
+				pass
+			process.terminate()
+
+	### Messages ###
+	def _decode(self, process:_KernelProcess, value:tuple)->Any:
+		match value:
+			case ("shm", name, shape, dtype):
+				import numpy as np
+				shm = _attach_shared_memory(name)
+				# zero copy: the array keeps the mapping alive
+				array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf).view(_shared_array_type())
+				array._shared_memory = shm # type: ignore
+				process.send(("release", name))
+				return array
+			case ("pickle", data):
+				return pickle.loads(data)
+			case ("repr", text):
+				return text
+		raise ValueError(f"unknown value encoding: {value[0]}")
+
+	def _onMessage(self, process:_KernelProcess, message:tuple):
+		if process is not self._process:
+			# the standby, or a terminated kernel. the resource tracker of a terminated kernel
+			# unlinks its shared memory
+			return
+
+		match message:
+			case ("ready",):
+				pass
+			case ("stream", request_id, "stdout", text):
+				self.stdoutReceived.emit(text)
+			case ("stream", request_id, "stderr", text):
+				self.stderrReceived.emit(text)
+			case ("display", request_id, value):
+				self.displayed.emit(self._decode(process, value))
+			case ("error", request_id, ("pickle", data)):
+				self.exceptionThrown.emit(pickle.loads(data))
+			case ("error", request_id, ("error", type_name, text, lineno, traceback)):
+				self.exceptionThrown.emit(KernelError(type_name, text, lineno, traceback))
+			case ("interrupted", request_id):
+				self.interrupted.emit(request_id)
+			case ("done", request_id, elapsed):
+				self._pending.discard(request_id)
+				self.finished.emit(request_id, elapsed)
+				if not self._pending:
+					self.busyChanged.emit(False)
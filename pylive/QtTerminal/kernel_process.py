@@ -0,0 +1,149 @@
+"""
+The execution kernel process of the live terminal.
+
+runs in a subprocess, owns the execution namespace,
+and talks to the Kernel client over a multiprocessing Pipe.
+Kept free of Qt, so the kernel process starts fast.
+
+messages from the client:
+    ("execute", request_id, source, mode)
+    ("release", shared_memory_name)
+    ("shutdown",)
+
+messages to the client:
+    ("ready",)
+    ("stream", request_id, "stdout"|"stderr", text)
+    ("display", request_id, encoded_value)
+    ("error", request_id, encoded_exception)
+    ("interrupted", request_id)
+    ("done", request_id, elapsed_seconds)
+
+large numpy arrays are copied once into shared memory, instead of pickled through the pipe.
+the client releases the shared memory after mapping it.
+"""
+
+from typing import *
+from multiprocessing.connection import Connection
+from multiprocessing import shared_memory
+import builtins
+import threading
+import traceback
+import signal
+import pickle
+import time
+import sys
+import io
+
+
+SHARED_MEMORY_THRESHOLD = 64 * 1024 # bytes, smaller arrays are pickled
+SCRIPT_FILENAME = "<script>"
+
+
+class KernelChannel:
+	"""the kernel side of the pipe"""
+	def __init__(self, conn:Connection):
+		self.conn = conn
+		self.lock = threading.Lock() # user code may print from threads
+		self.request_id:int|None = None
+		self.shared:dict[str, shared_memory.SharedMemory] = dict() # sent, not yet released
+
+	def send(self, message:tuple):
+		with self.lock:
+			self.conn.send(message)
+
+	def encode(self, value:Any)->tuple:
+		"""("shm", name, shape, dtype) for large arrays, ("pickle", bytes), or ("repr", str)"""
+		if (numpy:=sys.modules.get("numpy")) and isinstance(value, numpy.ndarray) and value.nbytes >= SHARED_MEMORY_THRESHOLD:
+			shm = shared_memory.SharedMemory(create=True, size=value.nbytes)
+			target = numpy.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)
+			target[...] = value
+			del target
+			self.shared[shm.name] = shm
+			return "shm", shm.name, value.shape, value.dtype.str
+		try:
+			return "pickle", pickle.dumps(value)
+		except Exception:
+			return "repr", repr(value)
+
+	def release(self, name:str):
+		if shm:=self.shared.pop(name, None):
+			shm.close()
+			shm.unlink()
+
+	def releaseAll(self):
+		for name in list(self.shared):
+			self.release(name)
+
+
+class StreamWriter(io.TextIOBase):
+	"""sends stdout/stderr to the client"""
+	def __init__(self, channel:KernelChannel, name:Literal["stdout", "stderr"]):
+		self.channel = channel
+		self.name = name
+
+	def write(self, text:str)->int:
+		if text:
+			self.channel.send(("stream", self.channel.request_id, self.name, text))
+		return len(text)
+
+	def writable(self)->bool:
+		return True
+
+
+def encode_exception(err:BaseException)->tuple:
+	"""("pickle", bytes) for syntax errors, else ("error", type name, message, lineno, traceback)"""
+	if isinstance(err, SyntaxError):
+		return "pickle", pickle.dumps(err)
+	frames = [frame for frame in traceback.extract_tb(err.__traceback__) if frame.filename == SCRIPT_FILENAME]
+	lineno = frames[-1].lineno if frames else None
+	text = "".join(traceback.format_exception(type(err), err, err.__traceback__))
+	return "error", type(err).__name__, str(err), lineno, text
+
+
+def execute(channel:KernelChannel, namespace:dict, request_id:int, source:str, mode:Literal["exec", "single"]):
+	channel.request_id = request_id
+	start_time = time.perf_counter()
+	try:
+		code = compile(source, SCRIPT_FILENAME, mode=mode)
+		exec(code, namespace)
+	except KeyboardInterrupt:
+		channel.send(("interrupted", request_id))
+	except BaseException as err:
+		channel.send(("error", request_id, encode_exception(err)))
+	finally:
+		sys.stdout.flush()
+		sys.stderr.flush()
+		channel.send(("done", request_id, time.perf_counter() - start_time))
+		channel.request_id = None
+
+
+def kernel_main(conn:Connection):
+	"""entry point of the kernel process"""
+	channel = KernelChannel(conn)
+	sys.stdout = StreamWriter(channel, "stdout")
+	sys.stderr = StreamWriter(channel, "stderr")
+
+	def display(data:Any):
+		channel.send(("display", channel.request_id, channel.encode(data)))
+
+	namespace = {"__name__": "__live__", "__builtins__": builtins, "display": display}
+
+	# interrupt raises KeyboardInterrupt in the running code
+	signal.signal(signal.SIGINT, signal.default_int_handler)
+	channel.send(("ready",))
+	while True:
+		try:
+			message = conn.recv()
+		except KeyboardInterrupt:
+			continue # interrupted while idle
+		except (EOFError, OSError):
+			break
+
+		match message:
+			case ("execute", request_id, source, mode):
+				execute(channel, namespace, request_id, source, mode)
+			case ("release", name):
+				channel.release(name)
+			case ("shutdown",):
+				break
+	channel.releaseAll()
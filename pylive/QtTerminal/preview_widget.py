@@ -3,6 +3,10 @@ from PySide6.QtGui import *
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
 
+import numpy as np
+
+from pylive.qt_components.frame_view import FrameView
+
 
 class SingletonException(Exception):
 	...
@@ -36,6 +40,8 @@ class PreviewWidget(QWidget):
 		QWidget.__init__(self, parent=None)
 		self.setObjectName("PREVIEW_WINDOW_ID")
 		self.statusLabel = QLabel()
+		self._slots:dict[Hashable, QWidget] = dict()
+		self._own_widgets:set[QWidget] = set() # created by display, the others belong to the caller
 
 		self.previewFrame = QWidget()
 		self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -53,38 +59,72 @@ class PreviewWidget(QWidget):
 		mainLayout.setContentsMargins(0, 0, 0, 0)
 		mainLayout.addWidget(self.previewScrollArea, 1)
 
-	def display(self, data:Any):
+	def display(self, data:Any, slot:Hashable|None=None):
+		"""
+		append a widget showing the data.
+		displaying to a named slot again replaces the slot's widget, and reuses
+		the widgets created here, so numpy frames displayed in a loop stream into a single FrameView.
+		widgets passed in are shown as they are, they are never changed or deleted.
+		"""
+		current = self._slots.get(slot) if slot is not None else None
+		own = current if current in self._own_widgets else None
 		match data:
-			case str():
-				self.previewFrame.layout().addWidget(QLabel(data))
-			case QImage():
-				pixlabel = QLabel()
-				pixmap = QPixmap()
-				pixmap.convertFromImage(data)
-				pixlabel.setPixmap(pixmap)
-				self.previewFrame.layout().addWidget(pixlabel)
-			case QPixmap():
-				pixlabel = QLabel()
-				pixlabel.setPixmap(data)
-				self.previewFrame.layout().addWidget(pixlabel)
 			case QWidget():
-				self.previewFrame.layout().addWidget(data)
+				widget = data
+			case np.ndarray() | QImage() if isinstance(own, FrameView):
+				own.setFrame(data)
+				widget = own
+			case np.ndarray() | QImage():
+				widget = FrameView()
+				widget.setFrame(data)
+				self._own_widgets.add(widget)
+			case QPixmap():
+				widget = own if type(own) is QLabel else self._ownLabel()
+				widget.setPixmap(data)
 			case _:
-				self.previewFrame.layout().addWidget(QLabel(str(data)))
+				widget = own if type(own) is QLabel else self._ownLabel()
+				widget.setText(str(data))
+
+		if widget is not current:
+			self._setSlotWidget(slot, widget)
 
 		self.contentChanged.emit()
 
+	def _ownLabel(self)->QLabel:
+		label = QLabel()
+		self._own_widgets.add(label)
+		return label
+
+	def _setSlotWidget(self, slot:Hashable|None, widget:QWidget):
+		layout = self.previewFrame.layout()
+		current = self._slots.get(slot) if slot is not None else None
+		if current is None:
+			layout.addWidget(widget)
+		else:
+			layout.replaceWidget(current, widget)
+			self._removeWidget(current)
+		if slot is not None:
+			self._slots[slot] = widget
+
+	def _removeWidget(self, widget:QWidget):
+		"""delete the widgets created here, and hand the others back to the caller"""
+		if widget in self._own_widgets:
+			self._own_widgets.discard(widget)
+			widget.deleteLater()
+		else:
+			widget.setParent(None)
+
 	def clear(self):
 		layout = self.previewFrame.layout()
-		while item:=layout.itemAt(0):
-			layout.removeItem(item)
-			# item.widget().deleteLater()
+		while item:=layout.takeAt(0):
+			if widget:=item.widget():
+				self._removeWidget(widget)
+		self._slots.clear()
 
 		self.contentChanged.emit()
 
 
 if __name__ == "__main__":
-	from pylive.examples import livescript
 	import sys
 	app = QApplication(sys.argv)
 	window = QWidget()
@@ -94,4 +134,4 @@ if __name__ == "__main__":
 	layout.addWidget(QLabel("left pane"))
 	layout.addWidget( PreviewWidget.instance() )
 	window.show()
-	sys.exit(app.exec())
\ No newline at end of file
+	sys.exit(app.exec())
@@ -5,6 +5,7 @@ from PySide6.QtCore import *
 from PySide6.QtWidgets import *
 
 from pylive.QtTerminal.logwindow import LogWindow
+from pylive.QtTerminal.kernel import Kernel
 from pylive.QtScriptEditor.components.async_jedi_completer import (
     AsyncJediCompleter,
 )
@@ -19,6 +20,8 @@ class Terminal(QFrame):
         super().__init__(parent=parent)
         self.setWindowTitle("Terminal with exec")
         self.setContext({})
+        self._kernel: Kernel | None = None
+        self._kernel_connections = []
         self.setFrameStyle(QFrame.Shape.StyledPanel)
 
         self.output = LogWindow()
@@ -68,7 +71,38 @@ class Terminal(QFrame):
         self._context = context
         self._context["__builtins__"] = __builtins__
 
-    def _execute(self, source: str, mode: Literal["exec", "single"]):
+    def kernel(self) -> Kernel | None:
+        return self._kernel
+
+    def setKernel(self, kernel: Kernel | None):
+        """execute in a kernel process instead of the gui thread.
+        the context is ignored then, the kernel owns the namespace"""
+        if self._kernel:
+            for signal, slot in self._kernel_connections:
+                signal.disconnect(slot)
+            self._kernel_connections = []
+
+        self._kernel = kernel
+
+        if kernel:
+            self._kernel_connections = [
+                (kernel.stdoutReceived, self.output.appendMessage),
+                (kernel.stderrReceived, self.output.appendError),
+                (kernel.exceptionThrown, self.exceptionThrown.emit),
+                (kernel.interrupted, self._onInterrupted),
+            ]
+            for signal, slot in self._kernel_connections:
+                signal.connect(slot)
+
+    def _onInterrupted(self, request_id: int):
+        self.output.appendError("interrupted\n")
+
+    def _execute(self, source: str, mode: Literal["exec", "single"]) -> int | None:
+        """returns the kernel request id, when executed in a kernel"""
+        if self._kernel:
+            self.output.appendMessage(f">{source.strip()}\n")
+            return self._kernel.execute(source, mode)
+
         try:
             tree = ast.parse(source)
             try:
@@ -92,8 +126,8 @@ class Terminal(QFrame):
         except Exception as err:
             self.exceptionThrown.emit(err)  # underline
 
-    def execute(self, source: str):
-        self._execute(source, mode="exec")
+    def execute(self, source: str) -> int | None:
+        return self._execute(source, mode="exec")
 
     def clear(self):
         self.output.clear()
@@ -0,0 +1,91 @@
+import unittest
+from typing import *
+
+from PySide6.QtCore import *
+from PySide6.QtWidgets import *
+import numpy as np
+
+from pylive.QtTerminal.kernel import Kernel, KernelError
+
+app = QApplication.instance() or QApplication([])
+
+
+def wait_until(condition:Callable[[], bool], timeout:float=20.0):
+	deadline = QDeadlineTimer(int(timeout*1000))
+	while not condition():
+		if deadline.hasExpired():
+			raise TimeoutError()
+		QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 50)
+
+
+class TestKernel(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.kernel = Kernel()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.kernel.shutdown()
+
+	def setUp(self):
+		self.output:list[str] = []
+		self.errors:list[Exception] = []
+		self.displayed:list[Any] = []
+		self.finished:list[int] = []
+		self.interrupted:list[int] = []
+		self.connections = [
+			(self.kernel.stdoutReceived, self.output.append),
+			(self.kernel.exceptionThrown, self.errors.append),
+			(self.kernel.displayed, self.displayed.append),
+			(self.kernel.interrupted, self.interrupted.append),
+			(self.kernel.finished, lambda request_id, elapsed: self.finished.append(request_id))
+		]
+		for signal, slot in self.connections:
+			signal.connect(slot)
+
+	def tearDown(self):
+		for signal, slot in self.connections:
+			signal.disconnect(slot)
+
+	def run_source(self, source:str, mode:Literal["exec", "single"]="exec"):
+		request_id = self.kernel.execute(source, mode)
+		wait_until(lambda: request_id in self.finished)
+
+	def test_namespace_and_stdout(self):
+		self.run_source("x = 21")
+		self.run_source("print(x*2)")
+		self.assertEqual("".join(self.output), "42\n")
+
+	def test_exceptions_have_line_numbers(self):
+		self.run_source("a = 1\nraise ValueError('bad')")
+		self.assertIsInstance(self.errors[0], KernelError)
+		self.assertEqual(self.errors[0].lineno, 2)
+
+		self.run_source("def (")
+		self.assertIsInstance(self.errors[1], SyntaxError)
+
+	def test_large_arrays_use_shared_memory(self):
+		self.run_source("import numpy as np\ndisplay(np.arange(100_000, dtype=np.float32))")
+		array = self.displayed[0]
+		self.assertIsNotNone(array._shared_memory)
+		np.testing.assert_array_equal(array, np.arange(100_000, dtype=np.float32))
+
+		self.run_source("display([1, 2])")
+		self.assertEqual(self.displayed[1], [1, 2])
+
+	def test_interrupt_and_restart(self):
+		request_id = self.kernel.execute("import time\nwhile True: time.sleep(0.01)")
+		QTimer.singleShot(500, self.kernel.interrupt)
+		wait_until(lambda: request_id in self.finished)
+		self.assertEqual(self.interrupted, [request_id])
+		self.assertEqual(self.errors, [], "an interrupt is not an exception of the code")
+		self.assertFalse(self.kernel.isBusy())
+
+		self.run_source("y = 1")
+		self.kernel.restart()
+		self.run_source("print('y' in globals())")
+		self.assertEqual("".join(self.output), "False\n")
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,140 @@
+"""
+Reset, add and remove latency of NXNetworkView.
+
+Builds a tree of nodes with ports and an attribute, then measures:
+- populating the view, with every node shown, and with a viewport sized visible rect
+  (the items of offscreen nodes are deferred)
+- a model reset that changes a fraction of the graph, reconciled with the existing items,
+  against tearing the view down and populating it again
+- adding and removing nodes one at a time, through the model signals
+- scrolling the visible rect over an empty area, the pending nodes are not scanned
+
+Usage:
+    python -m pylive.VisualCode_NetworkX.UI.benchmark_nx_network_item_view [--nodes 5000] [--changed 0.01] [--edits 100] [--scrolls 1000]
+"""
+
+from typing import *
+import sys
+import time
+import random
+import argparse
+
+import networkx as nx
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+from pylive.VisualCode_NetworkX.UI.nx_network_model import NXNetworkModel
+from pylive.VisualCode_NetworkX.UI.nx_network_item_view import NXNetworkView
+
+VISIBLE_RECT = QRectF(0, 0, 1280, 720)
+
+
+def make_graph(count:int)->nx.MultiDiGraph:
+    """a binary tree, each node feeds one inlet of its two children"""
+    G = nx.MultiDiGraph()
+    for i in range(count):
+        G.add_node(f"node{i}", inlets=["a", "b"], outlets=["out"], value=i)
+        if i > 0:
+            parent = (i - 1) // 2
+            G.add_edge(f"node{parent}", f"node{i}", ("out", "a" if i % 2 else "b"))
+    return G
+
+
+def change_graph(G:nx.MultiDiGraph, fraction:float, rng:random.Random)->nx.MultiDiGraph:
+    """a copy of the graph, with a fraction of the leaves replaced, and a fraction of the values changed"""
+    G = G.copy()
+    count = max(1, int(G.number_of_nodes() * fraction))
+    leaves = [n for n in G.nodes if G.out_degree(n) == 0]
+    for n in rng.sample(leaves, count):
+        parent = next(iter(G.predecessors(n)))
+        G.remove_node(n)
+        new_node = f"{n}_replaced"
+        G.add_node(new_node, inlets=["a", "b"], outlets=["out"], value=-1)
+        G.add_edge(parent, new_node, ("out", "a"))
+    for n in rng.sample(list(G.nodes), count):
+        G.nodes[n]['value'] = rng.random()
+    return G
+
+
+def populate(scene:QGraphicsScene, G:nx.MultiDiGraph, visible_rect:QRectF|None)->tuple[NXNetworkView, float]:
+    start = time.perf_counter()
+    view = NXNetworkView(NXNetworkModel())
+    scene.addItem(view)
+    view.setVisibleSceneRect(visible_rect)
+    view.model().setGraph(G.copy())
+    if visible_rect is not None:
+        # look at the root of the tree
+        view.setVisibleSceneRect(visible_rect.translated(view.nodePosition("node0") - visible_rect.center()))
+    QApplication.processEvents()
+    return view, time.perf_counter() - start
+
+
+def measure(name:str, seconds:float, view:NXNetworkView):
+    items = len(view._node_graphics_objects)
+    print(f"  {name:<40} {seconds*1000:9.1f}ms  node items {items}, pending {len(view._pending_nodes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=5000)
+    parser.add_argument("--changed", type=float, default=0.01, help="fraction of the nodes changed by the reset")
+    parser.add_argument("--edits", type=int, default=100, help="nodes added and removed one at a time")
+    parser.add_argument("--scrolls", type=int, default=1000, help="visible rect moves")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    rng = random.Random(args.seed)
+    G = make_graph(args.nodes)
+    changed = change_graph(G, args.changed, rng)
+
+    for label, visible_rect in (("every node shown", None), ("viewport sized visible rect", VISIBLE_RECT)):
+        print(f"{args.nodes} nodes, {label}")
+        scene = QGraphicsScene() # owns the items, keep it alive
+        view, seconds = populate(scene, G, visible_rect)
+        measure("populate", seconds, view)
+
+        ### reset
+        positions = {n: view.nodePosition(n) for n in G.nodes if changed.has_node(n)}
+        start = time.perf_counter()
+        view.model().setGraph(changed.copy())
+        QApplication.processEvents()
+        measure(f"reset, {args.changed:.0%} changed, reconciled", time.perf_counter() - start, view)
+        moved = sum(1 for n, pos in positions.items() if view.nodePosition(n) != pos)
+        assert moved == 0, f"{moved} kept nodes moved"
+
+        model = view.model()
+        start = time.perf_counter()
+        view.setModel(None)
+        view.setModel(model)
+        QApplication.processEvents()
+        measure("reset, torn down and populated", time.perf_counter() - start, view)
+
+        ### add and remove
+        added = [f"added{i}" for i in range(args.edits)]
+        parents = rng.sample(list(G.nodes & changed.nodes), args.edits)
+        start = time.perf_counter()
+        for node_id, parent in zip(added, parents):
+            model.addNode(node_id, inlets=["a", "b"], outlets=["out"], value=0)
+            model.addEdge(parent, node_id, ("out", "b"))
+        QApplication.processEvents()
+        measure(f"add {args.edits} nodes, per node", (time.perf_counter() - start) / args.edits, view)
+
+        start = time.perf_counter()
+        for node_id in added:
+            model.removeNode(node_id)
+        QApplication.processEvents()
+        measure(f"remove {args.edits} nodes, per node", (time.perf_counter() - start) / args.edits, view)
+
+        if visible_rect is not None:
+            ### scroll left of the graph
+            origin = view.mapRectToScene(view.boundingRect()).topLeft() - QPointF(visible_rect.width() * 2, 0)
+            start = time.perf_counter()
+            for i in range(args.scrolls):
+                view.setVisibleSceneRect(visible_rect.translated(origin + QPointF(0, i)))
+            measure(f"scroll {args.scrolls} times, per scroll", (time.perf_counter() - start) / args.scrolls, view)
+
+
+if __name__ == "__main__":
+    main()
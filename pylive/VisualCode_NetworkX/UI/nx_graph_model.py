@@ -5,6 +5,7 @@ from PySide6.QtWidgets import *
 
 import networkx as nx
 from collections import defaultdict
+from pylive.utils.unique import NameRegistry
 
 
 type _NodeId=Hashable
@@ -35,12 +36,16 @@ class NXGraphModel(QObject):
     edgeAttributesRemoved = Signal(dict)        #dict[_EdgeId, list[str]]
     edgeAttributesChanged = Signal(dict)        #dict[_EdgeId, list[str]]
 
+    ### Graph
+    modelReset = Signal()
+
 
     def __init__(self, G: nx.MultiDiGraph|None = None, parent=None):
         super().__init__(parent=parent)
         self.G = G or nx.MultiDiGraph()
         self._children:dict[Hashable, list[Hashable]] = defaultdict(list)
         self._parents:dict[Hashable, Hashable] = dict()
+        self._node_names = NameRegistry(n for n in self.G.nodes() if isinstance(n, str)) # the str node ids
 
         # for n in self.G.nodes():
         self.nodesAdded.emit([_ for _ in self.G.nodes()])
@@ -52,6 +57,14 @@ class NXGraphModel(QObject):
         #     u, v, k = e
         #     self.addEdge(u, v, k)
 
+    def setGraph(self, G: nx.MultiDiGraph):
+        """replace the whole graph, views reconcile their items with it on modelReset"""
+        self.G = G
+        self._children.clear()
+        self._parents.clear()
+        self._node_names = NameRegistry(n for n in self.G.nodes() if isinstance(n, str))
+        self.modelReset.emit()
+
     def patch(self, G: nx.MultiDiGraph):
         ...
         raise NotImplementedError("Not yet implemented")
@@ -63,6 +76,10 @@ class NXGraphModel(QObject):
     def nodes(self) -> List[Hashable]:
         return [n for n in self.G.nodes()]
 
+    def uniqueNodeId(self, name: str, /) -> str:
+        """name, or name numbered so no node has it as its id yet"""
+        return self._node_names.unique(name)
+
     def addNode(self, node_id: Hashable, /,*, parent:Hashable|None=None, **attrs) -> Hashable:
         if parent is not None and parent not in self.G.nodes:
             raise KeyError(f"No parent node {parent} exists!")
@@ -70,6 +87,8 @@ class NXGraphModel(QObject):
         if node_id in self.G.nodes:
             raise ValueError(f"node {node_id!r} already in graph", self.G.nodes)
         self.G.add_node(node_id, **attrs)
+        if isinstance(node_id, str):
+            self._node_names.reserve(node_id)
         if parent is not None:
             self._parents[node_id] = parent
             self._children[parent].append(node_id)
@@ -92,6 +111,8 @@ class NXGraphModel(QObject):
         self.nodeAttributesAboutToBeRemoved.emit({n: self.nodeAttributes(n)})
         self.nodesAboutToBeRemoved.emit([n])
         self.G.remove_node(n)
+        if isinstance(n, str):
+            self._node_names.release(n)
         if n in self._parents:
             parent_node_id = self._parents[n]
             self._children[parent_node_id].remove(n)
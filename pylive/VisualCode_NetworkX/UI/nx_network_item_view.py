@@ -17,6 +17,10 @@
 
 
 from typing import *
+import math
+from collections import defaultdict
+from functools import partial
+from itertools import chain
 from PySide6.QtGui import *
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
@@ -49,6 +53,34 @@ class _InletName(str):...
 class _EdgeId(tuple[_NodeId, _NodeId, tuple[_OutletName, _InletName]]):...
 
 
+def _differs(value:object, shown:object)->bool:
+    if value is shown:
+        return False
+    try:
+        return bool(value != shown)
+    except Exception: # eg. numpy arrays
+        return True
+
+
+def _removeItem(item:QGraphicsItem):
+    if scene := item.scene():
+        scene.removeItem(item)
+    else:
+        item.setParentItem(None)
+
+
+# the size of a node that has no item yet, to tell if it is in the visible rect
+PENDING_NODE_SIZE = QSizeF(160, 60)
+# pending nodes are indexed by the grid cell of their position, a scroll only looks at the visible cells
+PENDING_CELL_SIZE = 1000
+# distance between a node placed on reset and its placed neighbours
+PLACEMENT_SPACING = 200
+
+
+def _cell(pos:QPointF)->tuple[int, int]:
+    return math.floor(pos.x() / PENDING_CELL_SIZE), math.floor(pos.y() / PENDING_CELL_SIZE)
+
+
 class NXNetworkView(QGraphicsItem):
     def __init__(self, model: NXNetworkModel, delegate=NXNetworkSceneDelegate()):
         super().__init__()
@@ -67,8 +99,26 @@ class NXNetworkView(QGraphicsItem):
         self._inlet_graphics_objects: bidict[tuple[_NodeId, _InletName], QGraphicsItem] = bidict()
         self._link_graphics_objects: bidict[_EdgeId, QGraphicsItem] = bidict()
         self._attribute_editors: bidict[tuple[_NodeId, str], QGraphicsItem] = bidict()
-
-
+        # the values shown by the attribute editors, a reset only updates the editors of changed values
+        self._attribute_values: dict[tuple[_NodeId, str], object] = dict()
+
+        # every node has a position, offscreen nodes get their items when they scroll into view.
+        # Note: the position of a node with an item is the item position
+        self._node_positions: dict[_NodeId, QPointF] = dict()
+        self._pending_nodes: set[_NodeId] = set()
+        self._pending_cells: defaultdict[tuple[int, int], set[_NodeId]] = defaultdict(set) # pending nodes by the grid cell of their position
+        self._pending_links: set[_EdgeId] = set() # links waiting for the items of their nodes
+        self._visible_rect: QRectF|None = None # in item coordinates, None shows every node
+        self._pending_rect = QRectF() # bounds the pending nodes, so views can scroll to them. shrinks on reset and scroll
+
+        # links attached to each node, to find the links to move without scanning the model
+        self._node_links: defaultdict[_NodeId, set[_EdgeId]] = defaultdict(set)
+        # link geometry is recomputed once per event loop iteration, for all the links moved since
+        self._dirty_links: set[_EdgeId] = set()
+        self._link_update_timer = QTimer()
+        self._link_update_timer.setSingleShot(True)
+        self._link_update_timer.setInterval(0)
+        self._link_update_timer.timeout.connect(self.updateDirtyLinks)
 
         # set model
         # populate with initial model
@@ -76,10 +126,10 @@ class NXNetworkView(QGraphicsItem):
         self.setModel(model)
 
     def boundingRect(self) -> QRectF:
-        return QRectF(0,0,100,100)
+        return QRectF(0,0,100,100).united(self._pending_rect)
 
     def paint(self, painter:QPainter, option, widget=None):
-        painter.drawRect(self.boundingRect())
+        painter.drawRect(QRectF(0,0,100,100))
 
 
     def setModel(self, model: NXNetworkModel):
@@ -102,6 +152,9 @@ class NXNetworkView(QGraphicsItem):
             self._model.edgeAttributesAboutToBeRemoved.disconnect(self.onEdgeAttributesRemoved)
             self._model.edgeAttributesChanged.disconnect(self.onEdgeAttributesChanged)
 
+            # Graph
+            self._model.modelReset.disconnect(self.onModelReset)
+
         if model:
             # Nodes
             model.nodesAdded.connect(self.onNodesAdded)
@@ -120,49 +173,58 @@ class NXNetworkView(QGraphicsItem):
             model.edgeAttributesAdded.connect(self.onEdgeAttributesAdded)
             model.edgeAttributesAboutToBeRemoved.connect(self.onEdgeAttributesRemoved)
             model.edgeAttributesChanged.connect(self.onEdgeAttributesChanged)
-        
+
+            # Graph
+            model.modelReset.connect(self.onModelReset)
+
+        ### clear graph, items of an other model are not reused
+        self.onNodesRemoved([_ for _ in self._node_positions])
         self._model = model
         if self._model:
             ### populate graph
-            self.onNodesAdded(self._model.nodes())
-            edges:list[tuple[_NodeId, _NodeId, tuple[str, str]]] = [e for e in self._model.edges()]
-            self.onEdgesAdded( edges )
-
-            # layout items
-            self.layout()
+            self.onModelReset()
 
     def model(self):
         return self._model
 
     ### <<< Map the interactive graphics ids to widgets
+    # Note: the items of offscreen nodes are created when they are asked for
     def nodeGraphicsObject(self, node_id: _NodeId) -> BaseNodeItem|None:
         assert self._model
-        if node_id not in [_ for _ in self._model.nodes()]:
+        if not self._model.G.has_node(node_id):
             raise KeyError(f"model has no node: {node_id}")
+        if node_id in self._pending_nodes:
+            self.createNodeItems([node_id])
         if editor:=self._node_graphics_objects.get(node_id):
             return editor
 
     def outletGraphicsObject(self, node_id:_NodeId, key:_OutletName) -> QGraphicsItem|None:
         assert isinstance(key, str)
         assert self._model
-        if node_id not in [_ for _ in self._model.nodes()]:
+        if not self._model.G.has_node(node_id):
             raise KeyError(f"model has no node: {node_id}")
+        if node_id in self._pending_nodes:
+            self.createNodeItems([node_id])
         if editor:=self._outlet_graphics_objects.get((node_id, key), None):
             return editor
 
     def inletGraphicsObject(self, node_id:_NodeId, key: _InletName) -> QGraphicsItem|None:
         assert isinstance(key, str)
         assert self._model
-        if node_id not in [_ for _ in self._model.nodes()]:
+        if not self._model.G.has_node(node_id):
             raise KeyError(f"model has no node: {node_id}")
+        if node_id in self._pending_nodes:
+            self.createNodeItems([node_id])
         if editor:=self._inlet_graphics_objects.get((node_id, key), None):
             return editor
 
     def linkGraphicsObject(self, u:_NodeId, v:_NodeId, k:tuple[_OutletName, _InletName]) -> BaseLinkItem|None:
         edge_id = u, v, k
         assert self._model
-        if edge_id not in [_ for _ in self._model.edges()]:
+        if not self._model.G.has_edge(u, v, k):
             raise KeyError(f"model has no edge: {edge_id}")
+        if edge_id in self._pending_links:
+            self.createNodeItems([n for n in (u, v) if n in self._pending_nodes])
 
         if editor:=self._link_graphics_objects.get(edge_id):
             return cast(BaseLinkItem, editor)
@@ -170,141 +232,348 @@ class NXNetworkView(QGraphicsItem):
     def attributeEditor(self, node_id:_NodeId, attr:str)->QGraphicsItem|None:
         assert isinstance(attr, str)
         assert self._model
-        if node_id not in [_ for _ in self._model.nodes()]:
+        if not self._model.G.has_node(node_id):
             raise KeyError(f"model has no node: {node_id}")
-        if attr not in [_ for _ in self._model.nodeAttributes(node_id)]:
+        if not self._model.hasNodeAttribute(node_id, attr):
             raise KeyError(f"node {node_id} has no attribute: {attr}")
+        if node_id in self._pending_nodes:
+            self.createNodeItems([node_id])
 
         if editor:=self._attribute_editors.get((node_id, attr), None):
             return editor
 
+    def nodePosition(self, node_id:_NodeId)->QPointF:
+        """the position of the node, with or without an item"""
+        if node_editor := self._node_graphics_objects.get(node_id):
+            return node_editor.pos()
+        return self._node_positions[node_id]
+
+    def setNodePosition(self, node_id:_NodeId, pos:QPointF):
+        if node_id in self._pending_nodes:
+            self._discardPendingNode(node_id)
+            self._node_positions[node_id] = QPointF(pos)
+            self._addPendingNode(node_id)
+            self._growPendingRect([node_id])
+        else:
+            self._node_positions[node_id] = QPointF(pos)
+        if node_editor := self._node_graphics_objects.get(node_id):
+            node_editor.setPos(pos)
+
+    def isNodePending(self, node_id:_NodeId)->bool:
+        """the node has no items yet, because it was not visible"""
+        return node_id in self._pending_nodes
+
+    ### <<< Offscreen nodes
+    def setVisibleSceneRect(self, rect:QRectF|None):
+        """create the items of the nodes in the visible rect.
+        connect to LODGraphicsView.visibleSceneRectChanged, None shows every node."""
+        self._visible_rect = self.mapRectFromScene(rect) if rect is not None else None
+        self.createVisibleNodeItems()
+
+    def isNodeVisible(self, node_id:_NodeId)->bool:
+        if self._visible_rect is None:
+            return True
+        return self._visible_rect.intersects(QRectF(self.nodePosition(node_id), PENDING_NODE_SIZE))
+
+    def createVisibleNodeItems(self):
+        if visible := [n for n in self._visiblePendingCandidates() if self.isNodeVisible(n)]:
+            self.createNodeItems(visible)
+            self._updatePendingRect()
+
+    def _visiblePendingCandidates(self)->Iterable[_NodeId]:
+        """the pending nodes in the grid cells that overlap the visible rect"""
+        if self._visible_rect is None:
+            return list(self._pending_nodes)
+        # a node is visible when its rect, starting at its position, intersects the visible rect
+        rect = self._visible_rect.adjusted(-PENDING_NODE_SIZE.width(), -PENDING_NODE_SIZE.height(), 0, 0)
+        left, top = _cell(rect.topLeft())
+        right, bottom = _cell(rect.bottomRight())
+        if (right-left+1) * (bottom-top+1) > len(self._pending_cells):
+            # zoomed out, fewer occupied cells than visible cells
+            cells = [
+                cell for cell in self._pending_cells
+                if left <= cell[0] <= right and top <= cell[1] <= bottom
+            ]
+        else:
+            cells = [
+                (column, row)
+                for column in range(left, right+1)
+                for row in range(top, bottom+1)
+                if (column, row) in self._pending_cells
+            ]
+        return [n for cell in cells for n in self._pending_cells[cell]]
+
+    def _addPendingNode(self, node_id:_NodeId):
+        self._pending_nodes.add(node_id)
+        self._pending_cells[_cell(self._node_positions[node_id])].add(node_id)
+
+    def _discardPendingNode(self, node_id:_NodeId):
+        if node_id not in self._pending_nodes:
+            return
+        self._pending_nodes.remove(node_id)
+        cell = _cell(self._node_positions[node_id])
+        nodes = self._pending_cells[cell]
+        nodes.discard(node_id)
+        if not nodes:
+            del self._pending_cells[cell]
+
+    def _updatePendingRect(self):
+        """bound the pending nodes, only the nodes in the outer cells are looked at"""
+        rect = QRectF()
+        if self._pending_cells:
+            left_column, right_column = min(c for c, _ in self._pending_cells), max(c for c, _ in self._pending_cells)
+            top_row, bottom_row = min(r for _, r in self._pending_cells), max(r for _, r in self._pending_cells)
+            def positions(cells:Iterable[tuple[int, int]])->list[QPointF]:
+                return [self._node_positions[n] for cell in cells for n in self._pending_cells[cell]]
+            left = min(p.x() for p in positions(c for c in self._pending_cells if c[0] == left_column))
+            right = max(p.x() for p in positions(c for c in self._pending_cells if c[0] == right_column))
+            top = min(p.y() for p in positions(c for c in self._pending_cells if c[1] == top_row))
+            bottom = max(p.y() for p in positions(c for c in self._pending_cells if c[1] == bottom_row))
+            rect = QRectF(QPointF(left, top), QPointF(right, bottom) + QPointF(PENDING_NODE_SIZE.width(), PENDING_NODE_SIZE.height()))
+        if rect != self._pending_rect:
+            self.prepareGeometryChange()
+            self._pending_rect = rect
+
+    def _growPendingRect(self, nodes:Iterable[_NodeId]):
+        rect = QRectF(self._pending_rect)
+        for node_id in nodes:
+            if node_id in self._pending_nodes:
+                rect = rect.united(QRectF(self._node_positions[node_id], PENDING_NODE_SIZE))
+        if rect != self._pending_rect:
+            self.prepareGeometryChange()
+            self._pending_rect = rect
+
+    def createNodeItems(self, nodes:Iterable[_NodeId]):
+        """create the items of pending nodes, and of their pending neighbours,
+        so the links of the nodes can be shown"""
+        assert self._model
+        nodes = [n for n in nodes if n in self._pending_nodes]
+        if not nodes:
+            return
+        neighbours = {
+            n
+            for node_id in nodes
+            for edge_id in self._node_links.get(node_id, ())
+            if edge_id in self._pending_links
+            for n in edge_id[:2]
+            if n in self._pending_nodes
+        }
+        for node_id in chain(nodes, neighbours.difference(nodes)):
+            self._discardPendingNode(node_id)
+            self._createNodeItem(node_id)
+
+        links = {
+            edge_id
+            for node_id in chain(nodes, neighbours)
+            for edge_id in self._node_links.get(node_id, ())
+            if edge_id in self._pending_links
+            and edge_id[0] not in self._pending_nodes
+            and edge_id[1] not in self._pending_nodes
+        }
+        for edge_id in links:
+            self._pending_links.discard(edge_id)
+            self._createLinkItem(edge_id)
+
+    def _createNodeItem(self, node_id:_NodeId):
+        assert self._model
+        ### create node editor
+        node_editor = self.delegate.createNodeEditor(self._model, node_id)
+        self._node_graphics_objects[node_id] = node_editor
+        node_editor.setParentItem(self)
+        node_editor.setPos(self._node_positions[node_id])
+        node_editor.scenePositionChanged.connect(partial(self.scheduleNodeLinksUpdate, node_id))
+        attributes = [_ for _ in self._model.nodeAttributes(node_id)]
+
+        ### create attribute editors
+        for attr in attributes:
+            editor = self.delegate.createAttributeEditor(node_editor, self._model, node_id, attr)
+            if editor:
+                self._attribute_editors[(node_id, attr)] = editor
+                self._updateAttributeEditor(node_id, attr, editor)
+
+        self._createPortItems(node_id, node_editor)
+        self.delegate.updateNodeEditor(self._model, node_id, node_editor, attributes)
+
+    def _createPortItems(self, node_id:_NodeId, node_editor:QGraphicsItem):
+        assert self._model
+        ### create inlets
+        inlets = []
+        for inlet_name in self._model.inlets(node_id):
+            inlet = self.delegate.createInletEditor(node_editor, node_id, inlet_name)
+            self._inlet_graphics_objects[(node_id, inlet_name)] = inlet
+            inlets.append(inlet)
+        # position inlet
+        for inlet in inlets:
+            inlet.setY(node_editor.boundingRect().top()-3)
+        distribute_items_horizontal(inlets, node_editor.boundingRect())
+
+        ### create outlets
+        outlets = []
+        for outlet_name in self._model.outlets(node_id):
+            outlet = self.delegate.createOutletEditor(node_editor, node_id, outlet_name)
+            self._outlet_graphics_objects[(node_id, outlet_name)] = outlet
+            outlets.append(outlet)
+        # position outlets
+        for outlet in outlets:
+            outlet.setY(node_editor.boundingRect().bottom()+3)
+        distribute_items_horizontal(outlets, node_editor.boundingRect())
+
+    def _updateAttributeEditor(self, node_id:_NodeId, attr:str, editor:QGraphicsItem):
+        assert self._model
+        self.delegate.updateAttributeEditor(self._model, node_id, attr, editor)
+        self._attribute_values[(node_id, attr)] = self._model.getNodeAttribute(node_id, attr)
+
+    def _nodeItemKeys(self, node_editor:QGraphicsItem)->tuple[list[_InletName], list[_OutletName], list[str]]:
+        """the inlets, outlets and attributes of the node that have items"""
+        inlets, outlets, attributes = [], [], []
+        for child in node_editor.childItems():
+            if key := self._inlet_graphics_objects.inverse.get(child):
+                inlets.append(key[1])
+            elif key := self._outlet_graphics_objects.inverse.get(child):
+                outlets.append(key[1])
+            elif key := self._attribute_editors.inverse.get(child):
+                attributes.append(key[1])
+        return inlets, outlets, attributes
+
+    def _removeNodeItem(self, node_id:_NodeId):
+        node_editor = self._node_graphics_objects.pop(node_id)
+        inlets, outlets, attributes = self._nodeItemKeys(node_editor)
+        for inlet_name in inlets:
+            del self._inlet_graphics_objects[(node_id, inlet_name)]
+        for outlet_name in outlets:
+            del self._outlet_graphics_objects[(node_id, outlet_name)]
+        for attr in attributes:
+            del self._attribute_editors[(node_id, attr)]
+            self._attribute_values.pop((node_id, attr), None)
+        _removeItem(node_editor) # with its ports and attribute editors
+
+    ### <<< Links
+    def _addLinks(self, edges:Iterable[_EdgeId]):
+        for e in edges:
+            u, v, _ = e
+            self._node_links[u].add(e)
+            self._node_links[v].add(e)
+            if u in self._pending_nodes or v in self._pending_nodes:
+                self._pending_links.add(e)
+            else:
+                self._createLinkItem(e)
+
+    def _createLinkItem(self, e:_EdgeId):
+        u, v, (o, i) = e
+        link = self.delegate.createLinkEditor(self._model, u, v, (o, i))
+
+        self._link_graphics_objects[e] = link
+        link.setParentItem(self)
+        link.move(
+            self._outlet_graphics_objects[(u, o)],
+            self._inlet_graphics_objects[(v, i)]
+        )
+
+    def _removeLinks(self, edges:Iterable[_EdgeId]):
+        for e in edges:
+            u, v, _ = e
+            for node_id in (u, v):
+                if links := self._node_links.get(node_id):
+                    links.discard(e)
+            self._pending_links.discard(e)
+            self._dirty_links.discard(e)
+            if link := self._link_graphics_objects.pop(e, None):
+                _removeItem(link)
+
     def moveAttachedLinks(self, node_id:_NodeId):
-        from itertools import chain
-        model = self.model()
-        assert model
-        for e in chain(model.inEdges(node_id), model.outEdges(node_id)):
-            u, v, (o, i) = e
-            source_node = self.nodeGraphicsObject(u)
-            outlet = self.outletGraphicsObject(u, o)
-            target_node = self.nodeGraphicsObject(v)
-            inlet = self.inletGraphicsObject(v, i)
-            link = self.linkGraphicsObject(u, v, (o, i))
-            link.move(outlet, inlet)
+        for e in self._node_links.get(node_id, ()):
+            if link := self._link_graphics_objects.get(e):
+                u, v, (o, i) = e
+                link.move(self._outlet_graphics_objects[(u, o)], self._inlet_graphics_objects[(v, i)])
+                self._dirty_links.discard(e)
+
+    def scheduleNodeLinksUpdate(self, node_id:_NodeId):
+        """mark the links attached to the node to be moved.
+        Dragging a selection moves every node, the links are then moved once,
+        when control returns to the event loop"""
+        if links := self._node_links.get(node_id):
+            self._dirty_links.update(links)
+            if not self._link_update_timer.isActive():
+                self._link_update_timer.start()
+
+    def updateDirtyLinks(self):
+        dirty_links, self._dirty_links = self._dirty_links, set()
+        for e in dirty_links:
+            if link := self._link_graphics_objects.get(e):
+                u, v, (o, i) = e
+                link.move(self._outlet_graphics_objects[(u, o)], self._inlet_graphics_objects[(v, i)])
 
     ### <<< Handle Model Signals
     def onNodesAdded(self, nodes: list[_NodeId]):
         assert self._model
         for node_id in nodes:
-            ### create node editor
-            node_editor = self.delegate.createNodeEditor(self._model, node_id)
-            node_editor.scenePositionChanged.connect(lambda node_id=node_id: self.moveAttachedLinks(node_id))
-            self._node_graphics_objects[node_id] = node_editor
-
-            self.nodeGraphicsObject(node_id).setParentItem(self)
-            attributes = [_ for _ in self._model.nodeAttributes(node_id)]
-            
-
-            ### create attribute editors
-            for attr in attributes:
-                editor = self.delegate.createAttributeEditor(node_editor, self._model, node_id, attr)
-                if editor:
-                    self._attribute_editors[(node_id, attr)] = editor
-                    self.delegate.updateAttributeEditor(self._model, node_id, attr, editor)
-
-            ### create inlets
-            inlets = []
-            for inlet_name in self._model.inlets(node_id):
-                node_editor = cast(BaseNodeItem, self.nodeGraphicsObject(node_id))
-                inlet = self.delegate.createInletEditor(node_editor, node_id, inlet_name)
-                self._inlet_graphics_objects[(node_id, inlet_name)] = inlet
-                inlets.append(inlet)
-            # position inlet
-            for inlet in inlets:
-                inlet.setY(node_editor.boundingRect().top()-3)
-            distribute_items_horizontal(inlets, node_editor.boundingRect())
-
-            ### create outlets
-            outlets = []
-            for outlet_name in self._model.outlets(node_id):
-                node_editor = cast(BaseNodeItem, self.nodeGraphicsObject(node_id))
-                outlet = self.delegate.createOutletEditor(node_editor, node_id, outlet_name)
-                self._outlet_graphics_objects[(node_id, outlet_name)] = outlet
-                outlets.append(outlet)
-            # position outlets
-            for outlet in outlets:
-                outlet.setY(node_editor.boundingRect().bottom()+3)
-            distribute_items_horizontal(outlets, node_editor.boundingRect())
-
-            self.delegate.updateNodeEditor(self._model, node_id, node_editor, attributes)
+            self._node_positions[node_id] = QPointF()
+            self._addPendingNode(node_id)
+        self.createNodeItems([n for n in nodes if self.isNodeVisible(n)])
+        self._growPendingRect(nodes)
 
     def onNodesRemoved(self, nodes: list[_NodeId]):
         for n in nodes:
+            if n not in self._node_positions:
+                continue
+            self._removeLinks([e for e in self._node_links.pop(n, ())])
             if n in self._node_graphics_objects:
-                node_graphics_object = self.nodeGraphicsObject(n)
-                raise NotImplementedError()
+                self._removeNodeItem(n)
+            self._discardPendingNode(n)
+            del self._node_positions[n]
+        if not self._pending_nodes:
+            self._updatePendingRect()
 
     def onEdgesAdded(self, edges: Iterable[tuple[_NodeId, _NodeId, tuple[str, str]]]):
-        for e in edges:
-            u, v, (o, i) = e
-            link = self.delegate.createLinkEditor(self._model, u, v, (o, i))
-
-            self._link_graphics_objects[e] = link
-            link.setParentItem(self)
-
-            u, v, (o, i) = e
-            link.move(
-                self.outletGraphicsObject(u, o),
-                self.inletGraphicsObject(v, i)
-            )
+        self._addLinks(edges)
 
     def onEdgesRemoved(self, edges: Iterable[tuple[_NodeId, _NodeId, tuple[str, str]]]):
-        for e in edges:
-            u, v, (o, i) = e
-            self.removeItem(self.linkGraphicsObject(u, v, (o, i)))
-            if e in self._link_graphics_objects:
-                del self._link_graphics_objects[e]
+        self._removeLinks(edges)
 
     def onNodeAttributesAdded(self, node_attributes:dict[_NodeId, list[str]]):
         assert self._model
         for node_id, attributes in node_attributes.items():
-            if node_editor := self.nodeGraphicsObject(node_id):
+            # pending nodes create their editors from the model, when they are shown
+            if node_editor := self._node_graphics_objects.get(node_id):
                 for attr in attributes:
+                    if (node_id, attr) in self._attribute_editors:
+                        continue # created with the node
                     if attr_editor := self.delegate.createAttributeEditor(node_editor, self._model, node_id, attr):
                         self._attribute_editors[(node_id, attr)] = attr_editor
                         
 
                 self.delegate.updateNodeEditor(self._model, node_id, node_editor, attributes)
                 for attr in attributes:
-                    if attr_editor:=self.attributeEditor(node_id, attr):
-                        self.delegate.updateAttributeEditor(self._model, node_id, attr, attr_editor)
+                    if attr_editor:=self._attribute_editors.get((node_id, attr)):
+                        self._updateAttributeEditor(node_id, attr, attr_editor)
 
 
     def onNodeAttributesRemoved(self, node_attributes:dict[_NodeId, list[str]]):
         assert self._model
         for node_id, attributes in node_attributes.items():
-            if node_editor := self.nodeGraphicsObject(node_id):
+            if node_editor := self._node_graphics_objects.get(node_id):
                 for attr in attributes:
                     if attr_editor := self._attribute_editors.get((node_id, attr)):
                         del self._attribute_editors[(node_id, attr)]
-                        scene = attr_editor.scene()
-                        scene.removeItem(attr_editor)
+                        self._attribute_values.pop((node_id, attr), None)
+                        _removeItem(attr_editor)
 
                 self.delegate.updateNodeEditor(self._model, node_id, node_editor, attributes)
 
     def onNodeAttributesChanged(self, node_attributes:dict[_NodeId, list[str]]):
         assert self._model
         for node_id, attributes in node_attributes.items():
-            if node_editor := self.nodeGraphicsObject(node_id):
+            if node_editor := self._node_graphics_objects.get(node_id):
                 for attr in attributes:
-                    if attr_editor := self.attributeEditor(node_id, attr):
-                        self.delegate.updateAttributeEditor(self._model, node_id, attr, attr_editor)
+                    if attr_editor := self._attribute_editors.get((node_id, attr)):
+                        self._updateAttributeEditor(node_id, attr, attr_editor)
                 self.delegate.updateNodeEditor(self._model, node_id, node_editor, attributes)
 
     def onEdgeAttributesAdded(self, edge_attributes:dict[_EdgeId, list[str]]):
         assert self._model
         for edge_id, attributes in edge_attributes.items():
             u, v, k = edge_id
-            edge_editor = self.linkGraphicsObject(u, v, k)
+            edge_editor = self._link_graphics_objects.get(edge_id)
             for attr in attributes:
                 ...
 
@@ -312,7 +581,7 @@ class NXNetworkView(QGraphicsItem):
         assert self._model
         for edge_id, attributes in edge_attributes.items():
             u, v, k = edge_id
-            edge_editor = self.linkGraphicsObject(u, v, k)
+            edge_editor = self._link_graphics_objects.get(edge_id)
             for attr in attributes:
                 ...
 
@@ -320,35 +589,115 @@ class NXNetworkView(QGraphicsItem):
         assert self._model
         for edge_id, attributes in edge_attributes.items():
             u, v, k = edge_id
-            edge_editor = self.linkGraphicsObject(u, v, k)
+            edge_editor = self._link_graphics_objects.get(edge_id)
             for attr in attributes:
                 ...
 
     def onModelReset(self):
+        """reconcile the items with the model.
+        items of removed nodes and links are removed, new nodes are placed next to
+        their neighbours, and the items of the other nodes are kept where they are"""
         assert self._model
-        ### clear graph
-        self._node_graphics_objects.clear()
-        self._inlet_graphics_objects.clear()
-        self._link_graphics_objects.clear()
-        self._node_graphics_objects.clear()
-        self.clear()
+        G = self._model.G
+
+        ### remove
+        self._removeLinks([
+            e for e in chain(self._link_graphics_objects.keys(), self._pending_links)
+            if not G.has_edge(*e)
+        ])
+        self.onNodesRemoved([n for n in self._node_positions if not G.has_node(n)])
+
+        ### update the kept nodes
+        for node_id in list(self._node_graphics_objects.keys()):
+            self._updateNodeItems(node_id)
+
+        ### add
+        new_nodes = [n for n in G.nodes if n not in self._node_positions]
+        has_layout = len(self._node_positions) > 0
+        for node_id in new_nodes:
+            self._node_positions[node_id] = QPointF()
+            self._addPendingNode(node_id)
+        if has_layout:
+            self._placeNodes(new_nodes)
+        else:
+            self.layout()
 
-        ### populate graph
-        self.onNodesAdded(self._model.nodes())
-        self.onEdgesAdded(self._model.edges())
+        self._addLinks([
+            e for e in self._model.edges()
+            if e not in self._link_graphics_objects and e not in self._pending_links
+        ])
+        self.createVisibleNodeItems()
+        self._updatePendingRect()
 
-        # layout items
-        self.layout()
+    def _updateNodeItems(self, node_id:_NodeId):
+        """update the attribute editors and the ports of a kept node"""
+        assert self._model
+        node_editor = self._node_graphics_objects[node_id]
+        inlets, outlets, attributes = self._nodeItemKeys(node_editor)
+
+        ### attribute editors
+        model_attributes = [_ for _ in self._model.nodeAttributes(node_id)]
+        if removed := list(set(attributes).difference(model_attributes)):
+            self.onNodeAttributesRemoved({node_id: removed})
+        if added := [attr for attr in model_attributes if attr not in attributes]:
+            self.onNodeAttributesAdded({node_id: added})
+        if changed := [
+            attr for attr in model_attributes
+            if attr in attributes and _differs(self._model.getNodeAttribute(node_id, attr), self._attribute_values.get((node_id, attr)))
+        ]:
+            self.onNodeAttributesChanged({node_id: changed})
+
+        ### ports, recreated when they changed
+        if inlets != list(self._model.inlets(node_id)) or outlets != list(self._model.outlets(node_id)):
+            for inlet_name in inlets:
+                _removeItem(self._inlet_graphics_objects.pop((node_id, inlet_name)))
+            for outlet_name in outlets:
+                _removeItem(self._outlet_graphics_objects.pop((node_id, outlet_name)))
+            self._createPortItems(node_id, node_editor)
+            self.scheduleNodeLinksUpdate(node_id)
+
+    def _placeNodes(self, nodes:list[_NodeId]):
+        """place new nodes below their placed predecessors, or above their placed successors,
+        the others are placed in a column right of the graph"""
+        assert self._model
+        G = self._model.G
+        placed = self._node_positions.keys() - set(nodes)
+        if not nodes or not placed:
+            return
+        right = max(self.nodePosition(n).x() for n in placed) + PLACEMENT_SPACING
+        column_y = 0.0
+        for node_id in nodes:
+            if predecessors := [self.nodePosition(n) for n in G.predecessors(node_id) if n in placed]:
+                pos = QPointF(
+                    sum(p.x() for p in predecessors) / len(predecessors),
+                    max(p.y() for p in predecessors) + PLACEMENT_SPACING
+                )
+            elif successors := [self.nodePosition(n) for n in G.successors(node_id) if n in placed]:
+                pos = QPointF(
+                    sum(p.x() for p in successors) / len(successors),
+                    min(p.y() for p in successors) - PLACEMENT_SPACING
+                )
+            else:
+                pos = QPointF(right, column_y)
+                column_y += PLACEMENT_SPACING
+            self.setNodePosition(node_id, pos)
+            placed.add(node_id)
 
     ### <<< Handle Model Signals
 
     def layout(self):
+        """lay out every node, the nodes without items too"""
         assert self._model
-        from pylive.utils.graph import hiearchical_layout_with_nx
-        pos = hiearchical_layout_with_nx(self._model.G, scale=200)
+        import networkx as nx
+        from pylive.utils.graph import hiearchical_layout_with_sugiyama
+        # Note: the layered layout spaces the nodes of large graphs, and accepts cycles.
+        # multipartite_layout fits any graph in the same rect, the nodes overlap
+        G = nx.DiGraph()
+        G.add_nodes_from(self._model.G.nodes)
+        G.add_edges_from((u, v) for u, v, _ in self._model.G.edges)
+        pos = hiearchical_layout_with_sugiyama(G, scale=PLACEMENT_SPACING)
         for N, (x, y) in pos.items():
-            widget = self.nodeGraphicsObject(N)
-            widget.setPos(x, y)
+            self.setNodePosition(N, QPointF(x, y))
 
     ### Handle Events
     # def nodeAt(self, position: QPointF) -> _NodeId | None:
@@ -418,7 +767,8 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
 
     # setup main window
-    view = QGraphicsView()
+    from pylive.qt_components.lod_graphicsview import LODGraphicsView
+    view = LODGraphicsView()
     view.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
     view.setCacheMode(QGraphicsView.CacheModeFlag.CacheNone)
     view.setWindowTitle("NXNetworkScene")
@@ -438,6 +788,7 @@ if __name__ == "__main__":
     scene = QGraphicsScene()
     graph_view_item = NXNetworkView(graph)
     scene.addItem(graph_view_item)
+    view.visibleSceneRectChanged.connect(graph_view_item.setVisibleSceneRect)
     scene.setSceneRect(QRectF(-400, -400, 800, 800))
     view.setScene(scene)
 
@@ -5,7 +5,6 @@ from PySide6.QtWidgets import *
 
 
 from pylive.VisualCode_NetworkX.UI.nx_network_model import NXNetworkModel
-from pylive.utils.unique import make_unique_name
 
 """
 node
@@ -35,7 +34,7 @@ class PythonGraphModel(NXNetworkModel):
             callable_name = fn.__name__
         except AttributeError:
             callable_name = fn.__class__.__name__
-        node_id = make_unique_name(callable_name, [str(n) for n in self.nodes()])
+        node_id = self.uniqueNodeId(callable_name)
         super().addNode(
             node_id,
             _content=fn,
@@ -255,6 +255,55 @@ class TestGraphModelAlgorithms(unittest.TestCase):
 		self.assertEqual(set(list(self.graph.rootRodes())), {self.finish_node})
 
 
+class TestGraphIndexes(unittest.TestCase):
+	def setUp(self) -> None:
+		self.graph = GraphModel()
+		self.source, self.target = self.graph.addNodes([("source", 0, 0), ("target", 0, 0)])
+		self.outlet = self.graph.addOutlet(self.source, "out")
+		self.inlets = self.graph.addInlets([(self.target, f"in{i}") for i in range(3)])
+		self.edges = self.graph.addEdges([(self.outlet, inlet) for inlet in self.inlets])
+		return super().setUp()
+
+	def test_lookups_return_all_matches(self):
+		self.assertEqual(self.graph.getOutletEdges(self.outlet), self.edges)
+		self.assertEqual(self.graph.getNodeInlets(self.target), self.inlets)
+		self.assertEqual(list(self.graph.getTargetNodes(self.source)), [self.target]*3)
+
+	def test_refs_are_reused(self):
+		self.assertIs(self.graph.getEdgeSource(self.edges[1]), self.outlet)
+		self.assertIs(self.graph.getInletOwner(self.inlets[2]), self.target)
+
+	def test_bulk_insert_emits_once(self):
+		spy = QSignalSpy(self.graph.nodesAdded)
+		nodes = self.graph.addNodes([(f"node{i}", i, i) for i in range(100)])
+		self.assertEqual(spy.count(), 1)
+		self.assertEqual(len(spy.at(0)[0]), 100)
+		self.assertEqual(self.graph.nodeCount(), 102)
+
+	def test_indexes_follow_removed_rows(self):
+		self.graph.removeInlets([self.inlets[0], self.inlets[2]])
+		self.assertEqual(self.graph.getOutletEdges(self.outlet), [self.edges[1]])
+		self.assertEqual(self.graph.getEdgeTarget(self.edges[1]), self.inlets[1])
+		self.assertEqual(self.graph.edgeCount(), 1)
+
+		self.graph.removeNodes([self.source])
+		self.assertEqual(self.graph.edgeCount(), 0)
+		self.assertEqual(self.graph.getNodeInlets(self.target), [self.inlets[1]])
+
+	def test_set_edge_target(self):
+		self.graph.setEdgeTarget(self.edges[0], self.inlets[1])
+		self.assertEqual(self.graph.getInletEdges(self.inlets[0]), [])
+		self.assertCountEqual(self.graph.getInletEdges(self.inlets[1]), [self.edges[0], self.edges[1]])
+
+	def test_table_facade(self):
+		table = self.graph._nodeTable
+		self.assertEqual(table.rowCount(), 2)
+		self.assertEqual(table.index(1, 1).data(), "target")
+		self.assertTrue(table.setData(table.index(1, 1), "renamed"))
+		self.assertEqual(self.graph.getNodeData(self.target, NodeAttribute.Name), "renamed")
+		self.assertFalse(table.setData(table.index(1, 0), "NEWID"), "ids are read only")
+
+
 """
 test if related inlets, edges etc are get removed when nodes are removed
 """
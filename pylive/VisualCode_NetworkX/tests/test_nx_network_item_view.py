@@ -0,0 +1,155 @@
+import unittest
+from typing import *
+import networkx as nx
+from PySide6.QtGui import *
+from PySide6.QtCore import *
+from PySide6.QtWidgets import *
+
+from pylive.VisualCode_NetworkX.UI.nx_network_model import NXNetworkModel
+from pylive.VisualCode_NetworkX.UI.nx_network_item_view import NXNetworkView, PENDING_NODE_SIZE, _cell
+
+app = QApplication.instance() or QApplication([])
+
+
+def make_chain(count:int)->nx.MultiDiGraph:
+    """each node feeds the 'a' inlet of the next one"""
+    G = nx.MultiDiGraph()
+    for i in range(count):
+        G.add_node(f"node{i}", inlets=["a", "b"], outlets=["out"], value=i)
+        if i > 0:
+            G.add_edge(f"node{i-1}", f"node{i}", ("out", "a"))
+    return G
+
+
+class TestNetworkView(unittest.TestCase):
+    def make_view(self, G:nx.MultiDiGraph, visible_rect:QRectF|None=None)->NXNetworkView:
+        self.scene = QGraphicsScene() # owns the items, keep it alive
+        view = NXNetworkView(NXNetworkModel())
+        self.scene.addItem(view)
+        view.setVisibleSceneRect(visible_rect)
+        view.model().setGraph(G)
+        return view
+
+    def assertBookkeeping(self, view:NXNetworkView):
+        """every node is either pending or has an item, and the pending nodes are indexed by their cell"""
+        G = view.model().G
+        self.assertEqual(set(view._node_positions), set(G.nodes))
+        self.assertEqual(view._pending_nodes | set(view._node_graphics_objects), set(G.nodes))
+        self.assertFalse(view._pending_nodes & set(view._node_graphics_objects))
+        indexed = {n: cell for cell, nodes in view._pending_cells.items() for n in nodes}
+        self.assertEqual(set(indexed), view._pending_nodes)
+        for n, cell in indexed.items():
+            self.assertEqual(cell, _cell(view._node_positions[n]))
+        self.assertTrue(all(view._pending_cells.values()), "empty cells are dropped")
+
+        self.assertEqual(view._pending_links | set(view._link_graphics_objects), set(G.edges))
+        for u, v, _ in view._pending_links:
+            self.assertTrue(u in view._pending_nodes or v in view._pending_nodes)
+        self.assertEqual({n for n, links in view._node_links.items() if links} - set(G.nodes), set())
+        for n in G.nodes:
+            self.assertEqual(view._node_links.get(n, set()), set(G.in_edges(n, keys=True)) | set(G.out_edges(n, keys=True)))
+
+        for n in view._pending_nodes:
+            self.assertTrue(view._pending_rect.contains(QRectF(view._node_positions[n], PENDING_NODE_SIZE)))
+
+    def visibleRectAt(self, view:NXNetworkView, node_id:str)->QRectF:
+        return QRectF(view.mapToScene(view.nodePosition(node_id)), QSizeF(100, 50))
+
+    def test_every_node_shown(self):
+        view = self.make_view(make_chain(20))
+        self.assertEqual(view._pending_nodes, set())
+        self.assertEqual(len(view._link_graphics_objects), 19)
+        self.assertTrue(view._pending_rect.isNull())
+        self.assertBookkeeping(view)
+
+    def test_offscreen_nodes_are_deferred(self):
+        G = make_chain(50)
+        view = self.make_view(G, QRectF(-1e6, -1e6, 1, 1))
+        self.assertEqual(view._pending_nodes, set(G.nodes))
+        self.assertEqual(view._node_graphics_objects, {})
+        self.assertBookkeeping(view)
+
+        ### asking for an item creates the node, and its neighbours for the links
+        self.assertIsNotNone(view.nodeGraphicsObject("node10"))
+        self.assertEqual(set(view._node_graphics_objects), {"node9", "node10", "node11"})
+        self.assertEqual(set(view._link_graphics_objects), {("node9", "node10", ("out", "a")), ("node10", "node11", ("out", "a"))})
+        self.assertBookkeeping(view)
+
+    def test_scrolling_creates_the_visible_nodes(self):
+        view = self.make_view(make_chain(50), QRectF(-1e6, -1e6, 1, 1))
+        view.setVisibleSceneRect(self.visibleRectAt(view, "node30"))
+        self.assertFalse(view.isNodePending("node30"))
+        self.assertTrue(view.isNodePending("node0"))
+        self.assertBookkeeping(view)
+
+        ### a large visible rect creates every node
+        view.setVisibleSceneRect(view.mapRectToScene(view.boundingRect()))
+        self.assertEqual(view._pending_nodes, set())
+        self.assertEqual(view._pending_cells, {})
+        self.assertTrue(view._pending_rect.isNull())
+        self.assertBookkeeping(view)
+
+    def test_moving_a_pending_node(self):
+        view = self.make_view(make_chain(10), QRectF(-1e6, -1e6, 1, 1))
+        view.setNodePosition("node5", QPointF(1e5, 1e5))
+        self.assertBookkeeping(view)
+        view.setVisibleSceneRect(QRectF(view.mapToScene(QPointF(1e5, 1e5)), QSizeF(10, 10)))
+        self.assertFalse(view.isNodePending("node5"))
+        self.assertEqual(view.nodePosition("node5"), QPointF(1e5, 1e5))
+        self.assertBookkeeping(view)
+
+    def test_reset_reconciles(self):
+        G = make_chain(30)
+        view = self.make_view(G, QRectF(-1e6, -1e6, 1, 1))
+        view.setVisibleSceneRect(self.visibleRectAt(view, "node10"))
+        node_item = view.nodeGraphicsObject("node10")
+        positions = {n: view.nodePosition(n) for n in G.nodes}
+
+        changed = G.copy()
+        changed.remove_nodes_from(["node20", "node0"])
+        changed.add_node("new", inlets=["a"], outlets=["out"], value=0)
+        changed.add_edge("node10", "new", ("out", "a"))
+        changed.nodes["node10"]['outlets'] = ["out", "other"]
+        changed.nodes["node11"]['value'] = -1
+        view.model().setGraph(changed)
+
+        self.assertIs(view.nodeGraphicsObject("node10"), node_item, "kept nodes keep their items")
+        for n in changed.nodes:
+            if n != "new":
+                self.assertEqual(view.nodePosition(n), positions[n], "kept nodes keep their positions")
+        self.assertEqual(view.nodePosition("new").x(), positions["node10"].x(), "placed below its predecessor")
+        self.assertGreater(view.nodePosition("new").y(), positions["node10"].y())
+        for n in ("node0", "node20"):
+            self.assertNotIn(n, view._node_positions)
+            self.assertNotIn(n, view._pending_nodes)
+            self.assertNotIn(n, view._node_links)
+        self.assertIsNotNone(view.outletGraphicsObject("node10", "other"), "changed ports are recreated")
+        self.assertIsNotNone(view.linkGraphicsObject("node10", "new", ("out", "a")))
+        self.assertBookkeeping(view)
+
+    def test_remove_nodes(self):
+        view = self.make_view(make_chain(10), QRectF(-1e6, -1e6, 1, 1))
+        view.nodeGraphicsObject("node3")
+        for n in ("node3", "node7"): # with an item, and pending
+            view.model().removeNode(n)
+            self.assertNotIn(n, view._node_positions)
+            self.assertNotIn(n, view._node_graphics_objects)
+            self.assertNotIn(n, view._node_links)
+            self.assertBookkeeping(view)
+        self.assertNotIn(("node2", "node3", ("out", "a")), view._link_graphics_objects)
+
+    def test_set_model_none_clears(self):
+        view = self.make_view(make_chain(10), QRectF(-1e6, -1e6, 1, 1))
+        view.nodeGraphicsObject("node3")
+        view.setModel(None)
+        for bookkeeping in (
+            view._node_positions, view._pending_nodes, view._pending_cells, view._pending_links,
+            view._node_graphics_objects, view._link_graphics_objects, view._inlet_graphics_objects,
+            view._outlet_graphics_objects, view._attribute_editors
+        ):
+            self.assertEqual(len(bookkeeping), 0)
+        self.assertTrue(view._pending_rect.isNull())
+
+
+if __name__ == "__main__":
+    unittest.main()
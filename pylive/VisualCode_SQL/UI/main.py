@@ -65,11 +65,11 @@ class GraphInspector(QWidget):
 
 
 class Window(QWidget):
-    def __init__(self, parent:QWidget|None=None):
+    def __init__(self, path:str=":memory:", parent:QWidget|None=None):
         super().__init__()
         self.setWindowTitle("SQLGraphEditor")
 
-        self.model = SQLGraphModel()
+        self.model = SQLGraphModel(path)
         self.graph_selection = QItemSelectionModel(self.model.graphs)
         self.node_selection = QItemSelectionModel(self.model.nodes)
         self.edge_selection = QItemSelectionModel(self.model.edges)
@@ -147,9 +147,8 @@ class Window(QWidget):
 
     @Slot()
     def remove_selected_graphs(self):
-        for index in self.graph_selection.selectedIndexes():
-            graph_key =  self.model.graphs.record(index.row()).value("key")
-            self.model.delete_graph(graph_key)
+        graph_keys = {self.model.graphs.record(index.row()).value("key") for index in self.graph_selection.selectedIndexes()}
+        self.model.delete_graphs(graph_keys)
 
     @Slot()
     def create_new_node(self):
@@ -159,9 +158,8 @@ class Window(QWidget):
 
     @Slot()
     def remove_selected_nodes(self):
-        for index in self.node_selection.selectedIndexes():
-            node_key = self.model.nodes.record(index.row()).value("key")
-            self.model.delete_node(node_key)
+        node_keys = {self.model.nodes.record(index.row()).value("key") for index in self.node_selection.selectedIndexes()}
+        self.model.delete_nodes(node_keys)
 
     @Slot()
     def create_new_edge(self):
@@ -171,21 +169,19 @@ class Window(QWidget):
         current_node_key = self.model.nodes.record(current_node.row()).value("key")
         selected_node_keys = [self.model.nodes.record(_.row()).value("key") for _ in selected_nodes]
 
-        for source_node_key in selected_node_keys:
-            if source_node_key !=current_node_key:
-                self.model.add_edge(source_node_key, current_node_key)
+        self.model.add_edges([(source_node_key, current_node_key) for source_node_key in set(selected_node_keys) if source_node_key != current_node_key])
 
     @Slot()
     def remove_selected_edges(self):
-        for index in self.edge_selection.selectedIndexes():
-            edge_key = self.model.edges.record(index.row()).value("key")
-            self.model.delete_edge(edge_key)
+        edge_keys = {self.model.edges.record(index.row()).value("key") for index in self.edge_selection.selectedIndexes()}
+        self.model.delete_edges(edge_keys)
             
 
 
 
 if __name__ == "__main__":
+    import sys
     app = QApplication()
-    window = Window()
+    window = Window(sys.argv[1] if len(sys.argv) > 1 else ":memory:") # eg.: python main.py graphs.sqlite
     window.show()
     app.exec()
\ No newline at end of file
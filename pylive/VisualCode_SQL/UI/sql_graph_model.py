@@ -4,7 +4,8 @@ from typing import *
 from PySide6.QtCore import *
 from PySide6.QtSql import *
 
-from itertools import chain
+from contextlib import contextmanager
+import json
 
 from PySide6.QtWidgets import QApplication
 
@@ -16,7 +17,16 @@ from PySide6.QtWidgets import QApplication
 #         return super().flags(index)
 
 class SQLGraphModel(QObject):
-    def __init__(self, parent:QObject|None=None):
+    """
+    graphs, nodes and edges in an sqlite database.
+
+    the tables are exposed as QSqlRelationalTableModels for the views.
+    edits run as set based queries in a single transaction, then the affected
+    table models are selected again.
+
+    path is an sqlite file, opened in WAL mode, or ':memory:'.
+    """
+    def __init__(self, path:str=":memory:", parent:QObject|None=None):
         super().__init__(parent=parent)
         self.db:QSqlDatabase
         self.graphs:QSqlRelationalTableModel
@@ -24,52 +34,63 @@ class SQLGraphModel(QObject):
         self.edges:QSqlRelationalTableModel
 
         ### setup sql database
-        self._create_database()
-        self._populate_database()
+        is_new = self._create_database(path)
+        if is_new:
+            self._populate_database()
         self._create_models()
 
-    def _create_database(self):
-        self.db = QSqlDatabase.addDatabase("QSQLITE")
-        self.db.setDatabaseName(":memory:")
+    def _create_database(self, path:str)->bool:
+        """open the database, and create the missing tables and indexes.
+        return True, if the database had no graphs yet"""
+        # a connection for each model, the default connection is shared by the application
+        self.db = QSqlDatabase.addDatabase("QSQLITE", f"{self.__class__.__name__}_{id(self)}")
+        self.db.setDatabaseName(path)
 
         if not self.db.open():
-            print("Error: Cannot open database")
-            return False
-
-        queries = []
-
-        queries.append("""CREATE TABLE graph (
-            key INTEGER PRIMARY KEY AUTOINCREMENT, 
-            name TEXT
-        )""")
-        
-        queries.append("""CREATE TABLE node (
-            key INTEGER PRIMARY KEY AUTOINCREMENT, 
-            name TEXT, 
-            graph INTEGER, 
-            FOREIGN KEY(graph) REFERENCES graph(key))
-        """)
-
-        queries.append("""CREATE TABLE edge (
-            key INTEGER PRIMARY KEY AUTOINCREMENT, 
-            source_node INTEGER, 
-            target_node INTEGER, 
-            FOREIGN KEY(source_node) REFERENCES node(key),
-            FOREIGN KEY(target_node) REFERENCES node(key)
-        )""")
-
-        query = QSqlQuery(self.db)
-        for create_query in queries:
-            if not query.exec(create_query):
-                print(f"Error creating tables: {query.lastError().text()}")
+            raise RuntimeError(f"Cannot open database: {self.db.lastError().text()}")
+
+        self._exec("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._exec("PRAGMA journal_mode = WAL")
+            self._exec("PRAGMA synchronous = NORMAL") # durable at checkpoints, WAL keeps the file consistent
+
+        with self._transaction():
+            self._exec("""CREATE TABLE IF NOT EXISTS graph (
+                key INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT
+            )""")
+
+            self._exec("""CREATE TABLE IF NOT EXISTS node (
+                key INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                graph INTEGER,
+                FOREIGN KEY(graph) REFERENCES graph(key))
+            """)
+
+            self._exec("""CREATE TABLE IF NOT EXISTS edge (
+                key INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_node INTEGER,
+                target_node INTEGER,
+                FOREIGN KEY(source_node) REFERENCES node(key),
+                FOREIGN KEY(target_node) REFERENCES node(key)
+            )""")
+
+            # topology lookups and cascading deletes go through these
+            self._exec("CREATE INDEX IF NOT EXISTS node_graph ON node(graph)")
+            self._exec("CREATE INDEX IF NOT EXISTS edge_source_node ON edge(source_node)")
+            self._exec("CREATE INDEX IF NOT EXISTS edge_target_node ON edge(target_node)")
+
+        query = self._exec("SELECT NOT EXISTS (SELECT 1 FROM graph)")
+        query.next()
+        return bool(query.value(0))
 
     def _create_models(self):
         # graphs table
         self.graphs = QSqlRelationalTableModel(self, self.db)
         self.graphs.setTable("graph")
-        
+
         self.graphs.select()
-        
+
 
         ### nodes table
         self.nodes = QSqlRelationalTableModel(self, self.db)
@@ -77,9 +98,9 @@ class SQLGraphModel(QObject):
         self.nodes.setRelation(2, QSqlRelation("graph", "key", "name"))
         self.nodes.setHeaderData(1, Qt.Orientation.Horizontal, "name")
         self.nodes.setHeaderData(2, Qt.Orientation.Horizontal, "graph")
-        
+
         self.nodes.select()
-        
+
 
         ### edges table
         self.edges = QSqlRelationalTableModel(self, self.db)
@@ -98,173 +119,221 @@ class SQLGraphModel(QObject):
 
     def _populate_database(self):
         ### create initial data
-        graph_inserts = [
-            "INSERT INTO graph (name) VALUES ('MainGraph')"
-        ]
-        node_inserts = [
-            "INSERT INTO node (graph, name) VALUES (1, 'NodeA')",
-            "INSERT INTO node (graph, name) VALUES (1, 'NodeB')",
-            "INSERT INTO node (graph, name) VALUES (1, 'NodeC')"
-        ]
-        edge_inserts = [
-            "INSERT INTO edge (source_node, target_node) VALUES (1, 2)",
-            "INSERT INTO edge (source_node, target_node) VALUES (2, 3)",
-            "INSERT INTO edge (source_node, target_node) VALUES (3, 1)"
-        ]
+        self.import_graph("MainGraph", ["NodeA", "NodeB", "NodeC"], [(0, 1), (1, 2), (2, 0)], select=False)
 
+    def close(self):
+        for model in (self.graphs, self.nodes, self.edges):
+            model.clear()
+        self.db.close()
+
+    ### Queries ###
+    def _exec(self, sql:str, **values:Any)->QSqlQuery:
+        """run a query with named :placeholders"""
         query = QSqlQuery(self.db)
-        for insertion in chain(graph_inserts, node_inserts, edge_inserts):
-            if not query.exec(insertion):
-                print(f"Error creating tables: {query.lastError().text()}")
+        if not query.prepare(sql):
+            raise RuntimeError(f"Error preparing query: {query.lastError().text()}\n{sql}")
+        for name, value in values.items():
+            query.bindValue(f":{name}", value)
+        if not query.exec():
+            raise RuntimeError(f"Error executing query: {query.lastError().text()}\n{sql}")
+        return query
+
+    def _insert_many(self, table:str, columns:Sequence[str], rows:Sequence[Sequence[Any]])->List[int]:
+        """
+        insert rows with a single query, and return the new keys.
 
+        QSQLITE has no batch operations, and the execBatch emulation copies the
+        bound lists for every row. the rows are bound as one json array instead.
+        keys are consecutive, as the rows are inserted by a single statement.
+        """
+        if not rows:
+            return []
+        values = ", ".join(f"json_extract(value, '$[{i}]')" for i in range(len(columns)))
+        query = self._exec(
+            f"INSERT INTO {table} ({', '.join(columns)}) SELECT {values} FROM json_each(:rows)",
+            rows=json.dumps([list(row) for row in rows])
+        )
+        last_key = query.lastInsertId()
+        return list(range(last_key-len(rows)+1, last_key+1))
+
+    @contextmanager
+    def _transaction(self):
+        if not self.db.transaction():
+            raise RuntimeError(f"Cannot start transaction: {self.db.lastError().text()}")
+        try:
+            yield
+        except Exception:
+            self.db.rollback()
+            raise
+        else:
+            self.db.commit()
+
+    ### Graphs ###
     def create_graph(self, name: str) -> int:
         """
         Create a new graph and return its key.
-        
+
         Args:
             name (str): Name of the graph
-        
+
         Returns:
             int: Key of the newly created graph
         """
-        row = self.graphs.rowCount()
-        self.graphs.beginInsertRows(QModelIndex(), row, row)
-        record = self.graphs.record()
-        record.setValue("name", name)
-        self.graphs.insertRecord(-1, record)
-        self.graphs.endInsertRows()
-        self.graphs.submitAll()
-        
-        # Return the key of the last inserted graph
-        return self.graphs.record(row).value("key")
+        graph_key = self._exec("INSERT INTO graph (name) VALUES (:name)", name=name).lastInsertId()
+        self.graphs.select()
+        return graph_key
 
     def delete_graph(self, graph_key: int):
         """
         Delete a graph and all its associated nodes and edges.
-        
+
         Args:
             graph_key (int): Key of the graph to delete
         """
-        # Delete associated edges first
-        edge_filter = f"source_node IN (SELECT key FROM node WHERE graph = {graph_key}) OR " \
-                      f"target_node IN (SELECT key FROM node WHERE graph = {graph_key})"
-        self.edges.setFilter(edge_filter)
-        while self.edges.rowCount() > 0:
-            self.edges.removeRow(0)
-        self.edges.setFilter("")
-        
-        # Delete nodes of the graph
-        self.nodes.setFilter(f"graph = {graph_key}")
-        while self.nodes.rowCount() > 0:
-            self.nodes.removeRow(0)
-        self.nodes.setFilter("")
-        
-        # Delete the graph itself
-        for row in range(self.graphs.rowCount()):
-            if self.graphs.record(row).value("key") == graph_key:
-                self.graphs.beginRemoveRows(QModelIndex(), row, row)
-                self.graphs.removeRow(row)
-                self.graphs.endRemoveRows()
-                break
+        self.delete_graphs([graph_key])
+
+    def delete_graphs(self, graph_keys: Iterable[int]):
+        """Delete graphs with their nodes and edges, in a single transaction."""
+        keys = json.dumps(list(graph_keys))
+        with self._transaction():
+            self._exec("""DELETE FROM edge
+                WHERE source_node IN (SELECT key FROM node WHERE graph IN (SELECT value FROM json_each(:keys)))
+                   OR target_node IN (SELECT key FROM node WHERE graph IN (SELECT value FROM json_each(:keys)))
+            """, keys=keys)
+            self._exec("DELETE FROM node WHERE graph IN (SELECT value FROM json_each(:keys))", keys=keys)
+            self._exec("DELETE FROM graph WHERE key IN (SELECT value FROM json_each(:keys))", keys=keys)
+        self.edges.select()
+        self.nodes.select()
+        self.graphs.select()
+
+    def import_graph(self, name:str, nodes:Sequence[str], edges:Iterable[Tuple[int, int]], select:bool=True) -> int:
+        """
+        Create a graph with nodes and edges in a single transaction.
 
+        Args:
+            name (str): Name of the graph
+            nodes (Sequence[str]): Names of the nodes
+            edges (Iterable[Tuple[int, int]]): source and target positions in nodes
+
+        Returns:
+            int: Key of the newly created graph
+        """
+        with self._transaction():
+            graph_key = self._exec("INSERT INTO graph (name) VALUES (:name)", name=name).lastInsertId()
+            node_keys = self._insert_many("node", ["graph", "name"], [(graph_key, node_name) for node_name in nodes])
+            self._insert_many("edge", ["source_node", "target_node"], [(node_keys[source], node_keys[target]) for source, target in edges])
+        if select:
+            self.graphs.select()
+            self.nodes.select()
+            self.edges.select()
+        return graph_key
+
+    ### Nodes ###
     def add_node(self, graph_key: int, name: str) -> int:
         """
         Add a node to a specific graph.
-        
+
         Args:
             graph_key (int): Key of the graph to add the node to
             name (str): Name of the node
-        
+
         Returns:
             int: Key of the newly created node
         """
-        print(f"!!!!!add_node, graph_key: {graph_key}, name:{name}")
-        row = self.nodes.rowCount()
-
-        # Begin inserting the row
-        self.nodes.beginInsertRows(QModelIndex(), row, row)
-        
-        # Create a new record and set its values
-        record = self.nodes.record()
-        record.setValue("name", name)
-        record.setValue("graph", graph_key)
-        
-        # Insert the record into the model
-        if not self.nodes.insertRecord(row, record):
-            print("cant insert record")
-        
-        # End inserting rows
-        self.nodes.endInsertRows()
-
-        # Commit changes to the database
-        if not self.nodes.submitAll():
-            print("Error submitting data:")
-            print("-", self.nodes.lastError().text())
-
-        # Get the key of the newly inserted node
-        new_node_key =  self.nodes.record(row).value("key")
-        print(new_node_key)
-        return new_node_key
+        return self.add_nodes(graph_key, [name])[0]
 
+    def add_nodes(self, graph_key: int, names: Iterable[str]) -> List[int]:
+        """Add nodes to a graph in a single transaction, and return their keys."""
+        with self._transaction():
+            node_keys = self._insert_many("node", ["graph", "name"], [(graph_key, name) for name in names])
+        self.nodes.select()
+        return node_keys
 
     def delete_node(self, node_key: int):
         """
         Delete a node and all its associated edges.
-        
+
         Args:
             node_key (int): Key of the node to delete
         """
-        # First, delete associated edges
-        self.edges.setFilter(f"source_node = {node_key} OR target_node = {node_key}")
-        while self.edges.rowCount() > 0:
-            self.edges.removeRow(0)
-        self.edges.setFilter("")  # Clear the filter after removing rows
-        
-        # Now, delete the node itself
-        self.nodes.setFilter(f"key = {node_key}")
-        for row in range(self.nodes.rowCount()):
-            self.nodes.beginRemoveRows(QModelIndex(), row, row)
-            self.nodes.removeRow(row)
-            self.nodes.endRemoveRows()
-        self.nodes.setFilter("")  # Clear the filter after removing rows
+        self.delete_nodes([node_key])
+
+    def delete_nodes(self, node_keys: Iterable[int]):
+        """Delete nodes with their edges, in a single transaction."""
+        keys = json.dumps(list(node_keys))
+        with self._transaction():
+            self._exec("""DELETE FROM edge
+                WHERE source_node IN (SELECT value FROM json_each(:keys))
+                   OR target_node IN (SELECT value FROM json_each(:keys))
+            """, keys=keys)
+            self._exec("DELETE FROM node WHERE key IN (SELECT value FROM json_each(:keys))", keys=keys)
+        self.edges.select()
+        self.nodes.select()
 
+    ### Edges ###
     def add_edge(self, source_node_key: int, target_node_key: int) -> int:
         """
         Add an edge between two nodes.
-        
+
         Args:
             source_node_key (int): Key of the source node
             target_node_key (int): Key of the target node
-        
+
         Returns:
             int: Key of the newly created edge
         """
-        row = self.edges.rowCount()
-        self.edges.beginInsertRows(QModelIndex(), row, row)
-        record = self.edges.record()
-        record.setValue("source_node", source_node_key)
-        record.setValue("target_node", target_node_key)
-        self.edges.insertRecord(-1, record)
-        self.edges.endInsertRows()
-        
-        # Return the key of the last inserted edge
-        return self.edges.record(row).value("key")
+        return self.add_edges([(source_node_key, target_node_key)])[0]
+
+    def add_edges(self, edges: Iterable[Tuple[int, int]]) -> List[int]:
+        """Add (source_node_key, target_node_key) edges in a single transaction, and return their keys."""
+        with self._transaction():
+            edge_keys = self._insert_many("edge", ["source_node", "target_node"], list(edges))
+        self.edges.select()
+        return edge_keys
 
     def delete_edge(self, edge_key: int):
         """
         Delete a specific edge.
-        
+
         Args:
             edge_key (int): Key of the edge to delete
         """
-        for row in range(self.edges.rowCount()):
-            if self.edges.record(row).value("key") == edge_key:
-                self.edges.beginRemoveRows(QModelIndex(), row, row)
-                self.edges.removeRow(row)
-                self.edges.endRemoveRows()
-                break
+        self.delete_edges([edge_key])
+
+    def delete_edges(self, edge_keys: Iterable[int]):
+        """Delete edges in a single transaction."""
+        with self._transaction():
+            self._exec("DELETE FROM edge WHERE key IN (SELECT value FROM json_each(:keys))", keys=json.dumps(list(edge_keys)))
+        self.edges.select()
 
-        self.edges.submitAll()
+    ### Traversal ###
+    def ancestors(self, node_key: int) -> Set[int]:
+        """Keys of the nodes with a path to the node."""
+        query = self._exec("""WITH RECURSIVE ancestor(key) AS (
+                SELECT source_node FROM edge WHERE target_node = :key
+                UNION
+                SELECT edge.source_node FROM edge JOIN ancestor ON edge.target_node = ancestor.key
+            )
+            SELECT key FROM ancestor
+        """, key=node_key)
+        keys = set()
+        while query.next():
+            keys.add(query.value(0))
+        return keys
+
+    def descendants(self, node_key: int) -> Set[int]:
+        """Keys of the nodes reachable from the node."""
+        query = self._exec("""WITH RECURSIVE descendant(key) AS (
+                SELECT target_node FROM edge WHERE source_node = :key
+                UNION
+                SELECT edge.target_node FROM edge JOIN descendant ON edge.source_node = descendant.key
+            )
+            SELECT key FROM descendant
+        """, key=node_key)
+        keys = set()
+        while query.next():
+            keys.add(query.value(0))
+        return keys
 
 
 if __name__ == "__main__":
@@ -272,4 +341,4 @@ if __name__ == "__main__":
     model = SQLGraphModel()
 
 
-    app.exec()
\ No newline at end of file
+    app.exec()
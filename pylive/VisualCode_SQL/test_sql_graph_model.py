@@ -3,39 +3,92 @@ from typing import *
 from PySide6.QtGui import *
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
-from pylive.SQLPythonGraphEditor.sql_graph_model import SQLGraphModel
+
+import os
+import tempfile
+
+from pylive.VisualCode_SQL.UI.sql_graph_model import SQLGraphModel
+
+app = QApplication.instance() or QApplication([])
+
 
 class TestNodeCRUD(unittest.TestCase):
     def setUp(self) -> None:
-        self.app = QApplication()
+        self.model = SQLGraphModel()
+
+    def tearDown(self) -> None:
+        self.model.close()
 
     def test_create_graph(self):
-        print(self.app)
-        model = SQLGraphModel()
-        graph_key = model.add_graph("MainGraph")
-        print(graph_key)
-        # graph.addNode("n1")
-        # self.assertIn("n1", graph.nodes())
-
-    # def test_adding_unique_nodes(self):
-    #     """adding new functions must have unique id"""
-    #     graph = SQLGraphModel()
-    #     graph.addNode("n1")
-    #     with self.assertRaises(ValueError):
-    #         graph.addNode("n1")
-
-    # def test_delete_node(self):
-    #     """adding new functions must have unique id"""
-    #     graph = SQLGraphModel()
-    #     graph.addNode("n1")
-    #     self.assertIn("n1", graph.nodes())
-
-    #     graph.removeNode("n1")
-    #     self.assertNotIn("n1", graph.nodes())
-        
-    # def tearDown(self):
-    #     ...
-    #     # del self.app
+        graph_key = self.model.create_graph("MainGraph")
+        self.assertEqual(self.model.graphs.rowCount(), 2)
+        self.assertEqual(self.model.graphs.record(1).value("key"), graph_key)
+
+    def test_add_nodes(self):
+        node_keys = self.model.add_nodes(1, ["a", "b", "c"])
+        self.assertEqual(len(set(node_keys)), 3)
+        self.assertEqual(self.model.nodes.rowCount(), 6)
+        self.assertEqual(self.model.nodes.record(5).value("key"), node_keys[-1])
+
+    def test_delete_node(self):
+        """deleting a node deletes its edges"""
+        self.model.delete_node(2)
+        self.assertEqual(self.model.nodes.rowCount(), 2)
+        self.assertEqual(self.model.edges.rowCount(), 1)
+
+    def test_delete_graph(self):
+        graph_key = self.model.import_graph("graph", ["a", "b"], [(0, 1)])
+        self.model.delete_graph(graph_key)
+        self.assertEqual(self.model.graphs.rowCount(), 1)
+        self.assertEqual(self.model.nodes.rowCount(), 3)
+        self.assertEqual(self.model.edges.rowCount(), 3)
+
+    def test_add_and_delete_edges(self):
+        edge_keys = self.model.add_edges([(1, 3), (3, 2)])
+        self.assertEqual(self.model.edges.rowCount(), 5)
+        self.model.delete_edges(edge_keys)
+        self.assertEqual(self.model.edges.rowCount(), 3)
+
+
+class TestTraversal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = SQLGraphModel()
+        graph_key = self.model.create_graph("chain")
+        self.keys = self.model.add_nodes(graph_key, ["a", "b", "c", "d"])
+        a, b, c, d = self.keys
+        self.model.add_edges([(a, b), (b, c), (a, d)])
+
+    def tearDown(self) -> None:
+        self.model.close()
+
+    def test_descendants(self):
+        a, b, c, d = self.keys
+        self.assertEqual(self.model.descendants(a), {b, c, d})
+        self.assertEqual(self.model.descendants(c), set())
+
+    def test_ancestors(self):
+        a, b, c, d = self.keys
+        self.assertEqual(self.model.ancestors(c), {a, b})
+
+    def test_cycles_terminate(self):
+        """the example graph is a cycle of three nodes"""
+        self.assertEqual(self.model.descendants(1), {1, 2, 3})
+
+
+class TestPersistence(unittest.TestCase):
+    def test_reopen(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "graphs.sqlite")
+            model = SQLGraphModel(path)
+            graph_key = model.import_graph("saved", ["a", "b"], [(0, 1)])
+            model.close()
+
+            model = SQLGraphModel(path)
+            self.assertEqual(model.graphs.rowCount(), 2, "the example graph is not added again")
+            self.assertEqual(model.nodes.rowCount(), 5)
+            self.assertEqual(model.edges.rowCount(), 4)
+            model.close()
+
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -167,7 +167,7 @@ class GraphDetailsView(QWidget):
 		if node.isValid():
 			self.id_label.setText(node.data())
 			self.mapper.setCurrentModelIndex(node)  # Update the mapper's current index
-			node_name = self._model._nodeTable.itemFromIndex(index).text()  # Get the selected node's name
+			node_name = node.siblingAtColumn(0).data()  # the owner columns hold the node id
 			self.selected_node_inlets.setFilterFixedString(node_name) # update inlet filters
 			self.selected_node_outlets.setFilterFixedString(node_name) # update outlet filters
 			self.panel.show()
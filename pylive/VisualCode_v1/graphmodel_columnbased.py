@@ -1,6 +1,5 @@
-from enum import IntEnum, StrEnum
-from pylive import unique
-import sys
+from enum import StrEnum
+from pylive.utils import unique
 from PySide6.QtGui import *
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
@@ -144,131 +143,230 @@ class OutletRef():
 		return f"{self.__class__.__name__}({self._index.row()},{self._index.column()})"
 
 
+class _ColumnTable(QAbstractTableModel):
+	"""one graph table, stored column by column.
+
+	the first column holds the unique ids. read only columns can only be changed
+	through setValue, eg.: the owner and endpoint columns the graph indexes."""
+	def __init__(self, labels:Iterable[str], readonly:Iterable[str]=(), parent:QObject|None=None):
+		super().__init__(parent)
+		self._labels:List[str] = list(labels)
+		self._columns:List[list] = [[] for _ in self._labels]
+		self._readonly:Set[str] = set(readonly)
+
+	### QAbstractTableModel ###
+	def rowCount(self, parent:QModelIndex|QPersistentModelIndex=QModelIndex())->int:
+		return 0 if parent.isValid() else len(self._columns[0])
+
+	def columnCount(self, parent:QModelIndex|QPersistentModelIndex=QModelIndex())->int:
+		return 0 if parent.isValid() else len(self._labels)
+
+	def data(self, index:QModelIndex|QPersistentModelIndex, role:int=Qt.ItemDataRole.DisplayRole)->Any:
+		if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+			return None
+		return self._columns[index.column()][index.row()]
+
+	def setData(self, index:QModelIndex|QPersistentModelIndex, value:Any, role:int=Qt.ItemDataRole.EditRole)->bool:
+		if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+			return False
+		if self._labels[index.column()] in self._readonly:
+			return False
+		self.setValue(index.row(), self._labels[index.column()], value)
+		return True
+
+	def flags(self, index:QModelIndex|QPersistentModelIndex)->Qt.ItemFlag:
+		flags = super().flags(index)
+		if index.isValid() and self._labels[index.column()] not in self._readonly:
+			flags |= Qt.ItemFlag.ItemIsEditable
+		return flags
+
+	def headerData(self, section:int, orientation:Qt.Orientation, role:int=Qt.ItemDataRole.DisplayRole)->Any:
+		if role != Qt.ItemDataRole.DisplayRole:
+			return None
+		if orientation == Qt.Orientation.Horizontal:
+			return self._labels[section] if 0 <= section < len(self._labels) else None
+		return section
+
+	### Columns ###
+	def labels(self)->List[str]:
+		return list(self._labels)
+
+	def isReadOnly(self, label:str)->bool:
+		return label in self._readonly
+
+	def findColumn(self, label:str)->int:
+		try:
+			return self._labels.index(label)
+		except ValueError:
+			raise KeyError(f"No '{label}' column in table")
+
+	def addColumn(self, label:str)->int:
+		column = len(self._labels)
+		self.beginInsertColumns(QModelIndex(), column, column)
+		self._labels.append(label)
+		self._columns.append([None]*self.rowCount())
+		self.endInsertColumns()
+		return column
+
+	def ids(self)->List[str]:
+		return self._columns[0]
+
+	def value(self, row:int, label:str)->Any:
+		return self._columns[self.findColumn(label)][row]
+
+	def setValue(self, row:int, label:str, value:Any):
+		column = self.findColumn(label)
+		self._columns[column][row] = value
+		index = self.index(row, column)
+		self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
+	### Rows ###
+	def appendRows(self, rows:Sequence[Sequence[Any]]):
+		"""append rows with a single rowsInserted signal.
+		each row holds the values of the leading columns, the rest are None"""
+		if not rows:
+			return
+		first = self.rowCount()
+		self.beginInsertRows(QModelIndex(), first, first+len(rows)-1)
+		for column, values in enumerate(self._columns):
+			values.extend(row[column] if column < len(row) else None for row in rows)
+		self.endInsertRows()
+
+	def removeRowSet(self, rows:Iterable[int]):
+		"""remove rows with a single rowsRemoved signal.
+		scattered rows are moved to the end first, Qt would update
+		every persistent index after each removed range otherwise"""
+		rows = sorted(set(rows))
+		if not rows:
+			return
+		if rows[-1] - rows[0] + 1 != len(rows):
+			self._moveRowsToEnd(rows)
+			rows = list(range(self.rowCount()-len(rows), self.rowCount()))
+
+		first, last = rows[0], rows[-1]
+		self.beginRemoveRows(QModelIndex(), first, last)
+		for values in self._columns:
+			del values[first:last+1]
+		self.endRemoveRows()
+
+	def _moveRowsToEnd(self, rows:List[int]):
+		"""reorder as a layout change, keeping the order of the other rows"""
+		moved = set(rows)
+		order = [row for row in range(self.rowCount()) if row not in moved] + rows
+		new_rows = [0]*len(order)
+		for new_row, old_row in enumerate(order):
+			new_rows[old_row] = new_row
+
+		self.layoutAboutToBeChanged.emit()
+		self._columns = [[values[row] for row in order] for values in self._columns]
+		old_indexes = self.persistentIndexList()
+		self.changePersistentIndexList(old_indexes, [self.index(new_rows[index.row()], index.column()) for index in old_indexes])
+		self.layoutChanged.emit()
+
+
 class GraphModel(QObject):
+	"""a graph of nodes, inlets, outlets and edges, in four tables.
+
+	the tables are QAbstractTableModels, to be shown by views directly.
+	topology is kept in indexes by id, so relation lookups take O(1) or O(degree),
+	and the refs of the items are created once, and reused by lookups and signals."""
 	nodesAdded = Signal(list) #List[NodeRef]
 	nodesAboutToBeRemoved = Signal(list) #List[NodeRef]
-	nodesDataChanged = Signal(list, list) #List[NodeRef], List[NodeDataColumn]
+	nodesDataChanged = Signal(list, list) #List[NodeRef], List[NodeAttribute|str]
 
 	inletsAdded = Signal(list) #List[InletRef]
 	inletsAboutToBeRemoved = Signal(list) #List[InletRef]
-	inletsDataChanged = Signal(list, list) #List[InletRef], List[InletDataColumn]
+	inletsDataChanged = Signal(list, list) #List[InletRef], List[InletAttribute|str]
 
 	outletsAdded = Signal(list) #List[OutletIndex]
 	outletsAboutToBeRemoved = Signal(list) #List[OutletRef]
-	outletsDataChanged = Signal(list, list) #List[OutletRef], List[OutletDataColumn]
+	outletsDataChanged = Signal(list, list) #List[OutletRef], List[OutletAttribute|str]
 
 	edgesAdded = Signal(list) #List[EdgeRef]
 	edgesAboutToBeRemoved = Signal(list) #List[EdgeRef]
-	edgesDataChanged = Signal(list, list) #List[EdgeRef], List[EdgeDataColumn]
-
-	# class NodeDataColumn(IntEnum):
-	# 	Id = 0
-	# 	Name = 1
-	# 	LocationX = 2
-	# 	LocationY = 3
-	# 	User = 4
-
-	# class InletDataColumn(IntEnum):
-	# 	Id = 0
-	# 	Owner = 1
-	# 	Name = 2
-	# 	User = 3
-
-	# class OutletDataColumn(IntEnum):
-	# 	Id = 0
-	# 	Owner = 1
-	# 	Name = 2
-	# 	User = 3
-
-	# class EdgeDataColumn(IntEnum):
-	# 	Id = 0
-	# 	SourceOutlet =  1
-	# 	TargetInlet = 2
+	edgesDataChanged = Signal(list, list) #List[EdgeRef], List[EdgeAttribute|str]
 
 	def __init__(self, parent=None):
 		super().__init__(parent)
-		### CREATE QT MODELS ###
+		### CREATE TABLES ###
+		self._nodeTable = _ColumnTable(NodeAttribute, readonly=[NodeAttribute.Id])
+		self._inletTable = _ColumnTable(InletAttribute, readonly=[InletAttribute.Id, InletAttribute.Owner])
+		self._outletTable = _ColumnTable(OutletAttribute, readonly=[OutletAttribute.Id, OutletAttribute.Owner])
+		self._edgeTable = _ColumnTable(EdgeAttribute, readonly=EdgeAttribute)
+
+		### Refs by id ###
+		# persistent indexes, so they follow their rows when rows are removed
+		self._nodeRefs:Dict[str, NodeRef] = dict()
+		self._inletRefs:Dict[str, InletRef] = dict()
+		self._outletRefs:Dict[str, OutletRef] = dict()
+		self._edgeRefs:Dict[str, EdgeRef] = dict()
+
+		### Topology indexes ###
+		# ids by id, dicts are used as insertion ordered sets
+		self._nodeInlets:Dict[str, Dict[str, None]] = dict()
+		self._nodeOutlets:Dict[str, Dict[str, None]] = dict()
+		self._outletEdges:Dict[str, Dict[str, None]] = dict()
+		self._inletEdges:Dict[str, Dict[str, None]] = dict()
+
+		### Forward table signals ###
+		for table, refs, RefType, added, aboutToBeRemoved, dataChanged in [
+			(self._nodeTable,   self._nodeRefs,   NodeRef,   self.nodesAdded,   self.nodesAboutToBeRemoved,   self.nodesDataChanged),
+			(self._inletTable,  self._inletRefs,  InletRef,  self.inletsAdded,  self.inletsAboutToBeRemoved,  self.inletsDataChanged),
+			(self._outletTable, self._outletRefs, OutletRef, self.outletsAdded, self.outletsAboutToBeRemoved, self.outletsDataChanged),
+			(self._edgeTable,   self._edgeRefs,   EdgeRef,   self.edgesAdded,   self.edgesAboutToBeRemoved,   self.edgesDataChanged),
+		]:
+			self._forwardTableSignals(table, refs, RefType, added, aboutToBeRemoved, dataChanged)
+
+	def _forwardTableSignals(self, table:_ColumnTable, refs:Dict[str, Any], RefType:type, added:SignalInstance, aboutToBeRemoved:SignalInstance, dataChanged:SignalInstance):
+		def onRowsInserted(parent:QModelIndex, first:int, last:int):
+			ids = table.ids()
+			for row in range(first, last+1):
+				refs[ids[row]] = RefType(table.index(row, 0), self)
+			added.emit([refs[ids[row]] for row in range(first, last+1)])
+
+		def onRowsAboutToBeRemoved(parent:QModelIndex, first:int, last:int):
+			ids = table.ids()
+			aboutToBeRemoved.emit([refs[ids[row]] for row in range(first, last+1)])
+
+		def onDataChanged(topLeft:QModelIndex, bottomRight:QModelIndex, roles:List[int]):
+			ids = table.ids()
+			labels = table.labels()
+			dataChanged.emit(
+				[refs[ids[row]] for row in range(topLeft.row(), bottomRight.row()+1)],
+				[labels[column] for column in range(topLeft.column(), bottomRight.column()+1)]
+			)
 
-		### Nodes Model ###
-		self._nodeTable = QStandardItemModel()
+		table.rowsInserted.connect(onRowsInserted)
+		table.rowsAboutToBeRemoved.connect(onRowsAboutToBeRemoved)
+		table.dataChanged.connect(onDataChanged)
 
-		self._nodeTable.setHorizontalHeaderLabels([member.name for member in NodeAttribute])
-		self._nodeTable.rowsInserted.connect(lambda parent, first, last:
-			self.nodesAdded.emit([NodeRef(self._nodeTable.index(row, 0), self) for row in range(first, last+1)])
-		)
+	### Ids ###
+	@staticmethod
+	def _makeId(*existing:Container[str])->str:
+		while any((unique_id := unique.make_unique_id()) in ids for ids in existing):
+			pass
+		return unique_id
 
-		self._nodeTable.rowsAboutToBeRemoved.connect(lambda parent, first, last:
-			self.nodesAboutToBeRemoved.emit([NodeRef(self._nodeTable.index(row, 0), self) for row in range(first, last+1)])
-		)
+	def _nodeId(self, node:NodeRef)->str:
+		return self._nodeTable.ids()[node._index.row()]
 
-		self._nodeTable.dataChanged.connect(lambda topLeft, bottomRight, roles:
-			self.nodesDataChanged.emit(
-				[NodeRef(self._nodeTable.index(row, 0), self) for row in range(topLeft.row(), bottomRight.row()+1)],
-				None
-			)
-		)
-
-		### Inlets Model ###
-		self._inletTable = QStandardItemModel()
-		self._inletTable.setHorizontalHeaderLabels([member.name for member in InletAttribute])
-		self._inletTable.rowsInserted.connect(lambda parent, first, last:
-			self.inletsAdded.emit([InletRef(self._inletTable.index(row, 0), self) for row in range(first, last+1)])
-		)
-
-		self._inletTable.rowsAboutToBeRemoved.connect(lambda parent, first, last:
-			self.inletsAboutToBeRemoved.emit([InletRef(self._inletTable.index(row, 0), self) for row in range(first, last+1)])
-		)
-
-		self._inletTable.dataChanged.connect(lambda topLeft, bottomRight, roles:
-			self.inletsDataChanged.emit(
-				[InletRef(self._inletTable.index(row, 0), self) for row in range(topLeft.row(), bottomRight.row()+1)],
-				roles
-			)
-		)
-
-		### Outlets Model ###
-		self._outletTable = QStandardItemModel()
-		self._outletTable.setHorizontalHeaderLabels([member.name for member in OutletAttribute])
-		self._outletTable.rowsInserted.connect(lambda parent, first, last:
-			self.outletsAdded.emit([OutletRef(self._outletTable.index(row, 0), self) for row in range(first, last+1)])
-		)
-
-		self._outletTable.rowsAboutToBeRemoved.connect(lambda parent, first, last:
-			self.outletsAboutToBeRemoved.emit([OutletRef(self._outletTable.index(row, 0), self) for row in range(first, last+1)])
-		)
-
-		self._outletTable.dataChanged.connect(lambda topLeft, bottomRight, roles:
-			self.outletsDataChanged.emit(
-				[OutletRef(self._outletTable.index(row, 0), self) for row in range(topLeft.row(), bottomRight.row()+1)],
-				roles
-			)
-		)
-
-		### Edges Model ###
-		self._edgeTable = QStandardItemModel()
-		self._edgeTable.setHorizontalHeaderLabels([member.name for member in EdgeAttribute])
-		self._edgeTable.rowsInserted.connect(lambda parent, first, last:
-			self.edgesAdded.emit([EdgeRef(self._edgeTable.index(row, 0), self) for row in range(first, last+1)])
-		)
-
-		self._edgeTable.rowsAboutToBeRemoved.connect(lambda parent, first, last:
-			self.edgesAboutToBeRemoved.emit([EdgeRef(self._edgeTable.index(row, 0), self) for row in range(first, last+1)])
-		)
-
-		self._edgeTable.dataChanged.connect(lambda topLeft, bottomRight, roles:
-			self.edgesDataChanged.emit(
-				[EdgeRef(self._edgeTable.index(row, 0), self) for row in range(topLeft.row(), bottomRight.row()+1)],
-				roles
-			)
-		)
-		
+	def _inletId(self, inlet:InletRef)->str:
+		return self._inletTable.ids()[inlet._index.row()]
+
+	def _outletId(self, outlet:OutletRef)->str:
+		return self._outletTable.ids()[outlet._index.row()]
+
+	def _edgeId(self, edge:EdgeRef)->str:
+		return self._edgeTable.ids()[edge._index.row()]
+
+	### Items ###
 	def getNodes(self)->Iterable[NodeRef]:
-		for row in range(self._nodeTable.rowCount()):
-			yield NodeRef(self._nodeTable.index(row, 0), self)
+		for node_id in self._nodeTable.ids():
+			yield self._nodeRefs[node_id]
 
 	def getEdges(self)->Iterable[EdgeRef]:
-		for row in range(self._edgeTable.rowCount()):
-			yield EdgeRef(self._edgeTable.index(row, 0), self)
+		for edge_id in self._edgeTable.ids():
+			yield self._edgeRefs[edge_id]
 
 	def nodeCount(self)->int:
 		return self._nodeTable.rowCount()
@@ -283,358 +381,254 @@ class GraphModel(QObject):
 		return self._edgeTable.rowCount()
 
 	def addNode(self, name:str, posx:int, posy:int)->NodeRef:
-		if not isinstance(name, str):
-			raise TypeError(f"'name' must be s tring, got: '{name}'")
-		if not isinstance(posx, int) or not isinstance(posy, int):
-			raise TypeError(f"'posx and posy' must be s tring, got: '{posx}', '{posy}")
-
-		id_item   = QStandardItem()
-		id_item.setData(unique.make_unique_id(), Qt.ItemDataRole.DisplayRole)
-		name_item = QStandardItem()
-		name_item.setData(name, Qt.ItemDataRole.DisplayRole)
-		posx_item = QStandardItem()
-		posx_item.setData(int(posx), Qt.ItemDataRole.DisplayRole)
-		posy_item = QStandardItem()
-		posy_item.setData(int(posy), Qt.ItemDataRole.DisplayRole)
-
-		self._nodeTable.appendRow([id_item, name_item, posx_item, posy_item])
-
-		return NodeRef(self._nodeTable.indexFromItem(id_item), self)
+		return self.addNodes([(name, posx, posy)])[0]
+
+	def addNodes(self, nodes:Iterable[Tuple[str, int, int]])->List[NodeRef]:
+		"""add (name, posx, posy) nodes, with a single nodesAdded signal"""
+		rows = []
+		for name, posx, posy in nodes:
+			if not isinstance(name, str):
+				raise TypeError(f"'name' must be s tring, got: '{name}'")
+			if not isinstance(posx, int) or not isinstance(posy, int):
+				raise TypeError(f"'posx and posy' must be s tring, got: '{posx}', '{posy}")
+			node_id = self._makeId(self._nodeInlets)
+			self._nodeInlets[node_id] = dict()
+			self._nodeOutlets[node_id] = dict()
+			rows.append((node_id, name, int(posx), int(posy)))
+
+		self._nodeTable.appendRows(rows)
+		return [self._nodeRefs[row[0]] for row in rows]
 
 	def addInlet(self, node:NodeRef, name:str)->InletRef:
-		if not node.isValid():
-			raise ValueError(f"Node {node._index.data()}, does not exist!")
-
-		id_item    = QStandardItem()
-		id_item.setData(unique.make_unique_id(), Qt.ItemDataRole.DisplayRole)
-		owner_item = QStandardItem()
-		owner_item.setData(self._nodeTable.data(node._index, Qt.ItemDataRole.DisplayRole), Qt.ItemDataRole.DisplayRole)
-		name_item  = QStandardItem()
-		name_item.setData(name, Qt.ItemDataRole.DisplayRole)
-		
-		self._inletTable.appendRow([id_item, owner_item, name_item])
-		return InletRef(self._inletTable.indexFromItem(id_item), self)
+		return self.addInlets([(node, name)])[0]
+
+	def addInlets(self, inlets:Iterable[Tuple[NodeRef, str]])->List[InletRef]:
+		"""add (node, name) inlets, with a single inletsAdded signal"""
+		rows = []
+		for node, name in inlets:
+			if not node.isValid():
+				raise ValueError(f"Node {node._index.data()}, does not exist!")
+			node_id = self._nodeId(node)
+			inlet_id = self._makeId(self._inletEdges)
+			self._nodeInlets[node_id][inlet_id] = None
+			self._inletEdges[inlet_id] = dict()
+			rows.append((inlet_id, node_id, name))
+
+		self._inletTable.appendRows(rows)
+		return [self._inletRefs[row[0]] for row in rows]
 
 	def addOutlet(self, node:NodeRef, name:str)->OutletRef:
-		id_item    = QStandardItem()
-		id_item.setData(unique.make_unique_id(), Qt.ItemDataRole.DisplayRole)
-		owner_item = QStandardItem()
-		owner_item.setData(self._nodeTable.data(node._index, Qt.ItemDataRole.DisplayRole), Qt.ItemDataRole.DisplayRole)
-		name_item = QStandardItem()
-		name_item.setData(name, Qt.ItemDataRole.DisplayRole)
-		
-		self._outletTable.appendRow([id_item, owner_item, name_item])
-		return OutletRef(self._outletTable.indexFromItem(id_item), self)
+		return self.addOutlets([(node, name)])[0]
+
+	def addOutlets(self, outlets:Iterable[Tuple[NodeRef, str]])->List[OutletRef]:
+		"""add (node, name) outlets, with a single outletsAdded signal"""
+		rows = []
+		for node, name in outlets:
+			if not node.isValid():
+				raise ValueError(f"Node {node._index.data()}, does not exist!")
+			node_id = self._nodeId(node)
+			outlet_id = self._makeId(self._outletEdges)
+			self._nodeOutlets[node_id][outlet_id] = None
+			self._outletEdges[outlet_id] = dict()
+			rows.append((outlet_id, node_id, name))
+
+		self._outletTable.appendRows(rows)
+		return [self._outletRefs[row[0]] for row in rows]
 
 	def addEdge(self, outlet:OutletRef, inlet:InletRef)->EdgeRef:
-		if not outlet.isValid():
-			raise ValueError(f"outlet '{outlet}'' does not exist")
-		if not inlet.isValid():
-			raise ValueError(f"inlet {inlet} does not exist")
-
-		unique_id = unique.make_unique_id()
-		outlet_id = self._outletTable.data(outlet._index, Qt.ItemDataRole.DisplayRole)
-		inlet_id = self._inletTable.data(inlet._index, Qt.ItemDataRole.DisplayRole)
-		assert isinstance(outlet_id, str)
-		assert isinstance(inlet_id, str)
-		assert isinstance(unique_id, str)
-
-		id_item =        QStandardItem()
-		id_item.setData(unique_id, Qt.ItemDataRole.DisplayRole)
-		outlet_id_item = QStandardItem()
-		outlet_id_item.setData(outlet_id, Qt.ItemDataRole.DisplayRole)
-		inlet_id_item =  QStandardItem()
-
-		inlet_id_item.setData(inlet_id, Qt.ItemDataRole.DisplayRole)
-
-		self._edgeTable.appendRow([id_item, outlet_id_item, inlet_id_item])
-		return EdgeRef(self._edgeTable.indexFromItem(id_item), self)
+		return self.addEdges([(outlet, inlet)])[0]
+
+	def addEdges(self, edges:Iterable[Tuple[OutletRef, InletRef]])->List[EdgeRef]:
+		"""add (outlet, inlet) edges, with a single edgesAdded signal"""
+		rows = []
+		new_ids:Set[str] = set()
+		for outlet, inlet in edges:
+			if not outlet.isValid():
+				raise ValueError(f"outlet '{outlet}'' does not exist")
+			if not inlet.isValid():
+				raise ValueError(f"inlet {inlet} does not exist")
+			outlet_id = self._outletId(outlet)
+			inlet_id = self._inletId(inlet)
+			edge_id = self._makeId(self._edgeRefs, new_ids)
+			new_ids.add(edge_id)
+			self._outletEdges[outlet_id][edge_id] = None
+			self._inletEdges[inlet_id][edge_id] = None
+			rows.append((edge_id, outlet_id, inlet_id))
+
+		self._edgeTable.appendRows(rows)
+		return [self._edgeRefs[row[0]] for row in rows]
 
 	def removeNodes(self, nodes_to_remove:List[NodeRef]):
 		assert all( isinstance(node, NodeRef) for node in nodes_to_remove )
 		assert all( node.isValid() for node in nodes_to_remove )
 
-		# collect inlets to be removed
-		inlets_to_remove = []
-		for node in nodes_to_remove:
-			node_inlets = self.getNodeInlets(node)
-			inlets_to_remove+=node_inlets
-		self.removeInlets(inlets_to_remove)
-
-		outlets_to_remove = []
-		for node in nodes_to_remove:
-			node_outlets = self.getNodeOutlets(node)
-			outlets_to_remove+=node_outlets
-		self.removeOutlets(outlets_to_remove)
-
+		node_ids = {self._nodeId(node) for node in nodes_to_remove}
+		self.removeInlets([self._inletRefs[inlet_id] for node_id in node_ids for inlet_id in self._nodeInlets[node_id]])
+		self.removeOutlets([self._outletRefs[outlet_id] for node_id in node_ids for outlet_id in self._nodeOutlets[node_id]])
 
-		for node in sorted(nodes_to_remove, key=lambda node:node._index.row(), reverse=True):
-			self._nodeTable.removeRow(node._index.row())
+		self._nodeTable.removeRowSet(node._index.row() for node in nodes_to_remove)
+		for node_id in node_ids:
+			del self._nodeInlets[node_id]
+			del self._nodeOutlets[node_id]
+			del self._nodeRefs[node_id]
 
 	def removeOutlets(self, outlets_to_remove:List[OutletRef]):
-		# collect edges to be removed
 		assert all( isinstance(outlet, OutletRef) for outlet in outlets_to_remove )
+		assert all( outlet.isValid() for outlet in outlets_to_remove )
 
-		edges_to_remove = []
-		for outlet in outlets_to_remove:
-			outlet_edges = self.getOutletEdges(outlet)
-			edges_to_remove+=outlet_edges
-		self.removeEdges(edges_to_remove)
+		owners = {self._outletId(outlet): self._outletTable.value(outlet._index.row(), OutletAttribute.Owner) for outlet in outlets_to_remove}
+		self.removeEdges([self._edgeRefs[edge_id] for outlet_id in owners for edge_id in self._outletEdges[outlet_id]])
 
-		for outlet in sorted(outlets_to_remove, key=lambda outlet: outlet._index.row(), reverse=True):
-			self._outletTable.removeRow(outlet._index.row())
-
-	def getOutletEdges(self, outlet:OutletRef)->List[EdgeRef]:
-		assert isinstance(outlet, OutletRef) and outlet.isValid()
-		
-		outlet_id = self._outletTable.data(outlet._index)
-		connected_edges = [EdgeRef(idx.siblingAtColumn(0), self) for idx in self._edgeTable.match(
-			self._edgeTable.index(0, GraphModel.EdgeDataColumn.SourceOutlet), Qt.ItemDataRole.DisplayRole, outlet_id, 1, Qt.MatchFlag.MatchExactly
-		)]
-		return connected_edges
-
-	def getInletEdges(self, inlet:InletRef)->List[EdgeRef]:
-		assert isinstance(inlet, InletRef) and inlet.isValid()
-
-		inlet_id = self._inletTable.data(inlet._index)
-		connected_edges = [EdgeRef(idx.siblingAtColumn(0), self) for idx in self._edgeTable.match(
-			self._edgeTable.index(0, GraphModel.EdgeDataColumn.TargetInlet), Qt.ItemDataRole.DisplayRole, inlet_id, 1, Qt.MatchFlag.MatchExactly
-		)]
-		return connected_edges
-
-	def getOutletOwner(self, outlet: OutletRef)->NodeRef:
-		assert isinstance(outlet, OutletRef) and outlet.isValid()
-
-		node_id:str = self._outletTable.data(outlet._index.sibling(outlet._index.row(), GraphModel.OutletDataColumn.Owner), Qt.ItemDataRole.DisplayRole)
-		owner_nodes = [NodeRef(index, self) for index in self._nodeTable.match(
-			self._nodeTable.index(0, GraphModel.NodeDataColumn.Id), Qt.ItemDataRole.DisplayRole, node_id, 1, Qt.MatchFlag.MatchExactly
-		)]
-		assert len(owner_nodes)==1
-		return owner_nodes[0]
+		self._outletTable.removeRowSet(outlet._index.row() for outlet in outlets_to_remove)
+		for outlet_id, node_id in owners.items():
+			del self._nodeOutlets[node_id][outlet_id]
+			del self._outletEdges[outlet_id]
+			del self._outletRefs[outlet_id]
 
 	def removeInlets(self, inlets_to_remove:List[InletRef]):
-		# collect edges to be removed
 		assert all( isinstance(inlet, InletRef) for inlet in inlets_to_remove ), f"got: {inlets_to_remove}"
 		assert all( inlet.isValid() for inlet in inlets_to_remove)
 
-		edges_to_remove = []
-		for inlet in inlets_to_remove:
-			inlet_edges = self.getInletEdges(inlet)
-			edges_to_remove+=inlet_edges
-		self.removeEdges(edges_to_remove)
+		owners = {self._inletId(inlet): self._inletTable.value(inlet._index.row(), InletAttribute.Owner) for inlet in inlets_to_remove}
+		self.removeEdges([self._edgeRefs[edge_id] for inlet_id in owners for edge_id in self._inletEdges[inlet_id]])
 
-		for inlet in sorted(inlets_to_remove, key=lambda inlet: inlet._index.row(), reverse=True):
-			self._inletTable.removeRow(inlet._index.row())
+		self._inletTable.removeRowSet(inlet._index.row() for inlet in inlets_to_remove)
+		for inlet_id, node_id in owners.items():
+			del self._nodeInlets[node_id][inlet_id]
+			del self._inletEdges[inlet_id]
+			del self._inletRefs[inlet_id]
 
 	def removeEdges(self, edges_to_remove:List[EdgeRef]):
-		# Remove the rows from the GraphModel (starting from the last one, to avoid shifting indices)
 		assert all( isinstance(edge, EdgeRef) for edge in edges_to_remove )
-
-		for edge in sorted(edges_to_remove, key=lambda edge: edge._index.row(), reverse=True):
-			self._edgeTable.removeRow(edge._index.row())
+		assert all( edge.isValid() for edge in edges_to_remove )
+
+		endpoints = {self._edgeId(edge): (
+			self._edgeTable.value(edge._index.row(), EdgeAttribute.SourceOutlet),
+			self._edgeTable.value(edge._index.row(), EdgeAttribute.TargetInlet)
+		) for edge in edges_to_remove}
+		self._edgeTable.removeRowSet(edge._index.row() for edge in edges_to_remove)
+		for edge_id, (outlet_id, inlet_id) in endpoints.items():
+			del self._outletEdges[outlet_id][edge_id]
+			del self._inletEdges[inlet_id][edge_id]
+			del self._edgeRefs[edge_id]
+
+	### Data ###
+	def _getData(self, table:_ColumnTable, ref:NodeRef|InletRef|OutletRef|EdgeRef, attr:str)->Any:
+		"""raises KeyError for unknown attributes"""
+		return table.value(ref._index.row(), attr)
+
+	def _setData(self, table:_ColumnTable, ref:NodeRef|InletRef|OutletRef|EdgeRef, value:Any, attr:str):
+		"""set an attribute, unknown attributes are added as new columns"""
+		if table.isReadOnly(attr):
+			raise ValueError(f"'{attr}' is read only, it is kept by the graph")
+		if attr not in table.labels():
+			table.addColumn(attr)
+		table.setValue(ref._index.row(), attr, value)
 
 	def getNodeData(self, node:NodeRef, attr:NodeAttribute|str):
 		assert isinstance(node, NodeRef) and node.isValid(), f"got: {node}"
-
-		def findColumn(label)->int:
-			for column in range(self._nodeTable.columnCount()):
-				if self._nodeTable.horizontalHeaderItem(column).text() == label:
-					return column
-			raise KeyError(f"No '{label}' in node table")
-		
-		match attr:
-			case NodeAttribute.Id:
-				column = [self._nodeTable.horizontalHeaderItem(col).text() for col in range(self._nodeTable.columnCount())]
-				return self._nodeTable.data(node._index.sibling(node._index.row(), findColumn(NodeAttribute.Id)), Qt.ItemDataRole.DisplayRole)
-			case NodeAttribute.Name:
-				return self._nodeTable.data(node._index.sibling(node._index.row(), findColumn(NodeAttribute.Name)), Qt.ItemDataRole.DisplayRole)
-			case NodeAttribute.LocationX:
-				return self._nodeTable.data(node._index.sibling(node._index.row(), findColumn(NodeAttribute.LocationX)), Qt.ItemDataRole.DisplayRole)
-			case NodeAttribute.LocationY:
-				return self._nodeTable.data(node._index.sibling(node._index.row(), findColumn(NodeAttribute.LocationY)), Qt.ItemDataRole.DisplayRole)
-			case _:
-				column = findColumn(attr)
-				return self._nodeTable.data(node._index.sibling(node._index.row(), column), Qt.ItemDataRole.DisplayRole)
-
+		return self._getData(self._nodeTable, node, attr)
 
 	def setNodeData(self, node:NodeRef, value, attr:NodeAttribute|str):
 		assert isinstance(node, NodeRef) and node.isValid(), f"got: {node}"
-
-		def findColumn(label)->int:
-			for column in range(self._nodeTable.columnCount()):
-				if self._nodeTable.horizontalHeaderItem(column).text() == label:
-					return column
-			raise KeyError(f"No '{label}' in node table")
-
-		# self._nodeTable.blockSignals(True)
-		columnsChanged = []
 		match attr:
-			case NodeAttribute.Id: #id
-				assert isinstance(value, str)
-				self._nodeTable.setData(node._index.sibling(node._index.row(), findColumn(NodeAttribute.Id)), value, Qt.ItemDataRole.DisplayRole)
-			case NodeAttribute.Name: #name
+			case NodeAttribute.Name:
 				assert isinstance(value, str)
-				self._nodeTable.setData(node._index.sibling(node._index.row(), findColumn(NodeAttribute.Name)), value, Qt.ItemDataRole.DisplayRole)
-			case NodeAttribute.LocationX: #"posx":
-				assert isinstance(value, int)
-				self._nodeTable.setData(node._index.sibling(node._index.row(), findColumn(NodeAttribute.LocationX)), value, Qt.ItemDataRole.DisplayRole)
-			case NodeAttribute.LocationY: #"posy":
+			case NodeAttribute.LocationX | NodeAttribute.LocationY:
 				assert isinstance(value, int)
-				self._nodeTable.setData(node._index.sibling(node._index.row(), findColumn(NodeAttribute.LocationY)), value, Qt.ItemDataRole.DisplayRole)
-			case _:
-				column = findColumn(attr)
-				self._nodeTable.setData(node._index.sibling(node._index.row(), column), value, Qt.ItemDataRole.DisplayRole)
-
-
-		# self._nodeTable.blockSignals(False)
-		# for start, end in group_consecutive_numbers(columnsChanged):
-		# 	self._nodeTable.dataChanged.emit(node.siblingAtColumn(start), node.siblingAtColumn(end))
+		self._setData(self._nodeTable, node, value, attr)
 
-	def getInletData(self, inlet:InletRef, attr:InletAttribute):
+	def getInletData(self, inlet:InletRef, attr:InletAttribute|str):
 		assert isinstance(inlet, InletRef) and inlet.isValid()
+		return self._getData(self._inletTable, inlet, attr)
 
-		match attr:
-			case InletAttribute.Id: #Id:
-				return self._inletTable.data(inlet._index.sibling(inlet._index.row(), GraphModel.InletDataColumn.Id))
-			case InletAttribute.Name: #Name
-				return self._inletTable.data(inlet._index.sibling(inlet._index.row(), GraphModel.InletDataColumn.Name))
-			case _:
-				raise ValueError(f"cant get attribute for inlet: attribute column {attr} does not exist")
-
-	def setInletData(self, inlet: InletRef, value, attr:InletAttribute):
+	def setInletData(self, inlet: InletRef, value, attr:InletAttribute|str):
 		assert isinstance(inlet, InletRef) and inlet.isValid()
+		self._setData(self._inletTable, inlet, value, attr)
 
-		match attr:
-			case InletAttribute.Id: #Id:
-				self._inletTable.setData(inlet._index.sibling(inlet._index.row(), GraphModel.InletDataColumn.Id), value, Qt.ItemDataRole.DisplayRole)
-			case InletAttribute.Name: #Name
-				self._inletTable.setData(inlet._index.sibling(inlet._index.row(), GraphModel.InletDataColumn.Name), value, Qt.ItemDataRole.DisplayRole)
-			case _:
-				raise ValueError(f"cant set attribute for inlet: attribute column {attr} does not exist")
-
-	def getOutletData(self, outlet:OutletRef, attr:OutletAttribute):
+	def getOutletData(self, outlet:OutletRef, attr:OutletAttribute|str):
 		assert isinstance(outlet, OutletRef) and outlet.isValid()
+		return self._getData(self._outletTable, outlet, attr)
 
-		match attr:
-			case OutletAttribute.Id: #Id
-				return self._outletTable.data(outlet._index.sibling(outlet._index.row(), GraphModel.OutletDataColumn.Id), Qt.ItemDataRole.DisplayRole)
-			case OutletAttribute.Name: #Name:
-				return self._outletTable.data(outlet._index.sibling(outlet._index.row(), GraphModel.OutletDataColumn.Name), Qt.ItemDataRole.DisplayRole)
-			case _:
-				raise ValueError(f"cant get attribute for outlet: attribute column {attr} does not exist")
-
-	def setOutletData(self, outlet: OutletRef, value, attr:OutletAttribute):
+	def setOutletData(self, outlet: OutletRef, value, attr:OutletAttribute|str):
 		assert isinstance(outlet, OutletRef) and outlet.isValid()
+		self._setData(self._outletTable, outlet, value, attr)
 
-		match attr:
-			case OutletAttribute.Id: #Id
-				self._outletTable.setData(outlet._index.sibling(outlet._index.row(), GraphModel.OutletDataColumn.Id), value, Qt.ItemDataRole.DisplayRole)
-			case OutletAttribute.Name: #Name
-				self._outletTable.setData(outlet._index.sibling(outlet._index.row(), GraphModel.OutletDataColumn.Name), value, Qt.ItemDataRole.DisplayRole)
-			case _:
-				raise ValueError(f"cant get attribute for outlet: attribute column {attr} does not exist")
+	def getEdgeData(self, edge:EdgeRef, attr:EdgeAttribute|str):
+		assert isinstance(edge, EdgeRef) and edge.isValid()
+		return self._getData(self._edgeTable, edge, attr)
 
-	def getEdgeData(self, edge:EdgeRef, attr:EdgeAttribute):
-		assert isinstance(edge, EdgeRef)
+	def setEdgeData(self, edge:EdgeRef, value, attr:EdgeAttribute|str):
+		"""the endpoints are set with setEdgeSource and setEdgeTarget"""
+		assert isinstance(edge, EdgeRef) and edge.isValid()
+		self._setData(self._edgeTable, edge, value, attr)
 
-		match attr:
-			case GraphModel.EdgeDataColumn.Id: #Id
-				return self._edgeTable.data(edge._index.sibling(edge._index.row(), GraphModel.EdgeDataColumn.Id), Qt.ItemDataRole.DisplayRole)
-			case _:
-				raise ValueError(f"cant get attribute for edge: attribute column {attr} does not exist")
+	def setEdgeSource(self, edge:EdgeRef, outlet:OutletRef):
+		assert isinstance(edge, EdgeRef) and edge.isValid()
+		assert isinstance(outlet, OutletRef) and outlet.isValid()
 
-	def setEdgeData(self, edge:EdgeRef, value, attr:EdgeAttribute):
-		assert isinstance(edge, EdgeRef)
+		edge_id, outlet_id = self._edgeId(edge), self._outletId(outlet)
+		del self._outletEdges[self._edgeTable.value(edge._index.row(), EdgeAttribute.SourceOutlet)][edge_id]
+		self._outletEdges[outlet_id][edge_id] = None
+		self._edgeTable.setValue(edge._index.row(), EdgeAttribute.SourceOutlet, outlet_id)
 
-		match attr:
-			case EdgeAttribute.Id: #Id
-				if not isinstance(value, str):
-					raise ValueError(f"id must be a string, got: {value}")
-				return self._edgeTable.setData(edge._index.sibling(edge._index.row(), GraphModel.EdgeDataColumn.Id), value, Qt.ItemDataRole.DisplayRole)
-			case _:
-				raise ValueError(f"cant set attribute for edge: attribute column {attr} does not exist")
+	def setEdgeTarget(self, edge:EdgeRef, inlet:InletRef):
+		assert isinstance(edge, EdgeRef) and edge.isValid()
+		assert isinstance(inlet, InletRef) and inlet.isValid()
 
-	def getNodeInlets(self, node:NodeRef)->List[InletRef]:
-		assert isinstance(node, NodeRef)
+		edge_id, inlet_id = self._edgeId(edge), self._inletId(inlet)
+		del self._inletEdges[self._edgeTable.value(edge._index.row(), EdgeAttribute.TargetInlet)][edge_id]
+		self._inletEdges[inlet_id][edge_id] = None
+		self._edgeTable.setValue(edge._index.row(), EdgeAttribute.TargetInlet, inlet_id)
 
-		node_id = self._nodeTable.data(node._index.sibling(node._index.row(), GraphModel.NodeDataColumn.Id))
-		inlets = [InletRef(idx.siblingAtColumn(0), self) for idx in self._inletTable.match(
-			self._inletTable.index(0, GraphModel.InletDataColumn.Owner), Qt.ItemDataRole.DisplayRole, node_id, 1, Qt.MatchFlag.MatchExactly
-		)]
-		return inlets
+	### Relations ###
+	def getNodeInlets(self, node:NodeRef)->List[InletRef]:
+		assert isinstance(node, NodeRef) and node.isValid()
+		return [self._inletRefs[inlet_id] for inlet_id in self._nodeInlets[self._nodeId(node)]]
 
 	def getNodeOutlets(self, node:NodeRef)->List[OutletRef]:
-		assert isinstance(node, NodeRef)
+		assert isinstance(node, NodeRef) and node.isValid()
+		return [self._outletRefs[outlet_id] for outlet_id in self._nodeOutlets[self._nodeId(node)]]
+
+	def getInletEdges(self, inlet:InletRef)->List[EdgeRef]:
+		assert isinstance(inlet, InletRef) and inlet.isValid()
+		return [self._edgeRefs[edge_id] for edge_id in self._inletEdges[self._inletId(inlet)]]
 
-		node_id = self._nodeTable.data(node._index.sibling(node._index.row(), GraphModel.NodeDataColumn.Id))
-		outlets = [OutletRef(idx.siblingAtColumn(GraphModel.OutletDataColumn.Id), self) for idx in self._outletTable.match(
-			self._outletTable.index(0, GraphModel.OutletDataColumn.Owner), Qt.ItemDataRole.DisplayRole, node_id, 1, Qt.MatchFlag.MatchExactly
-		)]
-		return outlets
+	def getOutletEdges(self, outlet:OutletRef)->List[EdgeRef]:
+		assert isinstance(outlet, OutletRef) and outlet.isValid()
+		return [self._edgeRefs[edge_id] for edge_id in self._outletEdges[self._outletId(outlet)]]
 
 	def getInletOwner(self, inlet:InletRef)->NodeRef:
 		assert isinstance(inlet, InletRef) and inlet.isValid()
+		return self._nodeRefs[self._inletTable.value(inlet._index.row(), InletAttribute.Owner)]
 
-		node_id:str = self._inletTable.data(inlet._index.sibling(inlet._index.row(), GraphModel.InletDataColumn.Owner), Qt.ItemDataRole.DisplayRole)
-		owner_nodes = [NodeRef(idx.siblingAtColumn(GraphModel.NodeDataColumn.Id), self) for idx in self._nodeTable.match(
-			self._nodeTable.index(0, GraphModel.NodeDataColumn.Id), Qt.ItemDataRole.DisplayRole, node_id, 1, Qt.MatchFlag.MatchExactly
-		)]
-		assert len(owner_nodes)==1
-		return owner_nodes[0]
+	def getOutletOwner(self, outlet: OutletRef)->NodeRef:
+		assert isinstance(outlet, OutletRef) and outlet.isValid()
+		return self._nodeRefs[self._outletTable.value(outlet._index.row(), OutletAttribute.Owner)]
 
 	def getEdgeSource(self, edge: EdgeRef)->OutletRef:
-		assert isinstance(edge, EdgeRef)
-
-		outlet_id:str = self._edgeTable.data(edge._index.sibling(edge._index.row(), GraphModel.EdgeDataColumn.SourceOutlet))
-		source_outlets = [OutletRef(idx.siblingAtColumn(GraphModel.OutletDataColumn.Id), self) for idx in self._outletTable.match(
-			self._outletTable.index(0, GraphModel.OutletDataColumn.Id), Qt.ItemDataRole.DisplayRole, outlet_id, 1, Qt.MatchFlag.MatchExactly
-		)]
-		assert len(source_outlets) == 1
-		return source_outlets[0]
+		assert isinstance(edge, EdgeRef) and edge.isValid()
+		return self._outletRefs[self._edgeTable.value(edge._index.row(), EdgeAttribute.SourceOutlet)]
 
 	def getEdgeTarget(self, edge:EdgeRef)->InletRef:
-		assert isinstance(edge, EdgeRef)
-
-		inlet_id:str = self._edgeTable.data(edge._index.sibling(edge._index.row(), GraphModel.EdgeDataColumn.TargetInlet), Qt.ItemDataRole.DisplayRole)
-		assert isinstance(inlet_id, str), f"got: {inlet_id}"
-		target_inlets = [InletRef(idx.siblingAtColumn(GraphModel.InletDataColumn.Id), self) for idx in self._inletTable.match(
-			self._inletTable.index(0, GraphModel.InletDataColumn.Id), Qt.ItemDataRole.DisplayRole, inlet_id, 1, Qt.MatchFlag.MatchExactly
-		)]
-		assert len(target_inlets) == 1
-		return target_inlets[0]
-
-	def getSourceNodes(self, node:NodeRef):
-		assert isinstance(node, NodeRef)
-		assert node._index.model() == self._nodeTable
-		assert node._index.column() == 0
-
-		inlets = self.getNodeInlets(node)
-		for inlet in inlets:
-			for edge in self.getInletEdges(inlet):
-				outlet = self.getEdgeSource(edge)
-				yield self.getOutletOwner(outlet)
+		assert isinstance(edge, EdgeRef) and edge.isValid()
+		return self._inletRefs[self._edgeTable.value(edge._index.row(), EdgeAttribute.TargetInlet)]
 
-	def getTargetNodes(self, node:NodeRef):
-		assert isinstance(node, NodeRef)
-		assert node._index.model() == self._nodeTable
-		assert node._index.column() == GraphModel.NodeDataColumn.Id
+	def getSourceNodes(self, node:NodeRef)->Iterable[NodeRef]:
+		for inlet in self.getNodeInlets(node):
+			for edge in self.getInletEdges(inlet):
+				yield self.getOutletOwner(self.getEdgeSource(edge))
 
-		outlets = self.getNodeOutlets(node)
-		for outlet in outlets:
+	def getTargetNodes(self, node:NodeRef)->Iterable[NodeRef]:
+		for outlet in self.getNodeOutlets(node):
 			for edge in self.getOutletEdges(outlet):
-				inlet = self.getEdgeTarget(edge)
-				yield self.getInletOwner(inlet)
+				yield self.getInletOwner(self.getEdgeTarget(edge))
 
 	def rootRodes(self)->Iterable[NodeRef]:
-		"""Yield all root nodes (nodes without outlets) in the graph."""
-		def hasTargets(node:NodeRef):
-			assert isinstance(node, NodeRef)
-			assert node.isValid()
-			return len(list(self.getTargetNodes(node))) > 0
-		
-		for node in self.getNodes():
-			if not hasTargets(node):
-				yield node
+		"""Yield all root nodes (nodes without targets) in the graph."""
+		for node_id in self._nodeTable.ids():
+			if not any(self._outletEdges[outlet_id] for outlet_id in self._nodeOutlets[node_id]):
+				yield self._nodeRefs[node_id]
 
 	def dfs(self)->Iterable[NodeRef]:
 		"""Perform DFS starting from the root nodes and yield each node."""
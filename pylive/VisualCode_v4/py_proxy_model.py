@@ -8,6 +8,7 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 from pylive.utils import group_consecutive_numbers
+from pylive.utils.bilist import bilist
 
 from pylive.VisualCode_v4.py_data_model import PyDataModel
 
@@ -17,7 +18,7 @@ class PyProxyNodeModel(QAbstractItemModel):
     _headers = ['name', 'source', 'inlets', 'result']
     def __init__(self, source_model:PyDataModel, parent:QObject|None=None):
         super().__init__(parent=parent)
-        self._nodes:list[str] = list()
+        self._nodes:bilist[str] = bilist() # O(log n) row <-> node lookup
         self._source_model:PyDataModel|None=None
 
         self.setSourceModel(source_model)
@@ -58,8 +59,7 @@ class PyProxyNodeModel(QAbstractItemModel):
         assert self._source_model
         self.beginResetModel()
         self._nodes.clear()
-        for row, node in enumerate(self._source_model.nodes()):
-            self._nodes.insert(row, node)
+        self._nodes.extend(self._source_model.nodes())
 
         self.modelReset.emit()
         self.endResetModel()
@@ -72,26 +72,23 @@ class PyProxyNodeModel(QAbstractItemModel):
     def _on_source_nodes_added(self, nodes:list[str]):
         first = len(self._nodes)
         last = first+len(nodes)-1
-        for row, node in enumerate(nodes, start=first):
-            self._nodes.insert(row, node)
+        self._nodes.extend(nodes)
         self.rowsInserted.emit(QModelIndex(), first, last)
 
     def _on_source_nodes_about_to_be_removed(self, nodes:list[str]):
-        indexes = [self.mapFromSource(node) for node in nodes]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for r in reversed(ranges):
+        for r in reversed(self._rowRanges(nodes)):
             self.rowsAboutToBeRemoved.emit(QModelIndex(), r.start, r.stop-1)
 
     def _on_source_nodes_removed(self, nodes:list[str]):
-        indexes = [self.mapFromSource(node) for node in nodes]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for range_group in reversed(ranges):
-            for row in reversed(range_group):
-                del self._nodes[row]
+        for range_group in reversed(self._rowRanges(nodes)):
+            del self._nodes[range_group.start:range_group.stop]
             self.rowsRemoved.emit(QModelIndex(), range_group.start, range_group.stop-1)
 
+    def _rowRanges(self, nodes:Iterable[str])->list[range]:
+        """consecutive rows of nodes, so batches are signaled as ranges"""
+        rows = sorted(set(self._nodes.index(node) for node in nodes))
+        return list(group_consecutive_numbers(rows))
+
     # Proxy functions
     def mapFromSource(self, node:str)->QModelIndex:
         row = self._nodes.index(node)
@@ -111,9 +108,6 @@ class PyProxyNodeModel(QAbstractItemModel):
 
         item_selection = QItemSelection()
         for r in ranges:
-            r.start
-            r.stop
-
             selection_range = QItemSelectionRange(
                 self.index(r.start, 0), 
                 self.index(r.stop-1, self.columnCount()-1)
@@ -200,7 +194,7 @@ from pylive.VisualCode_v4.graph_editor.graph_data_roles import GraphDataRole
 class PyProxyLinkModel(QAbstractItemModel):
     def __init__(self, source_model:PyDataModel, parent:QObject|None=None):
         super().__init__(parent=parent)
-        self._links:list[tuple[str, str, str, str]] = list()
+        self._links:bilist[tuple[str, str, str, str]] = bilist() # O(log n) row <-> link lookup
 
         self._items_model:PyProxyNodeModel|None=None
         self._source_model:PyDataModel|None=None
@@ -242,8 +236,7 @@ class PyProxyLinkModel(QAbstractItemModel):
         assert self._source_model
         self.beginResetModel()
         self._links.clear()
-        for row, link in enumerate(self._source_model.links()):
-            self._links.insert(row, link)
+        self._links.extend(self._source_model.links())
         self.endResetModel()
 
     def _on_source_nodes_about_to_be_linked(self, links:list[tuple[str,str,str,str]]):
@@ -254,26 +247,23 @@ class PyProxyLinkModel(QAbstractItemModel):
     def _on_source_nodes_linked(self, links:list[tuple[str,str,str,str]]):
         first = len(self._links)
         last = first+len(links)-1
-        for row, link in enumerate(links, start=first):
-            self._links.insert(row, link)
+        self._links.extend(links)
         self.rowsInserted.emit(QModelIndex(), first, last)
 
     def _on_source_nodes_about_to_be_unlinked(self, links:list[tuple[str,str,str,str]]):
-        indexes = [self.mapFromSource(link) for link in links]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for r in reversed(ranges):
+        for r in reversed(self._rowRanges(links)):
             self.rowsAboutToBeRemoved.emit(QModelIndex(), r.start, r.stop-1)
 
     def _on_source_nodes_unlinked(self, links:list[tuple[str,str,str,str]]):
-        indexes = [self.mapFromSource(link) for link in links]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for range_group in reversed(ranges):
-            for row in reversed(range_group):
-                del self._links[row]
+        for range_group in reversed(self._rowRanges(links)):
+            del self._links[range_group.start:range_group.stop]
             self.rowsRemoved.emit(QModelIndex(), range_group.start, range_group.stop-1)
 
+    def _rowRanges(self, links:Iterable[tuple[str,str,str,str]])->list[range]:
+        """consecutive rows of links, so batches are signaled as ranges"""
+        rows = sorted(set(self._links.index(link) for link in links))
+        return list(group_consecutive_numbers(rows))
+
     # Proxy functions
     def mapFromSource(self, link:tuple[str,str,str,str])->QModelIndex:
         row = self._links.index(link)
@@ -289,12 +279,9 @@ class PyProxyLinkModel(QAbstractItemModel):
 
         item_selection = QItemSelection()
         for r in ranges:
-            r.start
-            r.stop
-
             selection_range = QItemSelectionRange(
                 self.index(r.start, 0), 
-                self.index(r.stop, self.columnCount()-1)
+                self.index(r.stop-1, self.columnCount()-1)
             )
 
             item_selection.append(selection_range)
@@ -6,12 +6,13 @@ from PySide6.QtWidgets import *
 
 from pylive.VisualCode_v5.py_graph_model import PyGraphModel
 from pylive.utils import group_consecutive_numbers
+from pylive.utils.bilist import bilist
 
 
 class PyProxyLinkModel(QAbstractItemModel):
     def __init__(self, source_model:PyGraphModel, parent:QObject|None=None):
         super().__init__(parent=parent)
-        self._links:list[tuple[str, str, str, str]] = list()
+        self._links:bilist[tuple[str, str, str, str]] = bilist() # O(log n) row <-> link lookup
         self._source_model:PyGraphModel|None=None
 
         self._model_connections = []
@@ -43,8 +44,7 @@ class PyProxyLinkModel(QAbstractItemModel):
         assert self._source_model
         self.beginResetModel()
         self._links.clear()
-        for row, link in enumerate(self._source_model.links()):
-            self._links.insert(row, link)
+        self._links.extend(self._source_model.links())
         self.endResetModel()
 
     def _on_source_nodes_about_to_be_linked(self, links:list[tuple[str,str,str,str]]):
@@ -55,26 +55,23 @@ class PyProxyLinkModel(QAbstractItemModel):
     def _on_source_nodes_linked(self, links:list[tuple[str,str,str,str]]):
         first = len(self._links)
         last = first+len(links)-1
-        for row, link in enumerate(links, start=first):
-            self._links.insert(row, link)
+        self._links.extend(links)
         self.rowsInserted.emit(QModelIndex(), first, last)
 
     def _on_source_nodes_about_to_be_unlinked(self, links:list[tuple[str,str,str,str]]):
-        indexes = [self.mapFromSource(link) for link in links]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for r in reversed(ranges):
+        for r in reversed(self._rowRanges(links)):
             self.rowsAboutToBeRemoved.emit(QModelIndex(), r.start, r.stop-1)
 
     def _on_source_nodes_unlinked(self, links:list[tuple[str,str,str,str]]):
-        indexes = [self.mapFromSource(link) for link in links]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for range_group in reversed(ranges):
-            for row in reversed(range_group):
-                del self._links[row]
+        for range_group in reversed(self._rowRanges(links)):
+            del self._links[range_group.start:range_group.stop]
             self.rowsRemoved.emit(QModelIndex(), range_group.start, range_group.stop-1)
 
+    def _rowRanges(self, links:Iterable[tuple[str,str,str,str]])->list[range]:
+        """consecutive rows of links, so batches are signaled as ranges"""
+        rows = sorted(set(self._links.index(link) for link in links))
+        return list(group_consecutive_numbers(rows))
+
     # Proxy functions
     def mapFromSource(self, link:tuple[str,str,str,str])->QModelIndex:
         row = self._links.index(link)
@@ -90,12 +87,9 @@ class PyProxyLinkModel(QAbstractItemModel):
 
         item_selection = QItemSelection()
         for r in ranges:
-            r.start
-            r.stop
-
             selection_range = QItemSelectionRange(
                 self.index(r.start, 0), 
-                self.index(r.stop, self.columnCount()-1)
+                self.index(r.stop-1, self.columnCount()-1)
             )
 
             item_selection.append(selection_range)
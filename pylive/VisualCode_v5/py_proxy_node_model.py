@@ -6,13 +6,14 @@ from PySide6.QtWidgets import *
 
 from pylive.VisualCode_v5.py_graph_model import PyGraphModel
 from pylive.utils import group_consecutive_numbers
+from pylive.utils.bilist import bilist
 
 
 class PyProxyNodeModel(QAbstractItemModel):
     _headers = ['name', 'inlets', 'outlets', 'source', 'result']
     def __init__(self, source_model:PyGraphModel, parent:QObject|None=None):
         super().__init__(parent=parent)
-        self._nodes:list[str] = list()
+        self._nodes:bilist[str] = bilist() # O(log n) row <-> node lookup
         self._source_model:PyGraphModel|None=None
 
         self._connections = []
@@ -63,8 +64,7 @@ class PyProxyNodeModel(QAbstractItemModel):
         assert self._source_model
         self.beginResetModel()
         self._nodes.clear()
-        for row, node in enumerate(self._source_model.nodes()):
-            self._nodes.insert(row, node)
+        self._nodes.extend(self._source_model.nodes())
 
         self.modelReset.emit()
         self.endResetModel()
@@ -77,26 +77,23 @@ class PyProxyNodeModel(QAbstractItemModel):
     def _on_source_nodes_added(self, nodes:list[str]):
         first = len(self._nodes)
         last = first+len(nodes)-1
-        for row, node in enumerate(nodes, start=first):
-            self._nodes.insert(row, node)
+        self._nodes.extend(nodes)
         self.rowsInserted.emit(QModelIndex(), first, last)
 
     def _on_source_nodes_about_to_be_removed(self, nodes:list[str]):
-        indexes = [self.mapFromSource(node) for node in nodes]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for r in reversed(ranges):
+        for r in reversed(self._rowRanges(nodes)):
             self.rowsAboutToBeRemoved.emit(QModelIndex(), r.start, r.stop-1)
 
     def _on_source_nodes_removed(self, nodes:list[str]):
-        indexes = [self.mapFromSource(node) for node in nodes]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for range_group in reversed(ranges):
-            for row in reversed(range_group):
-                del self._nodes[row]
+        for range_group in reversed(self._rowRanges(nodes)):
+            del self._nodes[range_group.start:range_group.stop]
             self.rowsRemoved.emit(QModelIndex(), range_group.start, range_group.stop-1)
 
+    def _rowRanges(self, nodes:Iterable[str])->list[range]:
+        """consecutive rows of nodes, so batches are signaled as ranges"""
+        rows = sorted(set(self._nodes.index(node) for node in nodes))
+        return list(group_consecutive_numbers(rows))
+
     # Proxy functions
     def mapFromSource(self, node:str)->QModelIndex:
         row = self._nodes.index(node)
@@ -116,9 +113,6 @@ class PyProxyNodeModel(QAbstractItemModel):
 
         item_selection = QItemSelection()
         for r in ranges:
-            r.start
-            r.stop
-
             selection_range = QItemSelectionRange(
                 self.index(r.start, 0), 
                 self.index(r.stop-1, self.columnCount()-1)
@@ -0,0 +1,130 @@
+"""
+Pan and zoom benchmark for PyGraphView.
+
+Builds a large graph, then scripts a pan/zoom session over it,
+and a drag of a node selection,
+repainting the viewport on every step, and reports the frames per second.
+
+Usage:
+    python -m pylive.VisualCode_v6.benchmark_py_graph_view [--nodes 10000] [--drag 50] [--no-lod]
+"""
+
+from typing import *
+import sys
+import time
+import math
+import argparse
+from collections import defaultdict
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+from pylive.VisualCode_v6.py_graph_model import PyGraphModel
+from pylive.VisualCode_v6.py_graph_view import PyGraphView
+from pylive.qt_components.lod_graphicsview import levelOfDetailForScale
+
+
+def make_graph(count:int)->PyGraphModel:
+    """a forest of small trees: two constants feeding into a sum"""
+    nodes = []
+    links = []
+    for i in range(count):
+        if i % 3 == 2:
+            nodes.append({'name': f"node{i}", 'kind': 'expression', 'content': "a+b"})
+            links.append({'source': f"node{i-2}", 'target': f"node{i}", 'inlet': 'a'})
+            links.append({'source': f"node{i-1}", 'target': f"node{i}", 'inlet': 'b'})
+        else:
+            nodes.append({'name': f"node{i}", 'kind': 'expression', 'content': f"{i}"})
+
+    return PyGraphModel.fromData({'nodes': nodes, 'links': links})
+
+
+def grid_layout(view:PyGraphView, spacing:QSizeF=QSizeF(160, 90)):
+    """spread the nodes on a grid, each tree in its own column"""
+    columns = int(math.sqrt(len(view._node_widgets)))
+    for i, node_widget in enumerate(view._node_widgets.values()):
+        row, column = divmod(i, columns)
+        node_widget.setPos(column * spacing.width(), row * spacing.height())
+
+
+def pan_and_zoom_session(steps:int)->Iterable[tuple[float, QPointF]]:
+    """yield (zoom, scene center) for each frame:
+    zoom out over the whole graph, pan across at mid zoom, then zoom into detail"""
+    for i in range(steps):
+        t = i / max(1, steps-1)
+        zoom = 0.05 + 1.45 * (0.5 - 0.5 * math.cos(t * 2 * math.pi))
+        pan = QPointF(math.sin(t * 2 * math.pi) * 2000, math.cos(t * 2 * math.pi) * 1000)
+        yield zoom, pan
+
+
+def run(view:PyGraphView, steps:int)->dict[str, float]:
+    """replay the session, and return the frames per second for each level of detail"""
+    app = QApplication.instance()
+    assert app
+    center = view.scene().itemsBoundingRect().center()
+    frame_times:dict[str, list[float]] = defaultdict(list)
+    for zoom, pan in pan_and_zoom_session(steps):
+        start = time.perf_counter()
+        view.setTransform(QTransform.fromScale(zoom, zoom))
+        view.centerOn(center + pan)
+        view.viewport().repaint()
+        app.processEvents()
+        tier = levelOfDetailForScale(zoom).name if view.isLevelOfDetailEnabled() else "Full"
+        frame_times[tier].append(time.perf_counter() - start)
+        frame_times['total'].append(time.perf_counter() - start)
+
+    return {tier: len(times) / sum(times) for tier, times in frame_times.items()}
+
+
+def drag(view:PyGraphView, count:int, steps:int)->float:
+    """move a selection of nodes like a mouse drag does, and return the frames per second"""
+    app = QApplication.instance()
+    assert app
+    node_widgets = list(view._node_widgets.values())[:count]
+    for node_widget in node_widgets:
+        node_widget.setSelected(True)
+    view.setTransform(QTransform())
+    view.centerOn(node_widgets[0])
+
+    start = time.perf_counter()
+    for i in range(steps):
+        offset = QPointF(math.cos(i / 10) * 4, math.sin(i / 10) * 4)
+        for node_widget in node_widgets:
+            node_widget.moveBy(offset.x(), offset.y())
+        app.processEvents()
+        view.viewport().repaint()
+    return steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PyGraphView pan and zoom benchmark")
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--drag", type=int, default=50, help="number of selected nodes to drag")
+    parser.add_argument("--no-lod", action='store_true', help="disable level of detail rendering")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    start = time.perf_counter()
+    model = make_graph(args.nodes)
+    view = PyGraphView()
+    view.setLevelOfDetailEnabled(not args.no_lod)
+    view.resize(1280, 720)
+    view.show()
+    view.setModel(model)
+    grid_layout(view)
+    app.processEvents()
+    print(f"populate {args.nodes} nodes: {time.perf_counter()-start:.2f}s")
+
+    run(view, args.steps) # warm up: evaluate nodes as they come into view
+    for tier, fps in run(view, args.steps).items():
+        print(f"pan and zoom ({'no lod' if args.no_lod else 'lod'}) {tier}: {fps:.1f} fps")
+
+    fps = drag(view, args.drag, args.steps)
+    print(f"drag {args.drag} nodes: {fps:.1f} fps")
+
+
+if __name__ == "__main__":
+    main()
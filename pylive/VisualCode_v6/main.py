@@ -494,9 +494,8 @@ class MainWindow(QWidget):
 
         # delete selected nodes
         node_indexes:list[QModelIndex] = self.node_selection_model.selectedRows(column=0)
-        for node_index in sorted(node_indexes, key=lambda idx:idx.row(), reverse=True):
-            node = self.node_proxy_model.mapToSource(node_index)
-            self._model.removeNode(node)
+        nodes = [self.node_proxy_model.mapToSource(node_index) for node_index in node_indexes]
+        self._model.removeNodes(nodes)
 
     def connect_nodes(self, source:str, target:str, inlet:str):
         assert self._model
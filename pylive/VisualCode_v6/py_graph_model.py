@@ -4,11 +4,11 @@ from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
-from pylive.VisualCode_v4._ARCHIVE import node_tree_model
 from pylive.VisualCode_v5.abstract_graph_model import AbstractGraphModel
 from pylive.utils.evaluate_python import call_function_with_named_args, compile_python_function
 import inspect
-import networkx as nx
+from pylive.utils.lazy_import import lazy_import
+nx = lazy_import("networkx") # loaded on the first graph query
 from pathlib import Path
 
 import logging
@@ -18,7 +18,8 @@ logger = logging.getLogger(__name__)
 
 from pylive.VisualCode_v6.py_import_model import PyImportsModel
 from pylive.utils.evaluate_python import find_unbounded_names
-import pydoc
+from pylive.utils.unique import NameRegistry
+pydoc = lazy_import("pydoc")
 
 KindType = Literal["operator", 'value-int', 'value-float', 'value-str', 'value-path', 'expression']
 
@@ -45,6 +46,8 @@ class GraphMimeData(StrEnum):
 
 import importlib
 import importlib.util
+import ast
+import sys
 _NodeKey = str
 class PyGraphModel(QObject):
     modelAboutToBeReset = Signal()
@@ -84,6 +87,7 @@ class PyGraphModel(QObject):
         """
 
         self._node_data:OrderedDict[str, _PyGraphItem] = OrderedDict()
+        self._node_names = NameRegistry() # the names of _node_data
         self._compile_cache:dict[str, Callable] = dict()
         self._result_cache:dict[str, Any] = dict()
 
@@ -92,6 +96,8 @@ class PyGraphModel(QObject):
         self._imports: list[str] = []
         self._context:dict[str, ModuleType] = {'__builtins__': __builtins__}
 
+        self._module_imports:dict[str, set[str]] = dict() # module -> imported modules
+        self._module_paths:dict[str, str] = dict() # file path -> module name
         self._module_watcher = QFileSystemWatcher()
         self.module_watcher_connections = []
 
@@ -104,50 +110,160 @@ class PyGraphModel(QObject):
         return [_ for _ in self._imports]
 
     def restartKernel(self):
-        import traceback
-
         context:dict[str, ModuleType] = {
             '__builtins__': __builtins__
         }
 
-        for module_name in self._imports:
-            # try:
-            import os
-            from pathlib import Path
-            cwd = Path.cwd()
-            try:
-                spec = importlib.util.spec_from_file_location(module_name, cwd/f"{module_name}.py")
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-            except FileNotFoundError:
-                module = importlib.import_module(module_name)
-
-            context[module_name] = module
+        self._module_imports = self._parseModuleImports(self._imports)
+        for module_name in self._moduleLoadOrder(self._imports):
+            context[module_name] = self._loadModule(module_name)
 
         self._context = context
+        self._compile_cache.clear()
+        self._watchModules()
 
+        node_keys = [_ for _ in self.nodes()]
+        self.invalidate(node_keys)
+
+    def reloadModules(self, module_names:Iterable[str]):
+        """reload the given modules and every module importing them,
+        then invalidate only the nodes bound to the reloaded modules
+        (and their descendants)
+        """
+        affected = self._moduleDependents(module_names)
+        if not affected:
+            return
+
+        # imports might have changed with the edit
+        self._module_imports.update(self._parseModuleImports(affected))
+        for module_name in self._moduleLoadOrder(affected):
+            try:
+                self._context[module_name] = self._loadModule(module_name)
+            except Exception as err:
+                logger.warning(f"failed to reload module '{module_name}': {err}")
+
+        bound_nodes = [node for node in self.nodes() if self.nodeModules(node) & affected]
+        for node in bound_nodes:
+            if node in self._compile_cache:
+                del self._compile_cache[node]
+        if bound_nodes:
+            self.invalidate(bound_nodes)
+
+    def nodeModules(self, node:str)->set[str]:
+        """the imported modules the node resolves its names from"""
+        node_item = self._node_data[node]
+        match node_item.kind:
+            case 'operator' | 'expression':
+                assert isinstance(node_item.content, str)
+                try:
+                    names = find_unbounded_names(node_item.content)
+                except SyntaxError:
+                    return set()
+                return {name for name in names if name in self._imports}
+            case _:
+                return set()
+
+    def _loadModule(self, module_name:str)->ModuleType:
+        cwd = Path.cwd()
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, cwd/f"{module_name}.py")
+            assert spec and spec.loader
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except FileNotFoundError:
+            module = importlib.import_module(module_name)
+        else:
+            # register the fresh module, so dependents loaded after
+            # it import this version instead of a stale one
+            sys.modules[module_name] = module
+        return module
+
+    def _parseModuleImports(self, module_names:Iterable[str])->dict[str, set[str]]:
+        """map each local module to the imported modules it imports"""
+        module_imports:dict[str, set[str]] = dict()
+        for module_name in module_names:
+            module_imports[module_name] = set()
+            try:
+                source = (Path.cwd()/f"{module_name}.py").read_text()
+                tree = ast.parse(source)
+            except (OSError, SyntaxError):
+                continue
+
+            for node in ast.walk(tree):
+                match node:
+                    case ast.Import():
+                        names = [alias.name for alias in node.names]
+                    case ast.ImportFrom(level=0) if node.module:
+                        names = [node.module]
+                    case _:
+                        continue
+                for name in names:
+                    root = name.split(".")[0]
+                    if root in self._imports and root != module_name:
+                        module_imports[module_name].add(root)
+        return module_imports
+
+    def _moduleDependents(self, module_names:Iterable[str])->set[str]:
+        """the modules and all modules importing them, transitively"""
+        affected = set()
+        stack = [name for name in module_names if name in self._imports]
+        while stack:
+            module_name = stack.pop()
+            if module_name in affected:
+                continue
+            affected.add(module_name)
+            for importer, imported in self._module_imports.items():
+                if module_name in imported:
+                    stack.append(importer)
+        return affected
+
+    def _moduleLoadOrder(self, module_names:Iterable[str])->list[str]:
+        """sort modules so that imported modules load before their importers"""
+        module_names = [name for name in self._imports if name in set(module_names)]
+        G = nx.DiGraph()
+        G.add_nodes_from(module_names)
+        for importer in module_names:
+            for imported in self._module_imports.get(importer, set()):
+                if imported in G:
+                    G.add_edge(imported, importer)
+        try:
+            return list(nx.lexicographical_topological_sort(G, key=module_names.index))
+        except nx.NetworkXUnfeasible:
+            # circular imports, keep the import order
+            return module_names
+
+    def _watchModules(self):
         if self._module_watcher:
             for signal, slot in self.module_watcher_connections:
                 signal.disconnect(slot)
 
+        self._module_paths = dict()
         module_watcher = QFileSystemWatcher()
-        for name, module in context.items():
-            if isinstance(module, ModuleType) and module.__file__:
-                module_watcher.addPath(module.__file__)
-
-        if module_watcher:
-            self.module_watcher_connections = [
-                (module_watcher.fileChanged, lambda: 
-                    self.invalidate([_ for _ in self.nodes()])) #TODO: invalidate only nodes from this module
-            ]
-            for signal, slot in self.module_watcher_connections:
-                signal.connect(slot)
+        for name, module in self._context.items():
+            if isinstance(module, ModuleType) and getattr(module, '__file__', None):
+                path = str(Path(module.__file__).resolve())
+                self._module_paths[path] = name
+                module_watcher.addPath(path)
+
+        self.module_watcher_connections = [
+            (module_watcher.fileChanged, self._onModuleFileChanged)
+        ]
+        for signal, slot in self.module_watcher_connections:
+            signal.connect(slot)
 
         self._module_watcher = module_watcher
 
-        node_keys = [_ for _ in self.nodes()]
-        # TODO invalidate effected nodes only!
-        self.invalidate(node_keys)
+    def _onModuleFileChanged(self, path:str):
+        path = str(Path(path).resolve())
+        module_name = self._module_paths.get(path)
+        if not module_name:
+            return
+
+        # editors saving by replacing the file drop it from the watcher
+        if Path(path).exists() and path not in self._module_watcher.files():
+            self._module_watcher.addPath(path)
+
+        self.reloadModules([module_name])
 
     ### Graph imlpementation
     def nodes(self)->Collection[str]:
@@ -281,24 +397,42 @@ class PyGraphModel(QObject):
     def outlets(self, node:str)->Collection[str]:
         return ['out']
 
+    def uniqueNodeName(self, name:str)->str:
+        """name, or name numbered so no node has it yet"""
+        return self._node_names.unique(name)
+
     def addNode(self, name:str, data:str, kind:Literal['operator', 'value-int', 'value-float', 'value-str', 'value-path', 'expression']='operator'):
         if name in self._node_data:
             raise ValueError("nodes must have a unique name")
         self.nodesAboutToBeAdded.emit([name])
         self._node_data[name] = _PyGraphItem(self, data, kind)
+        self._node_names.reserve(name)
         self.nodesAdded.emit([name])
 
     def removeNode(self, name:str):
-        ### remove links
-        for source, target, outlet, inlet in self.inLinks(name):
-            self.unlinkNodes(source, target, outlet, inlet)
-        for source, target, outlet, inlet in self.outLinks(name):
-            self.unlinkNodes(source, target, outlet, inlet)
-        ### remove parameters
+        self.removeNodes([name])
+
+    def removeNodes(self, names:Iterable[str]):
+        """remove nodes with their links. the nodes and the links are each signaled as a single batch"""
+        names = list(names)
+        removed = set(names)
 
-        self.nodesAboutToBeRemoved.emit([name])
-        del self._node_data[name]
-        self.nodesRemoved.emit([name])
+        ### remove links
+        links = [link for link in self._links if link[0] in removed or link[1] in removed]
+        if links:
+            self.nodesAboutToBeUnlinked.emit(links)
+            self._links.difference_update(links)
+            self.nodesUnlinked.emit(links)
+            targets = list({target for source, target, outlet, inlet in links if target not in removed})
+            if targets:
+                self.invalidate(targets)
+                self.dataChanged.emit(targets, ['result'])
+
+        self.nodesAboutToBeRemoved.emit(names)
+        for name in names:
+            del self._node_data[name]
+            self._node_names.release(name)
+        self.nodesRemoved.emit(names)
 
     def linkNodes(self, source:str, target:str, outlet:str, inlet:str):
         # if source not in self._nodes.keys():
@@ -434,6 +568,7 @@ class PyGraphModel(QObject):
         adn all of their dependents
         """
         assert isinstance(nodes, list)
+        G = self._toNetworkX() # build the graph once, not for each node
         for node in nodes:  # this will rigger multiple times for when multiple nodes invalidated at  once: handle overlapping depednencies
             self.inletsReset.emit([node])
             self.outletsReset.emit([node])
@@ -442,10 +577,11 @@ class PyGraphModel(QObject):
             ## invalidate node and dependent cache
             if node in self._result_cache:
                 del self._result_cache[node]
-            dependents = [_ for _ in self.descendants(node)]
+            dependents = [_ for _ in nx.descendants(G, node)]
 
             for dep in dependents:
-                del self._result_cache[dep]
+                if dep in self._result_cache:
+                    del self._result_cache[dep]
 
             self.dataChanged.emit([node] + dependents, ['result'])
 
@@ -508,7 +644,7 @@ class PyGraphModel(QObject):
                 return False
 
     ### Helpers
-    def _toNetworkX(self)->nx.MultiDiGraph:
+    def _toNetworkX(self)->'nx.MultiDiGraph':
         G = nx.MultiDiGraph()
         for node, item in self._node_data.items():
             G.add_node(node, item=item)
@@ -530,6 +666,7 @@ class PyGraphModel(QObject):
         for node_data in data['nodes']:
             node_item = _PyGraphItem(graph, node_data['content'], node_data['kind'])
             graph._node_data[node_data['name']] = node_item
+        graph._node_names = NameRegistry(graph._node_data.keys())
 
         for link_data in data['links']:
             edge_entry = link_data['source'], link_data['target'], 'out', link_data['inlet']
@@ -24,21 +24,19 @@ from bidict import bidict
 
 from pylive.utils.geo import makeLineBetweenShapes, makeLineToShape
 from pylive.utils.qt import distribute_items_horizontal
-from pylive.utils.unique import make_unique_name
 from pylive.utils.diff import diff_set
+from pylive.utils.layered_layout import LayeredLayout
+from pylive.qt_components.lod_graphicsview import LODGraphicsView, LevelOfDetail
 
 import logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-from pylive.VisualCode_v6.py_graph_model import PyGraphModel
+from pylive.VisualCode_v6.py_graph_model import PyGraphModel, GraphMimeData
 from pylive.utils.evaluate_python import get_function_name
 
 
-from py_graph_model import GraphMimeData
-
-
-class PyGraphView(QGraphicsView):
+class PyGraphView(LODGraphicsView):
     nodesLinked = Signal(QModelIndex, QModelIndex, str, str)
 
     def __init__(self, parent:QWidget|None=None):
@@ -52,6 +50,22 @@ class PyGraphView(QGraphicsView):
         self._link_widgets:bidict[tuple[str,str,str,str], LinkItem] = bidict()
         self._draft_link:QGraphicsLineItem|None=None
 
+        # offscreen nodes are not updated until they scroll into view
+        self._stale_node_items:set[str] = set()
+        self._defer_node_updates = False
+
+        # links attached to each node, to find the links to move without scanning the model
+        self._node_links:defaultdict[str, set[tuple[str,str,str,str]]] = defaultdict(set)
+        # link geometry is recomputed once per event loop iteration, for all the links moved since
+        self._dirty_links:set[tuple[str,str,str,str]] = set()
+        self._link_update_timer = QTimer(self)
+        self._link_update_timer.setSingleShot(True)
+        self._link_update_timer.setInterval(0)
+        self._link_update_timer.timeout.connect(self.updateDirtyLinkItems)
+
+        # keeps the last layout, so laying out again only lays out the parts of the graph that changed
+        self._layered_layout = LayeredLayout(node_spacing=20)
+
         # self._node_in_links:defaultdict[QPersistentModelIndex, list[QPersistentModelIndex]] = defaultdict(list) # Notes: store attached links, because the underlzing model has to find the relevant edges  and thats is O(n)
         # self._node_out_links:defaultdict[QPersistentModelIndex, list[QPersistentModelIndex]] = defaultdict(list) # Notes: store attached links, because the underlzing model has to find the relevant edges  and thats is O(n)
 
@@ -59,15 +73,13 @@ class PyGraphView(QGraphicsView):
 
     def setupUI(self):
         self.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
-        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheNone)
-        self.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        self.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
-        self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
 
         scene = QGraphicsScene()
-        scene.setSceneRect(QRectF(-9999,-9999,9999*2, 9999*2))
         self.setScene(scene)
 
+        self.levelOfDetailChanged.connect(self.setNodeItemsLevelOfDetail)
+        self.visibleSceneRectChanged.connect(lambda rect: self.refreshStaleNodeItems())
+
     def setModel(self, model:PyGraphModel|None):
         if self._model:
             for signal, slot in self._model_connections:
@@ -129,8 +141,14 @@ class PyGraphView(QGraphicsView):
         self.scene().clear()
         self._node_widgets.clear()
         self._link_widgets.clear()
+        self._stale_node_items.clear()
+        self._node_links.clear()
+        self._dirty_links.clear()
+        self._layered_layout.clear()
 
         ## populate
+        # nodes are laid out at the end, dont evaluate them until then
+        self._defer_node_updates = True
         ### nodes
         self.addNodeItems(self._model.nodes())
 
@@ -147,7 +165,9 @@ class PyGraphView(QGraphicsView):
         self.addLinkItems(link_keys)
 
         ## layout
-        self.layoutNodes()        
+        self.layoutNodes()
+        self._defer_node_updates = False
+        self.refreshStaleNodeItems()
 
     ### Node
     def addNodeItems(self, node_keys:Iterable[str]):
@@ -156,8 +176,9 @@ class PyGraphView(QGraphicsView):
             if node_key not in self._node_widgets:
                 node_widget = NodeItem(model=self._model, key=node_key)
                 self._node_widgets[node_key] = node_widget
-                self.scene().addItem(node_widget)
                 node_widget._view = self
+                node_widget.setLevelOfDetail(self.levelOfDetail())
+                self.scene().addItem(node_widget)
 
                 self.updateNodeItems([node_key])
                 self.resetInletItems([node_key])
@@ -172,7 +193,15 @@ class PyGraphView(QGraphicsView):
         assert all(key in self._node_widgets for key in node_keys), "{node_keys} some keys are not in graph"
         for node_key in node_keys:
             node_widget = self._node_widgets[node_key]
-            
+            label_text = self._model.data(node_key, 'label')
+            node_widget.setHeaderText(label_text)
+
+            # skip evaluating offscreen nodes, until they scroll into view
+            if self._defer_node_updates or not self.isItemVisible(node_widget):
+                self._stale_node_items.add(node_key)
+                continue
+
+            self._stale_node_items.discard(node_key)
             error, value = self._model.data(node_key, 'result')
             node_widget.debug.setHtml(dedent(f"""\
             <div>
@@ -180,15 +209,34 @@ class PyGraphView(QGraphicsView):
                 {f"<p style='margin:0; color: green'>😀" if error is None else ""}
             </div>
             """))
-            assert self._model
-            label_text = self._model.data(node_key, 'label')
-            node_widget.setHeaderText(label_text)
+
+    def refreshStaleNodeItems(self):
+        """update the stale node items that are visible"""
+        if self._defer_node_updates or not self._stale_node_items:
+            return
+        # ask the scene index for the visible items, instead of testing every stale node
+        visible_nodes = [
+            item.key for item in self.scene().items(self.visibleSceneRect())
+            if isinstance(item, NodeItem) and item.key in self._stale_node_items
+        ]
+        if visible_nodes:
+            self.updateNodeItems(visible_nodes)
+
+    def setNodeItemsLevelOfDetail(self, level:LevelOfDetail):
+        """nodes and links paint at the view's level of detail"""
+        for node_widget in self._node_widgets.values():
+            node_widget.setLevelOfDetail(level)
+        for link_widget in self._link_widgets.values():
+            link_widget.setLevelOfDetail(level)
 
     def removeNodeItems(self, node_keys:list[str]):
         for key in node_keys:
             if key in self._node_widgets:
                 node_widget = self._node_widgets[key]
                 del self._node_widgets[key]
+                self._stale_node_items.discard(key)
+                if key in self._node_links:
+                    del self._node_links[key]
                 self.scene().removeItem(node_widget)
 
     def nodeItem(self, node:str)->'NodeItem':
@@ -267,10 +315,12 @@ class PyGraphView(QGraphicsView):
                 node_widget._inlet_widgets[key] = widget
                 widget.setY(node_widget.boundingRect().top()-widget.boundingRect().bottom())
                 widget.setParentItem(node_widget)
+                widget.setVisible(node_widget.levelOfDetail() == LevelOfDetail.Full)
                 self.updateInletItems(node_key, [key])
             else:
                 self.updateInletItems(node_key, [key])
         distribute_items_horizontal([_ for _ in node_widget._inlet_widgets.values()], node_widget.boundingRect())
+        self.scheduleNodeLinksUpdate(node_key)
 
     def insertOutletItems(self, node_key:str, index:int, outlet_keys:Iterable[str]):
         """insert outlet item for keys.
@@ -286,11 +336,13 @@ class PyGraphView(QGraphicsView):
                 node_widget._outlet_widgets[key] = widget
                 widget.setY(node_widget.boundingRect().bottom()-widget.boundingRect().top())
                 widget.setParentItem(node_widget)
+                widget.setVisible(node_widget.levelOfDetail() == LevelOfDetail.Full)
                 widget._view = self
                 self.updateOutletItems(node_key, [key])
             else:
                 self.updateOutletItems(node_key, [key])
         distribute_items_horizontal([_ for _ in node_widget._outlet_widgets.values()], node_widget.boundingRect())
+        self.scheduleNodeLinksUpdate(node_key)
 
     def updateInletItems(self, node_key:str, inlet_keys:Iterable[str], hints=[]):
         """update inlet item for keys.
@@ -365,21 +417,35 @@ class PyGraphView(QGraphicsView):
             self._link_widgets[link_key] = link_widget
             self.scene().addItem(link_widget)
             link_widget._view = self
-            link_widget.move()
+            link_widget.setLevelOfDetail(self.levelOfDetail())
+            self._node_links[source_key].add(link_key)
+            self._node_links[target_key].add(link_key)
+            self._dirty_links.add(link_key)
+
+        if self._dirty_links:
+            self._link_update_timer.start()
 
     def updateLinkItems(self, link_keys:Iterable[tuple[str,str,str,str]], hint=None):
         """update link items.
         raise an exception if linkitem does not exist """
         assert all(key in self._link_widgets for key in link_keys), "link item does not exist"
         for link_key in link_keys:
-            source_key, target_key, outlet_key, inlet_key = link_key
-            link_widget = self._link_widgets[link_key]
-            source_port_item = self._node_widgets[source_key]._outlet_widgets[outlet_key]
-            target_port_item = self._node_widgets[target_key]._inlet_widgets[inlet_key]
-
-            from pylive.utils.geo import makeLineBetweenShapes
-            line = makeLineBetweenShapes(source_port_item, target_port_item)
-            link_widget.setLine(line)
+            self._dirty_links.discard(link_key)
+            self._link_widgets[link_key].move()
+
+    def scheduleNodeLinksUpdate(self, node_key:str):
+        """mark the links attached to the node to be moved.
+        Dragging a selection moves every port of every node,
+        the links are then moved once, when control returns to the event loop"""
+        if links := self._node_links.get(node_key):
+            self._dirty_links.update(links)
+            if not self._link_update_timer.isActive():
+                self._link_update_timer.start()
+
+    def updateDirtyLinkItems(self):
+        dirty_links = [link_key for link_key in self._dirty_links if link_key in self._link_widgets]
+        self._dirty_links.clear()
+        self.updateLinkItems(dirty_links)
 
     def removeLinkItems(self, link_keys:Iterable[tuple[str,str,str,str]]):
         """remove link items.
@@ -389,6 +455,12 @@ class PyGraphView(QGraphicsView):
             source, target, outlet, inlet = link_key
             link_widget = self._link_widgets[link_key]
             del self._link_widgets[link_key]
+            # the node may be removed already, do not create its entry again
+            if links := self._node_links.get(source):
+                links.discard(link_key)
+            if links := self._node_links.get(target):
+                links.discard(link_key)
+            self._dirty_links.discard(link_key)
             self.scene().removeItem(link_widget)
     
     ### DRAG links and ports
@@ -412,18 +484,22 @@ class PyGraphView(QGraphicsView):
 
     def layoutNodes(self, orientation=Qt.Orientation.Vertical, scale=100):
         assert self._model, f"bad _model, got: {self._model}"
-        # from pylive.utils.graph import hiearchical_layout_with_nx, hiearchical_layout_with_grandalf
-        import networkx as nx
         G = self._model._toNetworkX()
-        layers = {layer:nodes for layer, nodes in enumerate(nx.topological_generations(G))}
-        pos = nx.multipartite_layout(G, 
-            subset_key=layers, 
-            align='horizontal' if Qt.Orientation.Vertical else 'vertical', 
-            scale=100)
+        # layers run top to bottom, or left to right. size is the node extent across the layers
+        if orientation == Qt.Orientation.Vertical:
+            sizes = {node_key: self._node_widgets[node_key].boundingRect().width() for node_key in G.nodes}
+        else:
+            sizes = {node_key: self._node_widgets[node_key].boundingRect().height() for node_key in G.nodes}
+        self._layered_layout.layer_spacing = scale
+        pos = self._layered_layout.update(G, sizes)
 
         for node_key, (x, y) in pos.items():
             if node_widget := self._node_widgets[node_key]:
-                node_widget.setPos(x, y)
+                x -= sizes[node_key] / 2 # x is the node center
+                if orientation == Qt.Orientation.Vertical:
+                    node_widget.setPos(x, y)
+                else:
+                    node_widget.setPos(y, x)
 
     ### Selection
     def selectedNodes(self)->list[str]:
@@ -529,7 +605,8 @@ class PortItem(QGraphicsItem):
         self.setAcceptHoverEvents(True)
         r = 3
         # self.setGeometry(QRectF(-r,-r,r*2,r*2))
-        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsScenePositionChanges, True)
+        # Note: ports dont send scene position changes, the node item moves the links.
+        # Notifying every port of a dragged selection is costly.
         self._view:PyGraphView|None = None
 
     def hoverEnterEvent(self, event: QGraphicsSceneHoverEvent) -> None:
@@ -540,20 +617,10 @@ class PortItem(QGraphicsItem):
         self._label.hide()
         super().hoverLeaveEvent(event)
 
-    def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any) -> Any:
-        if change == QGraphicsItem.GraphicsItemChange.ItemScenePositionHasChanged:
-            assert self._view
-            assert self._view._model
-            node_widget = self.parentItem()
-            assert isinstance(node_widget, NodeItem)
-            inlink_keys = self._view._model.inLinks(node_widget.key)
-            outlink_keys = self._view._model.outLinks(node_widget.key)
-            link_keys = list(chain(inlink_keys, outlink_keys))
-
-            for link_key in link_keys:
-                if link_item := self._view._link_widgets.get(link_key):
-                    link_item.move()
-        return super().itemChange(change, value)
+    def sceneShapeRect(self)->QRectF:
+        """the port shape bounds in scene coordinates.
+        links are routed to this rect analytically, instead of intersecting painter paths"""
+        return self.mapRectToScene(self.shape().boundingRect())
 
     def boundingRect(self) -> QRectF:
         r = 3
@@ -583,6 +650,9 @@ class InletItem(PortItem):
         self.model = model
         self.node = node
         self.key = key
+        # cache model queries used while painting, updated on refresh
+        self._flags:set[str] = set()
+        self._is_linked:bool = False
 
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent) -> None:
         # Setup new drag
@@ -686,7 +756,7 @@ class InletItem(PortItem):
         return super().dragMoveEvent(event)
 
     def boundingRect(self) -> QRectF:
-        flags = self.model.inletFlags(self.node, self.key)
+        flags = self._flags
         r = 3
         if 'multi' in flags:
             return QRectF(-r,-r, r*4, r*2).adjusted(-3,-3,3,3)
@@ -694,7 +764,7 @@ class InletItem(PortItem):
             return QRectF(-r,-r,r*2,r*2).adjusted(-3,-3,3,3)
 
     def shape(self):
-        flags = self.model.inletFlags(self.node, self.key)
+        flags = self._flags
         path = QPainterPath()
         r = 3
         if 'multi' in flags:
@@ -705,7 +775,7 @@ class InletItem(PortItem):
         return path
 
     def paint(self, painter:QPainter, option:QStyleOption, widget:QWidget|None=None):
-        flags = self.model.inletFlags(self.node, self.key)
+        flags = self._flags
         palette = widget.palette() if widget else QApplication.palette()
         painter.setPen(Qt.PenStyle.NoPen)
         painter.setBrush(palette.text())
@@ -714,7 +784,7 @@ class InletItem(PortItem):
         if QStyle.StateFlag.State_MouseOver in option.state:
             painter.setBrush(palette.accent())
 
-        if 'required' in flags and not self.model.isInletLinked(self.node, self.key):
+        if 'required' in flags and not self._is_linked:
             painter.setBrush(QBrush("red"))
 
         r = 3
@@ -732,6 +802,12 @@ class InletItem(PortItem):
     def refresh(self):
         self._label.setPlainText(f"{self.key}")
         self.prepareGeometryChange()
+        try:
+            self._flags = self.model.inletFlags(self.node, self.key)
+        except AssertionError:
+            # inlet does not exist on the node, it is only shown for a dangling link
+            self._flags = set()
+        self._is_linked = self.model.isInletLinked(self.node, self.key)
         self.update()
 
 
@@ -840,6 +916,8 @@ class NodeItem(QGraphicsWidget):
         self.model = model
         self.key:str = key
         self._header_text = f"{self.key}"
+        self._bounding_rect:QRectF|None = None
+        self._level_of_detail = LevelOfDetail.Full
 
         self._inlet_widgets:bidict[str, InletItem] = bidict()
         self._outlet_widgets:bidict[str, OutletItem] = bidict()
@@ -854,15 +932,51 @@ class NodeItem(QGraphicsWidget):
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsScenePositionChanges, True)
 
+    def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any) -> Any:
+        if change == QGraphicsItem.GraphicsItemChange.ItemScenePositionHasChanged and self._view:
+            self._view.scheduleNodeLinksUpdate(self.key)
+        return super().itemChange(change, value)
+
     def headerText(self)->str:
         return self._header_text
 
     def setHeaderText(self, text:str):
         # print("set header text", text)
+        if text == self._header_text:
+            return
         self._header_text = text
         self.prepareGeometryChange()
+        self._bounding_rect = None
+        if self._level_of_detail == LevelOfDetail.Outline:
+            self.setLevelOfDetail(self._level_of_detail) # resize the cache
         self.update()
 
+    def levelOfDetail(self)->LevelOfDetail:
+        return self._level_of_detail
+
+    def setLevelOfDetail(self, level:LevelOfDetail):
+        """Zoomed out, draw a plain rect without text or ports.
+        At mid zoom, draw from a cached pixmap without ports.
+        Cached items are painted by Qt without calling back into python."""
+        self._level_of_detail = level
+        self.debug.setVisible(level > LevelOfDetail.Outline)
+        for port in chain(self._inlet_widgets.values(), self._outlet_widgets.values()):
+            port.setVisible(level == LevelOfDetail.Full)
+
+        match level:
+            case LevelOfDetail.Outline:
+                # render the cache at a fraction of the size, so paint draws the outline
+                rect = self.boundingRect()
+                size = QSize(max(1, int(rect.width()/4)), max(1, int(rect.height()/4)))
+                self.setCacheMode(QGraphicsItem.CacheMode.ItemCoordinateCache, size)
+                self.debug.setCacheMode(QGraphicsItem.CacheMode.NoCache)
+            case LevelOfDetail.Cached:
+                self.setCacheMode(QGraphicsItem.CacheMode.ItemCoordinateCache)
+                self.debug.setCacheMode(QGraphicsItem.CacheMode.ItemCoordinateCache)
+            case LevelOfDetail.Full:
+                self.setCacheMode(QGraphicsItem.CacheMode.NoCache)
+                self.debug.setCacheMode(QGraphicsItem.CacheMode.NoCache)
+
     def font(self):
         if widget:=self.parentWidget():
             return widget.font()
@@ -891,9 +1005,11 @@ class NodeItem(QGraphicsWidget):
 
     def boundingRect(self) -> QRectF:
         # return QRectF(0,0,80,16)
-        fm = QFontMetrics(self.font())
-        bbox = fm.boundingRect(f"{self._header_text}")
-        return bbox.adjusted(-6,-2,6,2)
+        if self._bounding_rect is None:
+            fm = QFontMetrics(self.font())
+            bbox = fm.boundingRect(f"{self._header_text}")
+            self._bounding_rect = QRectF(bbox.adjusted(-6,-2,6,2))
+        return self._bounding_rect
 
     def shape(self)->QPainterPath:
         path = QPainterPath()
@@ -908,6 +1024,10 @@ class NodeItem(QGraphicsWidget):
             pen.setBrush(self.palette().accent())
         painter.setPen(pen)
 
+        if self._level_of_detail == LevelOfDetail.Outline:
+            painter.fillRect(rect, pen.brush())
+            return
+
         painter.drawRoundedRect(rect, 6,6)
         painter.drawText(rect, f"{self._header_text}", QTextOption(Qt.AlignmentFlag.AlignCenter))
 
@@ -922,6 +1042,15 @@ class LinkItem(QGraphicsLineItem):
 
         self.setAcceptHoverEvents(True)
         self._view:PyGraphView|None = None
+        self._level_of_detail = LevelOfDetail.Full
+
+    def levelOfDetail(self)->LevelOfDetail:
+        return self._level_of_detail
+
+    def setLevelOfDetail(self, level:LevelOfDetail):
+        """highlight on hover only at full detail"""
+        self._level_of_detail = level
+        self.setAcceptHoverEvents(level == LevelOfDetail.Full)
 
     def move(self):
         assert self._view
@@ -929,7 +1058,7 @@ class LinkItem(QGraphicsLineItem):
         source = self._view._node_widgets[source]._outlet_widgets[outlet]
         target = self._view._node_widgets[target]._inlet_widgets[inlet]
 
-        self.setLine( makeLineBetweenShapes(source, target) )
+        self.setLine( makeLineBetweenShapes(source.sceneShapeRect(), target.sceneShapeRect()) )
 
     def palette(self)->QPalette:
         if widget:=self.parentWidget():
@@ -985,9 +1114,11 @@ class LinkItem(QGraphicsLineItem):
         ...
             
     def paint(self, painter:QPainter, option:QStyleOption, widget:QWidget|None=None):
-        painter.setPen( QPen(self.palette().text(), 1) )
-        if QStyle.StateFlag.State_MouseOver in option.state:
+        # the pen is set from the palette on init, dont look up the palette for every link on every frame
+        if self._level_of_detail == LevelOfDetail.Full and QStyle.StateFlag.State_MouseOver in option.state:
             painter.setPen( QPen(self.palette().accent(), 1) )
+        else:
+            painter.setPen( self.pen() )
         painter.drawLine(self.line())
 
 
@@ -1061,7 +1192,7 @@ def main():
         @Slot()
         def create_node(self):
             assert self._model
-            unique_name = make_unique_name("node0", self._model.nodes())
+            unique_name = self._model.uniqueNodeName("node0")
             self._model.addNode(unique_name)
 
         @Slot()
@@ -7,13 +7,14 @@ from PySide6.QtWidgets import *
 
 from pylive.VisualCode_v6.py_graph_model import PyGraphModel
 from pylive.utils import group_consecutive_numbers
+from pylive.utils.bilist import bilist
 
 
 class PyProxyNodeModel(QAbstractItemModel):
     _headers = ['name', 'kind', 'content', 'inlets', 'outlets', 'result']
     def __init__(self, source_model:PyGraphModel|None=None, parent:QObject|None=None):
         super().__init__(parent=parent)
-        self._nodes:list[str] = list()
+        self._nodes:bilist[str] = bilist() # O(log n) row <-> node lookup
         self._source_model:PyGraphModel|None=None
 
         self._connections = []
@@ -27,10 +28,9 @@ class PyProxyNodeModel(QAbstractItemModel):
 
         if source_model:
             def emit_inlets_changed(nodes):
-                for node in nodes:
-                    row = self.mapFromSource(node).row()
-                    index = self.index(row, self._headers.index('inlets'))
-                    self.dataChanged.emit(index, index, [])
+                column = self._headers.index('inlets')
+                for r in self._rowRanges(nodes):
+                    self.dataChanged.emit(self.index(r.start, column), self.index(r.stop-1, column), [])
 
             self._connections = [
                 (source_model.modelAboutToBeReset, self.modelAboutToBeReset.emit),
@@ -50,24 +50,25 @@ class PyProxyNodeModel(QAbstractItemModel):
         self._resetModel()
 
     def _on_data_changed(self, nodes:list[str], hints:list[str]):
-        for node in nodes:
-            row = self.mapFromSource(node).row()
-            if not hints:
-                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount()-1), [])
-            else:
-                columns = []
-                for hint in hints:
-                    column = self._headers.index(hint)
-                    columns.append(column)
-                columns.sort()
-                self.dataChanged.emit(self.index(row, columns[0]), self.index(row, columns[-1]), [])
+        if not hints:
+            first_column, last_column = 0, self.columnCount()-1
+        else:
+            columns = []
+            for hint in hints:
+                column = self._headers.index(hint)
+                columns.append(column)
+            columns.sort()
+            first_column, last_column = columns[0], columns[-1]
+
+        # one signal for each range of consecutive rows
+        for r in self._rowRanges(nodes):
+            self.dataChanged.emit(self.index(r.start, first_column), self.index(r.stop-1, last_column), [])
 
     def _resetModel(self):
         assert self._source_model
         self.beginResetModel()
         self._nodes.clear()
-        for row, node in enumerate(self._source_model.nodes()):
-            self._nodes.insert(row, node)
+        self._nodes.extend(self._source_model.nodes())
 
         self.modelReset.emit()
         self.endResetModel()
@@ -80,26 +81,23 @@ class PyProxyNodeModel(QAbstractItemModel):
     def _on_source_nodes_added(self, nodes:list[str]):
         first = len(self._nodes)
         last = first+len(nodes)-1
-        for row, node in enumerate(nodes, start=first):
-            self._nodes.insert(row, node)
+        self._nodes.extend(nodes)
         self.rowsInserted.emit(QModelIndex(), first, last)
 
     def _on_source_nodes_about_to_be_removed(self, nodes:list[str]):
-        indexes = [self.mapFromSource(node) for node in nodes]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for r in reversed(ranges):
+        for r in reversed(self._rowRanges(nodes)):
             self.rowsAboutToBeRemoved.emit(QModelIndex(), r.start, r.stop-1)
 
     def _on_source_nodes_removed(self, nodes:list[str]):
-        indexes = [self.mapFromSource(node) for node in nodes]
-        rows = set([idx.row() for idx in indexes])
-        ranges = list(group_consecutive_numbers(sorted(rows)))
-        for range_group in reversed(ranges):
-            for row in reversed(range_group):
-                del self._nodes[row]
+        for range_group in reversed(self._rowRanges(nodes)):
+            del self._nodes[range_group.start:range_group.stop]
             self.rowsRemoved.emit(QModelIndex(), range_group.start, range_group.stop-1)
 
+    def _rowRanges(self, nodes:Iterable[str])->list[range]:
+        """consecutive rows of nodes, so batches are signaled as ranges"""
+        rows = sorted(set(self._nodes.index(node) for node in nodes))
+        return list(group_consecutive_numbers(rows))
+
     # Proxy functions
     def mapFromSource(self, node:str)->QModelIndex:
         row = self._nodes.index(node)
@@ -39,5 +39,45 @@ class TestEvaluation(unittest.TestCase):
 
         self.assertEqual(graph.data('mul', 'result'), (None, 6) )
 
+class TestModuleReload(unittest.TestCase):
+    def setUp(self):
+        import os
+        import tempfile
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        Path("helper.py").write_text("def value():\n    return 1\n")
+        Path("user.py").write_text("import helper\ndef value():\n    return helper.value() + 10\n")
+        Path("other.py").write_text("def value():\n    return 100\n")
+
+    def tearDown(self):
+        import os
+        os.chdir(self._cwd)
+        for name in ("helper", "user", "other"):
+            sys.modules.pop(name, None)
+        self._tmp.cleanup()
+
+    def test_reload_invalidates_bound_nodes_only(self):
+        graph = PyGraphModel()
+        graph.setImports(["user", "helper", "other"])
+        graph.addNode("u", "user.value()", 'expression')
+        graph.addNode("o", "other.value()", 'expression')
+        graph.addNode("plus", "x+1", 'expression')
+        graph.linkNodes("u", "plus", "out", "x")
+
+        self.assertEqual(graph.nodeModules("u"), {"user"})
+        self.assertEqual(graph.data('plus', 'result'), (None, 12))
+        self.assertEqual(graph.data('o', 'result'), (None, 100))
+
+        spy = QSignalSpy(graph.dataChanged)
+        Path("helper.py").write_text("def value():\n    return 2\n")
+        graph.reloadModules(["helper"])
+
+        invalidated = {key for i in range(spy.count()) for key in spy.at(i)[0]}
+        self.assertEqual(invalidated, {"u", "plus"})
+        self.assertEqual(graph.data('plus', 'result'), (None, 13))
+        self.assertEqual(graph.data('o', 'result'), (None, 100))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
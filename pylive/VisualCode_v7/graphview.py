@@ -24,6 +24,7 @@ from pylive.utils.geo import makeLineBetweenShapes, makeLineToShape
 from pylive.utils.qt import distribute_items_horizontal
 from pylive.utils.unique import make_unique_name
 from pylive.utils.diff import diff_set
+from pylive.qt_components.lod_graphicsview import LODGraphicsView, LevelOfDetail
 
 import logging
 
@@ -50,16 +51,12 @@ class GraphView(QWidget):
         self.setupUI()
 
     def setupUI(self):
-        self.graphicsview = QGraphicsView(self)
+        self.graphicsview = LODGraphicsView(self)
         self.graphicsview.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
-        self.graphicsview.setCacheMode(QGraphicsView.CacheModeFlag.CacheNone)
-        self.graphicsview.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        self.graphicsview.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
-        self.graphicsview.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
 
         scene = QGraphicsScene()
-        scene.setSceneRect(QRectF(-9999, -9999, 9999 * 2, 9999 * 2))
         self.graphicsview.setScene(scene)
+        self.graphicsview.levelOfDetailChanged.connect(self.setNodeItemsLevelOfDetail)
         layout = QVBoxLayout()
         layout.addWidget(self.graphicsview)
         self.setLayout(layout)
@@ -99,6 +96,12 @@ class GraphView(QWidget):
 
     def model(self) -> Tuple[QAbstractItemModel, QAbstractItemModel] | None:
         return self._nodes, self._links
+
+    def setNodeItemsLevelOfDetail(self, level: LevelOfDetail):
+        # node and first cell indexes are the same, so look up node and link items in the scene
+        for item in self.graphicsview.scene().items():
+            if isinstance(item, (NodeItem, LinkItem)):
+                item.setLevelOfDetail(level)
     #
     ### Handle Model Signals
     def populate(self):
@@ -117,6 +120,7 @@ class GraphView(QWidget):
         for row in range(self._nodes.rowCount()):
             node_index = self._nodes.index(row, 0)
             node_item = NodeItem()
+            node_item.setLevelOfDetail(self.graphicsview.levelOfDetail())
             node_item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
             node_item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
             self.graphicsview.scene().addItem(node_item)
@@ -130,6 +134,7 @@ class GraphView(QWidget):
                 proxy = QGraphicsProxyWidget()
                 proxy.setWidget(label)
                 node_item.layout().addItem(proxy)
+                proxy.setVisible(node_item.levelOfDetail() > LevelOfDetail.Outline)
                 self._widgets[QPersistentModelIndex(cell_index)] = proxy
 
             # create inlets from children
@@ -138,6 +143,7 @@ class GraphView(QWidget):
                 inlet_item = InletItem()
                 self._widgets[QPersistentModelIndex(inlet_index)] = inlet_item
                 inlet_item.setParentItem(node_item)
+                inlet_item.setVisible(node_item.levelOfDetail() > LevelOfDetail.Outline)
 
 
 
@@ -483,6 +489,23 @@ class NodeItem(QGraphicsWidget):
 
         layout = QGraphicsLinearLayout(Qt.Orientation.Vertical)
         self.setLayout(layout)
+        self._level_of_detail = LevelOfDetail.Full
+
+    def levelOfDetail(self) -> LevelOfDetail:
+        return self._level_of_detail
+
+    def setLevelOfDetail(self, level: LevelOfDetail):
+        """hide labels and ports when zoomed out,
+        and render from a cached pixmap at mid zoom"""
+        self._level_of_detail = level
+        for child in self.childItems():
+            child.setVisible(level > LevelOfDetail.Outline)
+
+        match level:
+            case LevelOfDetail.Cached:
+                self.setCacheMode(QGraphicsItem.CacheMode.ItemCoordinateCache)
+            case _:
+                self.setCacheMode(QGraphicsItem.CacheMode.NoCache)
 
     def paint(self, painter: QPainter, option: QStyleOption, widget=None):
         rect = option.rect
@@ -491,6 +514,9 @@ class NodeItem(QGraphicsWidget):
         if self.isSelected():
             pen.setBrush(self.palette().accent())
         painter.setPen(pen)
+        if self._level_of_detail == LevelOfDetail.Outline:
+            painter.fillRect(rect, pen.brush())
+            return
         painter.drawRoundedRect(rect, 6, 6)
 
 
@@ -504,6 +530,15 @@ class LinkItem(QGraphicsLineItem):
 
         self.setAcceptHoverEvents(True)
         self._view: PyGraphView | None = None
+        self._level_of_detail = LevelOfDetail.Full
+
+    def levelOfDetail(self) -> LevelOfDetail:
+        return self._level_of_detail
+
+    def setLevelOfDetail(self, level: LevelOfDetail):
+        """highlight on hover only at full detail"""
+        self._level_of_detail = level
+        self.setAcceptHoverEvents(level == LevelOfDetail.Full)
 
     def move(self):
         assert self._view
@@ -568,7 +603,7 @@ class LinkItem(QGraphicsLineItem):
 
     def paint(self, painter: QPainter, option: QStyleOption, widget: QWidget | None = None):
         painter.setPen(QPen(self.palette().text(), 1))
-        if QStyle.StateFlag.State_MouseOver in option.state:
+        if self._level_of_detail == LevelOfDetail.Full and QStyle.StateFlag.State_MouseOver in option.state:
             painter.setPen(QPen(self.palette().accent(), 1))
         painter.drawLine(self.line())
 
@@ -7,12 +7,12 @@ Usage:
 """
 
 def open_livescript(filepath=None):
-	from pylive.QtLiveApp.live_script_with_exec import LiveAppWithExec
+	from pylive.QtLiveCode.live_script_with_exec import LiveScriptWithExec
 	from PySide6.QtWidgets import QApplication
 
 	import sys
 	app = QApplication(sys.argv)
-	window = LiveAppWithExec.instance()
+	window = LiveScriptWithExec.instance()
 	if filepath:
 		window.fileLink.openFile(filepath)
 	window.show()
@@ -46,5 +46,5 @@ if __name__ == "__main__":
 		open_livescript(args.filepath)
 
 	if args.command == 'imsketch':
-		from imsketch.main_v3 import start
+		from pylive.imsketch.main_v3 import start
 		start(args.filepath)
\ No newline at end of file
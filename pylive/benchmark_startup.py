@@ -0,0 +1,129 @@
+"""
+Startup import benchmark for the pylive apps.
+
+Imports the module of each entry point in a fresh interpreter with `-X importtime`,
+and checks it against the import budget:
+- the cumulative import time of the entry module (the best of a few runs)
+- heavy subsystems that must load on first use, not at startup
+
+exits with 1 if an entry point is over budget.
+
+Usage:
+    python -m pylive.benchmark_startup [livescript visualcode perspy imsketch] [--runs 5] [--top 15]
+"""
+
+from typing import *
+from dataclasses import dataclass, field
+from pathlib import Path
+import subprocess
+import argparse
+import sys
+import os
+
+
+PACKAGE_DIR = Path(__file__).parent
+
+
+@dataclass
+class EntryPoint:
+    module: str
+    budget: float # milliseconds, cumulative import time of the module
+    deferred: list[str] = field(default_factory=list) # modules that must not be imported at startup
+    path: Path|None = None # added to sys.path, for apps importing their folder as top level modules
+
+
+ENTRY_POINTS = {
+    "livescript": EntryPoint(
+        "pylive.QtLiveCode.live_script_with_exec", budget=700,
+        deferred=["jedi", "parso", "rope", "networkx"]
+    ),
+    "visualcode": EntryPoint(
+        "pylive.VisualCode_v6.py_graph_model", budget=600,
+        deferred=["networkx", "pydoc", "pylive.VisualCode_v4._ARCHIVE"]
+    ),
+    "perspy": EntryPoint(
+        "pylive.perspy.app.app", budget=1500,
+        deferred=["PIL.Image", "pyperclip", "reloading"],
+        path=PACKAGE_DIR / "perspy" / "app"
+    ),
+    "imsketch": EntryPoint(
+        "pylive.imsketch.main_v3", budget=1200,
+        deferred=["networkx", "jedi"]
+    ),
+}
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure(entry:EntryPoint)->list[ImportRecord]:
+    """import the entry module in a new interpreter, and parse the -X importtime report"""
+    code = "import sys\n"
+    if entry.path:
+        code += f"sys.path.insert(0, {str(entry.path)!r})\n"
+    code += f"import {entry.module}\n"
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env)
+    if process.returncode != 0:
+        last_line = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else ""
+        raise RuntimeError(f"importing {entry.module} failed: {last_line}")
+
+    records = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def check(name:str, entry:EntryPoint, runs:int, top:int)->bool:
+    best: list[ImportRecord]|None = None
+    best_total = float("inf")
+    for i in range(runs):
+        records = measure(entry)
+        total = next(record.cumulative_us for record in records if record.module == entry.module) / 1000
+        if total < best_total:
+            best, best_total = records, total
+    assert best is not None
+
+    imported = {record.module for record in best}
+    eager = [module for module in entry.deferred if module in imported]
+    ok = best_total <= entry.budget and not eager
+
+    print(f"{name}: {entry.module} imports in {best_total:.0f}ms (budget {entry.budget:.0f}ms) {'OK' if ok else 'OVER BUDGET'}")
+    for module in eager:
+        print(f"  imported at startup, should load on first use: {module}")
+    for record in sorted(best, key=lambda record: record.self_us, reverse=True)[:top]:
+        print(f"  {record.self_us/1000:7.1f}ms {record.module}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pylive startup import benchmark")
+    parser.add_argument("entry_points", nargs="*", help=f"default: all of {', '.join(ENTRY_POINTS)}")
+    parser.add_argument("--runs", type=int, default=5, help="the best run is compared to the budget")
+    parser.add_argument("--top", type=int, default=10, help="list the slowest modules")
+    args = parser.parse_args()
+
+    for name in args.entry_points:
+        if name not in ENTRY_POINTS:
+            parser.error(f"unknown entry point: {name}, choose from: {', '.join(ENTRY_POINTS)}")
+
+    failed = []
+    for name in args.entry_points or ENTRY_POINTS:
+        try:
+            if not check(name, ENTRY_POINTS[name], args.runs, args.top):
+                failed.append(name)
+        except RuntimeError as err:
+            print(f"{name}: {err}")
+            failed.append(name)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Diff and patch benchmark for keyed Node trees.
+
+Builds a tree of containers with keyed text children, applies random edits
+(insert, remove, move, update text) to a copy, then times the diff and the patch,
+and counts the operations and the subtrees shared with the original tree.
+Then times a flat list of children reversed, the worst case for the moves.
+
+Usage:
+    python -m pylive.diff_and_patch.benchmark_node --nodes 10000 --edits 10 100 1000
+"""
+
+from typing import *
+import time
+import random
+import argparse
+import statistics
+
+from pylive.diff_and_patch.node import Node
+from pylive.diff_and_patch.demo import TextNode, ContainerNode
+
+
+def make_tree(nodes:int, fanout:int=100)->ContainerNode:
+    """a root with containers of `fanout` text nodes each"""
+    containers = []
+    for c in range(max(1, nodes // fanout)):
+        containers.append(ContainerNode([TextNode(f"text {c}.{i}", key=f"{c}.{i}") for i in range(fanout)], key=f"c{c}"))
+    return ContainerNode(containers, key="root")
+
+
+def edit_tree(tree:ContainerNode, edits:int, rng:random.Random)->ContainerNode:
+    """a copy of the tree with random edits, untouched containers are shared"""
+    containers = list(tree.children)
+    edited:dict[int, list[Node]] = dict()
+    for n in range(edits):
+        c = rng.randrange(len(containers))
+        children = edited.setdefault(c, list(containers[c].children))
+        match rng.choice(["insert", "remove", "move", "update"]):
+            case "insert":
+                children.insert(rng.randrange(len(children)+1), TextNode("inserted", key=f"new{n}"))
+            case "remove" if children:
+                children.pop(rng.randrange(len(children)))
+            case "move" if children:
+                children.insert(rng.randrange(len(children)), children.pop(rng.randrange(len(children))))
+            case "update" if children:
+                i = rng.randrange(len(children))
+                children[i] = TextNode(children[i].props["value"] + "!", key=children[i].key)
+    for c, children in edited.items():
+        containers[c] = ContainerNode(children, key=containers[c].key)
+    return ContainerNode(containers, key=tree.key)
+
+
+def count_nodes(node:Node)->int:
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def shared_nodes(a:Node, b:Node)->int:
+    """nodes of b, that are the same objects as in a"""
+    if a is b:
+        return count_nodes(b)
+    by_key = {child.key: child for child in a.children}
+    return sum(shared_nodes(by_key[child.key], child) for child in b.children if child.key in by_key)
+
+
+def run(nodes:int, edits:int, repeat:int, seed:int=0)->dict:
+    rng = random.Random(seed)
+    tree = make_tree(nodes)
+    diff_times, patch_times, op_counts, shared = [], [], [], []
+    for _ in range(repeat):
+        target = edit_tree(tree, edits, rng)
+
+        start = time.perf_counter()
+        ops = tree.diff(target)
+        diff_times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        patched = tree.patch(ops)
+        patch_times.append((time.perf_counter() - start) * 1000)
+
+        op_counts.append(len(ops))
+        shared.append(shared_nodes(tree, patched) / count_nodes(patched))
+
+    return {
+        "diff": statistics.median(diff_times),
+        "patch": statistics.median(patch_times),
+        "ops": statistics.median(op_counts),
+        "shared": statistics.median(shared),
+    }
+
+
+def run_reversed(nodes:int)->dict:
+    tree = ContainerNode([TextNode(f"text {i}", key=i) for i in range(nodes)], key="root")
+    target = ContainerNode(list(reversed(tree.children)), key="root")
+
+    start = time.perf_counter()
+    ops = tree.diff(target)
+    diff_time = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    tree.patch(ops)
+    patch_time = (time.perf_counter() - start) * 1000
+    return {"diff": diff_time, "patch": patch_time, "ops": len(ops)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="keyed Node diff and patch benchmark")
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--edits", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for edits in args.edits:
+        stats = run(args.nodes, edits, args.repeat, args.seed)
+        print(f"{args.nodes:>7} nodes {edits:>5} edits  diff {stats['diff']:7.2f}ms  patch {stats['patch']:7.2f}ms  ops {stats['ops']:6.0f}  shared {stats['shared']:6.1%}")
+
+    stats = run_reversed(args.nodes)
+    print(f"{args.nodes:>7} children reversed  diff {stats['diff']:7.2f}ms  patch {stats['patch']:7.2f}ms  ops {stats['ops']:6.0f}")
+
+
+if __name__ == "__main__":
+    main()
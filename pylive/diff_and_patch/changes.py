@@ -3,6 +3,10 @@ class Operation:
         self.op = op
         self.path = path
 
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in vars(self).items() if name != "op")
+        return f"{self.__class__.__name__}({fields})"
+
 class ReplaceNode(Operation):
     def __init__(self, path, new_node):
         super().__init__("replace", path)
@@ -24,3 +28,10 @@ class RemoveChild(Operation):
     def __init__(self, path, index):
         super().__init__("remove_child", path)
         self.index = index
+
+class MoveChild(Operation):
+    """pop the child at from_index, then insert it at to_index"""
+    def __init__(self, path, from_index, to_index):
+        super().__init__("move_child", path)
+        self.from_index = from_index
+        self.to_index = to_index
@@ -1,5 +1,5 @@
-from node import Node
-from changes import UpdateProp, AddChild, RemoveChild, ReplaceNode
+from pylive.diff_and_patch.node import Node
+from pylive.diff_and_patch.changes import UpdateProp
 
 
 class TextNode(Node):
@@ -16,9 +16,6 @@ class TextNode(Node):
         if isinstance(op, UpdateProp):
             if op.key == "value":
                 self.props["value"] = op.value
-        elif isinstance(op, ReplaceNode):
-            self.type = op.new_node.type
-            self.props = op.new_node.props
 
 
 class ContainerNode(Node):
@@ -26,40 +23,11 @@ class ContainerNode(Node):
         super().__init__("Container", props={}, children=children or [], key=key)
 
     def _diff_self(self, other, path):
-        ops = []
-        # Diff children by position (simple version)
-        min_len = min(len(self.children), len(other.children))
-        for i in range(min_len):
-            ops += self.children[i].diff(other.children[i], path + [i])
-        if len(self.children) < len(other.children):
-            for i in range(len(self.children), len(other.children)):
-                ops.append(AddChild(path, i, other.children[i]))
-        elif len(self.children) > len(other.children):
-            for i in range(len(other.children), len(self.children)):
-                ops.append(RemoveChild(path, i))
-        return ops
+        # children are reconciled by key in Node
+        return []
 
     def _apply_op(self, op):
-        if isinstance(op, AddChild):
-            self.children.insert(op.index, op.node)
-        elif isinstance(op, RemoveChild):
-            self.children.pop(op.index)
-        elif isinstance(op, ReplaceNode):
-            self.type = op.new_node.type
-            self.props = op.new_node.props
-            self.children = op.new_node.children
-
-
-a = ContainerNode(children=[
-    TextNode("Hello"),
-    TextNode("World")
-])
-
-b = ContainerNode(children=[
-    TextNode("Hello there"),
-    TextNode("World!"),
-    TextNode("New line")
-])
+        pass
 
 
 def render(node, indent=0):
@@ -67,13 +35,26 @@ def render(node, indent=0):
     for child in node.children:
         render(child, indent + 1)
 
-render(a)
 
-print("\nDiff operations:")
-ops = a.diff(b)
-for op in ops:
-    print("- ", op.op, op.path, getattr(op, "value", getattr(op, "node", None)))
+if __name__ == "__main__":
+    a = ContainerNode(children=[
+        TextNode("Hello", key="hello"),
+        TextNode("World", key="world")
+    ])
+
+    b = ContainerNode(children=[
+        TextNode("New line", key="new"),
+        TextNode("World!", key="world"),
+        TextNode("Hello there", key="hello"),
+    ])
+
+    render(a)
+
+    print("\nDiff operations:")
+    ops = a.diff(b)
+    for op in ops:
+        print("- ", op)
 
-print("\nPatching a to become b...")
-a.patch(ops)
-render(a)
\ No newline at end of file
+    print("\nPatching a to become b...")
+    patched = a.patch(ops)
+    render(patched)
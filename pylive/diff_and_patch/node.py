@@ -1,6 +1,19 @@
-from copy import deepcopy
+from copy import copy
 from abc import ABC, abstractmethod
-from changes import ReplaceNode, UpdateProp, AddChild, RemoveChild
+from pylive.utils.diff import longest_increasing_subsequence
+from pylive.diff_and_patch.changes import ReplaceNode, UpdateProp, AddChild, RemoveChild, MoveChild
+
+
+class _OpTree:
+    """operations grouped by path"""
+    __slots__ = ("ops", "children")
+
+    def __init__(self):
+        self.ops = []
+        self.children = {}
+
+
+_POSITION = object()  # keys unkeyed children by position, without clashing with user keys
 
 
 class Node(ABC):
@@ -20,41 +33,166 @@ class Node(ABC):
         if path is None:
             path = []
 
-        if self.type != other.type:
-            # Type changed → full replace
+        if self is other:
+            # shared subtree
+            return []
+
+        if self.type != other.type or self.key != other.key:
+            # Type or identity changed → full replace
             return [ReplaceNode(path, other)]
 
         # Dispatch to subclass-specific implementation
-        return self._diff_self(other, path)
+        return self._diff_self(other, path) + self._diff_children(other, path)
+
+    def _diff_children(self, other, path):
+        """
+        Reconcile children by key, unkeyed children are matched by position.
+
+        Emits the removals, then the moves and inserts of the children off the
+        longest increasing subsequence of kept children, then the diffs of the
+        matched children. Child paths index the children after the structural
+        operations of their parent.
+        """
+        old_keys = _child_keys(self.children)
+        new_keys = _child_keys(other.children)
+        old_index = {key: i for i, key in enumerate(old_keys)}
+        new_key_set = set(new_keys)
+        ops = []
+
+        # removals, from the back so the indices stay valid
+        for i in reversed(range(len(old_keys))):
+            if old_keys[i] not in new_key_set:
+                ops.append(RemoveChild(path, i))
+
+        # kept children stay, when they are in a longest increasing run
+        current = [key for key in old_keys if key in new_key_set]
+        kept_position = {key: i for i, key in enumerate(current)}
+        matched = [key for key in new_keys if key in kept_position]
+        stable = {matched[i] for i in longest_increasing_subsequence([kept_position[key] for key in matched])}
+
+        # every other child is placed after its predecessor, left to right, so it ends up
+        # in the run following the last stable child before it (or in the run at the front).
+        # Slots: the run at the front, then for each kept child its slot followed by its run.
+        run_lengths = [0] * (len(current) + 1)  # 0: the front, c+1: after kept child c
+        anchor = 0
+        for key in new_keys:
+            if key in stable:
+                anchor = kept_position[key] + 1
+            else:
+                run_lengths[anchor] += 1
+        run_start = [0] * (len(current) + 1)
+        kept_slot = [0] * len(current)
+        slot = run_lengths[0]
+        for c in range(len(current)):
+            kept_slot[c] = slot
+            run_start[c + 1] = slot + 1
+            slot += 1 + run_lengths[c + 1]
+
+        # the index of a child is the count of occupied slots before it
+        occupied = _Counts(slot)
+        for c in kept_slot:
+            occupied.add(c, 1)
+        next_slot = run_start[0]
+        for i, key in enumerate(new_keys):
+            if key in stable:
+                next_slot = run_start[kept_position[key] + 1]
+                continue
+            to_slot = next_slot
+            next_slot += 1
+            if key in kept_position:
+                from_slot = kept_slot[kept_position[key]]
+                from_index = occupied.count_before(from_slot)
+                occupied.add(from_slot, -1)
+                ops.append(MoveChild(path, from_index, occupied.count_before(to_slot)))
+            else:
+                ops.append(AddChild(path, occupied.count_before(to_slot), other.children[i]))
+            occupied.add(to_slot, 1)
+
+        for i, key in enumerate(new_keys):
+            if key in old_index:
+                ops += self.children[old_index[key]].diff(other.children[i], path + [i])
+        return ops
 
     def patch(self, ops):
-        """Apply a list of operations to this node recursively."""
+        """
+        Return the tree with the operations applied, in a single traversal.
+
+        Untouched subtrees are shared with this tree, patched nodes are shallow copies.
+        """
+        root = _OpTree()
         for op in ops:
-            self._apply_op_recursive(op)
-        return self
-
-    def _apply_op_recursive(self, op):
-        """Recursively apply an operation based on its path."""
-        if not op.path:
-            self._apply_op(op)
-        else:
-            # Traverse to the correct child
-            child_index = op.path[0]
-            child = self.children[child_index]
-            # Create a new op with shortened path
-            new_op = deepcopy(op)
-            new_op.path = op.path[1:]
-            child._apply_op_recursive(new_op)
+            tree = root
+            for index in op.path:
+                tree = tree.children.setdefault(index, _OpTree())
+            tree.ops.append(op)
+        return self._patch(root)
+
+    def _patch(self, tree):
+        node = self._copy()
+        for op in tree.ops:
+            match op:
+                case ReplaceNode():
+                    node = op.new_node._copy()
+                case AddChild():
+                    node.children.insert(op.index, op.node)
+                case RemoveChild():
+                    node.children.pop(op.index)
+                case MoveChild():
+                    node.children.insert(op.to_index, node.children.pop(op.from_index))
+                case _:
+                    node._apply_op(op)
+
+        for index, subtree in tree.children.items():
+            node.children[index] = node.children[index]._patch(subtree)
+        return node
+
+    def _copy(self):
+        node = copy(self)
+        node.props = dict(self.props)
+        node.children = list(self.children)
+        return node
 
     # -------------------------------
     # Hooks for subclasses
     # -------------------------------
     @abstractmethod
     def _diff_self(self, other, path):
-        """Return list of operations describing differences."""
+        """Return list of operations describing differences of the props."""
         pass
 
     @abstractmethod
     def _apply_op(self, op):
-        """Apply a single operation to this node."""
+        """Apply a single prop operation to this node."""
         pass
+
+
+class _Counts:
+    """Fenwick tree of counts per slot, O(log n) updates and prefix sums"""
+    __slots__ = ("_tree",)
+
+    def __init__(self, size):
+        self._tree = [0] * (size + 1)  # 1-based
+
+    def add(self, slot, delta):
+        i = slot + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def count_before(self, slot):
+        """the sum of the counts of the slots before `slot`"""
+        total = 0
+        i = slot
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+def _child_keys(children):
+    keys = [child.key if child.key is not None else (_POSITION, i) for i, child in enumerate(children)]
+    if len(set(keys)) != len(keys):
+        seen = set()
+        duplicate = next(key for key in keys if key in seen or seen.add(key))
+        raise ValueError(f"duplicate child key: {duplicate!r}")
+    return keys
@@ -0,0 +1,102 @@
+import unittest
+import random
+
+from pylive.utils.diff import longest_increasing_subsequence
+from pylive.diff_and_patch.changes import AddChild, RemoveChild, MoveChild, ReplaceNode
+from pylive.diff_and_patch.demo import TextNode, ContainerNode
+
+
+def texts(node):
+    return [(child.key, child.props["value"]) for child in node.children]
+
+
+class TestLongestIncreasingSubsequence(unittest.TestCase):
+    def test_subsequence(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        indices = longest_increasing_subsequence(values)
+        self.assertEqual(len(indices), 4)
+        self.assertEqual([values[i] for i in indices], sorted({values[i] for i in indices}))
+
+    def test_empty(self):
+        self.assertEqual(longest_increasing_subsequence([]), [])
+
+
+class TestKeyedReconciliation(unittest.TestCase):
+    def test_insert_at_front(self):
+        """a single insert, instead of a cascade of updates"""
+        a = ContainerNode([TextNode(str(i), key=i) for i in range(10)])
+        b = ContainerNode([TextNode("new", key="new")] + a.children)
+        ops = a.diff(b)
+        self.assertEqual(len(ops), 1)
+        self.assertIsInstance(ops[0], AddChild)
+        self.assertEqual(texts(a.patch(ops)), texts(b))
+
+    def test_move_is_a_single_op(self):
+        a = ContainerNode([TextNode(str(i), key=i) for i in range(10)])
+        children = list(a.children)
+        children.insert(2, children.pop(8))
+        b = ContainerNode(children)
+        ops = a.diff(b)
+        self.assertEqual([type(op) for op in ops], [MoveChild])
+        self.assertEqual(texts(a.patch(ops)), texts(b))
+
+    def test_changed_key_replaces(self):
+        a = ContainerNode([TextNode("x", key="a")], key="root")
+        b = ContainerNode([TextNode("x", key="a")], key="other")
+        self.assertEqual([type(op) for op in a.diff(b)], [ReplaceNode])
+
+    def test_duplicate_keys(self):
+        a = ContainerNode([TextNode("x", key="a")])
+        b = ContainerNode([TextNode("x", key="a"), TextNode("y", key="a")])
+        with self.assertRaises(ValueError):
+            a.diff(b)
+
+    def test_random_edits(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            keys = list(range(20))
+            a = ContainerNode([TextNode(str(key), key=key) for key in keys])
+            rng.shuffle(keys)
+            keys = keys[:rng.randrange(21)] + [f"new{i}" for i in range(rng.randrange(5))]
+            rng.shuffle(keys)
+            b = ContainerNode([TextNode(f"{key}{rng.choice(['', '!'])}", key=key) for key in keys])
+            ops = a.diff(b)
+            self.assertEqual(texts(a.patch(ops)), texts(b))
+            moves = sum(isinstance(op, MoveChild) for op in ops)
+            kept = [key for key in keys if isinstance(key, int)]
+            self.assertEqual(moves, len(kept) - len(longest_increasing_subsequence(kept)))
+
+    def test_reversed(self):
+        a = ContainerNode([TextNode(str(i), key=i) for i in range(2000)])
+        b = ContainerNode(list(reversed(a.children)))
+        ops = a.diff(b)
+        self.assertEqual(len(ops), 1999)
+        self.assertEqual(texts(a.patch(ops)), texts(b))
+
+
+class TestPatch(unittest.TestCase):
+    def test_structural_sharing(self):
+        left = ContainerNode([TextNode("a", key="a")], key="left")
+        right = ContainerNode([TextNode("b", key="b")], key="right")
+        a = ContainerNode([left, right])
+        b = ContainerNode([left, ContainerNode([TextNode("b!", key="b")], key="right")])
+
+        patched = a.patch(a.diff(b))
+        self.assertIs(patched.children[0], left, "untouched subtrees are shared")
+        self.assertIsNot(patched.children[1], right)
+        self.assertEqual(right.children[0].props["value"], "b", "the original tree is not modified")
+        self.assertEqual(patched.children[1].children[0].props["value"], "b!")
+
+    def test_nested_edits(self):
+        a = ContainerNode([ContainerNode([TextNode(str(i), key=i) for i in range(5)], key=k) for k in "xyz"])
+        b = ContainerNode([
+            ContainerNode([TextNode("4", key=4), TextNode("new", key="n"), TextNode("0!", key=0)], key="z"),
+            ContainerNode([TextNode(str(i), key=i) for i in range(5)], key="x"),
+        ])
+        patched = a.patch(a.diff(b))
+        self.assertEqual([child.key for child in patched.children], ["z", "x"])
+        self.assertEqual(texts(patched.children[0]), texts(b.children[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
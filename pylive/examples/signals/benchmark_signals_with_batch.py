@@ -0,0 +1,94 @@
+"""
+Propagation benchmark for the signals.
+
+chain:   a Data, and a chain of Computeds each adding one to the previous,
+         read by an Effect at the end.
+diamond: a Data read by many Computeds, all summed by one Computed, read by an
+         Effect. the Effect must run once per write.
+batch:   writes to many Data in a batch, each read by its own Computed, all
+         summed by one Computed, read by an Effect.
+
+Usage:
+    python -m pylive.examples.signals.benchmark_signals_with_batch [--signals 100000] [--writes 10]
+"""
+
+from typing import *
+import time
+import argparse
+
+from pylive.examples.signals.signals_with_batch import Data, Computed, Effect, batch
+
+
+def bench_chain(count:int, writes:int)->Tuple[float, float, int]:
+    start = time.perf_counter()
+    head = Data(0)
+    node:Data|Computed = head
+    for _ in range(count):
+        node = Computed(lambda previous=node: previous.value + 1)
+        node.value # compute each link once, instead of recursing through the chain on the first read
+    runs = []
+    effect = Effect(lambda tail=node: runs.append(tail.value))
+    effect()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(1, writes+1):
+        head.value = i
+    write_time = (time.perf_counter() - start) / writes
+    assert runs[-1] == writes + count
+    return build_time, write_time, len(runs) - 1
+
+
+def bench_diamond(count:int, writes:int)->Tuple[float, float, int]:
+    start = time.perf_counter()
+    head = Data(0)
+    sides = [Computed(lambda i=i: head.value + i) for i in range(count)]
+    total = Computed(lambda: sum(side.value for side in sides))
+    runs = []
+    effect = Effect(lambda: runs.append(total.value))
+    effect()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(1, writes+1):
+        head.value = i
+    write_time = (time.perf_counter() - start) / writes
+    assert runs[-1] == writes * count + count * (count-1) // 2
+    return build_time, write_time, len(runs) - 1
+
+
+def bench_batch(count:int, writes:int)->Tuple[float, float, int]:
+    start = time.perf_counter()
+    heads = [Data(0) for _ in range(count)]
+    doubles = [Computed(lambda head=head: head.value * 2) for head in heads]
+    total = Computed(lambda: sum(double.value for double in doubles))
+    runs = []
+    effect = Effect(lambda: runs.append(total.value))
+    effect()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(1, writes+1):
+        with batch():
+            for head in heads:
+                head.value = i
+    write_time = (time.perf_counter() - start) / writes
+    assert runs[-1] == writes * count * 2
+    return build_time, write_time, len(runs) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signals", type=int, default=100_000)
+    parser.add_argument("--writes", type=int, default=10)
+    args = parser.parse_args()
+
+    for name, bench in [("chain", bench_chain), ("diamond", bench_diamond), ("batch", bench_batch)]:
+        build_time, write_time, effect_runs = bench(args.signals, args.writes)
+        print(f"{name:<8} {args.signals} signals  build {build_time*1000:8.1f}ms  "
+              f"write {write_time*1000:8.1f}ms  {write_time/args.signals*1e6:5.2f}us/signal  "
+              f"effect runs {effect_runs} for {args.writes} writes")
+
+
+if __name__ == "__main__":
+    main()
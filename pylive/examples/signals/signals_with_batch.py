@@ -1,129 +1,291 @@
-class BatchContext:
-	# Tracks whether we're in a batch operation
-	active = False
-	queued_pushes = set()
-
-	@classmethod
-	def start(cls):
-		cls.active = True
-		cls.queued_pushes.clear()
-
-	@classmethod
-	def stop(cls):
-		cls.active = False
-		# Trigger all queued pushes at the end of the batch
-		for dep in cls.queued_pushes:
-			dep.push()
-		cls.queued_pushes.clear()
-
-	@classmethod
-	def queue_push(cls, dep):
-		# Queue the push for when the batch completes
-		cls.queued_pushes.add(dep)
+"""
+Reactive signals with batching.
+
+Data holds a value, Computed derives a memoised value from other signals, and
+Effect runs a function whenever the signals it read change.
+
+The signals read while a Computed or an Effect runs become its sources, and
+the sources it stops reading are unsubscribed. Each node has a height above
+its sources, and writes are propagated in the order of the heights: every
+node is updated once, after all its sources, so effects never see a mix of
+old and new values. Computeds without dependents are only marked stale, and
+computed again when read.
+
+Writes in a batch are propagated when the outermost batch exits. Reading a
+Computed inside a batch brings it up to date first.
+
+The tracking and the batches are per thread. A graph of signals is not
+locked, use it from one thread at a time.
+"""
+
+from typing import *
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from heapq import heappush, heappop
+from itertools import count
+import threading
+
+
+class _Context(threading.local):
+	"""the tracking and propagation state of a thread"""
+	def __init__(self):
+		self.observer:'_Observer|None' = None
+		self.batch_depth = 0
+		self.flushing = False
+		self.queue:List[Tuple[int, int, '_Observer']] = [] # height, order, node
+		self.deferred:List['Effect'] = [] # effects reached while bringing a computed up to date
+
+	def track(self, source:'Data|Computed'):
+		if self.observer is not None:
+			self.observer._reading.setdefault(source, source._version)
+
+	def schedule(self, node:'_Observer'):
+		if not node._queued:
+			node._queued = True
+			heappush(self.queue, (node._height, next(_order), node))
+
+	def process_next(self, defer_effects:bool):
+		height, _, node = heappop(self.queue)
+		if not node._queued:
+			return # processed when a computed was read
+		if height != node._height:
+			heappush(self.queue, (node._height, next(_order), node)) # raised by a new source
+			return
+		if defer_effects and isinstance(node, Effect):
+			self.deferred.append(node)
+			return
+		node._queued = False
+		node._process()
+
+	def settle(self, node:'Computed'):
+		"""process the queued nodes below the computed, and the computed itself"""
+		while self.queue and self.queue[0][0] < node._height:
+			self.process_next(defer_effects=True)
+		if node._queued:
+			node._queued = False
+			node._stale = True
+
+	def flush(self):
+		if self.flushing:
+			return # the running flush picks up the new writes
+		self.flushing = True
+		try:
+			while self.queue or self.deferred:
+				for effect in self.deferred:
+					heappush(self.queue, (effect._height, next(_order), effect))
+				self.deferred.clear()
+				while self.queue:
+					self.process_next(defer_effects=False)
+		finally:
+			self.flushing = False
+
+
+_context = _Context()
+_order = count() # orders the nodes of the same height
+
+
+def _equal(a:Any, b:Any)->bool:
+	if a is b:
+		return True
+	try:
+		return bool(a == b)
+	except Exception: # eg. numpy arrays
+		return False
 
 
 class Data:
-	def __init__(self, data):
-		self._data = data
-		self.dependents = set()
+	def __init__(self, value:Any):
+		self._value = value
+		self._version = 0
+		self._height = 0
+		self._dependents:Dict['_Observer', None] = dict() # ordered set
 
 	@property
-	def value(self):
-		self.dependents.add(Effect.ctx.stack[-1])
-		Effect.ctx.stack.append(self)
-		result = self._data
-		Effect.ctx.stack.pop()
-		return result
+	def value(self)->Any:
+		_context.track(self)
+		return self._value
 
 	@value.setter
-	def value(self, next_data):
-		self._data = next_data
-		self.push()
+	def value(self, value:Any):
+		if _equal(value, self._value):
+			return
+		self._value = value
+		self._version += 1
+		for dependent in self._dependents:
+			_context.schedule(dependent)
+		if _context.batch_depth == 0:
+			_context.flush()
 
-	def push(self):
-		if BatchContext.active:
-			BatchContext.queue_push(self)
-		else:
-			print(f"Data pushed {self._data}")
-			for dep in self.dependents:
-				dep.push()
+	def peek(self)->Any:
+		"""the value, without tracking"""
+		return self._value
 
 
-class Computed:
-	def __init__(self, fn):
+class _Observer(ABC):
+	"""runs a function, and tracks the signals it reads as its sources"""
+	def __init__(self, fn:Callable[[], Any]):
 		self._fn = fn
-		self.dependents = set()
+		self._sources:Dict[Data|Computed, int] = dict() # source -> version when read
+		self._reading:Dict[Data|Computed, int] = dict()
+		self._height = 1
+		self._queued = False
+		self._dependents:Dict[_Observer, None] = dict() # ordered set, only computeds have dependents
+
+	def _sources_changed(self)->bool:
+		return any(source._version != version for source, version in self._sources.items())
+
+	def _run_tracked(self)->Any:
+		previous, _context.observer = _context.observer, self
+		self._reading = dict()
+		try:
+			return self._fn()
+		finally:
+			_context.observer = previous
+			self._resubscribe(self._reading)
+			self._reading = dict()
+
+	def _resubscribe(self, sources:Dict['Data|Computed', int]):
+		if sources.keys() == self._sources.keys():
+			self._sources = sources # the same sources, their raised heights are already propagated
+			return
+		for source in self._sources:
+			if source not in sources:
+				del source._dependents[self]
+		for source in sources:
+			if source not in self._sources:
+				source._dependents[self] = None
+		self._sources = sources
+
+		height = 1 + max((source._height for source in sources), default=0)
+		if height > self._height:
+			self._raise_height(height)
+
+	def _raise_height(self, height:int):
+		self._height = height
+		stack:List[_Observer] = [self]
+		while stack:
+			node = stack.pop()
+			for dependent in node._dependents:
+				if dependent._height <= node._height:
+					dependent._height = node._height + 1
+					stack.append(dependent)
+
+	def _unsubscribe(self):
+		for source in self._sources:
+			del source._dependents[self]
+		self._sources = dict()
+
+	@abstractmethod
+	def _process(self):
+		"""bring the node up to date, after its sources changed"""
+		pass
+
+
+class Computed(_Observer):
+	def __init__(self, fn:Callable[[], Any]):
+		super().__init__(fn)
+		self._value:Any = None
+		self._version = 0
+		self._computed = False
+		self._stale = True
+		self._computing = False
 
 	@property
-	def value(self):
-		self.dependents.add(Effect.ctx.stack[-1])
-		Effect.ctx.stack.append(self)
-		result = self._fn()
-		Effect.ctx.stack.pop()
-		return result
-
-	def push(self):
-		if BatchContext.active:
-			BatchContext.queue_push(self)
-		else:
-			print("Computed pushed")
-			for dep in self.dependents:
-				dep.push()
-
-
-class Effect:
-	ctx = None
-	def __init__(self, fn):
-		self.stack = []
-		self._fn = fn
+	def value(self)->Any:
+		if self._computing:
+			raise RuntimeError(f"{self._fn.__name__} depends on itself")
+		if _context.queue and (self._queued or _context.queue[0][0] < self._height):
+			_context.settle(self)
+		if self._stale:
+			self._stale = False
+			if (not self._computed or self._sources_changed()) and self._compute():
+				for dependent in self._dependents:
+					_context.schedule(dependent)
+		_context.track(self)
+		return self._value
 
+	def peek(self)->Any:
+		"""the value, without tracking"""
+		previous, _context.observer = _context.observer, None
+		try:
+			return self.value
+		finally:
+			_context.observer = previous
+
+	def dispose(self):
+		"""stop tracking the sources, the computed is computed again when read"""
+		self._unsubscribe()
+		self._stale = True
+		self._computed = False
+
+	def _compute(self)->bool:
+		"""compute the value, and return True if it changed"""
+		self._computing = True
+		try:
+			value = self._run_tracked()
+		finally:
+			self._computing = False
+		if self._computed and _equal(value, self._value):
+			return False
+		self._computed = True
+		self._value = value
+		self._version += 1
+		return True
+
+	def _process(self):
+		if not self._dependents:
+			self._stale = True # nothing reads it, compute it when it is read
+		elif self._sources_changed() and self._compute():
+			for dependent in self._dependents:
+				_context.schedule(dependent)
+
+
+class Effect(_Observer):
+	"""call the effect to run it the first time, then it runs when its sources change"""
 	def __call__(self):
-		Effect.ctx = self
-		self.stack = []
-		self.stack.append(self)
-		self._fn()
-		self.stack.pop()
-		print("Effect called")
+		self._run_tracked()
+
+	def dispose(self):
+		self._unsubscribe()
 
-	def push(self):
-		if BatchContext.active:
-			BatchContext.queue_push(self)
-		else:
-			print("Effect pushed")
-			self.__call__()
+	def _process(self):
+		if self._sources_changed():
+			self._run_tracked()
 
 
+@contextmanager
 def batch():
 	"""
 	Context manager to perform batched updates.
+	Nested batches are propagated when the outermost exits.
 	"""
-	class BatchContextManager:
-		def __enter__(self):
-			BatchContext.start()
-
-		def __exit__(self, exc_type, exc_value, traceback):
-			BatchContext.stop()
-
-	return BatchContextManager()
+	_context.batch_depth += 1
+	try:
+		yield
+	finally:
+		_context.batch_depth -= 1
+		if _context.batch_depth == 0:
+			_context.flush()
 
 
-# Test the batch functionality
+if __name__ == "__main__":
+	# Test the batch functionality
 
-name = Data("Andris")
-style = Data("  Hello {}!")
+	name = Data("Andris")
+	style = Data("  Hello {}!")
 
-@Computed
-def greeting():
-	return style.value.format(name.value)
+	@Computed
+	def greeting():
+		return style.value.format(name.value)
 
-@Effect
-def print_result():
-	print(greeting.value)
+	@Effect
+	def print_result():
+		print(greeting.value)
 
 
-print_result()
+	print_result()
 
-# Perform batched updates
-with batch():
-	style.value = "  Hey {}!"
-	name.value = "Judit"
+	# Perform batched updates
+	with batch():
+		style.value = "  Hey {}!"
+		name.value = "Judit"
@@ -0,0 +1,137 @@
+import unittest
+import threading
+
+from pylive.examples.signals.signals_with_batch import Data, Computed, Effect, batch
+
+
+class TestComputed(unittest.TestCase):
+	def test_memoised(self):
+		calls = []
+		a = Data(1)
+		@Computed
+		def double():
+			calls.append(a.value)
+			return a.value * 2
+
+		self.assertEqual(double.value, 2)
+		self.assertEqual(double.value, 2)
+		self.assertEqual(len(calls), 1)
+		a.value = 2
+		self.assertEqual(double.value, 4)
+		self.assertEqual(len(calls), 2)
+
+	def test_equal_values_stop_propagation(self):
+		a = Data(1)
+		parity = Computed(lambda: a.value % 2)
+		runs = []
+		effect = Effect(lambda: runs.append(parity.value))
+		effect()
+		a.value = 3
+		self.assertEqual(runs, [1])
+		a.value = 4
+		self.assertEqual(runs, [1, 0])
+
+	def test_dynamic_dependencies(self):
+		use_a, a, b = Data(True), Data("a"), Data("b")
+		choice = Computed(lambda: a.value if use_a.value else b.value)
+		runs = []
+		effect = Effect(lambda: runs.append(choice.value))
+		effect()
+
+		b.value = "b2"
+		self.assertEqual(runs, ["a"], "b is not read yet")
+		use_a.value = False
+		self.assertEqual(runs, ["a", "b2"])
+		self.assertNotIn(choice, a._dependents, "a is not read anymore")
+		a.value = "a2"
+		self.assertEqual(runs, ["a", "b2"])
+
+	def test_self_dependency(self):
+		loop = Computed(lambda: loop.value)
+		with self.assertRaises(RuntimeError):
+			loop.value
+
+
+class TestEffect(unittest.TestCase):
+	def test_diamond_runs_once(self):
+		a = Data(1)
+		left = Computed(lambda: a.value + 1)
+		right = Computed(lambda: a.value * 10)
+		seen = []
+		effect = Effect(lambda: seen.append((left.value, right.value)))
+		effect()
+		a.value = 2
+		self.assertEqual(seen, [(2, 10), (3, 20)], "no glitch with the old right value")
+
+	def test_uneven_paths(self):
+		a = Data(1)
+		b = Computed(lambda: a.value + 1)
+		c = Computed(lambda: b.value + 1)
+		total = Computed(lambda: a.value + c.value)
+		seen = []
+		effect = Effect(lambda: seen.append(total.value))
+		effect()
+		a.value = 10
+		self.assertEqual(seen, [4, 22])
+
+	def test_dispose(self):
+		a = Data(1)
+		runs = []
+		effect = Effect(lambda: runs.append(a.value))
+		effect()
+		effect.dispose()
+		a.value = 2
+		self.assertEqual(runs, [1])
+		self.assertFalse(a._dependents)
+
+	def test_write_in_effect(self):
+		a = Data(1)
+		b = Data(0)
+		copy = Effect(lambda: setattr(b, 'value', a.value * 2))
+		copy()
+		seen = []
+		effect = Effect(lambda: seen.append(b.value))
+		effect()
+		a.value = 5
+		self.assertEqual(seen, [2, 10])
+
+
+class TestBatch(unittest.TestCase):
+	def test_nested_batches(self):
+		a, b = Data(1), Data(1)
+		seen = []
+		effect = Effect(lambda: seen.append(a.value + b.value))
+		effect()
+		with batch():
+			a.value = 2
+			with batch():
+				b.value = 3
+			self.assertEqual(seen, [2], "propagated when the outermost batch exits")
+		self.assertEqual(seen, [2, 5])
+
+	def test_computed_in_batch_is_up_to_date(self):
+		a = Data(1)
+		double = Computed(lambda: a.value * 2)
+		seen = []
+		effect = Effect(lambda: seen.append(double.value))
+		effect()
+		with batch():
+			a.value = 2
+			self.assertEqual(double.value, 4)
+			self.assertEqual(seen, [2])
+		self.assertEqual(seen, [2, 4])
+
+	def test_batches_are_per_thread(self):
+		a = Data(1)
+		seen = []
+		effect = Effect(lambda: seen.append(a.value))
+		effect()
+		with batch():
+			thread = threading.Thread(target=lambda: setattr(a, 'value', 2))
+			thread.start()
+			thread.join()
+			self.assertEqual(seen, [1, 2], "the other thread is not in a batch")
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -6,7 +6,6 @@ from typing import Any, List, Tuple, Dict, cast, TypeVar
 import json
 
 # Third-party imports
-from PIL import Image
 import OpenGL.GL as gl
 import glfw
 from loguru import logger
@@ -15,18 +14,20 @@ import numpy as np
 from imgui_bundle import imgui, icons_fontawesome_4
 from imgui_bundle import icons_fontawesome_4 as fa
 from imgui_bundle import portable_file_dialogs as pfd
-import pyperclip
 
 # Local application imports
+from pylive.utils.lazy_import import lazy_import
+Image = lazy_import("PIL.Image") # loaded with the first image
 from pylive.perspy import solver
 
 import ui
 from document import PerspyDocument
 
-from pylive.perspy.app.hot_reloader import HotModuleReloader
-HotModuleReloader([solver]).start_file_watchers()
+from pylive.utils.hot_reload import HotReloader
+hot_reloader = HotReloader.shared()
+hot_reloader.watch(solver)
+hot_reloader.start()
 
-from reloading import reloading
 
 class PerspyApp():
     def __init__(self):
@@ -80,7 +81,7 @@ class PerspyApp():
 
     # Windows
     def setup_gui(self):
-        if self.doc.image_path:
+        if self.doc.image_data or self.doc.image_path:
             # Create OpenGL texture
             self.update_texture()
 
@@ -737,6 +738,7 @@ class PerspyApp():
                 logger.info(f"✓ Found file: {Path(path).absolute()}")
 
             self.doc.image_path = path
+            self.doc.image_data = None
 
             self.update_texture()
             
@@ -778,9 +780,14 @@ class PerspyApp():
         # Load image with PIL
         path = self.doc.image_path
         try:
-            from imgui_bundle import hello_imgui
-             # to ensure asset exists
-            img = Image.open(hello_imgui.asset_file_full_path(path) )
+            if self.doc.image_data:
+                import io
+                path = "embedded image"
+                img = Image.open(io.BytesIO(self.doc.image_data))
+            else:
+                from imgui_bundle import hello_imgui
+                 # to ensure asset exists
+                img = Image.open(hello_imgui.asset_file_full_path(path) )
         except FileNotFoundError:
             logger.error(f"🚨|⚠️|💡|🔥 File not found: {path}")
             return
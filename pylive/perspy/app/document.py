@@ -1,6 +1,5 @@
 from pathlib import Path
 from imgui_bundle import imgui
-from PIL.Image import Image
 import glm
 import json
 import base64
@@ -10,10 +9,11 @@ from typing import List, Tuple
 from struct import pack, unpack
 
 from typing import Literal
-import pyperclip
 
 
 from pylive.perspy import solver
+from pylive.utils.lazy_import import lazy_import
+PIL_Image = lazy_import("PIL.Image") # loaded with the first image
 
 import logging
 
@@ -41,7 +41,7 @@ def json_serializer(obj):
         case imgui.ImVec4():
             return {'x': obj.x, 'y': obj.y, 'z': obj.z, 'w': obj.w}
         
-        case Image():
+        case PIL_Image.Image():
             image_embed_data = b''
             import io
             buffer = io.BytesIO()
@@ -52,6 +52,9 @@ def json_serializer(obj):
         case _:
             raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
+def deserialize_vec2(obj:dict)->imgui.ImVec2:
+    return imgui.ImVec2(obj['x'], obj['y'])
+
 from abc import ABC, abstractmethod
 
 class BaseDocument(ABC):
@@ -256,6 +259,7 @@ class PerspyDocument(BaseDocument):
         # - content image
         self.image_path: str|None = '0a42f3b2-dc40-4f26-bae7-a14eaacc9488-1757x2040.jpg'
         self.content_size = imgui.ImVec2(1757.000000, 2040.000000)
+        self.image_data: bytes|None = None # the encoded image embedded in the document, preferred over image_path
 
         # - solver params
         self.solver_mode=solver.types.SolverMode.ThreeVP
@@ -305,7 +309,7 @@ class PerspyDocument(BaseDocument):
 
     def serialize(self)->bytearray:
         data = {
-            'version': self._version,
+            'version': self.version(),
             'solver_params': {
                 "mode": solver.types.SolverMode(self.solver_mode).name,
                 "first_axis": solver.types.Axis(self.first_axis).name,
@@ -321,13 +325,15 @@ class PerspyDocument(BaseDocument):
                 "origin": self.origin,
                 "principal_point": self.principal,
                 "first_vanishing_lines": self.first_vanishing_lines,
-                "second_vanishing_lines": self.second_vanishing_lines
+                "second_vanishing_lines": self.second_vanishing_lines,
+                "third_vanishing_lines": self.third_vanishing_lines
             },
 
             'image_params': {
                 "path": self.image_path,
                 "width": int(self.content_size.x),
-                "height": int(self.content_size.y)
+                "height": int(self.content_size.y),
+                "embedded": {"size": len(self.image_data)} if self.image_data else None
             },
 
             # 'results': {
@@ -362,19 +368,21 @@ class PerspyDocument(BaseDocument):
         # Convert document data to JSON
         document_data = json.dumps(data, indent=4, default=json_serializer).encode('utf-8')
         
-        # Build complete file: header + document data
+        # Build complete file: header + document data + embedded image
         header = self._construct_header(len(document_data))
         
         file_bytes = bytearray()
         file_bytes.extend(header)          # 12 bytes: header
         file_bytes.extend(document_data)   # N bytes: JSON data
+        if self.image_data:
+            file_bytes.extend(self.image_data) # M bytes: encoded image, as is
 
         return file_bytes
 
     def deserialize(self, file_bytes: bytearray):
         """Deserialize complete file format to restore document state."""
         # Parse header and extract document data
-        document_data, _ = self._parse_header(file_bytes)
+        document_data, offset = self._parse_header(file_bytes)
         
         # Convert JSON data to string
         json_text = document_data.decode('utf-8')
@@ -413,6 +421,12 @@ class PerspyDocument(BaseDocument):
                     [deserialize_vec2(line[0]), deserialize_vec2(line[1])]
                     for line in cp['second_vanishing_lines']
                 ]
+
+            if 'third_vanishing_lines' in cp:
+                self.third_vanishing_lines = [
+                    (deserialize_vec2(line[0]), deserialize_vec2(line[1]))
+                    for line in cp['third_vanishing_lines']
+                ]
         
         # Load image params
         if 'image_params' in data:
@@ -422,6 +436,12 @@ class PerspyDocument(BaseDocument):
             height = ip.get('height', 576)
             self.content_size = imgui.ImVec2(width, height)
 
+            embedded = ip.get('embedded') or {}
+            size = embedded.get('size', 0)
+            if len(file_bytes) < offset + size:
+                raise ValueError(f"File truncated - expected {size} bytes of image, got {len(file_bytes) - offset}")
+            self.image_data = bytes(file_bytes[offset:offset+size]) if size else None
+
     def as_python_script(self):
         """Serialize document and copy to clipboard as base64 string."""
         from textwrap import dedent
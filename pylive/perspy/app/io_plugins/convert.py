@@ -0,0 +1,430 @@
+"""
+Convert fSpy projects to perspy documents and back, headless.
+
+Only the headers and the JSON states are parsed. The image bytes are copied
+from file to file in chunks, they are never decoded, re-encoded or held in
+memory whole. A perspy document carries the image after its JSON data, see
+PerspyDocument.serialize.
+
+Directories are converted in a process pool, with the time and the peak
+resident memory of each file.
+
+Usage:
+    python -m pylive.perspy.app.io_plugins.convert SOURCE TARGET [--to perspy|fspy] [--workers 8] [--overwrite]
+
+SOURCE is a file or a directory, searched recursively for .fspy and .prsy
+files. Without --to, .fspy files become .prsy and .prsy files become .fspy.
+"""
+
+from typing import *
+from dataclasses import dataclass
+from pathlib import Path
+from struct import pack, unpack
+from concurrent.futures import ProcessPoolExecutor
+import os
+import json
+import time
+import argparse
+
+from pylive.perspy.app.io_plugins.fspy import read_fspy_header, ParsingError, FSPY_MAGIC_NUMBER
+
+PERSPY_EXTENSION = '.prsy'
+FSPY_EXTENSION = '.fspy'
+PERSPY_MAGIC = b'prsy'
+PERSPY_VERSION = "0.5.0" # see PerspyDocument.version
+CHUNK_SIZE = 1 << 20
+
+
+##########
+# PERSPY #
+##########
+
+def read_perspy_header(perspy_path:str|Path)->dict:
+    """
+    Read the header and the JSON document of a perspy file, without reading the embedded image.
+
+    Returns:
+        dict: 'document', 'image_offset' and 'image_size'. image_size is 0 without an embedded image.
+    """
+    with open(perspy_path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12:
+            raise ParsingError(f"Not a valid perspy file (got {len(header)} bytes)")
+        magic, version, data_size = header[:4], *unpack('<II', header[4:])
+        if magic != PERSPY_MAGIC:
+            raise ParsingError(f"Not a valid perspy file (got magic: {magic})")
+        if version != int(PERSPY_VERSION.split('.')[0]):
+            raise ParsingError(f"Unsupported perspy version: {version}")
+
+        document_data = f.read(data_size)
+        if len(document_data) < data_size:
+            raise ParsingError("perspy file truncated in the document")
+        document = json.loads(document_data.decode('utf-8'))
+
+    embedded = document.get('image_params', {}).get('embedded') or {}
+    return {
+        'document': document,
+        'image_offset': 12 + data_size,
+        'image_size': embedded.get('size', 0)
+    }
+
+
+###########
+# MAPPING #
+###########
+
+_FSPY_AXES = {
+    'xPositive': 'PositiveX', 'xNegative': 'NegativeX',
+    'yPositive': 'PositiveY', 'yNegative': 'NegativeY',
+    'zPositive': 'PositiveZ', 'zNegative': 'NegativeZ'
+}
+_PERSPY_AXES = {name: fspy_name for fspy_name, name in _FSPY_AXES.items()}
+
+_FSPY_REFERENCE_AXES = {None: 'Screen', 'xAxis': 'X_Axis', 'yAxis': 'Y_Axis', 'zAxis': 'Z_Axis'}
+_PERSPY_REFERENCE_AXES = {name: fspy_name for fspy_name, name in _FSPY_REFERENCE_AXES.items()}
+
+def _points(value:Any)->List[dict]:
+    """fSpy stores point pairs as lists, or as objects with "0" and "1" keys"""
+    if isinstance(value, dict):
+        return [value[key] for key in sorted(value, key=int)]
+    return list(value)
+
+def _to_pixels(point:dict, width:float, height:float)->dict:
+    return {'x': point['x'] * width, 'y': point['y'] * height}
+
+def _to_relative(point:dict, width:float, height:float)->dict:
+    return {'x': point['x'] / width, 'y': point['y'] / height}
+
+def fspy_state_to_perspy_document(state:dict)->dict:
+    """
+    the perspy document of an fSpy state. fSpy control points are relative to the image size,
+    perspy control points are in pixels. fSpy solves the principal point from the third
+    vanishing point in the ThreeVP mode of perspy.
+    """
+    camera = state.get('cameraParameters') or {}
+    width, height = camera.get('imageWidth'), camera.get('imageHeight')
+    if not width or not height:
+        raise ParsingError("fSpy project has no image size")
+
+    settings = state['calibrationSettingsBase']
+    control_points = state['controlPointsStateBase']
+    if state['globalSettings']['calibrationMode'] == 'OneVanishingPoint':
+        mode = 'OneVP'
+        second_lines = [_points(state['controlPointsState1VP']['horizon'])]
+        third_lines = []
+    else:
+        second_state = state['controlPointsState2VP']
+        principal_mode = state.get('calibrationSettings2VP', {}).get('principalPointMode')
+        mode = 'ThreeVP' if principal_mode == 'FromThirdVanishingPoint' else 'TwoVP'
+        second_lines = [_points(segment) for segment in second_state['secondVanishingPoint']['lineSegments']]
+        third_lines = [_points(segment) for segment in second_state.get('thirdVanishingPoint', {}).get('lineSegments', [])]
+    first_lines = [_points(segment) for segment in control_points['firstVanishingPoint']['lineSegments']]
+
+    def lines_to_pixels(lines):
+        return [[_to_pixels(point, width, height) for point in line] for line in lines]
+
+    offsets = control_points.get('referenceDistanceHandleOffsets') or [0.0, 100.0]
+    return {
+        'version': PERSPY_VERSION,
+        'solver_params': {
+            "mode": mode,
+            "first_axis": _FSPY_AXES[settings['firstVanishingPointAxis']],
+            "second_axis": _FSPY_AXES[settings['secondVanishingPointAxis']],
+            "scene_scale": settings.get('referenceDistance', 1.0),
+            "fov_degrees": camera.get('verticalFieldOfView', 1.0) * 180.0 / 3.141592653589793,
+            "quad_mode": state.get('calibrationSettings2VP', {}).get('quadModeEnabled', False),
+            "reference_distance_mode": _FSPY_REFERENCE_AXES.get(settings.get('referenceDistanceAxis'), 'Screen'),
+            "reference_distance_segment": [offsets[0], offsets[1] - offsets[0]]
+        },
+        'control_points': {
+            "origin": _to_pixels(control_points['origin'], width, height),
+            "principal_point": _to_pixels(control_points['principalPoint'], width, height),
+            "first_vanishing_lines": lines_to_pixels(first_lines),
+            "second_vanishing_lines": lines_to_pixels(second_lines),
+            "third_vanishing_lines": lines_to_pixels(third_lines)
+        },
+        'image_params': {
+            "path": None,
+            "width": int(width),
+            "height": int(height)
+        }
+    }
+
+def perspy_document_to_fspy_state(document:dict)->dict:
+    """
+    the fSpy state of a perspy document. the camera is not solved,
+    fSpy solves it from the control points when the project is opened.
+    """
+    image = document['image_params']
+    width, height = image['width'], image['height']
+    solver_params = document['solver_params']
+    control_points = document['control_points']
+
+    def lines_to_relative(lines):
+        return [[_to_relative(point, width, height) for point in line] for line in lines]
+
+    mode = solver_params['mode']
+    first_lines = lines_to_relative(control_points['first_vanishing_lines'])
+    second_lines = lines_to_relative(control_points['second_vanishing_lines'])
+    third_lines = lines_to_relative(control_points.get('third_vanishing_lines', []))
+    offset, length = solver_params.get('reference_distance_segment', [0.0, 100.0])
+    return {
+        "globalSettings": {
+            "calibrationMode": 'OneVanishingPoint' if mode == 'OneVP' else 'TwoVanishingPoints',
+            "imageOpacity": 1.0,
+            "overlay3DGuide": "None"
+        },
+        "calibrationSettingsBase": {
+            "referenceDistanceAxis": _PERSPY_REFERENCE_AXES.get(solver_params.get('reference_distance_mode', 'Screen')),
+            "referenceDistance": solver_params.get('scene_scale', 1.0),
+            "referenceDistanceUnit": "Meters",
+            "cameraData": {
+                "presetId": "custom",
+                "customSensorWidth": 36,
+                "customSensorHeight": 24,
+                "presetData": None
+            },
+            "firstVanishingPointAxis": _PERSPY_AXES[solver_params['first_axis']],
+            "secondVanishingPointAxis": _PERSPY_AXES[solver_params['second_axis']]
+        },
+        "calibrationSettings1VP": {
+            "principalPointMode": "Default",
+            "upAxis": "zPositive",
+            "horizonMode": "Manual",
+            "absoluteFocalLength": 50
+        },
+        "calibrationSettings2VP": {
+            "principalPointMode": "FromThirdVanishingPoint" if mode == 'ThreeVP' else "Default",
+            "quadModeEnabled": solver_params.get('quad_mode', False)
+        },
+        "controlPointsStateBase": {
+            "principalPoint": _to_relative(control_points['principal_point'], width, height),
+            "origin": _to_relative(control_points['origin'], width, height),
+            "referenceDistanceAnchor": _to_relative(control_points['origin'], width, height),
+            "referenceDistanceHandleOffsets": [offset, offset + length],
+            "firstVanishingPoint": {"lineSegments": first_lines}
+        },
+        "controlPointsState1VP": {
+            "horizon": second_lines[0] if mode == 'OneVP' and second_lines else [{"x": 0.25, "y": 0.5}, {"x": 0.75, "y": 0.5}]
+        },
+        "controlPointsState2VP": {
+            "secondVanishingPoint": {"lineSegments": second_lines if mode != 'OneVP' else []},
+            "thirdVanishingPoint": {"lineSegments": third_lines}
+        },
+        "cameraParameters": None,
+        "resultDisplaySettings": {
+            "orientationFormat": "AxisAngleDegrees",
+            "principalPointFormat": "Absolute",
+            "fieldOfViewFormat": "Degrees",
+            "displayAbsoluteFocalLength": True
+        }
+    }
+
+
+##############
+# CONVERSION #
+##############
+
+def _sniff_image_format(head:bytes)->str|None:
+    match head:
+        case _ if head.startswith(b'\xff\xd8\xff'):
+            return 'jpeg'
+        case _ if head.startswith(b'\x89PNG\r\n\x1a\n'):
+            return 'png'
+        case _ if head[:4] in (b'II*\x00', b'MM\x00*'):
+            return 'tiff'
+        case _ if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+            return 'webp'
+        case _:
+            return None
+
+def _copy_range(source:BinaryIO, target:BinaryIO, size:int):
+    """copy size bytes from the current position of source, in chunks"""
+    buffer = bytearray(min(CHUNK_SIZE, max(size, 1)))
+    view = memoryview(buffer)
+    remaining = size
+    while remaining > 0:
+        count = source.readinto(view[:min(remaining, len(buffer))])
+        if not count:
+            raise ParsingError(f"image truncated, {remaining} of {size} bytes missing")
+        target.write(view[:count])
+        remaining -= count
+
+def _read_head(path:str|Path, offset:int, size:int=16)->bytes:
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return f.read(size)
+
+def fspy_to_perspy(source:str|Path, target:str|Path)->int:
+    """convert an fSpy project to a perspy document with the embedded image, return the image size"""
+    header = read_fspy_header(source)
+    document = fspy_state_to_perspy_document(header['state'])
+    image_size = header['image_size']
+    if image_size:
+        document['image_params']['embedded'] = {
+            "format": _sniff_image_format(_read_head(source, header['image_offset'])),
+            "size": image_size
+        }
+    document_data = json.dumps(document, indent=4).encode('utf-8')
+
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        dst.write(PERSPY_MAGIC)
+        dst.write(pack('<II', int(PERSPY_VERSION.split('.')[0]), len(document_data)))
+        dst.write(document_data)
+        src.seek(header['image_offset'])
+        _copy_range(src, dst, image_size)
+    return image_size
+
+def perspy_to_fspy(source:str|Path, target:str|Path)->int:
+    """
+    convert a perspy document to an fSpy project, return the image size.
+    the image is the embedded image, or the image file of the document, relative to the document.
+    """
+    header = read_perspy_header(source)
+    document = header['document']
+    state_json = json.dumps(perspy_document_to_fspy_state(document), separators=(',', ':')).encode('utf-8')
+
+    if header['image_size']:
+        image_path, image_offset, image_size = Path(source), header['image_offset'], header['image_size']
+    else:
+        path = document.get('image_params', {}).get('path')
+        if not path:
+            raise ParsingError("perspy document has no image, fSpy projects need one")
+        image_path = Path(source).parent / path
+        if not image_path.exists():
+            raise ParsingError(f"image not found: {image_path}")
+        image_offset, image_size = 0, image_path.stat().st_size
+
+    with open(image_path, 'rb') as src, open(target, 'wb') as dst:
+        dst.write(pack('<IIII', FSPY_MAGIC_NUMBER, 1, len(state_json), image_size))
+        dst.write(state_json)
+        src.seek(image_offset)
+        _copy_range(src, dst, image_size)
+    return image_size
+
+
+############
+# BATCHING #
+############
+
+@dataclass
+class ConversionResult:
+    source: str
+    target: str
+    seconds: float
+    image_size: int
+    peak_rss: int|None # bytes, the peak of the worker process so far. None where the resource module is missing
+    error: str|None = None
+
+def _peak_rss()->int|None:
+    try:
+        import resource
+    except ImportError: # windows
+        return None
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024 # kilobytes on linux
+
+def convert_file(source:str|Path, target:str|Path)->ConversionResult:
+    """convert a file by its extension, errors are returned in the result"""
+    start = time.perf_counter()
+    image_size, error = 0, None
+    try:
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        match Path(source).suffix.lower(), Path(target).suffix.lower():
+            case '.fspy', '.prsy':
+                image_size = fspy_to_perspy(source, target)
+            case '.prsy', '.fspy':
+                image_size = perspy_to_fspy(source, target)
+            case conversion:
+                raise ParsingError(f"Unsupported conversion: {conversion}")
+    except (ParsingError, OSError, KeyError, ValueError) as err:
+        error = f"{type(err).__name__}: {err}"
+    return ConversionResult(str(source), str(target), time.perf_counter() - start, image_size, _peak_rss(), error)
+
+def _convert_job(job:Tuple[str, str])->ConversionResult:
+    return convert_file(*job)
+
+def find_jobs(
+        source:str|Path,
+        target:str|Path,
+        to:Literal['perspy', 'fspy']|None=None,
+        overwrite:bool=False
+    )->List[Tuple[str, str]]:
+    """the source and target paths of the files to convert, the target tree mirrors the source tree"""
+    source, target = Path(source), Path(target)
+    suffixes = {FSPY_EXTENSION: PERSPY_EXTENSION, PERSPY_EXTENSION: FSPY_EXTENSION}
+    if to is not None:
+        target_suffix = PERSPY_EXTENSION if to == 'perspy' else FSPY_EXTENSION
+        suffixes = {suffix: target_suffix for suffix in suffixes if suffix != target_suffix}
+
+    if source.is_file():
+        files = [(source, target if target.suffix else target / source.name)]
+    else:
+        files = [(path, target / path.relative_to(source)) for path in sorted(source.rglob('*')) if path.is_file()]
+
+    jobs = []
+    for path, destination in files:
+        suffix = path.suffix.lower()
+        if suffix not in suffixes:
+            continue
+        if destination.suffix.lower() in suffixes or destination.suffix == '':
+            destination = destination.with_suffix(suffixes[suffix])
+        if not overwrite and destination.exists():
+            continue
+        jobs.append((str(path), str(destination)))
+    return jobs
+
+def convert_tree(
+        source:str|Path,
+        target:str|Path,
+        to:Literal['perspy', 'fspy']|None=None,
+        workers:int|None=None,
+        overwrite:bool=False
+    )->Iterator[ConversionResult]:
+    """convert the files under source into target in a process pool, yields the results in order"""
+    jobs = find_jobs(source, target, to, overwrite)
+    if workers == 1 or len(jobs) < 2:
+        for job in jobs:
+            yield _convert_job(job)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(64, len(jobs) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_convert_job, jobs, chunksize=chunksize)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source")
+    parser.add_argument("target")
+    parser.add_argument("--to", choices=['perspy', 'fspy'], default=None)
+    parser.add_argument("--workers", type=int, default=None, help="processes, defaults to the number of cpus")
+    parser.add_argument("--overwrite", action="store_true")
+    parser.add_argument("--quiet", action="store_true", help="only print the failures and the summary")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    converted, failed, image_bytes, peak_rss = 0, 0, 0, 0
+    for result in convert_tree(args.source, args.target, args.to, args.workers, args.overwrite):
+        rss = f"{result.peak_rss / 2**20:7.1f}MB" if result.peak_rss is not None else "      -"
+        if result.error:
+            failed += 1
+            print(f"FAILED {result.source}: {result.error}")
+        else:
+            converted += 1
+            image_bytes += result.image_size
+            if not args.quiet:
+                print(f"{result.seconds*1000:8.2f}ms  rss {rss}  {result.source} -> {result.target}")
+        peak_rss = max(peak_rss, result.peak_rss or 0)
+
+    seconds = time.perf_counter() - start
+    print(f"converted {converted} files, {failed} failed, {image_bytes / 2**20:.1f}MB of images in {seconds:.2f}s "
+          f"({converted / seconds if seconds else 0:.0f} files/s), peak worker rss {peak_rss / 2**20:.1f}MB")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -35,29 +35,65 @@ class CameraParameters:
 
 class Project:
   def __init__(self, project_path):
-    project_file = open(project_path, "rb")
-
-    file_id = unpack('<I', project_file.read(4))[0]
-    if 2037412710 != file_id:
-        raise ParsingError("Trying to import a file that is not an fSpy project")
-    self.project_version = unpack('<I', project_file.read(4))[0]
-    if self.project_version != 1:
-        raise ParsingError("Unsupported fSpy project file version " + str(self.project_version))
-
-    state_string_size = unpack('<I', project_file.read(4))[0]
-    image_buffer_size = unpack('<I', project_file.read(4))[0]
-
-    if image_buffer_size == 0:
+    header = read_fspy_header(project_path)
+    if header['image_size'] == 0:
         raise ParsingError("Trying to import an fSpy project with no image data")
 
-    project_file.seek(16)
-    state = json.loads(project_file.read(state_string_size).decode('utf-8'))
+    state = header['state']
+    self.project_version = header['version']
     self.camera_parameters = CameraParameters(state["cameraParameters"])
     calibration_settings = state["calibrationSettingsBase"]
     self.reference_distance_unit = calibration_settings["referenceDistanceUnit"]
-    self.image_data = project_file.read(image_buffer_size)
+    self.project_path = project_path
+    self.image_offset = header['image_offset']
+    self.image_size = header['image_size']
     self.file_name = os.path.basename(project_path)
 
+  @property
+  def image_data(self):
+    """the image bytes, read from the project file when accessed"""
+    with open(self.project_path, "rb") as project_file:
+        project_file.seek(self.image_offset)
+        return project_file.read(self.image_size)
+
+FSPY_MAGIC_NUMBER = int.from_bytes(b'fspy', byteorder='little')  # 2037412710
+
+def read_fspy_header(fspy_path):
+    """
+    Read the header and the JSON state of an fspy file, without reading the image.
+
+    Returns:
+        dict: A dictionary containing:
+            - 'state': The complete JSON state dictionary
+            - 'version': fSpy project version
+            - 'image_offset': Position of the image bytes in the file
+            - 'image_size': Size of the image bytes
+
+    Raises:
+        ParsingError: If file is not a valid fSpy project
+    """
+    with open(fspy_path, 'rb') as f:
+        header = f.read(16)
+        if len(header) < 16:
+            raise ParsingError(f"Not a valid fSpy file (got {len(header)} bytes)")
+        file_id, version, state_string_size, image_buffer_size = unpack('<IIII', header)
+        if file_id != FSPY_MAGIC_NUMBER:
+            raise ParsingError(f"Not a valid fSpy file (got file ID: {file_id})")
+        if version != 1:
+            raise ParsingError(f"Unsupported fSpy version: {version}")
+
+        state_json_bytes = f.read(state_string_size)
+        if len(state_json_bytes) < state_string_size:
+            raise ParsingError("fSpy file truncated in the state")
+        state = json.loads(state_json_bytes.decode('utf-8'))
+
+    return {
+        'state': state,
+        'version': version,
+        'image_offset': 16 + state_string_size,
+        'image_size': image_buffer_size
+    }
+
 def export_to_fspy(output_path, state_dict, image_data):
     """
     Create an fspy file from a state dictionary and image data.
@@ -139,33 +175,19 @@ def import_from_fspy(fspy_path):
         with open("extracted_image.jpg", "wb") as f:
             f.write(data['image_data'])
     """
+    header = read_fspy_header(fspy_path)
+    if header['image_size'] == 0:
+        raise ParsingError("fSpy project has no image data")
+    state = header['state']
+    version = header['version']
+
+    # Read image data
     with open(fspy_path, 'rb') as f:
-        # Read header
-        file_id = unpack('<I', f.read(4))[0]
-        FSPY_MAGIC_NUMBER = int.from_bytes(b'fspy', byteorder='little')  # 2037412710
-        if file_id != FSPY_MAGIC_NUMBER:
-            raise ParsingError(f"Not a valid fSpy file (got file ID: {file_id})")
-        
-        version = unpack('<I', f.read(4))[0]
-        if version != 1:
-            raise ParsingError(f"Unsupported fSpy version: {version}")
-        
-        state_string_size = unpack('<I', f.read(4))[0]
-        image_buffer_size = unpack('<I', f.read(4))[0]
-        
-        if image_buffer_size == 0:
-            raise ParsingError("fSpy project has no image data")
-        
-        # Read JSON state
-        f.seek(16)
-        state_json_bytes = f.read(state_string_size)
-        state = json.loads(state_json_bytes.decode('utf-8'))
-        
-        # Read image data
-        image_data = f.read(image_buffer_size)
+        f.seek(header['image_offset'])
+        image_data = f.read(header['image_size'])
     
     # Extract commonly used fields
-    camera_params = state.get("cameraParameters", {})
+    camera_params = state.get("cameraParameters") or {} # null when fSpy could not solve the camera
     principal_point_dict = camera_params.get("principalPoint", {"x": 0, "y": 0})
     calibration_settings = state.get("calibrationSettingsBase", {})
     
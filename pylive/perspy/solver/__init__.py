@@ -1,9 +1,13 @@
 from . import types
 from . import core
 from . import utils
+from . import sequence
+from . import synthetic
 
 __all__ = [
     'types',
     'core',
-    'utils'
-]
\ No newline at end of file
+    'utils',
+    'sequence',
+    'synthetic'
+]
@@ -0,0 +1,124 @@
+"""
+Per-frame cost of solve_sequence.
+
+Solves a synthetic plate: the camera looks down the corner of a cube and pans
+slowly, and the vanishing lines are the projected edges of the cube, with
+gaussian noise on the endpoints. Each mode is solved frame by frame, then as
+a sequence with shared intrinsics, then with smoothing. Reports the time per
+frame, the total time, and the mean rotation error against the plate camera.
+
+Usage:
+    python -m pylive.perspy.solver.benchmark_sequence [--frames 1000] [--noise 1.0] [--smoothing 0.8] [--seed 0]
+"""
+
+from typing import *
+import math
+import time
+import random
+import argparse
+import statistics
+import warnings
+
+from pyglm import glm
+
+from pylive.perspy.solver import core, sequence
+from pylive.perspy.solver.types import Rect, SolverMode, Axis
+
+VIEWPORT = Rect(0, 0, 1920, 1080)
+P = glm.vec2(960, 540)
+F = 1200.0
+BASE = glm.mat3_cast(glm.quat(glm.normalize(glm.vec3(1, 1, 1)), glm.vec3(0, 0, -1)))
+SOLVER_PARAMS = dict(
+    reference_axis=None,
+    reference_distance_segment=(0, 100),
+    reference_world_size=5.0,
+    first_axis=Axis.PositiveX,
+    second_axis=Axis.PositiveY
+)
+
+
+def plate_orientation(index:int, count:int)->glm.mat3:
+    pan = 0.3 * math.sin(math.pi * index / count)
+    return glm.mat3_cast(glm.angleAxis(pan, glm.vec3(0, 1, 0))) * BASE
+
+
+def make_frames(count:int, noise:float, rng:random.Random)->List[sequence.Frame]:
+    frames = []
+    for index in range(count):
+        R = plate_orientation(index, count)
+        lines = []
+        for axis in range(3):
+            vp = P + glm.vec2(R[axis].x, R[axis].y) * (-F / R[axis].z)
+            direction = glm.normalize(vp - P)
+            side = glm.vec2(-direction.y, direction.x)
+            axis_lines = []
+            for offset in (-400, 400):
+                A = P + side * offset - direction * 300
+                B = A + glm.normalize(vp - A) * 600
+                axis_lines.append((
+                    (A.x + rng.gauss(0, noise), A.y + rng.gauss(0, noise)),
+                    (B.x + rng.gauss(0, noise), B.y + rng.gauss(0, noise))
+                ))
+            lines.append(axis_lines)
+        frames.append(sequence.Frame(*lines, O=(900, 600)))
+    return frames
+
+
+def mean_rotation_error(views:List[glm.mat4])->float:
+    count = len(views)
+    errors = [
+        sequence._angle_between(glm.quat_cast(glm.mat3(view)), glm.quat_cast(plate_orientation(index, count)))
+        for index, view in enumerate(views)
+    ]
+    return math.degrees(statistics.mean(errors))
+
+
+def report(name:str, frame_seconds:List[float], total:float, error:float):
+    ordered = sorted(frame_seconds)
+    p95 = ordered[int(len(ordered) * 0.95)]
+    print(f"  {name:<22} frame mean {statistics.mean(frame_seconds)*1e6:7.1f}us  p95 {p95*1e6:7.1f}us  "
+          f"max {ordered[-1]*1e6:7.1f}us  total {total*1000:7.1f}ms  rotation error {error:6.3f}deg")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--noise", type=float, default=1.0)
+    parser.add_argument("--smoothing", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore') # the one vp solver warns on every frame
+    frames = make_frames(args.frames, args.noise, random.Random(args.seed))
+
+    for mode in SolverMode:
+        print(f"{mode.name} {args.frames} frames")
+
+        ### every frame on its own
+        frame_seconds, views = [], []
+        start = time.perf_counter()
+        for frame in frames:
+            frame_start = time.perf_counter()
+            _, view = core.solve(
+                mode, VIEWPORT,
+                frame.first_vanishing_lines,
+                frame.second_vanishing_lines,
+                frame.third_vanishing_lines,
+                f=F, P=P, O=frame.O, **SOLVER_PARAMS
+            )
+            frame_seconds.append(time.perf_counter() - frame_start)
+            views.append(view)
+        report("core.solve", frame_seconds, time.perf_counter() - start, mean_rotation_error(views))
+
+        ### as a sequence
+        for name, options in [
+            ("sequence", dict()),
+            ("sequence shared", dict(intrinsics='shared')),
+            ("sequence smoothed", dict(rotation_smoothing=args.smoothing, focal_smoothing=args.smoothing)),
+        ]:
+            solution = sequence.solve_sequence(mode, VIEWPORT, frames, f=F, **SOLVER_PARAMS, **options)
+            report(name, [frame.seconds for frame in solution.frames], solution.seconds, mean_rotation_error([frame.view for frame in solution.frames]))
+
+
+if __name__ == "__main__":
+    main()
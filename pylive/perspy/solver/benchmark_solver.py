@@ -0,0 +1,157 @@
+"""
+Accuracy and speed of core.solve on synthetic scenes.
+
+Solves seeded synthetic scenes (see synthetic.make_scene) for every solver
+mode and noise level, with every axis assignment and handedness, and cycles
+through the reference axes. Reports the distribution of the angular, focal
+and position errors, and the time per solve.
+
+The baseline in pylive/perspy/tests/solver_baseline.json gates regressions,
+test_solver_regression runs the suite with the settings of the baseline.
+
+Usage:
+    python -m pylive.perspy.solver.benchmark_solver [--scenes 4] [--seed 0] [--check] [--write-baseline]
+"""
+
+from typing import *
+from pathlib import Path
+import json
+import time
+import random
+import argparse
+import statistics
+import warnings
+
+from pylive.perspy.solver import core, synthetic
+from pylive.perspy.solver.types import SolverMode, ReferenceAxis
+from pylive.perspy.solver.exceptions import SolverError
+
+BASELINE_PATH = Path(__file__).parent.parent / "tests" / "solver_baseline.json"
+NOISE_LEVELS = [0.0, 0.5, 2.0] # pixels
+REFERENCE_AXES = [None, ReferenceAxis.X_Axis, ReferenceAxis.Y_Axis, ReferenceAxis.Z_Axis, ReferenceAxis.Screen]
+METRICS = ['angle', 'focal', 'position']
+
+# a regression is worse than the baseline by this factor, plus an absolute margin for the rounding of the noise free scenes
+ACCURACY_TOLERANCE = 1.5
+ACCURACY_MARGIN = {'angle': 1e-3, 'focal': 1e-5, 'position': 1e-4}
+
+
+def case_name(mode:SolverMode, noise:float)->str:
+    return f"{mode.name} noise={noise}"
+
+
+def percentile(ordered:List[float], fraction:float)->float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_suite(seed:int=0, scenes_per_assignment:int=4)->dict:
+    """solve the scenes of every case, and return the statistics by case"""
+    results = dict()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore') # the one vp solver warns about its orthogonalization
+        for mode in SolverMode:
+            for noise in NOISE_LEVELS:
+                rng = random.Random(f"{seed}-{mode.name}-{noise}")
+                errors:Dict[str, List[float]] = {metric: [] for metric in METRICS}
+                seconds:List[float] = []
+                failures = 0
+                scene_index = 0
+                for first_axis, second_axis in synthetic.axis_assignments():
+                    for handedness in ('right-handed', 'left-handed'):
+                        for _ in range(scenes_per_assignment):
+                            scene = synthetic.make_scene(
+                                rng, mode, first_axis, second_axis, handedness,
+                                noise=noise,
+                                reference_axis=REFERENCE_AXES[scene_index % len(REFERENCE_AXES)]
+                            )
+                            scene_index += 1
+                            args = scene.solve_args()
+                            start = time.perf_counter()
+                            try:
+                                projection, view = core.solve(**args)
+                            except SolverError:
+                                failures += 1
+                                continue
+                            seconds.append(time.perf_counter() - start)
+                            solve_errors = synthetic.measure_errors(scene, projection, view)
+                            for metric in METRICS:
+                                errors[metric].append(getattr(solve_errors, metric))
+
+                stats = {'scenes': scene_index, 'failures': failures}
+                for metric in METRICS:
+                    ordered = sorted(errors[metric])
+                    stats[metric] = {
+                        'median': statistics.median(ordered),
+                        'p95': percentile(ordered, 0.95),
+                        'max': ordered[-1]
+                    }
+                stats['us_per_solve'] = statistics.median(seconds) * 1e6
+                results[case_name(mode, noise)] = stats
+
+    return {
+        'settings': {'seed': seed, 'scenes_per_assignment': scenes_per_assignment},
+        'cases': results
+    }
+
+
+def check_baseline(results:dict, baseline:dict, speed_tolerance:float=2.0)->List[str]:
+    """the regressions of the results against the baseline, as messages"""
+    regressions = []
+    for name, expected in baseline['cases'].items():
+        if name not in results['cases']:
+            regressions.append(f"{name}: missing")
+            continue
+        actual = results['cases'][name]
+        if actual['failures'] > expected['failures']:
+            regressions.append(f"{name}: {actual['failures']} failed solves, baseline {expected['failures']}")
+        for metric in METRICS:
+            for stat in ('median', 'p95'):
+                limit = expected[metric][stat] * ACCURACY_TOLERANCE + ACCURACY_MARGIN[metric]
+                if actual[metric][stat] > limit:
+                    regressions.append(f"{name}: {metric} {stat} {actual[metric][stat]:.3g}, baseline {expected[metric][stat]:.3g}")
+        if actual['us_per_solve'] > expected['us_per_solve'] * speed_tolerance:
+            regressions.append(f"{name}: {actual['us_per_solve']:.1f}us per solve, baseline {expected['us_per_solve']:.1f}us")
+    return regressions
+
+
+def load_baseline(path:Path=BASELINE_PATH)->dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", type=int, default=4, help="scenes per axis assignment and handedness")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="compare with the baseline, exit with 1 on regressions")
+    parser.add_argument("--write-baseline", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_suite(args.seed, args.scenes)
+    print(f"{'case':<22} {'scenes':>6} {'failed':>6}  "
+          f"{'angle deg median/p95/max':>28}  {'focal median/p95/max':>28}  {'position median/p95/max':>28}  {'us/solve':>8}")
+    for name, stats in results['cases'].items():
+        columns = [
+            f"{stats[metric]['median']:8.2g} {stats[metric]['p95']:9.2g} {stats[metric]['max']:9.2g}"
+            for metric in METRICS
+        ]
+        print(f"{name:<22} {stats['scenes']:>6} {stats['failures']:>6}  " + "  ".join(f"{column:>28}" for column in columns) + f"  {stats['us_per_solve']:8.1f}")
+    print(f"total {time.perf_counter() - start:.2f}s")
+
+    if args.write_baseline:
+        with open(BASELINE_PATH, 'w') as file:
+            json.dump(results, file, indent=4)
+        print(f"wrote {BASELINE_PATH}")
+
+    if args.check:
+        regressions = check_baseline(results, load_baseline())
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise SystemExit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # standard library
 from typing import List, Tuple, Literal
+import math
 import warnings
 
 # third party library
@@ -153,11 +154,12 @@ def compute_vanishing_point(lines: List[Line2], EPSILON: float = 1e-6) -> Tuple[
         b = qx - px
         c = px * qy - qx * py
 
-        # # Optionally normalize coefficients so the error is actual Euclidean distance
-        # norm = 1.0 / glm.sqrt(a*a + b*b)
-        # a *= norm
-        # b *= norm
-        # c *= norm
+        # normalize coefficients so the error is actual Euclidean distance,
+        # and the determinant below does not scale with the length of the lines
+        norm = 1.0 / math.sqrt(a*a + b*b)
+        a *= norm
+        b *= norm
+        c *= norm
 
         S_aa += a * a
         S_ab += a * b
@@ -170,10 +172,16 @@ def compute_vanishing_point(lines: List[Line2], EPSILON: float = 1e-6) -> Tuple[
     det = S_aa * S_bb - S_ab * S_ab
     
     if abs(det) < EPSILON:
-        p1_x, p1_y = lines[0][0]
-        residual = abs(S_aa * p1_x + S_ab * p1_y + S_ac)
+        # the lines are collinear if they all pass through a point of the first line
+        x, y = lines[0][0]
+        residual = (x*x * S_aa + 
+                    y*y * S_bb + 
+                    2*x*y * S_ab + 
+                    2*x * S_ac + 
+                    2*y * S_bc + 
+                    S_cc)
         
-        if residual < EPSILON:
+        if residual < EPSILON * (1.0 + S_cc):
             raise VanishingLinesError("All Lines are collinear.")
         else:
             raise VanishingLinesError("All lines are parallel.")
@@ -409,8 +417,10 @@ def adjust_scale_to_reference_distance(
             reference_axis_vector = right
 
     # find reference axis in screen space
+    # step along the axis by a fraction of the camera distance, a unit step can pass behind the camera
+    step = glm.length(glm.vec3(view[3])) * 1e-3
     O_screen = glm.project(glm.vec3(0, 0, 0), view, projection, tuple(viewport)).xy
-    V_screen = glm.project(reference_axis_vector, view, projection, tuple(viewport)).xy
+    V_screen = glm.project(reference_axis_vector * step, view, projection, tuple(viewport)).xy
     dir_screen = glm.normalize(glm.vec2(V_screen.x - O_screen.x, V_screen.y - O_screen.y))
 
     # cast rayt from reference points in screen space to intersect with reference axis in world space
@@ -0,0 +1,388 @@
+"""
+Solve the camera of an image sequence.
+
+solve_sequence solves every frame like core.solve, from the vanishing lines of
+the frame, but the frames are not independent:
+- the intrinsics are either shared by the whole sequence, or vary slowly
+  between the frames,
+- a frame with degenerate vanishing lines holds the vanishing points of the
+  previous frame,
+- the orientations are kept on the same quaternion hemisphere as the previous
+  frame, so the exported rotation curves do not flip,
+- the rotations and the intrinsics can be smoothed on their manifolds, with a
+  forward-backward exponential filter that does not lag behind the plate.
+"""
+
+# standard library
+from typing import List, Tuple, Literal, Sequence
+from dataclasses import dataclass, field
+import math
+import time
+
+# third party library
+from pyglm import glm
+
+# local imports
+from .constants import DEFAULT_NEAR_PLANE, DEFAULT_FAR_PLANE
+from . import utils
+from . import helpers
+from . import core
+from . types import (
+    Point2,
+    Line2,
+    Rect,
+    SolverMode,
+    Axis,
+    ReferenceAxis
+)
+from . exceptions import VanishingLinesError
+
+
+#########
+# TYPES #
+#########
+
+@dataclass
+class Frame:
+    """the control points of a frame"""
+    first_vanishing_lines:  List[Line2]
+    second_vanishing_lines: List[Line2]
+    third_vanishing_lines:  List[Line2] = field(default_factory=list)
+    O: Point2|None = None # origin, the center of the viewport when None
+    P: Point2|None = None # principal point, the center of the viewport when None. solved in ThreeVP mode
+
+@dataclass
+class FrameSolution:
+    projection: glm.mat4
+    view: glm.mat4
+    f: float
+    P: glm.vec2
+    held: bool # the vanishing lines were degenerate, the vanishing points of the previous frame were used
+    rotation_correction: float # the angle between the solved and the smoothed orientation, in radians
+    seconds: float # the time spent solving the frame
+
+@dataclass
+class SequenceSolution:
+    viewport: Rect
+    frames: List[FrameSolution]
+    seconds: float # the total time, including the smoothing
+
+    def to_animated_camera(self, fps:float=24.0, start_frame:int=1)->dict:
+        """
+        The solved camera as keyframes, one for each frame.
+        The transform is the camera to world matrix, as rows.
+        The rotation quaternions are continuous, they can be interpolated componentwise.
+        """
+        keyframes = []
+        previous = None
+        for index, frame in enumerate(self.frames):
+            transform = glm.inverse(frame.view)
+            position, rotation = utils.decompose_extrinsics(transform)
+            if previous is not None and glm.dot(previous, rotation) < 0:
+                rotation = -rotation
+            previous = rotation
+            keyframes.append({
+                "frame": start_frame + index,
+                "fovy_degrees": math.degrees(utils.fov_from_focal_length(frame.f, self.viewport.height)),
+                "focal_length": frame.f,
+                "principal_point": [frame.P.x, frame.P.y],
+                "position": [position.x, position.y, position.z],
+                "rotation_quaternion": [rotation.w, rotation.x, rotation.y, rotation.z],
+                "transform": [[transform[col][row] for col in range(4)] for row in range(4)]
+            })
+
+        return {
+            "fps": fps,
+            "viewport": {"width": self.viewport.width, "height": self.viewport.height},
+            "keyframes": keyframes
+        }
+
+
+#########################
+# MAIN SOLVER FUNCTIONS #
+#########################
+
+def solve_sequence(
+        mode:SolverMode,
+        viewport:Rect,
+        frames:Sequence[Frame],
+
+        f:float, # focal length (in height units), only for OneVP
+
+        reference_axis:ReferenceAxis|None,
+        reference_distance_segment:Tuple[float, float],
+        reference_world_size:float,
+
+        first_axis:Axis,
+        second_axis:Axis,
+        handedness:Literal['right-handed', 'left-handed']="right-handed",
+
+        intrinsics:Literal['shared', 'varying']='varying',
+        rotation_smoothing:float=0.0,
+        focal_smoothing:float=0.0
+    )->SequenceSolution:
+    """
+    Solve the camera of each frame.
+
+    Args:
+        intrinsics: 'shared' solves one focal length (and principal point in ThreeVP mode)
+            for the sequence, the median of the frames. 'varying' solves them per frame.
+        rotation_smoothing: 0 to 1, the weight of the previous frame in the rotation filter.
+        focal_smoothing: 0 to 1, the weight of the previous frame in the filter of the
+            varying intrinsics, the focal length is filtered on a log scale.
+
+    Raises:
+        VanishingLinesError: if the vanishing lines of every frame are degenerate.
+    """
+    if not 0.0 <= rotation_smoothing < 1.0:
+        raise ValueError(f"rotation_smoothing must be in [0, 1), got: {rotation_smoothing}")
+    if not 0.0 <= focal_smoothing < 1.0:
+        raise ValueError(f"focal_smoothing must be in [0, 1), got: {focal_smoothing}")
+
+    start = time.perf_counter()
+    seconds = [0.0] * len(frames)
+    center = glm.vec2(*viewport.center)
+
+    ### vanishing points and intrinsics of each frame
+    vanishing_points:List[Tuple[glm.vec2, ...]|None] = []
+    focal_lengths:List[float] = []
+    principal_points:List[glm.vec2] = []
+    for index, frame in enumerate(frames):
+        frame_start = time.perf_counter()
+        P = glm.vec2(*frame.P) if frame.P is not None else center
+        try:
+            vps, frame_f, P = _solve_vanishing_points(mode, frame, f, P)
+        except VanishingLinesError:
+            vps, frame_f = None, f
+        vanishing_points.append(vps)
+        focal_lengths.append(frame_f)
+        principal_points.append(P)
+        seconds[index] += time.perf_counter() - frame_start
+
+    held = _hold_missing(vanishing_points, focal_lengths, principal_points)
+
+    ### intrinsics
+    if mode != SolverMode.OneVP:
+        match intrinsics:
+            case 'shared':
+                shared_f = math.exp(_median([math.log(value) for value in focal_lengths]))
+                focal_lengths = [shared_f] * len(frames)
+                if mode == SolverMode.ThreeVP:
+                    shared_P = glm.vec2(
+                        _median([P.x for P in principal_points]),
+                        _median([P.y for P in principal_points])
+                    )
+                    principal_points = [shared_P] * len(frames)
+            case 'varying':
+                log_f = _smooth_values([math.log(value) for value in focal_lengths], focal_smoothing)
+                focal_lengths = [math.exp(value) for value in log_f]
+                if mode == SolverMode.ThreeVP:
+                    xs = _smooth_values([P.x for P in principal_points], focal_smoothing)
+                    ys = _smooth_values([P.y for P in principal_points], focal_smoothing)
+                    principal_points = [glm.vec2(x, y) for x, y in zip(xs, ys)]
+            case _:
+                raise ValueError(f"intrinsics must be 'shared' or 'varying', got: {intrinsics}")
+
+    ### orientations, held frames hold the orientation of the solved frame
+    # Note: held frames may miss the lines of the orientation, eg. the second line in OneVP mode
+    solved_orientations:List[glm.quat|None] = []
+    previous:glm.quat|None = None
+    for index, frame in enumerate(frames):
+        if held[index]:
+            solved_orientations.append(None)
+            continue
+        frame_start = time.perf_counter()
+        orientation = _solve_orientation(mode, viewport, frame, vanishing_points[index], focal_lengths[index], principal_points[index])
+        rotation = glm.quat_cast(orientation)
+        if previous is not None and glm.dot(previous, rotation) < 0:
+            rotation = -rotation # warm start: the same hemisphere as the previous frame
+        solved_orientations.append(rotation)
+        previous = rotation
+        seconds[index] += time.perf_counter() - frame_start
+    orientations = _hold_orientations(solved_orientations)
+
+    smoothed = smooth_rotations(orientations, rotation_smoothing)
+
+    ### cameras
+    solutions:List[FrameSolution] = []
+    for index, frame in enumerate(frames):
+        frame_start = time.perf_counter()
+        frame_f, P = focal_lengths[index], principal_points[index]
+        O = glm.vec2(*frame.O) if frame.O is not None else center
+
+        projection = utils.compose_intrinsics(viewport, frame_f, P, DEFAULT_NEAR_PLANE, DEFAULT_FAR_PLANE)
+        view = glm.mat4(glm.mat3_cast(smoothed[index]))
+        view = core.adjust_position_to_origin(viewport, projection, O, view, distance=reference_world_size)
+        view = core.adjust_axis_assignment(first_axis, second_axis, view, handedness)
+        if reference_axis is not None:
+            view = core.adjust_scale_to_reference_distance(
+                viewport,
+                projection,
+                reference_world_size,
+                reference_axis,
+                reference_distance_segment,
+                view
+            )
+
+        seconds[index] += time.perf_counter() - frame_start
+        solutions.append(FrameSolution(
+            projection=projection,
+            view=view,
+            f=frame_f,
+            P=P,
+            held=held[index],
+            rotation_correction=_angle_between(orientations[index], smoothed[index]),
+            seconds=seconds[index]
+        ))
+
+    return SequenceSolution(viewport=viewport, frames=solutions, seconds=time.perf_counter() - start)
+
+
+#############
+# SMOOTHING #
+#############
+
+def smooth_rotations(rotations:Sequence[glm.quat], smoothing:float)->List[glm.quat]:
+    """
+    Exponential smoothing of the rotations on the unit quaternions, forward then backward,
+    so the smoothed rotations do not lag. smoothing is the weight of the previous frame.
+    """
+    if smoothing == 0.0 or len(rotations) < 2:
+        return list(rotations)
+
+    forward = [rotations[0]]
+    for rotation in rotations[1:]:
+        forward.append(glm.slerp(forward[-1], rotation, 1.0 - smoothing))
+
+    backward = [forward[-1]]
+    for rotation in reversed(forward[:-1]):
+        backward.append(glm.slerp(backward[-1], rotation, 1.0 - smoothing))
+    backward.reverse()
+
+    # slerp takes the shortest path, keep the result on the hemisphere of the input
+    return [-smoothed if glm.dot(smoothed, rotation) < 0 else smoothed for smoothed, rotation in zip(backward, rotations)]
+
+def _smooth_values(values:Sequence[float], smoothing:float)->List[float]:
+    """the forward-backward exponential smoothing of smooth_rotations, on the real line"""
+    if smoothing == 0.0 or len(values) < 2:
+        return list(values)
+
+    forward = [values[0]]
+    for value in values[1:]:
+        forward.append(smoothing * forward[-1] + (1.0 - smoothing) * value)
+
+    backward = [forward[-1]]
+    for value in reversed(forward[:-1]):
+        backward.append(smoothing * backward[-1] + (1.0 - smoothing) * value)
+    backward.reverse()
+    return backward
+
+
+###########
+# HELPERS #
+###########
+
+def _solve_vanishing_points(mode:SolverMode, frame:Frame, f:float, P:glm.vec2)->Tuple[Tuple[glm.vec2, ...], float, glm.vec2]:
+    """the vanishing points, focal length and principal point of a frame"""
+    match mode:
+        case SolverMode.OneVP:
+            vp1 = glm.vec2(*core.compute_vanishing_point(frame.first_vanishing_lines))
+            if len(frame.second_vanishing_lines) < 1:
+                raise VanishingLinesError("A second vanishing line is required.")
+            return (vp1,), f, P
+
+        case SolverMode.TwoVP:
+            vp1 = glm.vec2(*core.compute_vanishing_point(frame.first_vanishing_lines))
+            vp2 = glm.vec2(*core.compute_vanishing_point(frame.second_vanishing_lines))
+            f = helpers.compute_focal_length_from_vanishing_points(Fu=vp1, Fv=vp2, P=P)
+            return (vp1, vp2), f, P
+
+        case SolverMode.ThreeVP:
+            vp1 = glm.vec2(*core.compute_vanishing_point(frame.first_vanishing_lines))
+            vp2 = glm.vec2(*core.compute_vanishing_point(frame.second_vanishing_lines))
+            vp3 = glm.vec2(*core.compute_vanishing_point(frame.third_vanishing_lines))
+            P = utils.triangle_orthocenter(vp1, vp2, vp3)
+            f = helpers.compute_focal_length_from_vanishing_points(Fu=vp1, Fv=vp2, P=P)
+            return (vp1, vp2, vp3), f, P
+
+        case _:
+            raise ValueError(f"Unknown solver mode: {mode}")
+
+def _hold_missing(
+        vanishing_points:List[Tuple[glm.vec2, ...]|None],
+        focal_lengths:List[float],
+        principal_points:List[glm.vec2]
+    )->List[bool]:
+    """
+    replace the frames with degenerate vanishing lines with the previous solved frame in place.
+    the frames before the first solved frame hold the first solved frame.
+    """
+    held = [vps is None for vps in vanishing_points]
+    solved = [index for index, missing in enumerate(held) if not missing]
+    if not solved:
+        raise VanishingLinesError("The vanishing lines of every frame are degenerate.")
+
+    source = solved[0]
+    for index in range(len(vanishing_points)):
+        if held[index]:
+            vanishing_points[index] = vanishing_points[source]
+            focal_lengths[index] = focal_lengths[source]
+            principal_points[index] = principal_points[source]
+        else:
+            source = index
+    return held
+
+def _hold_orientations(orientations:List[glm.quat|None])->List[glm.quat]:
+    """the held frames (None) take the orientation of the previous solved frame, or of the first solved frame"""
+    source = next(rotation for rotation in orientations if rotation is not None)
+    held:List[glm.quat] = []
+    for rotation in orientations:
+        if rotation is not None:
+            source = rotation
+        held.append(source)
+    return held
+
+def _solve_orientation(
+        mode:SolverMode,
+        viewport:Rect,
+        frame:Frame,
+        vanishing_points:Tuple[glm.vec2, ...],
+        f:float,
+        P:glm.vec2
+    )->glm.mat3:
+    """the orientation of a frame with the given intrinsics, see core.orientation_from_*"""
+    match mode:
+        case SolverMode.OneVP:
+            _, view = core.orientation_from_one_vanishing_point(
+                viewport,
+                vp1=vanishing_points[0],
+                second_line=frame.second_vanishing_lines[0],
+                f=f,
+                P=P
+            )
+            orientation = glm.mat3(view)
+        case _:
+            orientation = core._impl_compute_orientation_from_two_vanishing_points(
+                Fu=vanishing_points[0],
+                Fv=vanishing_points[1],
+                P=P,
+                f=f
+            )
+
+    # the vanishing points are not orthogonal with the shared or smoothed focal length
+    if not utils.validate_orthogonality(orientation):
+        orientation = utils.apply_gram_schmidt_orthogonalization(orientation)
+    return orientation
+
+def _median(values:Sequence[float])->float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+def _angle_between(a:glm.quat, b:glm.quat)->float:
+    """the rotation angle from a to b, precise for small angles unlike the acos of the dot product"""
+    if glm.dot(a, b) < 0:
+        b = -b
+    return 4.0 * math.asin(min(1.0, glm.length(a - b) / 2.0))
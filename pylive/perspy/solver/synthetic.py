@@ -0,0 +1,226 @@
+"""
+Synthetic scenes with a known camera, to measure the solver against.
+
+make_scene samples a camera looking at the corner of a box, renders segments
+parallel to the world axes to vanishing lines with glm.project, and adds
+gaussian noise to the endpoints. The scene holds every argument of core.solve,
+so a scene can be solved with `core.solve(**scene.solve_args())`, and
+measure_errors compares the solved camera with the scene camera.
+"""
+
+# standard library
+from typing import List, Tuple, Literal
+from dataclasses import dataclass
+import math
+import random
+
+# third party library
+from pyglm import glm
+
+# local imports
+from .constants import DEFAULT_NEAR_PLANE, DEFAULT_FAR_PLANE
+from . import utils
+from . import core
+from . types import (
+    Line2,
+    Rect,
+    SolverMode,
+    Axis,
+    ReferenceAxis
+)
+
+
+#########
+# TYPES #
+#########
+
+@dataclass
+class SyntheticScene:
+    mode: SolverMode
+    viewport: Rect
+    view: glm.mat4 # the camera to solve
+    projection: glm.mat4
+    f: float
+    P: glm.vec2
+    O: glm.vec2
+    first_vanishing_lines:  List[Line2]
+    second_vanishing_lines: List[Line2]
+    third_vanishing_lines:  List[Line2]
+    reference_axis: ReferenceAxis|None
+    reference_distance_segment: Tuple[float, float]
+    reference_world_size: float
+    first_axis: Axis
+    second_axis: Axis
+    handedness: Literal['right-handed', 'left-handed']
+
+    def solve_args(self)->dict:
+        """the arguments of core.solve"""
+        return dict(
+            mode=self.mode,
+            viewport=self.viewport,
+            first_vanishing_lines=self.first_vanishing_lines,
+            second_vanishing_lines=self.second_vanishing_lines,
+            third_vanishing_lines=self.third_vanishing_lines,
+            f=self.f,
+            P=self.P,
+            O=self.O,
+            reference_axis=self.reference_axis,
+            reference_distance_segment=self.reference_distance_segment,
+            reference_world_size=self.reference_world_size,
+            first_axis=self.first_axis,
+            second_axis=self.second_axis,
+            handedness=self.handedness
+        )
+
+@dataclass
+class SolveErrors:
+    angle: float # the angle between the solved and the scene orientation, in degrees
+    focal: float # the relative error of the focal length
+    position: float # the distance between the solved and the scene camera, relative to the distance to the origin
+
+
+###################
+# SCENE GENERATOR #
+###################
+
+def axis_assignments()->List[Tuple[Axis, Axis]]:
+    """every valid first and second axis pair, see core.create_axis_assignment_matrix"""
+    return [
+        (first, second)
+        for first in Axis
+        for second in Axis
+        if first // 2 != second // 2
+    ]
+
+def make_scene(
+        rng:random.Random,
+        mode:SolverMode,
+        first_axis:Axis=Axis.PositiveX,
+        second_axis:Axis=Axis.PositiveY,
+        handedness:Literal['right-handed', 'left-handed']='right-handed',
+        noise:float=0.0, # standard deviation of the endpoints, in pixels
+        lines_per_axis:int=2,
+        viewport:Rect=Rect(0, 0, 1920, 1080),
+        reference_axis:ReferenceAxis|None=None
+    )->SyntheticScene:
+    """
+    sample a camera, and render its vanishing lines.
+    the camera looks at the corner between the first and the second axis, both vanishing points are
+    in front of the camera. in ThreeVP mode the camera is pitched, so the third vanishing point is finite.
+    """
+    ### intrinsics
+    fovy = math.radians(rng.uniform(30, 75))
+    f = utils.focal_length_from_fov(fovy, viewport.height)
+    center = glm.vec2(*viewport.center)
+    P = center if mode == SolverMode.ThreeVP else center + glm.vec2(rng.uniform(-0.05, 0.05) * viewport.width, rng.uniform(-0.05, 0.05) * viewport.height)
+    projection = utils.compose_intrinsics(viewport, f, P, DEFAULT_NEAR_PLANE, DEFAULT_FAR_PLANE)
+
+    ### orientation, in the space of the vanishing points (see core._impl_compute_orientation_from_two_vanishing_points)
+    forward = glm.normalize(glm.vec3(-1, 0, -1))
+    if mode == SolverMode.OneVP:
+        # the one point solver keeps the third axis up, on the +y of the camera
+        up = glm.vec3(0, 1, 0)
+        corner = glm.mat3(forward, glm.cross(up, forward), up)
+    else:
+        right = glm.normalize(glm.vec3(1, 0, -1))
+        corner = glm.mat3(forward, right, glm.cross(forward, right))
+
+    pitch_range = (15, 35) if mode == SolverMode.ThreeVP else (0, 25)
+    yaw = math.radians(rng.uniform(-30, 30))
+    pitch = math.radians(rng.uniform(*pitch_range) * rng.choice((-1, 1)))
+    roll = math.radians(rng.uniform(-10, 10))
+    rotation = glm.mat3(
+        glm.rotate(roll, glm.vec3(0, 0, 1)) *
+        glm.rotate(pitch, glm.vec3(1, 0, 0)) *
+        glm.rotate(yaw, glm.vec3(0, 1, 0))
+    ) * corner
+
+    ### extrinsics, the origin is in front of the camera, under O
+    distance = rng.uniform(3, 10)
+    O = center + glm.vec2(rng.uniform(-0.25, 0.25) * viewport.width, rng.uniform(-0.25, 0.25) * viewport.height)
+    origin = glm.normalize(glm.vec3((O - P) / f, -1.0)) * distance
+    assignment = core.create_axis_assignment_matrix(first_axis, second_axis, handedness)
+    view = glm.translate(origin) * glm.mat4(rotation * glm.inverse(assignment))
+
+    ### vanishing lines, the segments are parallel to the world axes, around the origin
+    def render_lines(axis:int, count:int)->List[Line2]:
+        direction = assignment[axis]
+        lines = []
+        while len(lines) < count:
+            start = glm.vec3(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1)) * distance * 0.3
+            end = start + direction * distance * rng.uniform(0.3, 0.6)
+            if min(glm.vec3(view * glm.vec4(point, 1.0)).z for point in (start, end)) > -DEFAULT_NEAR_PLANE * 10:
+                continue # behind the camera
+            A, B = (glm.vec2(glm.project(point, view, projection, glm.vec4(*viewport))) for point in (start, end))
+            if glm.distance(A, B) < 50:
+                continue # too short to tell the direction
+            if any(abs(_cross2(B - A, glm.vec2(*Q) - glm.vec2(*R))) / glm.distance(A, B) / glm.distance(glm.vec2(*Q), glm.vec2(*R)) < math.sin(math.radians(2)) for R, Q in lines):
+                continue # almost collinear with another line, the vanishing point is ill-conditioned
+            lines.append((
+                (A.x + rng.gauss(0, noise), A.y + rng.gauss(0, noise)),
+                (B.x + rng.gauss(0, noise), B.y + rng.gauss(0, noise))
+            ))
+        return lines
+
+    first_vanishing_lines = render_lines(0, lines_per_axis)
+    second_vanishing_lines = render_lines(1, 1 if mode == SolverMode.OneVP else lines_per_axis)
+    third_vanishing_lines = render_lines(2, lines_per_axis) if mode == SolverMode.ThreeVP else []
+
+    ### reference distance, the length of the world size along the reference axis on the screen
+    reference_world_size = distance
+    reference_distance_segment = (0.0, 100.0)
+    if reference_axis is not None:
+        reference_world_size = rng.uniform(0.5, 2.0)
+        match reference_axis:
+            case ReferenceAxis.X_Axis:
+                end = glm.vec3(reference_world_size, 0, 0)
+            case ReferenceAxis.Y_Axis:
+                end = glm.vec3(0, reference_world_size, 0)
+            case ReferenceAxis.Z_Axis:
+                end = glm.vec3(0, 0, reference_world_size)
+            case ReferenceAxis.Screen | _:
+                end = glm.vec3(glm.inverse(view)[0]) * reference_world_size
+        O_screen = glm.vec2(glm.project(glm.vec3(0), view, projection, glm.vec4(*viewport)))
+        end_screen = glm.vec2(glm.project(end, view, projection, glm.vec4(*viewport)))
+        reference_distance_segment = (0.0, glm.distance(O_screen, end_screen))
+
+    return SyntheticScene(
+        mode=mode,
+        viewport=viewport,
+        view=view,
+        projection=projection,
+        f=f,
+        P=P,
+        O=O,
+        first_vanishing_lines=first_vanishing_lines,
+        second_vanishing_lines=second_vanishing_lines,
+        third_vanishing_lines=third_vanishing_lines,
+        reference_axis=reference_axis,
+        reference_distance_segment=reference_distance_segment,
+        reference_world_size=reference_world_size,
+        first_axis=first_axis,
+        second_axis=second_axis,
+        handedness=handedness
+    )
+
+def measure_errors(scene:SyntheticScene, projection:glm.mat4, view:glm.mat4)->SolveErrors:
+    """compare a solved camera with the camera of the scene"""
+    solved_rotation = glm.quat_cast(glm.mat3(view))
+    scene_rotation = glm.quat_cast(glm.mat3(scene.view))
+    if glm.dot(solved_rotation, scene_rotation) < 0:
+        scene_rotation = -scene_rotation
+    angle = 4.0 * math.asin(min(1.0, glm.length(solved_rotation - scene_rotation) / 2.0)) # precise for small angles
+
+    _, solved_f = utils.decompose_intrinsics(scene.viewport, projection)
+
+    solved_position = glm.vec3(glm.inverse(view)[3])
+    scene_position = glm.vec3(glm.inverse(scene.view)[3])
+
+    return SolveErrors(
+        angle=math.degrees(angle),
+        focal=abs(solved_f - scene.f) / scene.f,
+        position=glm.distance(solved_position, scene_position) / glm.length(scene_position)
+    )
+
+def _cross2(u:glm.vec2, v:glm.vec2)->float:
+    return u.x * v.y - u.y * v.x
@@ -440,14 +440,15 @@ def decompose_intrinsics(viewport:Rect, projection:glm.mat4)->Tuple[glm.vec2, fl
     :rtype: Tuple[Any, float, Any]
     
     """ 
-    left, right, top, bottom, near, far = decompose_frustum(projection)
-    Ppx = ((right + left) / (top - bottom)) * near
-    Ppy = ((top + bottom) / (top - bottom)) * near
+    left, right, bottom, top, near, far = decompose_frustum(projection)
+    # the lens shift of compose_intrinsics, in half viewport units
+    shift_x = (right + left) / (right - left)
+    shift_y = (top + bottom) / (top - bottom)
     P = glm.vec2(
-        viewport.center[0] - (Ppx / near) * (viewport.height / 2),
-        viewport.center[1] + (Ppy / near) * (viewport.height / 2)
+        viewport.center[0] - shift_x * (viewport.width / 2),
+        viewport.center[1] - shift_y * (viewport.height / 2)
     )
-    f = near/(bottom-top) * viewport.height
+    f = near/(top-bottom) * viewport.height
     return P, f
 
 def decompose_extrinsics(view)->Tuple[glm.vec3, glm.quat]:
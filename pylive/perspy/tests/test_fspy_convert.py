@@ -0,0 +1,175 @@
+import pytest
+import io
+import json
+from pathlib import Path
+
+from PIL import Image
+
+from pylive.perspy.app.io_plugins import convert
+from pylive.perspy.app.io_plugins.fspy import export_to_fspy, read_fspy_header, import_from_fspy, Project, ParsingError
+
+
+def make_image(width:int=64, height:int=48)->bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 100, 50)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def make_state(width:int=64, height:int=48, mode:str='TwoVanishingPoints')->dict:
+    def segment(x0, y0, x1, y1):
+        return [{"x": x0, "y": y0}, {"x": x1, "y": y1}]
+    return {
+        "globalSettings": {"calibrationMode": mode},
+        "calibrationSettingsBase": {
+            "referenceDistanceAxis": "yAxis",
+            "referenceDistance": 2.5,
+            "referenceDistanceUnit": "Meters",
+            "firstVanishingPointAxis": "xNegative",
+            "secondVanishingPointAxis": "yPositive"
+        },
+        "calibrationSettings2VP": {"principalPointMode": "FromThirdVanishingPoint", "quadModeEnabled": False},
+        "controlPointsStateBase": {
+            "principalPoint": {"x": 0.5, "y": 0.5},
+            "origin": {"x": 0.25, "y": 0.75},
+            "referenceDistanceHandleOffsets": [10.0, 110.0],
+            "firstVanishingPoint": {"lineSegments": [segment(0.1, 0.2, 0.3, 0.4), segment(0.1, 0.8, 0.3, 0.6)]}
+        },
+        "controlPointsState1VP": {"horizon": {"0": {"x": 0.2, "y": 0.5}, "1": {"x": 0.8, "y": 0.5}}},
+        "controlPointsState2VP": {
+            "secondVanishingPoint": {"lineSegments": [segment(0.9, 0.2, 0.7, 0.4), segment(0.9, 0.8, 0.7, 0.6)]},
+            "thirdVanishingPoint": {"lineSegments": [segment(0.4, 0.1, 0.45, 0.9), segment(0.6, 0.1, 0.55, 0.9)]}
+        },
+        "cameraParameters": {
+            "principalPoint": {"x": 0, "y": 0},
+            "horizontalFieldOfView": 1.0,
+            "verticalFieldOfView": 0.8,
+            "cameraTransform": {"rows": [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 5], [0, 0, 0, 1]]},
+            "imageWidth": width,
+            "imageHeight": height
+        }
+    }
+
+def assert_segments_equal(segments, expected):
+    assert len(segments) == len(expected)
+    for segment, expected_segment in zip(segments, expected):
+        for point, expected_point in zip(segment, expected_segment):
+            assert (point['x'], point['y']) == pytest.approx((expected_point['x'], expected_point['y']))
+
+@pytest.fixture
+def fspy_file(tmp_path:Path)->Path:
+    path = tmp_path / "scene.fspy"
+    export_to_fspy(path, make_state(), make_image())
+    return path
+
+
+def test_fspy_header_does_not_read_the_image(fspy_file:Path):
+    header = read_fspy_header(fspy_file)
+    assert header['image_size'] == len(make_image())
+    assert header['image_offset'] + header['image_size'] == fspy_file.stat().st_size
+
+    project = Project(fspy_file)
+    assert project.image_data == make_image() # read on access
+
+def test_fspy_header_errors(tmp_path:Path):
+    path = tmp_path / "broken.fspy"
+    path.write_bytes(b'fspy')
+    with pytest.raises(ParsingError):
+        read_fspy_header(path)
+
+    path.write_bytes(b'nope' + bytes(12))
+    with pytest.raises(ParsingError):
+        read_fspy_header(path)
+
+def test_fspy_to_perspy(fspy_file:Path, tmp_path:Path):
+    target = tmp_path / "scene.prsy"
+    image_size = convert.fspy_to_perspy(fspy_file, target)
+    assert image_size == len(make_image())
+
+    header = convert.read_perspy_header(target)
+    document = header['document']
+    assert document['solver_params']['mode'] == 'ThreeVP'
+    assert document['solver_params']['first_axis'] == 'NegativeX'
+    assert document['solver_params']['reference_distance_mode'] == 'Y_Axis'
+    assert document['solver_params']['reference_distance_segment'] == [10.0, 100.0]
+    assert document['control_points']['origin'] == {'x': 16.0, 'y': 36.0} # in pixels
+    assert len(document['control_points']['third_vanishing_lines']) == 2
+    assert document['image_params']['embedded'] == {'format': 'png', 'size': image_size}
+
+    with open(target, 'rb') as f:
+        f.seek(header['image_offset'])
+        assert f.read() == make_image() # the bytes, not a re-encoded image
+
+def test_one_vanishing_point_horizon(tmp_path:Path):
+    source = tmp_path / "one.fspy"
+    export_to_fspy(source, make_state(mode='OneVanishingPoint'), make_image())
+    target = tmp_path / "one.prsy"
+    convert.fspy_to_perspy(source, target)
+
+    control_points = convert.read_perspy_header(target)['document']['control_points']
+    assert control_points['second_vanishing_lines'] == [[{'x': 12.8, 'y': 24.0}, {'x': 51.2, 'y': 24.0}]]
+
+def test_round_trip(fspy_file:Path, tmp_path:Path):
+    perspy_file = tmp_path / "scene.prsy"
+    back = tmp_path / "back.fspy"
+    convert.fspy_to_perspy(fspy_file, perspy_file)
+    convert.perspy_to_fspy(perspy_file, back)
+
+    project = import_from_fspy(back)
+    state = project['state']
+    assert project['image_data'] == make_image()
+    original = make_state()
+    assert state['globalSettings']['calibrationMode'] == 'TwoVanishingPoints'
+    assert state['calibrationSettings2VP']['principalPointMode'] == 'FromThirdVanishingPoint'
+    assert state['calibrationSettingsBase']['referenceDistanceAxis'] == 'yAxis'
+    assert state['controlPointsStateBase']['referenceDistanceHandleOffsets'] == [10.0, 110.0]
+    assert_segments_equal(
+        state['controlPointsStateBase']['firstVanishingPoint']['lineSegments'],
+        original['controlPointsStateBase']['firstVanishingPoint']['lineSegments']
+    )
+    for vanishing_point in ('secondVanishingPoint', 'thirdVanishingPoint'):
+        assert_segments_equal(
+            state['controlPointsState2VP'][vanishing_point]['lineSegments'],
+            original['controlPointsState2VP'][vanishing_point]['lineSegments']
+        )
+
+def test_perspy_without_image(tmp_path:Path, fspy_file:Path):
+    perspy_file = tmp_path / "scene.prsy"
+    convert.fspy_to_perspy(fspy_file, perspy_file)
+
+    ### rewrite the document with a linked image, next to the document
+    document = convert.read_perspy_header(perspy_file)['document']
+    document['image_params']['embedded'] = None
+    document['image_params']['path'] = "image.png"
+    data = json.dumps(document).encode('utf-8')
+    linked = tmp_path / "linked.prsy"
+    linked.write_bytes(b'prsy' + (0).to_bytes(4, 'little') + len(data).to_bytes(4, 'little') + data)
+
+    with pytest.raises(ParsingError):
+        convert.perspy_to_fspy(linked, tmp_path / "linked.fspy")
+
+    (tmp_path / "image.png").write_bytes(make_image())
+    convert.perspy_to_fspy(linked, tmp_path / "linked.fspy")
+    assert import_from_fspy(tmp_path / "linked.fspy")['image_data'] == make_image()
+
+def test_convert_tree(tmp_path:Path):
+    source = tmp_path / "source"
+    for index in range(6):
+        folder = source / f"shot_{index % 2}"
+        folder.mkdir(parents=True, exist_ok=True)
+        export_to_fspy(folder / f"frame_{index}.fspy", make_state(), make_image())
+    (source / "notes.txt").write_text("not a project")
+    (source / "shot_0" / "broken.fspy").write_bytes(b'broken')
+
+    results = list(convert.convert_tree(source, tmp_path / "target", to='perspy', workers=2))
+    assert len(results) == 7
+    failed = [result for result in results if result.error]
+    assert [Path(result.source).name for result in failed] == ["broken.fspy"]
+    for result in results:
+        if not result.error:
+            assert Path(result.target).suffix == '.prsy'
+            assert Path(result.target).parent.name == Path(result.source).parent.name # the tree is mirrored
+            assert result.seconds > 0
+    assert (tmp_path / "target" / "shot_1" / "frame_3.prsy").exists()
+
+    ### existing targets are skipped, the failed file is retried
+    again = list(convert.convert_tree(source, tmp_path / "target", to='perspy', workers=1))
+    assert [Path(result.source).name for result in again] == ["broken.fspy"]
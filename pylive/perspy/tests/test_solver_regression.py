@@ -0,0 +1,38 @@
+import pytest
+import random
+import warnings
+
+from pylive.perspy.solver import core, synthetic, benchmark_solver
+from pylive.perspy.solver.types import SolverMode, ReferenceAxis
+
+
+@pytest.mark.parametrize("mode", list(SolverMode))
+def test_every_axis_assignment(mode):
+    rng = random.Random(mode.name)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for first_axis, second_axis in synthetic.axis_assignments():
+            for handedness in ('right-handed', 'left-handed'):
+                for reference_axis in (None, ReferenceAxis.X_Axis, ReferenceAxis.Screen):
+                    scene = synthetic.make_scene(rng, mode, first_axis, second_axis, handedness, reference_axis=reference_axis)
+                    projection, view = core.solve(**scene.solve_args())
+                    errors = synthetic.measure_errors(scene, projection, view)
+                    case = (first_axis.name, second_axis.name, handedness, reference_axis)
+                    assert errors.angle < 0.01, case
+                    assert errors.focal < 1e-4, case
+                    assert errors.position < 1e-3, case
+
+
+def test_scenes_are_seeded():
+    a = synthetic.make_scene(random.Random(1), SolverMode.ThreeVP, noise=1.0)
+    b = synthetic.make_scene(random.Random(1), SolverMode.ThreeVP, noise=1.0)
+    assert a.first_vanishing_lines == b.first_vanishing_lines
+    assert a.third_vanishing_lines == b.third_vanishing_lines
+
+
+def test_no_regressions_against_baseline():
+    baseline = benchmark_solver.load_baseline()
+    results = benchmark_solver.run_suite(**baseline['settings'])
+    # the baseline timings are from a developer machine, only catch gross slowdowns here
+    regressions = benchmark_solver.check_baseline(results, baseline, speed_tolerance=3.0)
+    assert not regressions, "\n".join(regressions)
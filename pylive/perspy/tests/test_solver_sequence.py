@@ -0,0 +1,174 @@
+import pytest
+import math
+import random
+from pyglm import glm
+
+from pylive.perspy.solver import core, sequence
+from pylive.perspy.solver.types import Rect, SolverMode, Axis, ReferenceAxis
+from pylive.perspy.solver.exceptions import VanishingLinesError
+
+VIEWPORT = Rect(0, 0, 1920, 1080)
+P = glm.vec2(960, 540)
+F = 1200.0
+
+# looking down the corner of a cube, every axis has a vanishing point in front of the camera
+BASE = glm.mat3_cast(glm.quat(glm.normalize(glm.vec3(1, 1, 1)), glm.vec3(0, 0, -1)))
+
+SOLVER_PARAMS = dict(
+    reference_axis=None,
+    reference_distance_segment=(0, 100),
+    reference_world_size=5.0,
+    first_axis=Axis.PositiveX,
+    second_axis=Axis.PositiveY
+)
+
+
+def orientation_at(index:int)->glm.mat3:
+    return glm.mat3_cast(glm.angleAxis(0.001 * index, glm.vec3(0, 1, 0))) * BASE
+
+def vanishing_lines(vp:glm.vec2, rng:random.Random, noise:float):
+    """two lines to the vanishing point, on each side of the viewport center"""
+    lines = []
+    direction = glm.normalize(vp - P)
+    side = glm.vec2(-direction.y, direction.x)
+    for offset in (-400, 400):
+        A = P + side * offset - direction * 300
+        B = A + glm.normalize(vp - A) * 600
+        lines.append((
+            (A.x + rng.gauss(0, noise), A.y + rng.gauss(0, noise)),
+            (B.x + rng.gauss(0, noise), B.y + rng.gauss(0, noise))
+        ))
+    return lines
+
+def make_frames(count:int, noise:float=0.0, seed:int=0)->list[sequence.Frame]:
+    rng = random.Random(seed)
+    frames = []
+    for index in range(count):
+        R = orientation_at(index)
+        vps = [P + glm.vec2(R[i].x, R[i].y) * (-F / R[i].z) for i in range(3)]
+        frames.append(sequence.Frame(
+            first_vanishing_lines=vanishing_lines(vps[0], rng, noise),
+            second_vanishing_lines=vanishing_lines(vps[1], rng, noise),
+            third_vanishing_lines=vanishing_lines(vps[2], rng, noise),
+            O=(900, 600)
+        ))
+    return frames
+
+def rotation_errors(solution:sequence.SequenceSolution)->list[float]:
+    errors = []
+    for index, frame in enumerate(solution.frames):
+        solved = glm.quat_cast(glm.mat3(frame.view))
+        expected = glm.quat_cast(orientation_at(index))
+        errors.append(sequence._angle_between(solved, expected))
+    return errors
+
+
+@pytest.mark.parametrize("mode", list(SolverMode))
+def test_matches_single_frame_solve(mode):
+    frames = make_frames(10)
+    solution = sequence.solve_sequence(mode, VIEWPORT, frames, f=F, **SOLVER_PARAMS)
+    assert len(solution.frames) == len(frames)
+    for frame, solved in zip(frames, solution.frames):
+        projection, view = core.solve(
+            mode, VIEWPORT,
+            frame.first_vanishing_lines,
+            frame.second_vanishing_lines,
+            frame.third_vanishing_lines,
+            f=F, P=P, O=frame.O, **SOLVER_PARAMS
+        )
+        for col in range(4):
+            assert list(solved.view[col]) == pytest.approx(list(view[col]), abs=1e-4)
+            assert list(solved.projection[col]) == pytest.approx(list(projection[col]), abs=1e-4)
+        assert solved.f == pytest.approx(F, rel=1e-3)
+        assert solved.seconds > 0.0
+
+
+def test_rotation_smoothing_reduces_jitter():
+    frames = make_frames(200, noise=1.0)
+    raw = sequence.solve_sequence(SolverMode.TwoVP, VIEWPORT, frames, f=F, **SOLVER_PARAMS)
+    smoothed = sequence.solve_sequence(SolverMode.TwoVP, VIEWPORT, frames, f=F, rotation_smoothing=0.8, focal_smoothing=0.8, **SOLVER_PARAMS)
+
+    raw_error = sum(rotation_errors(raw)) / len(frames)
+    smoothed_error = sum(rotation_errors(smoothed)) / len(frames)
+    assert smoothed_error < raw_error / 2
+    assert max(frame.rotation_correction for frame in raw.frames) == pytest.approx(0.0, abs=1e-6)
+    assert max(frame.rotation_correction for frame in smoothed.frames) > 0.0
+
+
+def test_smoothing_does_not_lag():
+    frames = make_frames(200)
+    solution = sequence.solve_sequence(SolverMode.ThreeVP, VIEWPORT, frames, f=F, rotation_smoothing=0.9, **SOLVER_PARAMS)
+    assert max(rotation_errors(solution)[30:-30]) < math.radians(0.05)
+
+
+def test_shared_intrinsics():
+    frames = make_frames(50, noise=1.0)
+    solution = sequence.solve_sequence(SolverMode.ThreeVP, VIEWPORT, frames, f=F, intrinsics='shared', **SOLVER_PARAMS)
+    assert len({frame.f for frame in solution.frames}) == 1
+    assert len({(frame.P.x, frame.P.y) for frame in solution.frames}) == 1
+    assert solution.frames[0].f == pytest.approx(F, rel=0.05)
+
+
+def test_degenerate_frames_hold_the_previous_frame():
+    frames = make_frames(5)
+    parallel = [((0, 0), (100, 0)), ((0, 100), (100, 100))]
+    frames[0].first_vanishing_lines = parallel
+    frames[3].first_vanishing_lines = parallel
+    solution = sequence.solve_sequence(SolverMode.TwoVP, VIEWPORT, frames, f=F, **SOLVER_PARAMS)
+
+    assert [frame.held for frame in solution.frames] == [True, False, False, True, False]
+    assert solution.frames[0].view == solution.frames[1].view
+    assert solution.frames[3].view == solution.frames[2].view
+
+    for frame in frames:
+        frame.first_vanishing_lines = parallel
+    with pytest.raises(VanishingLinesError):
+        sequence.solve_sequence(SolverMode.TwoVP, VIEWPORT, frames, f=F, **SOLVER_PARAMS)
+
+
+def test_one_vanishing_point_gap_frame():
+    frames = make_frames(5)
+    frames[2].first_vanishing_lines = []
+    frames[2].second_vanishing_lines = [] # the gap frame has no second line for the orientation
+    solution = sequence.solve_sequence(SolverMode.OneVP, VIEWPORT, frames, f=F, **SOLVER_PARAMS)
+
+    assert [frame.held for frame in solution.frames] == [False, False, True, False, False]
+    assert solution.frames[2].view == solution.frames[1].view
+
+
+def test_invalid_smoothing():
+    with pytest.raises(ValueError):
+        sequence.solve_sequence(SolverMode.TwoVP, VIEWPORT, make_frames(2), f=F, rotation_smoothing=1.0, **SOLVER_PARAMS)
+
+
+def test_smooth_rotations_keeps_the_hemisphere():
+    rotations = [glm.angleAxis(0.1 * i, glm.vec3(0, 0, 1)) for i in range(10)]
+    rotations[5] = -rotations[5]
+    smoothed = sequence.smooth_rotations(rotations, 0.5)
+    for rotation, result in zip(rotations, smoothed):
+        assert glm.dot(rotation, result) > 0
+
+
+def test_animated_camera():
+    frames = make_frames(30)
+    solution = sequence.solve_sequence(
+        SolverMode.TwoVP, VIEWPORT, frames, f=F,
+        reference_axis=ReferenceAxis.Screen,
+        reference_distance_segment=(0, 100),
+        reference_world_size=1.0,
+        first_axis=Axis.PositiveY,
+        second_axis=Axis.NegativeX
+    )
+    camera = solution.to_animated_camera(fps=25.0, start_frame=1001)
+
+    assert camera['fps'] == 25.0
+    keyframes = camera['keyframes']
+    assert [keyframe['frame'] for keyframe in keyframes] == list(range(1001, 1031))
+    for previous, keyframe in zip(keyframes, keyframes[1:]):
+        assert sum(a * b for a, b in zip(previous['rotation_quaternion'], keyframe['rotation_quaternion'])) > 0.99
+
+    first = keyframes[0]
+    camera_position = glm.vec3(glm.inverse(solution.frames[0].view)[3])
+    assert first['position'] == pytest.approx([camera_position.x, camera_position.y, camera_position.z], abs=1e-4)
+    assert first['fovy_degrees'] == pytest.approx(math.degrees(2 * math.atan(540 / F)), rel=1e-3)
+    assert [row[3] for row in first['transform'][:3]] == pytest.approx(first['position'], abs=1e-4)
@@ -0,0 +1,97 @@
+import pytest
+import math
+from pyglm import glm
+
+from pylive.perspy.solver import core, utils
+from pylive.perspy.solver.types import Rect
+from pylive.perspy.solver.exceptions import VanishingLinesError
+
+VIEWPORT = Rect(0, 0, 1920, 1080)
+
+
+###########################
+# compute_vanishing_point #
+###########################
+
+def test_vanishing_point_of_exact_lines():
+    vp = (2500.0, -300.0)
+    lines = [((0, 0), vp), ((100, 900), vp), ((1800, 1000), vp)]
+    assert core.compute_vanishing_point(lines) == pytest.approx(vp, abs=1e-6)
+
+def test_vanishing_point_does_not_depend_on_segment_length():
+    """the residuals are distances to the lines, a longer segment of the same line weighs the same"""
+    lines = [((0, 0), (1000, 110)), ((0, 500), (1000, 460)), ((0, 1000), (1000, 790))]
+    extended = [lines[0], lines[1], ((0, 1000), (5000, -50))]
+    assert core.compute_vanishing_point(lines) == pytest.approx(core.compute_vanishing_point(extended), abs=1e-6)
+
+@pytest.mark.parametrize("lines, message", [
+    ([((0, 0), (100, 0))], "two lines"),
+    ([((0, 0), (0, 0)), ((0, 10), (100, 10))], "zero length"),
+    ([((0, 0), (1000, 0)), ((0, 100), (1000, 100))], "parallel"),
+    ([((0, 0), (1000, 0)), ((0, 100), (1000, 100.01))], "parallel"), # meet 10 million pixels away
+    ([((0, 0), (1000, 0)), ((2000, 0), (3000, 0))], "collinear"),
+])
+def test_vanishing_point_of_degenerate_lines(lines, message):
+    with pytest.raises(VanishingLinesError, match=message):
+        core.compute_vanishing_point(lines)
+
+
+##############
+# intrinsics #
+##############
+
+@pytest.mark.parametrize("P", [(960, 540), (1010, 470), (700, 900)])
+@pytest.mark.parametrize("f", [300.0, 1200.0, 20000.0])
+def test_compose_decompose_intrinsics(P, f):
+    projection = utils.compose_intrinsics(VIEWPORT, f, glm.vec2(*P), 0.1, 100.0)
+    decomposed_P, decomposed_f = utils.decompose_intrinsics(VIEWPORT, projection)
+    assert decomposed_f == pytest.approx(f, rel=1e-5)
+    assert list(decomposed_P) == pytest.approx(P, abs=1e-2)
+
+def test_projection_of_the_principal_point():
+    P = glm.vec2(1010, 470)
+    projection = utils.compose_intrinsics(VIEWPORT, 1200.0, P, 0.1, 100.0)
+    point = glm.project(glm.vec3(0, 0, -5), glm.mat4(1), projection, glm.vec4(*VIEWPORT))
+    assert list(point.xy) == pytest.approx(list(P), abs=1e-3)
+
+
+############
+# cast_ray #
+############
+
+def test_cast_ray_through_pixels():
+    P, f = glm.vec2(1010, 470), 1200.0
+    projection = utils.compose_intrinsics(VIEWPORT, f, P, 0.1, 100.0)
+    view = glm.translate(glm.vec3(1, 2, 3)) * glm.rotate(0.3, glm.vec3(0, 1, 0))
+    camera_position = glm.vec3(glm.inverse(view)[3])
+    for pixel in [P, glm.vec2(0, 0), glm.vec2(1920, 1080), glm.vec2(-500, 3000)]: # outside the viewport too
+        origin, target = utils.cast_ray(pixel, view, projection, glm.vec4(*VIEWPORT))
+        direction = glm.normalize(target - origin)
+        expected = glm.normalize(glm.mat3(glm.inverse(view)) * glm.vec3((pixel - P) / f, -1.0))
+        assert list(direction) == pytest.approx(list(expected), abs=1e-4)
+        assert glm.length(glm.cross(origin - camera_position, direction)) == pytest.approx(0.0, abs=1e-4), "the ray starts on the line through the camera"
+
+
+#############
+# decompose #
+#############
+
+def test_decompose():
+    M = glm.translate(glm.vec3(1, 2, 3)) * glm.rotate(0.5, glm.vec3(0, 1, 0)) * glm.scale(glm.vec3(2, 2, 2))
+    scale, rotation, translation, skew, perspective = utils.decompose(M)
+    assert list(scale) == pytest.approx([2, 2, 2], abs=1e-5)
+    assert list(translation) == pytest.approx([1, 2, 3], abs=1e-5)
+    assert glm.angle(rotation) == pytest.approx(0.5, abs=1e-5)
+
+def test_decompose_singular_matrix():
+    with pytest.raises(ValueError):
+        utils.decompose(glm.mat4(0))
+
+def test_decompose_extrinsics_of_noisy_rotation():
+    """a view with rounding noise in the rotation still decomposes to a unit quaternion"""
+    view = glm.translate(glm.vec3(0, 0, -5)) * glm.rotate(1.0, glm.normalize(glm.vec3(1, 2, 3)))
+    view[0][1] += 1e-4
+    view[2][0] -= 1e-4
+    position, rotation = utils.decompose_extrinsics(view)
+    assert glm.length(rotation) == pytest.approx(1.0, abs=1e-4)
+    assert list(position) == pytest.approx([0, 0, -5], abs=1e-3)
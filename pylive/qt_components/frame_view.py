@@ -0,0 +1,163 @@
+from typing import *
+from collections import deque
+import threading
+import time
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+import numpy as np
+
+
+def ndarray_to_qimage(array:np.ndarray)->tuple[QImage, np.ndarray]:
+	"""
+	wrap an image array as a QImage.
+
+	uint8 gray (HxW), RGB (HxWx3) and RGBA (HxWx4), and float32 RGBA arrays are wrapped
+	without copying, as long as their rows are contiguous.
+	other arrays are converted to uint8 first.
+
+	returns the image and the array it references. keep the array alive while the image is used.
+	"""
+	if array.ndim == 3 and array.shape[2] == 1:
+		array = array[:, :, 0]
+	if array.ndim not in (2, 3) or (array.ndim == 3 and array.shape[2] not in (3, 4)):
+		raise ValueError(f"expected a HxW, HxWx3 or HxWx4 image array, got shape: {array.shape}")
+
+	channels = 1 if array.ndim == 2 else array.shape[2]
+	if array.dtype == np.float32 and channels == 4:
+		image_format = QImage.Format.Format_RGBA32FPx4
+	else:
+		if array.dtype != np.uint8:
+			if np.issubdtype(array.dtype, np.floating):
+				array = (np.clip(array, 0.0, 1.0) * 255 + 0.5).astype(np.uint8)
+			else:
+				array = np.clip(array, 0, 255).astype(np.uint8)
+		image_format = {
+			1: QImage.Format.Format_Grayscale8,
+			3: QImage.Format.Format_RGB888,
+			4: QImage.Format.Format_RGBA8888
+		}[channels]
+
+	# QImage needs contiguous pixels within a row, rows may be padded
+	if array.strides[-1] != array.itemsize or (array.ndim == 3 and array.strides[1] != channels*array.itemsize) or array.strides[0] < 0:
+		array = np.ascontiguousarray(array)
+
+	height, width = array.shape[:2]
+	row_bytes = width * (channels * array.itemsize)
+	if array.flags.c_contiguous:
+		buffer = array.data
+	else:
+		# padded rows (eg. a crop of a larger image): a flat byte view spanning all rows
+		span = array.strides[0] * (height-1) + row_bytes
+		buffer = np.lib.stride_tricks.as_strided(array.view(np.uint8), shape=(span,), strides=(1,)).data
+	image = QImage(buffer, width, height, array.strides[0], image_format)
+	return image, array
+
+
+class FrameView(QWidget):
+	"""
+	Shows the latest of a stream of image frames.
+
+	- frames are numpy arrays or QImages, wrapped without copying (see ndarray_to_qimage)
+	- setFrame can be called faster than the screen refreshes, and from any thread:
+	  only the latest frame is painted, frames replaced before they were painted are dropped
+	- displayed and dropped frames per second are reported with statsChanged
+	"""
+	statsChanged = Signal(float, float) # displayed fps, dropped fps
+
+	_frameSubmitted = Signal()
+
+	def __init__(self, parent:QWidget|None=None):
+		super().__init__(parent=parent)
+		self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+		self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
+
+		self._lock = threading.Lock()
+		self._pending:tuple[QImage, Any]|None = None # submitted, not yet painted
+		self._image:QImage|None = None
+		self._image_source:Any = None # keeps the wrapped buffer alive
+
+		self._displayed_times:deque[float] = deque()
+		self._dropped_times:deque[float] = deque()
+		self._show_stats = False
+
+		self._frameSubmitted.connect(self.update, Qt.ConnectionType.QueuedConnection)
+
+		self._stats_timer = QTimer(self)
+		self._stats_timer.setInterval(500)
+		self._stats_timer.timeout.connect(self._emitStats)
+		self._stats_timer.start()
+
+	def setFrame(self, frame:np.ndarray|QImage):
+		if isinstance(frame, QImage):
+			image, source = frame, None
+		else:
+			image, source = ndarray_to_qimage(frame)
+
+		with self._lock:
+			if self._pending is not None:
+				self._dropped_times.append(time.perf_counter())
+			self._pending = image, source
+
+		if QThread.currentThread() is self.thread():
+			self.update()
+		else:
+			self._frameSubmitted.emit()
+
+	def frame(self)->QImage|None:
+		return self._image
+
+	def setStatsVisible(self, visible:bool):
+		self._show_stats = visible
+		self.update()
+
+	def sizeHint(self)->QSize:
+		image = self._pending[0] if self._pending else self._image
+		if image:
+			return image.size()
+		return QSize(256, 256)
+
+	### Stats ###
+	def _fps(self, times:deque[float], window:float=1.0)->float:
+		now = time.perf_counter()
+		while times and times[0] < now - window:
+			times.popleft()
+		return len(times) / window
+
+	def displayedFps(self)->float:
+		return self._fps(self._displayed_times)
+
+	def droppedFps(self)->float:
+		with self._lock:
+			return self._fps(self._dropped_times)
+
+	def _emitStats(self):
+		if self._displayed_times or self._dropped_times:
+			self.statsChanged.emit(self.displayedFps(), self.droppedFps())
+
+	### Paint ###
+	def paintEvent(self, event:QPaintEvent):
+		with self._lock:
+			pending, self._pending = self._pending, None
+		if pending is not None:
+			self._image, self._image_source = pending
+			self._displayed_times.append(time.perf_counter())
+
+		if self._image is None or self._image.isNull():
+			return
+
+		painter = QPainter(self)
+		painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+		size = self._image.size().scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+		if self._image.width() <= self.width() and self._image.height() <= self.height():
+			size = self._image.size() # dont upscale
+		target = QRect(QPoint(0, 0), size)
+		target.moveCenter(self.rect().center())
+		painter.drawImage(target, self._image)
+
+		if self._show_stats:
+			painter.setPen(self.palette().color(QPalette.ColorRole.PlaceholderText))
+			painter.drawText(self.rect().adjusted(4, 4, -4, -4), Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft,
+				f"{self.displayedFps():.0f} fps, {self.droppedFps():.0f} dropped")
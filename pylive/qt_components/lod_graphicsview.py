@@ -0,0 +1,171 @@
+from typing import *
+from enum import IntEnum
+import math
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+
+class LevelOfDetail(IntEnum):
+    Outline = 0 # plain rects, no text, no ports
+    Cached = 1  # items render from cached pixmaps
+    Full = 2    # full detail, antialiased
+
+
+OUTLINE_SCALE = 0.35
+CACHED_SCALE = 0.8
+PIXMAP_CACHE_LIMIT = 256 * 1024 # KB
+
+
+def levelOfDetailForScale(scale:float)->LevelOfDetail:
+    if scale < OUTLINE_SCALE:
+        return LevelOfDetail.Outline
+    if scale < CACHED_SCALE:
+        return LevelOfDetail.Cached
+    return LevelOfDetail.Full
+
+
+class LODGraphicsView(QGraphicsView):
+    """A QGraphicsView for large scenes.
+
+    - tracks the zoom level and emits _levelOfDetailChanged_ when crossing a tier,
+      so items can hide their details or switch to cached rendering
+    - antialiasing is only enabled at full detail
+    - emits _visibleSceneRectChanged_ when panned, zoomed or resized,
+      so offscreen items can skip their updates until they scroll into view
+    - the scene rect grows with the scene content, instead of a fixed huge rect
+    - ctrl+wheel zooms around the mouse
+    """
+    levelOfDetailChanged = Signal(int) # LevelOfDetail
+    visibleSceneRectChanged = Signal(QRectF)
+
+    def __init__(self, parent:QWidget|None=None):
+        super().__init__(parent=parent)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.NoAnchor)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing, True)
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheNone)
+        self.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
+        self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+
+        self._lod_enabled = True
+        self._level_of_detail = LevelOfDetail.Full
+        self._visible_scene_rect = QRectF()
+        self.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+
+        # view changes are detected while painting, but handled after the paint event
+        self._view_changed_timer = QTimer(self)
+        self._view_changed_timer.setSingleShot(True)
+        self._view_changed_timer.setInterval(0)
+        self._view_changed_timer.timeout.connect(self._onViewChanged)
+
+        # the scene rect grows while dragging items, update the view once per event loop iteration
+        self._scene_rect_timer = QTimer(self)
+        self._scene_rect_timer.setSingleShot(True)
+        self._scene_rect_timer.setInterval(0)
+        self._scene_rect_timer.timeout.connect(self._updateSceneRect)
+
+        self._scene_connections = []
+        self._content_rect = QRectF()
+
+        # cached items must fit in the pixmap cache, or they are re-rendered on every frame
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), PIXMAP_CACHE_LIMIT))
+
+    def setScene(self, scene:QGraphicsScene|None):
+        if current_scene:=self.scene():
+            for signal, slot in self._scene_connections:
+                signal.disconnect(slot)
+            self._scene_connections = []
+
+        super().setScene(scene)
+
+        if scene:
+            self._scene_connections = [
+                (scene.sceneRectChanged, self._onSceneRectChanged)
+            ]
+            for signal, slot in self._scene_connections:
+                signal.connect(slot)
+            self._content_rect = scene.sceneRect()
+            self._updateSceneRect()
+
+    def setLevelOfDetailEnabled(self, enabled:bool):
+        self._lod_enabled = enabled
+        self._onViewChanged()
+
+    def isLevelOfDetailEnabled(self)->bool:
+        return self._lod_enabled
+
+    def levelOfDetail(self)->LevelOfDetail:
+        return self._level_of_detail
+
+    def zoom(self)->float:
+        return self.transform().m11()
+
+    def visibleSceneRect(self)->QRectF:
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+
+    def isItemVisible(self, item:QGraphicsItem)->bool:
+        return self.visibleSceneRect().intersects(item.sceneBoundingRect())
+
+    def wheelEvent(self, event:QWheelEvent):
+        ModifierDown = event.modifiers() in (
+            Qt.KeyboardModifier.MetaModifier,
+            Qt.KeyboardModifier.ControlModifier,
+        )
+        delta = event.angleDelta()
+        if ModifierDown and delta.y() != 0:
+            factor = math.pow(1.3, delta.y() / 120.0)
+            pos = event.position().toPoint()
+            oldPos = self.mapToScene(pos)
+            self.scale(factor, factor)
+            newPos = self.mapToScene(pos)
+            delta = newPos - oldPos
+            self.translate(delta.x(), delta.y())
+            event.accept()
+        else:
+            super().wheelEvent(event)
+
+    def drawBackground(self, painter:QPainter, rect:QRectF|QRect):
+        super().drawBackground(painter, rect)
+        if self._levelOfDetailForView() != self._level_of_detail or self.visibleSceneRect() != self._visible_scene_rect:
+            self._view_changed_timer.start()
+
+    def resizeEvent(self, event:QResizeEvent):
+        super().resizeEvent(event)
+        self._updateSceneRect()
+
+    def _levelOfDetailForView(self)->LevelOfDetail:
+        if not self._lod_enabled:
+            return LevelOfDetail.Full
+        return levelOfDetailForScale(self.zoom())
+
+    def _onViewChanged(self):
+        level = self._levelOfDetailForView()
+        if level != self._level_of_detail:
+            self._level_of_detail = level
+            self.setRenderHint(QPainter.RenderHint.Antialiasing, level == LevelOfDetail.Full)
+            self._updateSceneRect()
+            self.levelOfDetailChanged.emit(level)
+
+        visible_rect = self.visibleSceneRect()
+        if visible_rect != self._visible_scene_rect:
+            self._visible_scene_rect = visible_rect
+            self.visibleSceneRectChanged.emit(visible_rect)
+
+    def _onSceneRectChanged(self, rect:QRectF):
+        # Note: use the rect from the signal. QGraphicsScene.sceneRect() recomputes the bounds
+        # of every item, when items have moved since
+        self._content_rect = rect
+        self._scene_rect_timer.start()
+
+    def _updateSceneRect(self):
+        """grow the scroll area to the scene content,
+        with a viewport sized margin to pan the content to the edges"""
+        if not (scene:=self.scene()):
+            return
+        zoom = self.zoom() or 1.0
+        margin_x = self.viewport().width() / zoom
+        margin_y = self.viewport().height() / zoom
+        content = self._content_rect
+        self.setSceneRect(content.adjusted(-margin_x, -margin_y, margin_x, margin_y))
@@ -0,0 +1,115 @@
+import unittest
+from typing import *
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+import numpy as np
+
+from pylive.qt_components.frame_view import FrameView, ndarray_to_qimage
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestNdarrayToQImage(unittest.TestCase):
+	def test_uint8_is_not_copied(self):
+		for shape, image_format in [
+			((4, 5), QImage.Format.Format_Grayscale8),
+			((4, 5, 3), QImage.Format.Format_RGB888),
+			((4, 5, 4), QImage.Format.Format_RGBA8888)
+		]:
+			array = np.zeros(shape, dtype=np.uint8)
+			image, source = ndarray_to_qimage(array)
+			self.assertIs(source, array)
+			self.assertEqual(image.format(), image_format)
+			self.assertEqual((image.width(), image.height()), (5, 4))
+
+		array = np.zeros((4, 5, 3), dtype=np.uint8)
+		image, source = ndarray_to_qimage(array)
+		array[1, 2] = (255, 128, 0)
+		self.assertEqual(image.pixelColor(2, 1), QColor(255, 128, 0))
+
+	def test_row_views_are_not_copied(self):
+		array = np.zeros((8, 8, 4), dtype=np.uint8)
+		view = array[2:6, 1:5]
+		image, source = ndarray_to_qimage(view)
+		self.assertIs(source, view)
+		self.assertEqual(image.bytesPerLine(), 8*4)
+
+	def test_float(self):
+		rgba = np.ones((2, 3, 4), dtype=np.float32)
+		image, source = ndarray_to_qimage(rgba)
+		self.assertIs(source, rgba)
+		self.assertEqual(image.format(), QImage.Format.Format_RGBA32FPx4)
+
+		rgb = np.full((2, 3, 3), 0.5, dtype=np.float32)
+		image, source = ndarray_to_qimage(rgb)
+		self.assertEqual(source.dtype, np.uint8)
+		self.assertEqual(image.pixelColor(0, 0), QColor(128, 128, 128))
+
+	def test_invalid_shape(self):
+		with self.assertRaises(ValueError):
+			ndarray_to_qimage(np.zeros((2, 3, 5), dtype=np.uint8))
+
+
+class TestFrameView(unittest.TestCase):
+	def test_intermediate_frames_are_dropped(self):
+		view = FrameView()
+		view.resize(32, 32)
+		frames = [np.full((8, 8, 3), i, dtype=np.uint8) for i in range(10)]
+		for frame in frames:
+			view.setFrame(frame)
+		view.grab() # paint
+		self.assertEqual(view.frame().pixelColor(0, 0), QColor(9, 9, 9))
+		self.assertEqual(view.displayedFps(), 1)
+		self.assertEqual(view.droppedFps(), 9)
+
+
+class TestPreviewWidget(unittest.TestCase):
+	def test_slots_reuse_widgets(self):
+		from pylive.QtTerminal.preview_widget import PreviewWidget
+		preview = PreviewWidget.instance()
+		preview.clear()
+		layout = preview.previewFrame.layout()
+
+		for i in range(5):
+			preview.display(np.zeros((4, 4, 3), dtype=np.uint8), slot="frames")
+		preview.display("text", slot="message")
+		preview.display("more text", slot="message")
+		self.assertEqual(layout.count(), 2)
+		self.assertIsInstance(layout.itemAt(0).widget(), FrameView)
+		self.assertEqual(layout.itemAt(1).widget().text(), "more text")
+
+		preview.display("appended")
+		preview.display("appended again")
+		self.assertEqual(layout.count(), 4)
+
+		preview.clear()
+		self.assertEqual(layout.count(), 0)
+
+	def test_caller_widgets_are_not_changed(self):
+		from pylive.QtTerminal.preview_widget import PreviewWidget
+		preview = PreviewWidget.instance()
+		preview.clear()
+		layout = preview.previewFrame.layout()
+
+		slider, label = QSlider(), QLabel("caller")
+		preview.display(slider, slot="widget")
+		preview.display(label, slot="widget")
+		preview.display("text", slot="widget")
+		QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+		slider.setValue(5) # not deleted
+		self.assertEqual(label.text(), "caller")
+		self.assertIsNone(slider.parent())
+		self.assertEqual(layout.count(), 1)
+		self.assertEqual(layout.itemAt(0).widget().text(), "text")
+
+		preview.display(label)
+		preview.clear()
+		QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+		self.assertEqual(label.text(), "caller")
+		self.assertIsNone(label.parent())
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,108 @@
+"""
+Benchmark of diff_list and patch_list against the positional diff they replaced.
+
+Diffs 100k element lists after a few kinds of edits, and reports the diff and
+patch times, and how many items each diff reports as changed.
+
+Usage:
+    python -m pylive.utils.benchmark_diff [--size 100000] [--edits 10 1000] [--seed 0]
+"""
+
+from typing import *
+import time
+import random
+import argparse
+from itertools import zip_longest
+
+from pylive.utils.diff import diff_list, patch_list
+
+
+### Positional diff, as it was before ###
+_SENTINEL_ = object()
+
+def positional_diff_list(prev:list, current:list)->Tuple[dict, dict]:
+    added = dict()
+    removed = dict()
+    for i, (item1, item2) in enumerate(zip_longest(prev, current, fillvalue=_SENTINEL_)):
+        if item1 is item2:
+            continue
+        if item1 is not _SENTINEL_:
+            removed[i] = item1
+        if item2 is not _SENTINEL_:
+            added[i] = item2
+    return added, removed
+
+def positional_patch_list(original:list, change:Tuple[dict, dict])->list:
+    added, removed = change
+    updated = original[:]
+    for index in sorted(removed.keys(), reverse=True):
+        if index < len(updated):
+            updated.pop(index)
+    for index, value in added.items():
+        updated.insert(index, value)
+    return updated
+
+
+### Edits ###
+def insert_front(items:list, edits:int, rng:random.Random)->list:
+    return [f"new{i}" for i in range(edits)] + items
+
+def random_edits(items:list, edits:int, rng:random.Random)->list:
+    """inserts, deletes and replacements at random positions"""
+    edited = list(items)
+    for i in range(edits):
+        match rng.choice(["insert", "delete", "replace"]):
+            case "insert":
+                edited.insert(rng.randrange(len(edited)+1), f"new{i}")
+            case "delete":
+                edited.pop(rng.randrange(len(edited)))
+            case "replace":
+                edited[rng.randrange(len(edited))] = f"replaced{i}"
+    return edited
+
+def moves(items:list, edits:int, rng:random.Random)->list:
+    edited = list(items)
+    for i in range(edits):
+        edited.insert(rng.randrange(len(edited)), edited.pop(rng.randrange(len(edited))))
+    return edited
+
+EDITS:Dict[str, Callable[[list, int, random.Random], list]] = {
+    "insert_front": insert_front,
+    "random_edits": random_edits,
+    "moves": moves,
+}
+
+
+def measure(diff:Callable, patch:Callable, a:list, b:list)->Tuple[float, float, Any]:
+    start = time.perf_counter()
+    change = diff(a, b)
+    diff_time = time.perf_counter() - start
+    start = time.perf_counter()
+    patched = patch(a, change)
+    patch_time = time.perf_counter() - start
+    assert patched == b
+    return diff_time * 1000, patch_time * 1000, change
+
+
+def main():
+    parser = argparse.ArgumentParser(description="diff_list benchmark")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--edits", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    items = [f"item{i}" for i in range(args.size)]
+    for name, edit in EDITS.items():
+        for edits in args.edits:
+            b = edit(items, edits, random.Random(args.seed))
+
+            diff_time, patch_time, (added, removed) = measure(positional_diff_list, positional_patch_list, items, b)
+            print(f"{name:<13} {edits:>5} edits  positional  diff {diff_time:8.1f}ms  patch {patch_time:8.1f}ms  changed {len(added)+len(removed):>7}")
+
+            diff_time, patch_time, change = measure(diff_list, patch_list, items, b)
+            changed = sum(len(run.items) for run in change.runs if run.kind != "equal")
+            print(f"{name:<13} {edits:>5} edits  diff_list   diff {diff_time:8.1f}ms  patch {patch_time:8.1f}ms  changed {changed:>7}")
+
+
+if __name__ == "__main__":
+    main()
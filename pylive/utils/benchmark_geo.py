@@ -0,0 +1,113 @@
+"""
+Per-link routing cost of makeLineBetweenShapes.
+
+Routes links between graphics items of each shape, with the analytic
+intersections, and with the stroker based intersection used before, which
+mapped the item shape to the scene and clipped a stroke of the ray with it.
+Then routes the links between rectangles at once, with the vectorised
+intersect_segments_with_rectangles.
+
+Usage:
+    python -m pylive.utils.benchmark_geo [--links 2000] [--seed 0]
+"""
+
+from typing import *
+import math
+import time
+import random
+import argparse
+import numpy as np
+
+from PySide6.QtGui import *
+from PySide6.QtCore import *
+from PySide6.QtWidgets import *
+
+from pylive.utils.geo import (
+    makeLineBetweenShapes,
+    intersect_segments_with_rectangles,
+    _intersect_line_with_path_stroked,
+)
+
+
+class ShapeItem(QGraphicsPathItem):
+    def shape(self)->QPainterPath:
+        return self.path()
+
+
+def make_path(kind:str)->QPainterPath:
+    path = QPainterPath()
+    match kind:
+        case 'rect':
+            path.addRect(QRectF(-40, -20, 80, 40))
+        case 'rounded_rect':
+            path.addRoundedRect(QRectF(-40, -20, 80, 40), 8, 8)
+        case 'ellipse':
+            path.addEllipse(QRectF(-20, -20, 40, 40))
+        case 'star':
+            star = [QPointF(math.cos(i*math.pi/5) * (30 if i%2 == 0 else 12), math.sin(i*math.pi/5) * (30 if i%2 == 0 else 12)) for i in range(10)]
+            path.addPolygon(QPolygonF(star + [star[0]]))
+        case _:
+            raise ValueError(kind)
+    return path
+
+
+def legacy_line_between_items(A:QGraphicsItem, B:QGraphicsItem)->QLineF:
+    """makeLineBetweenShapes for items, before the analytic intersections"""
+    A_shape = A.sceneTransform().map(A.shape())
+    B_shape = B.sceneTransform().map(B.shape())
+    Ac, Bc = A_shape.boundingRect().center(), B_shape.boundingRect().center()
+    I2 = _intersect_line_with_path_stroked(Ac, Bc, B_shape) or Bc
+    I1 = _intersect_line_with_path_stroked(Bc, Ac, A_shape) or Ac
+    return QLineF(I1, I2)
+
+
+def make_links(kind:str, count:int, rng:random.Random)->List[Tuple[QGraphicsItem, QGraphicsItem]]:
+    links = []
+    for _ in range(count):
+        A, B = ShapeItem(make_path(kind)), ShapeItem(make_path(kind))
+        A.setPos(rng.uniform(100, 2000), rng.uniform(100, 2000))
+        B.setPos(rng.uniform(100, 2000), rng.uniform(100, 2000))
+        links.append((A, B))
+    return links
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--links", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    rng = random.Random(args.seed)
+
+    for kind in ['rect', 'rounded_rect', 'ellipse', 'star']:
+        links = make_links(kind, args.links, rng)
+        makeLineBetweenShapes(*links[0]) # warm the shape cache
+
+        start = time.perf_counter()
+        for A, B in links:
+            legacy_line_between_items(A, B)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for A, B in links:
+            makeLineBetweenShapes(A, B)
+        analytic_time = time.perf_counter() - start
+
+        print(f"{kind:<13} stroker {legacy_time/len(links)*1e6:8.1f}us/link  "
+              f"analytic {analytic_time/len(links)*1e6:8.1f}us/link  "
+              f"{legacy_time/analytic_time:6.1f}x")
+
+    # all the links between rectangles at once
+    rects = np.array([[-40, -20, 40, 20]], dtype=np.float64)
+    A = np.random.default_rng(args.seed).uniform(100, 2000, (args.links, 2))
+    B = np.random.default_rng(args.seed+1).uniform(100, 2000, (args.links, 2))
+    start = time.perf_counter()
+    I2 = intersect_segments_with_rectangles(A, B, rects + np.hstack([B, B]))
+    I1 = intersect_segments_with_rectangles(B, A, rects + np.hstack([A, A]))
+    vectorised_time = time.perf_counter() - start
+    print(f"{'rect':<13} vectorised {vectorised_time/args.links*1e6:8.2f}us/link")
+
+
+if __name__ == "__main__":
+    main()
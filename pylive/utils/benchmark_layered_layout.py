@@ -0,0 +1,111 @@
+"""
+Crossings and time benchmark for the layered layout.
+
+Lays out generated graphs with LayeredLayout, and compares the edge crossings
+with the plain topological generations layering the graph views used before.
+Then adds a node to the graph, and times the incremental update.
+
+Usage:
+    python -m pylive.utils.benchmark_layered_layout [--nodes 5000] [--seed 0] [--max-iterations 200]
+"""
+
+from typing import *
+import time
+import random
+import argparse
+import networkx as nx
+import numpy as np
+
+from pylive.utils.layered_layout import LayeredLayout, count_crossings
+
+
+def make_forest(count:int, rng:random.Random)->nx.DiGraph:
+    """many small expression trees, like a notebook of independent calculations"""
+    G = nx.DiGraph()
+    i = 0
+    while i < count:
+        size = min(count - i, rng.randint(3, 30))
+        G.add_node(i)
+        for j in range(i+1, i+size):
+            G.add_edge(rng.randrange(i, j), j)
+        i += size
+    return G
+
+
+def make_pipelines(count:int, rng:random.Random)->nx.DiGraph:
+    """long chains of operators, occasionally joining another chain"""
+    G = nx.DiGraph()
+    G.add_nodes_from(range(count))
+    chains = 50
+    for i in range(chains, count):
+        G.add_edge(i - chains, i)
+        if rng.random() < 0.1:
+            G.add_edge(rng.randrange(max(0, i-3*chains), i), i)
+    return G
+
+
+def make_random(count:int, rng:random.Random)->nx.DiGraph:
+    """every node reads one or two of the 30 nodes before it, with a few feedback edges"""
+    G = nx.DiGraph()
+    G.add_nodes_from(range(count))
+    for i in range(1, count):
+        for _ in range(rng.choice([1, 1, 2])):
+            G.add_edge(rng.randrange(max(0, i-30), i), i)
+        if rng.random() < 0.01:
+            G.add_edge(i, rng.randrange(max(0, i-30), i))
+    return G
+
+
+def generations_crossings(G:nx.DiGraph)->int:
+    """crossings of the topological generations layering, in node order, with long edges split"""
+    H = nx.DiGraph(G)
+    while not nx.is_directed_acyclic_graph(H):
+        H.remove_edges_from(nx.find_cycle(H))
+    layer = {node: r for r, nodes in enumerate(nx.topological_generations(H)) for node in nodes}
+    order = {node: i for i, node in enumerate(H.nodes)}
+    # dummy nodes of long edges go after the real nodes of a layer, in edge order
+    pairs:dict[int, list[tuple[float, float]]] = dict()
+    for e, (u, v) in enumerate(H.edges()):
+        upper = order[u]
+        for r in range(layer[u], layer[v]):
+            lower = order[v] if r+1 == layer[v] else len(H) + e
+            pairs.setdefault(r, []).append((upper, lower))
+            upper = lower
+    total = 0
+    for edges in pairs.values():
+        positions = np.array(edges, dtype=np.float64)
+        total += count_crossings(positions[:, 0], positions[:, 1])
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="layered layout benchmark")
+    parser.add_argument("--nodes", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-iterations", type=int, default=200, help="network simplex exchanges per component, 0 for no limit")
+    args = parser.parse_args()
+
+    for name, make_graph in [("forest", make_forest), ("pipelines", make_pipelines), ("random", make_random)]:
+        G = make_graph(args.nodes, random.Random(args.seed))
+        widths = {node: 1.0 for node in G.nodes}
+        layout = LayeredLayout(max_iterations=args.max_iterations or None)
+
+        start = time.perf_counter()
+        layout.layout(G, widths)
+        elapsed = time.perf_counter() - start
+
+        new_node = len(G)
+        G.add_edge(next(iter(G.nodes)), new_node)
+        widths[new_node] = 1.0
+        start = time.perf_counter()
+        layout.update(G, widths)
+        update_elapsed = time.perf_counter() - start
+
+        print(f"{name:10} {G.number_of_nodes()-1} nodes {G.number_of_edges()-1} edges: "
+              f"layout {elapsed*1000:.0f}ms, "
+              f"crossings {layout.crossings()} (generations: {generations_crossings(G)}), "
+              f"add node {update_elapsed*1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Time benchmark for making unique names.
+
+Creates many "node" names, like a graph editor adding similar nodes, with a
+NameRegistry and with the previous make_unique_name, which copied all the names
+into a set and counted up from node1 on every call. Then releases every other
+name and creates them again.
+
+Usage:
+    python -m pylive.utils.benchmark_unique [--count 100000] [--baseline-count 5000]
+"""
+
+from typing import *
+import re
+import time
+import argparse
+
+from pylive.utils.unique import NameRegistry
+
+
+def legacy_make_unique_name(name:str, names:Iterable[str])->str:
+    """make_unique_name before the NameRegistry"""
+    names = set(_ for _ in names)
+    match = re.search(r"(.*?)(\d*)$", name)
+    if match:
+        name_part = match.group(1)
+        digit = 1
+        while name in names:
+            name = f"{name_part}{digit}"
+            digit += 1
+    return name
+
+
+def bench_registry(count:int)->Tuple[float, float]:
+    names = NameRegistry()
+    start = time.perf_counter()
+    created = [names.reserve("node") for _ in range(count)]
+    create_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in created[::2]:
+        names.release(name)
+    for _ in created[::2]:
+        names.reserve("node")
+    recreate_time = time.perf_counter() - start
+    assert len(names) == count
+    return create_time, recreate_time
+
+
+def bench_legacy(count:int)->Tuple[float, float]:
+    names:List[str] = []
+    start = time.perf_counter()
+    for _ in range(count):
+        names.append(legacy_make_unique_name("node", names))
+    create_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    released = set(names[::2])
+    names = [name for name in names if name not in released]
+    for _ in released:
+        names.append(legacy_make_unique_name("node", names))
+    recreate_time = time.perf_counter() - start
+    assert len(set(names)) == count
+    return create_time, recreate_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--baseline-count", type=int, default=5_000, help="make_unique_name is quadratic, keep this small")
+    args = parser.parse_args()
+
+    for label, bench, count in [
+        ("NameRegistry", bench_registry, args.count),
+        ("NameRegistry", bench_registry, args.baseline_count),
+        ("make_unique_name", bench_legacy, args.baseline_count),
+    ]:
+        create_time, recreate_time = bench(count)
+        print(f"{label:<18} {count:>7} names  create {create_time*1000:9.1f}ms  "
+              f"{create_time/count*1e6:8.2f}us/name  release and recreate half {recreate_time*1000:9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,199 @@
 from typing import *
+from itertools import chain
 
 
-class bilist:
-    def __init__(self, iterable=()):
-        self.data = list(iterable)
-        self.index_map = {v: i for i, v in enumerate(self.data)}
-
-    def append(self, item):
-        self.index_map[item] = len(self.data)
-        self.data.append(item)
-
-    def remove(self, item):
-        idx = self.index_map.pop(item)
-        self.data.pop(idx)
-        # Update indices
-        for i in range(idx, len(self.data)):
-            self.index_map[self.data[i]] = i
-
-    def insert(self, index, item):
-        self.data.insert(index, item)
-        self.index_map[item] = index
-        for i in range(index + 1, len(self.data)):
-            self.index_map[self.data[i]] = i
-
-    def pop(self, index=-1):
-        item = self.data.pop(index)
-        del self.index_map[item]
-        for i in range(index, len(self.data)):
-            self.index_map[self.data[i]] = i
-        return item
+T = TypeVar('T', bound=Hashable)
+
+
+class bilist(Generic[T]):
+    """A list of unique, hashable items, with fast lookup in both directions.
+
+    items are stored in blocks of at most 2*LOAD items.
+    a Fenwick tree over the block lengths finds the block of a row,
+    and each item knows its block, so with b = n/LOAD blocks
+    - bilist[row] is O(log b)
+    - bilist.index(item) is O(log b + LOAD), the item is searched in its block
+    - insert, remove and pop are O(log b + LOAD), the block is a python list.
+      splitting a full block or dropping an empty one renumbers the blocks
+      and rebuilds the tree in O(b), at most once per LOAD inserts or removals
+      of that block
+    """
+    LOAD = 256
+
+    def __init__(self, iterable:Iterable[T]=()):
+        self._blocks:list[list[T]] = []
+        self._block_of:dict[T, list[T]] = dict()   # item -> its block
+        self._block_pos:dict[int, int] = dict()    # id(block) -> position in _blocks
+        self._tree:list[int] = [0]                 # Fenwick tree of block lengths, 1-based
+        self._len = 0
+        self._build(list(iterable))
+
+    ### Index
+    def _build(self, items:list[T]):
+        """rebuild blocks and index from items"""
+        if len(set(items)) != len(items):
+            raise ValueError("bilist items must be unique")
+        self._blocks = [items[i:i+self.LOAD] for i in range(0, len(items), self.LOAD)]
+        self._len = len(items)
+        self._block_of = {item: block for block in self._blocks for item in block}
+        self._reindexBlocks()
+
+    def _reindexBlocks(self):
+        """renumber the blocks and rebuild the Fenwick tree, O(number of blocks)"""
+        self._block_pos = {id(block): i for i, block in enumerate(self._blocks)}
+        tree = [0] + [len(block) for block in self._blocks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _addLength(self, block_pos:int, delta:int):
+        i = block_pos + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _rowsBefore(self, block_pos:int)->int:
+        """number of items in the blocks before block_pos"""
+        total = 0
+        i = block_pos
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, row:int)->tuple[int, int]:
+        """(block position, offset in block) of a row"""
+        if row < 0:
+            row += self._len
+        if not 0 <= row < self._len:
+            raise IndexError("bilist index out of range")
+        # descend the Fenwick tree
+        pos = 0
+        step = 1 << (len(self._tree).bit_length())
+        while step:
+            next_pos = pos + step
+            if next_pos < len(self._tree) and self._tree[next_pos] <= row:
+                pos = next_pos
+                row -= self._tree[next_pos]
+            step >>= 1
+        return pos, row
+
+    def _split(self, block_pos:int):
+        block = self._blocks[block_pos]
+        if len(block) <= 2 * self.LOAD:
+            return
+        tail = block[self.LOAD:]
+        del block[self.LOAD:]
+        for item in tail:
+            self._block_of[item] = tail
+        self._blocks.insert(block_pos+1, tail)
+        self._reindexBlocks()
+
+    def _dropEmpty(self, block_pos:int):
+        if not self._blocks[block_pos]:
+            del self._blocks[block_pos]
+            self._reindexBlocks()
+
+    ### Sequence
+    def index(self, item:T)->int:
+        try:
+            block = self._block_of[item]
+        except KeyError:
+            raise ValueError(f"{item!r} is not in bilist")
+        block_pos = self._block_pos[id(block)]
+        return self._rowsBefore(block_pos) + block.index(item)
 
-    def index(self, item):
-        return self.index_map[item]  # O(1) index lookup
+    def __contains__(self, item:object)->bool:
+        return item in self._block_of
 
-    def __getitem__(self, index):
-        return self.data[index]
+    def __getitem__(self, row:int)->T:
+        block_pos, offset = self._locate(row)
+        return self._blocks[block_pos][offset]
 
-    def __len__(self):
-        return len(self.data)
+    def __len__(self)->int:
+        return self._len
+
+    def __iter__(self)->Iterator[T]:
+        return chain.from_iterable(self._blocks)
 
     def __repr__(self):
-        return repr(self.data)
+        return f"bilist({list(self)!r})"
+
+    def __eq__(self, other:object)->bool:
+        if isinstance(other, bilist):
+            return list(self) == list(other)
+        return list(self) == other
+
+    ### Mutation
+    def append(self, item:T):
+        self.insert(self._len, item)
+
+    def extend(self, items:Iterable[T]):
+        items = list(items)
+        if len(items) > self._len:
+            # faster to rebuild
+            self._build(list(self) + items)
+            return
+        for item in items:
+            self.append(item)
+
+    def insert(self, row:int, item:T):
+        if item in self._block_of:
+            raise ValueError(f"{item!r} is already in the bilist")
+        if row < 0:
+            row = max(0, row + self._len)
+        row = min(row, self._len)
+
+        if not self._blocks:
+            self._blocks.append([item])
+            self._block_of[item] = self._blocks[0]
+            self._len = 1
+            self._reindexBlocks()
+            return
+
+        if row == self._len:
+            block_pos, offset = len(self._blocks)-1, len(self._blocks[-1])
+        else:
+            block_pos, offset = self._locate(row)
+        block = self._blocks[block_pos]
+        block.insert(offset, item)
+        self._block_of[item] = block
+        self._len += 1
+        self._addLength(block_pos, 1)
+        self._split(block_pos)
+
+    def remove(self, item:T):
+        self.pop(self.index(item))
+
+    def pop(self, row:int=-1)->T:
+        block_pos, offset = self._locate(row)
+        block = self._blocks[block_pos]
+        item = block.pop(offset)
+        del self._block_of[item]
+        self._len -= 1
+        self._addLength(block_pos, -1)
+        self._dropEmpty(block_pos)
+        return item
+
+    def __delitem__(self, key:int|slice):
+        if isinstance(key, int):
+            self.pop(key)
+            return
+        start, stop, step = key.indices(self._len)
+        if step != 1:
+            for row in sorted(range(start, stop, step), reverse=True):
+                self.pop(row)
+            return
+        if stop - start > self._len // 2:
+            # removing most of the items, faster to rebuild
+            items = list(self)
+            del items[start:stop]
+            self._build(items)
+            return
+        for _ in range(start, stop):
+            self.pop(start)
+
+    def clear(self):
+        self._build([])
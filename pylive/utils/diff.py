@@ -1,7 +1,7 @@
 from typing import *
-from dataclasses import dataclass
-from itertools import zip_longest
-_SENTINEL_ = object()
+from dataclasses import dataclass, field
+from collections import Counter, defaultdict
+from bisect import bisect_left
 
 @dataclass
 class Change:
@@ -12,19 +12,27 @@ class Change:
 
 def diff_dict(prev:dict, current:dict)->Change:
     """
-    Compute the difference between two dictionaries.
+    Compute the difference between two dictionaries, in a single pass over each.
 
     Args:
         prev (dict): The previous (original) dictionary.
         current (dict): The current (updated) dictionary.
 
     Returns:
-        dict: A dictionary containing added, removed, changed, and unchanged keys.
+        Change: the added, removed, changed (old, new) and unchanged items.
     """
-    added =     {k: current[k] for k in current if k not in prev.keys()}
-    removed =   {k: prev[k] for k in prev if k not in current.keys()}
-    changed =   {k: (prev[k], current[k]) for k in prev if k in current.keys() and prev[k] != current[k]}
-    unchanged = {k: prev[k] for k in prev if k in current and prev[k] == current[k].keys()}
+    added, removed, changed, unchanged = dict(), dict(), dict(), dict()
+    for key, value in prev.items():
+        if key not in current:
+            removed[key] = value
+        elif value is current[key] or value == current[key]:
+            unchanged[key] = value
+        else:
+            changed[key] = (value, current[key])
+
+    for key, value in current.items():
+        if key not in prev:
+            added[key] = value
 
     return Change(
         added=added,
@@ -58,29 +66,347 @@ def diff_set(prev: Set, current: Set) -> SetChange:
     )
 
 
-def diff_list(prev:list, current:list)->Change:
-    added = dict()
-    removed = dict()
-    unchanged = dict()
-    for i, (item1, item2) in enumerate(zip_longest(prev, current, fillvalue=_SENTINEL_)):
-        if item1 is item2:
-            # Items are unchanged
-            unchanged[i]=item1
-        elif item1 is _SENTINEL_:
-            # Item added in current
-            added[i]=item2
-        elif item2 is _SENTINEL_:
-            # Item removed from prev
-            removed[i]=item1
+### Lists ###
+@dataclass
+class ListRun:
+    """
+    consecutive items of an edit script.
+
+    equal:  prev[prev_index:] continues at current[current_index:]
+    delete: prev[prev_index:] is not in current, it was before current[current_index]
+    insert: current[current_index:] is not in prev, prev_index is -1
+    move:   prev[prev_index:] is at current[current_index:], out of order
+    """
+    kind: Literal["equal", "delete", "insert", "move"]
+    prev_index: int
+    current_index: int
+    items: list
+
+@dataclass
+class ListChange:
+    runs: List[ListRun] = field(default_factory=list) # in the order of the current list
+
+    def deleted(self)->List[ListRun]:
+        return [run for run in self.runs if run.kind == "delete"]
+
+    def inserted(self)->List[ListRun]:
+        return [run for run in self.runs if run.kind == "insert"]
+
+    def moved(self)->List[ListRun]:
+        return [run for run in self.runs if run.kind == "move"]
+
+
+def longest_increasing_subsequence(values:Sequence[Any])->List[int]:
+    """indices of a longest strictly increasing subsequence of values, in O(n log n)"""
+    tails = []  # value at the end of the best subsequence of each length
+    tail_indices = []
+    previous = [-1] * len(values)
+    for i, value in enumerate(values):
+        # mostly increasing values extend the longest subsequence, without a search
+        length = len(tails) if not tails or tails[-1] < value else bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_indices.append(i)
+        else:
+            tails[length] = value
+            tail_indices[length] = i
+        previous[i] = tail_indices[length-1] if length > 0 else -1
+
+    indices = []
+    i = tail_indices[-1] if tail_indices else -1
+    while i != -1:
+        indices.append(i)
+        i = previous[i]
+    return indices[::-1]
+
+_MYERS_LIMIT = 1_000 # largest gap without unique anchors, that is diffed with Myers
+_WINDOW_LIMIT = 1_024 # furthest a mismatch is resynchronized, before the rest is matched with anchors
+
+def _myers(a:Sequence[Hashable], b:Sequence[Hashable], a_lo:int, a_hi:int, b_lo:int, b_hi:int)->List[Tuple[int, int]]:
+    """matched index pairs of a shortest edit script, in O((N+M)D)"""
+    n, m = a_hi - a_lo, b_hi - b_lo
+    offset = n + m + 1
+    v = [0] * (2 * offset + 1) # furthest x on each diagonal k, at v[offset+k]
+    trace = [] # the diagonals -d-1..d+1 of v before each step d
+    for d in range(n + m + 1):
+        trace.append(v[offset-d-1:offset+d+2])
+        for k in range(-d, d+1, 2):
+            if k == -d or (k != d and v[offset+k-1] < v[offset+k+1]):
+                x = v[offset+k+1] # down: insertion
+            else:
+                x = v[offset+k-1] + 1 # right: deletion
+            y = x - k
+            while x < n and y < m and a[a_lo+x] == b[b_lo+y]:
+                x, y = x+1, y+1
+            v[offset+k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, n, m, a_lo, b_lo)
+    return []
+
+def _myers_backtrack(trace:List[List[int]], n:int, m:int, a_lo:int, b_lo:int)->List[Tuple[int, int]]:
+    matches = []
+    x, y = n, m
+    for d in range(len(trace)-1, 0, -1):
+        v = trace[d] # v[k+d+1] is diagonal k
+        k = x - y
+        if k == -d or (k != d and v[k-1+d+1] < v[k+1+d+1]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[previous_k+d+1]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x, y = x-1, y-1
+            matches.append((a_lo+x, b_lo+y))
+        x, y = previous_x, previous_y
+    while x > 0 and y > 0:
+        x, y = x-1, y-1
+        matches.append((a_lo+x, b_lo+y))
+    return matches[::-1]
+
+def _common_length(a:Sequence[Hashable], b:Sequence[Hashable], i:int, j:int, limit:int)->int:
+    """length of the common run of a[i:] and b[j:], up to limit. galloping slice compares, so the items are compared in C"""
+    lo, hi = 0, 1
+    while hi <= limit and a[i+lo:i+hi] == b[j+lo:j+hi]:
+        lo, hi = hi, hi * 2
+    hi = min(hi, limit + 1) # the run is shorter than hi
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[i+lo:i+mid] == b[j+lo:j+mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+def _common_suffix_length(a:Sequence[Hashable], b:Sequence[Hashable], a_hi:int, b_hi:int, limit:int)->int:
+    """length of the common run of a[:a_hi] and b[:b_hi], from the end, up to limit"""
+    lo, hi = 0, 1
+    while hi <= limit and a[a_hi-hi:a_hi-lo] == b[b_hi-hi:b_hi-lo]:
+        lo, hi = hi, hi * 2
+    hi = min(hi, limit + 1)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[a_hi-mid:a_hi-lo] == b[b_hi-mid:b_hi-lo]:
+            lo = mid
         else:
-            # Item replaced (treated as a remove and add)
-            removed[i]=item1
-            added[i]=item2
+            hi = mid
+    return lo
+
+def _resync(a:Sequence[Hashable], b:Sequence[Hashable], i:int, j:int, a_hi:int, b_hi:int)->Tuple[int, int]|None:
+    """the nearest matching pair after a mismatch at i, j, searched in growing windows up to _WINDOW_LIMIT"""
+    window = 8
+    while True:
+        a_end, b_end = min(i+window, a_hi), min(j+window, b_hi)
+        a_first = dict(zip(reversed(a[i:a_end]), reversed(range(i, a_end))))
+        nearest = None
+        for k in range(j, b_end):
+            position = a_first.get(b[k])
+            if position is not None and (nearest is None or position+k < nearest[0]+nearest[1]):
+                nearest = position, k
+        if nearest is not None:
+            return nearest
+        if (a_end == a_hi and b_end == b_hi) or window >= _WINDOW_LIMIT:
+            return None
+        window *= 2
+
+def _heaviest_increasing_runs(runs:List[Tuple[int, int, int]])->List[Tuple[int, int, int]]:
+    """
+    the runs (prev index, current index, length) of the longest total length,
+    increasing in both lists. runs are in the order of the current list, in O(r log r)
+    """
+    if sum(length for i, j, length in runs) <= 8 * len(runs):
+        # mostly short runs: the longest increasing subsequence of their items
+        items = [(i+k, j+k) for i, j, length in runs for k in range(length)]
+        heaviest:List[List[int]] = []
+        for index in longest_increasing_subsequence([i for i, j in items]):
+            i, j = items[index]
+            if heaviest and heaviest[-1][0] + heaviest[-1][2] == i and heaviest[-1][1] + heaviest[-1][2] == j:
+                heaviest[-1][2] += 1
+            else:
+                heaviest.append([i, j, 1])
+        return [(i, j, length) for i, j, length in heaviest]
+
+    rank = {i: r for r, i in enumerate(sorted(i for i, j, length in runs))}
+    weights = [0] * (len(runs) + 1) # Fenwick tree of the heaviest chain ending before each rank, 1-based
+    lasts = [-1] * (len(runs) + 1)  # and the last run of that chain
+    previous = [-1] * len(runs)
+    best_weight, best = 0, -1
+    for index, (i, j, length) in enumerate(runs):
+        weight, last = 0, -1
+        k = rank[i]
+        while k > 0:
+            if weights[k] > weight:
+                weight, last = weights[k], lasts[k]
+            k -= k & -k
+        previous[index] = last
+        weight += length
+        if weight > best_weight:
+            best_weight, best = weight, index
+        k = rank[i] + 1
+        while k < len(weights):
+            if weight > weights[k]:
+                weights[k], lasts[k] = weight, index
+            k += k & -k
+
+    chain = []
+    while best != -1:
+        chain.append(runs[best])
+        best = previous[best]
+    return chain[::-1]
 
-    return Change(added, removed, dict(), unchanged)
+def _matches(a:Sequence[Hashable], b:Sequence[Hashable])->List[Tuple[int, int, int]]:
+    """
+    matched runs (prev index, current index, length), increasing in both lists.
+
+    common prefixes and suffixes are matched first, then items unique in both
+    ranges are used as anchors (patience diff). each anchor is extended to the run
+    of equal items following it, and the heaviest increasing chain of runs is kept.
+    the gaps between the runs are matched the same way, gaps without anchors are
+    diffed with Myers.
+
+    large lists are first walked along the equal runs, and each mismatch is
+    resynchronized at the nearest matching pair in a small window. the skipped
+    items are matched as gaps, so local edits do not hash the whole lists.
+
+    equal runs are compared with slices, so long unchanged stretches are not
+    visited item by item in Python.
+    """
+    matches:List[Tuple[int, int, int]] = []
+    stack = []
+
+    # walk the equal runs
+    i, j = 0, 0
+    if len(a) + len(b) > _MYERS_LIMIT:
+        while i < len(a) and j < len(b):
+            length = _common_length(a, b, i, j, min(len(a)-i, len(b)-j))
+            if length:
+                matches.append((i, j, length))
+                i, j = i+length, j+length
+                continue
+            nearest = _resync(a, b, i, j, len(a), len(b))
+            if nearest is None:
+                break
+            stack.append((i, nearest[0], j, nearest[1]))
+            i, j = nearest
+    stack.append((i, len(a), j, len(b)))
+
+    while stack:
+        a_lo, a_hi, b_lo, b_hi = stack.pop()
+        length = _common_length(a, b, a_lo, b_lo, min(a_hi-a_lo, b_hi-b_lo))
+        if length:
+            matches.append((a_lo, b_lo, length))
+            a_lo, b_lo = a_lo+length, b_lo+length
+        length = _common_suffix_length(a, b, a_hi, b_hi, min(a_hi-a_lo, b_hi-b_lo))
+        if length:
+            a_hi, b_hi = a_hi-length, b_hi-length
+            matches.append((a_hi, b_hi, length))
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+
+        # keyed lists are mostly unique, then the items are not counted
+        a_position = dict(zip(a[a_lo:a_hi], range(a_lo, a_hi)))
+        a_counts = Counter(a[a_lo:a_hi]) if len(a_position) < a_hi - a_lo else None
+        b_counts = Counter(b[b_lo:b_hi]) if len(set(b[b_lo:b_hi])) < b_hi - b_lo else None
+        runs:List[Tuple[int, int, int]] = []
+        j = b_lo
+        while j < b_hi:
+            item = b[j]
+            if item in a_position and (a_counts is None or a_counts[item] == 1) and (b_counts is None or b_counts[item] == 1):
+                i = a_position[item]
+                length = _common_length(a, b, i, j, min(a_hi-i, b_hi-j))
+                runs.append((i, j, length))
+                j += length
+            else:
+                j += 1
+
+        if runs:
+            runs = _heaviest_increasing_runs(runs)
+            matches += runs
+            bounds = [(a_lo, b_lo, 0)] + runs + [(a_hi, b_hi, 0)]
+            for (a_start, b_start, start_length), (a_end, b_end, _) in zip(bounds, bounds[1:]):
+                a_start, b_start = a_start+start_length, b_start+start_length
+                if a_start < a_end or b_start < b_end:
+                    stack.append((a_start, a_end, b_start, b_end))
+        elif (a_hi - a_lo) + (b_hi - b_lo) <= _MYERS_LIMIT and not a_position.keys().isdisjoint(b[b_lo:b_hi]):
+            matches += [(i, j, 1) for i, j in _myers(a, b, a_lo, a_hi, b_lo, b_hi)]
+
+    matches.sort()
+    return matches
+
+def diff_list(prev:Sequence, current:Sequence, key:Callable[[Any], Hashable]|None=None)->ListChange:
+    """
+    Compute the runs of equal, deleted, inserted and moved items between two lists.
+
+    items are compared by key, or by equality when key is None, so they must be hashable.
+    use key=id to compare by identity.
+    deleted items that are inserted again are reported as moves.
+
+    Args:
+        prev (Sequence): The previous (original) list.
+        current (Sequence): The current (updated) list.
+
+    Returns:
+        ListChange: the runs, in the order of the current list.
+    """
+    a = [key(item) for item in prev] if key else list(prev)
+    b = [key(item) for item in current] if key else list(current)
+    matches = _matches(a, b)
+
+    # the adjacent matched runs as diagonals, and the gaps before them
+    diagonals:List[List[int]] = [] # prev index, current index, length
+    for i, j, length in matches:
+        if diagonals:
+            last = diagonals[-1]
+            if last[0] + last[2] == i and last[1] + last[2] == j:
+                last[2] += length
+                continue
+        diagonals.append([i, j, length])
+    diagonals.append([len(a), len(b), 0])
+
+    gaps:List[Tuple[int, int, int, int]] = [] # prev range, current range
+    i = j = 0
+    for diagonal_i, diagonal_j, length in diagonals:
+        gaps.append((i, diagonal_i, j, diagonal_j))
+        i, j = diagonal_i + length, diagonal_j + length
+
+    # pair the unmatched items with the same key as moves
+    unmatched_a:Dict[Hashable, List[int]] = defaultdict(list)
+    for a_lo, a_hi, b_lo, b_hi in reversed(gaps):
+        for i in reversed(range(a_lo, a_hi)):
+            unmatched_a[a[i]].append(i)
+    move_source:Dict[int, int] = dict() # current index -> prev index
+    for a_lo, a_hi, b_lo, b_hi in gaps:
+        for j in range(b_lo, b_hi):
+            if unmatched_a.get(b[j]):
+                move_source[j] = unmatched_a[b[j]].pop()
+    moved_a = set(move_source.values())
+
+    runs:List[ListRun] = []
+    def extend(kind:Literal["delete", "insert", "move"], prev_index:int, current_index:int, item:Any):
+        if runs:
+            last = runs[-1]
+            follows_prev = kind == "insert" or last.prev_index + len(last.items) == prev_index
+            follows_current = kind == "delete" or last.current_index + len(last.items) == current_index
+            if last.kind == kind and follows_prev and follows_current:
+                last.items.append(item)
+                return
+        runs.append(ListRun(kind, prev_index, current_index, [item]))
+
+    for (a_lo, a_hi, b_lo, b_hi), (diagonal_i, diagonal_j, length) in zip(gaps, diagonals):
+        for i in range(a_lo, a_hi):
+            if i not in moved_a:
+                extend("delete", i, b_lo, prev[i])
+        for j in range(b_lo, b_hi):
+            if j in move_source:
+                extend("move", move_source[j], j, prev[move_source[j]])
+            else:
+                extend("insert", -1, j, current[j])
+        if length:
+            runs.append(ListRun("equal", diagonal_i, diagonal_j, list(prev[diagonal_i:diagonal_i+length])))
+
+    return ListChange(runs)
 
 
-# New patch_dict
 def patch_dict(original: dict, change: Change) -> dict:
     """
     Apply a dictionary patch to transform the original dictionary.
@@ -93,36 +419,31 @@ def patch_dict(original: dict, change: Change) -> dict:
         dict: The updated dictionary.
     """
     updated = original.copy()
-    # Remove keys
     for key in change.removed:
-        updated.pop(key, None)
-    # Add or update keys
-    for key, value in change.added.items():
-        updated[key] = value
-    # Apply changed values
+        del updated[key]
+    updated.update(change.added)
     for key, (_, new_value) in change.changed.items():
         updated[key] = new_value
     return updated
 
-# New patch_list
-def patch_list(original: List, change: Change) -> List:
+def patch_list(original: Sequence, change: ListChange) -> list:
     """
-    Apply a list patch to transform the original list.
+    Apply a list patch to transform the original list, in a single pass.
+
+    kept and moved items are taken from the original list.
 
     Args:
-        original (List): The original list.
-        change (Change): The changes to apply.
+        original (Sequence): The original list.
+        change (ListChange): The runs to apply.
 
     Returns:
-        List: The updated list.
-    """
-    updated = original[:]
-    # Remove items in reverse order to preserve indices
-    for index in sorted(change.removed.keys(), reverse=True):
-        if index < len(updated):
-            updated.pop(index)
-    # Add items at the specified indices
-    for index, value in change.added.items():
-        updated.insert(index, value)
+        list: The updated list.
+    """
+    updated = []
+    for run in change.runs:
+        match run.kind:
+            case "equal" | "move":
+                updated.extend(original[run.prev_index:run.prev_index+len(run.items)])
+            case "insert":
+                updated.extend(run.items)
     return updated
-
@@ -75,32 +75,119 @@ def get_function_name(code_string:str)->str:
 import ast
 
 
+def _argument_names(args:ast.arguments)->set[str]:
+    return {arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg] if arg}
+
+def _local_names(body:list[ast.stmt])->set[str]:
+    """the names bound in a function or class body, without the names declared global"""
+    bound, declared_global = set(), set()
+    nodes:list[ast.AST] = list(body)
+    while nodes:
+        node = nodes.pop()
+        match node:
+            case ast.Name(ctx=ast.Store()):
+                bound.add(node.id)
+            case ast.FunctionDef() | ast.AsyncFunctionDef() | ast.ClassDef():
+                bound.add(node.name) # the body is a nested scope
+                continue
+            case ast.Lambda():
+                continue
+            case ast.Import() | ast.ImportFrom():
+                bound |= {alias.asname or alias.name.split(".")[0] for alias in node.names if alias.name != "*"}
+            case ast.ExceptHandler(name=str()):
+                bound.add(node.name)
+            case ast.Global():
+                declared_global |= set(node.names)
+        nodes.extend(ast.iter_child_nodes(node))
+    return bound - declared_global
+
+
 class UnboundedNameFinder(ast.NodeVisitor):
     def __init__(self):
         self.unbounded_names = list()
         self.defined_names = set()
         self.comprehension_names = set()  # Tracks variables bound in comprehensions
+        self._scopes:list[tuple[set[str], bool]] = [] # the local names of the enclosing functions and classes, and whether it is a class
+
+    def _isLocal(self, name:str)->bool:
+        # a class body is not visible from the functions inside it
+        return any(
+            name in names for i, (names, is_class) in enumerate(self._scopes)
+            if not is_class or i == len(self._scopes)-1
+        )
+
+    def _bind(self, name:str):
+        # names bound in a function or class body are local, the rest are global
+        if not self._scopes or name not in self._scopes[-1][0]:
+            self.defined_names.add(name)
+
+    def _visitScope(self, names:set[str], body:list[ast.AST], is_class:bool=False):
+        self._scopes.append((names, is_class))
+        for node in body:
+            self.visit(node)
+        self._scopes.pop()
 
     def visit_Name(self, node):
         if isinstance(node.ctx, ast.Load):  # Variable is being used
-            if node.id not in self.defined_names and node.id not in self.comprehension_names:
+            if node.id not in self.defined_names and node.id not in self.comprehension_names and not self._isLocal(node.id):
                 if node.id not in self.unbounded_names:
                     self.unbounded_names.append(node.id)
         elif isinstance(node.ctx, ast.Store):  # Variable is being assigned
-            self.defined_names.add(node.id)
+            self._bind(node.id)
         self.generic_visit(node)
 
     def visit_Assign(self, node):
-        # Process assigned variables before visiting right-hand side
+        # the right-hand side is evaluated before the targets are bound: `x = x + 1` reads x
+        self.visit(node.value)
         for target in node.targets:
-            if isinstance(target, ast.Name):
-                self.defined_names.add(target.id)
-        self.generic_visit(node)
+            self.visit(target)
+
+    def visit_AugAssign(self, node):
+        # `x += 1` reads x, then binds it
+        if isinstance(node.target, ast.Name):
+            self.visit_Name(ast.Name(id=node.target.id, ctx=ast.Load()))
+        self.visit(node.value)
+        self.visit(node.target)
+
+    def _visitArguments(self, args:ast.arguments):
+        # defaults and annotations are evaluated in the enclosing scope
+        for default in args.defaults + [default for default in args.kw_defaults if default]:
+            self.visit(default)
+        for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]:
+            if arg and arg.annotation:
+                self.visit(arg.annotation)
 
     def visit_FunctionDef(self, node):
-        # Function names should be considered defined
-        self.defined_names.add(node.name)
-        self.generic_visit(node)
+        # Function names should be considered defined, the arguments and the names bound in the body are local
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self._visitArguments(node.args)
+        if node.returns:
+            self.visit(node.returns)
+        self._bind(node.name)
+        self._visitScope(_argument_names(node.args) | _local_names(node.body), node.body)
+
+    def visit_AsyncFunctionDef(self, node):
+        self.visit_FunctionDef(node)
+
+    def visit_Lambda(self, node):
+        self._visitArguments(node.args)
+        self._visitScope(_argument_names(node.args), [node.body])
+
+    def visit_ClassDef(self, node):
+        for expr in node.decorator_list + node.bases + [keyword.value for keyword in node.keywords]:
+            self.visit(expr)
+        self._bind(node.name)
+        self._visitScope(_local_names(node.body), node.body, is_class=True)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self._bind(alias.asname or alias.name.split(".")[0])
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name != "*":
+                self._bind(alias.asname or alias.name)
 
     def visit_ListComp(self, node):
         # Handle comprehensions correctly
@@ -141,9 +141,11 @@ from PySide6.QtGui import *
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
 
+from typing import *
+import numpy as np
 
 
-def intersect_line_with_path(
+def _intersect_line_with_path_stroked(
     p1: QPointF, 
     p2: QPointF, 
     path: QPainterPath,
@@ -151,7 +153,8 @@ def intersect_line_with_path(
 ) -> QPointF|None:
     """
     Finds the intersection point of a line segment (ray) defined by p1 and p2 with a given QPainterPath.
-    Uses an optimized approach with configurable tolerance for better performance and accuracy.
+    Clips a stroke of the ray with the path. This was intersect_line_with_path,
+    it is kept as the reference for the analytic intersections.
     
     Args:
         p1: Start point of the ray
@@ -225,6 +228,323 @@ def intersect_line_with_path(
     return best_point
 
 
+
+### Analytic intersections ###
+# the segment p1 + t*(p2-p1), 0 <= t <= 1, enters a shape at the smallest t
+# inside the shape. t is 0, when p1 is inside.
+
+def _enter_rectangle(x:float, y:float, dx:float, dy:float, left:float, top:float, right:float, bottom:float)->float|None:
+    """slab method"""
+    t_min, t_max = 0.0, 1.0
+    for p, d, lo, hi in ((x, dx, left, right), (y, dy, top, bottom)):
+        if d == 0:
+            if not lo <= p <= hi:
+                return None
+            continue
+        t0, t1 = (lo - p) / d, (hi - p) / d
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_min, t_max = max(t_min, t0), min(t_max, t1)
+        if t_min > t_max:
+            return None
+    return t_min
+
+
+def _enter_ellipse(x:float, y:float, dx:float, dy:float, cx:float, cy:float, rx:float, ry:float)->float|None:
+    """solve the segment against the unit circle, in the space of the ellipse"""
+    if rx <= 0 or ry <= 0:
+        return None
+    px, py = (x - cx) / rx, (y - cy) / ry
+    qx, qy = dx / rx, dy / ry
+    a = qx * qx + qy * qy
+    b = 2 * (px * qx + py * qy)
+    c = px * px + py * py - 1
+    if c <= 0:
+        return 0.0
+    discriminant = b * b - 4 * a * c
+    if a == 0 or discriminant < 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / (2 * a)
+    return t if 0 <= t <= 1 else None
+
+
+def _enter_rounded_rectangle(x:float, y:float, dx:float, dy:float, left:float, top:float, right:float, bottom:float, rx:float, ry:float)->float|None:
+    """the rounded rectangle is the union of two rectangles and four corner ellipses"""
+    ts = [
+        _enter_rectangle(x, y, dx, dy, left, top + ry, right, bottom - ry),
+        _enter_rectangle(x, y, dx, dy, left + rx, top, right - rx, bottom),
+    ]
+    for cx in (left + rx, right - rx):
+        for cy in (top + ry, bottom - ry):
+            ts.append(_enter_ellipse(x, y, dx, dy, cx, cy, rx, ry))
+    return min((t for t in ts if t is not None), default=None)
+
+
+def _enter_convex_polygon(x:float, y:float, dx:float, dy:float, vertices:Sequence[Tuple[float, float]], orientation:float)->float|None:
+    """Cyrus-Beck clipping, against the inner side of each edge"""
+    t_min, t_max = 0.0, 1.0
+    for (ax, ay), (bx, by) in zip(vertices, [*vertices[1:], vertices[0]]):
+        ex, ey = bx - ax, by - ay
+        inside = (ex * (y - ay) - ey * (x - ax)) * orientation
+        rate = (ex * dy - ey * dx) * orientation
+        if rate == 0:
+            if inside < 0:
+                return None
+        elif rate > 0:
+            t_min = max(t_min, -inside / rate)
+        else:
+            t_max = min(t_max, -inside / rate)
+        if t_min > t_max:
+            return None
+    return t_min
+
+
+def _enter_edges(p1:np.ndarray, p2:np.ndarray, edges:np.ndarray)->np.ndarray:
+    """
+    the t of many segments entering the odd-even area of the edges.
+    p1, p2: (N, 2), edges: (E, 4) as x1, y1, x2, y2. nan where a segment misses.
+    """
+    d = (p2 - p1)[:, None, :]
+    a, e = edges[None, :, 0:2], edges[None, :, 2:4] - edges[None, :, 0:2]
+    ap = a - p1[:, None, :]
+    denominator = d[..., 0] * e[..., 1] - d[..., 1] * e[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (ap[..., 0] * e[..., 1] - ap[..., 1] * e[..., 0]) / denominator
+        u = (ap[..., 0] * d[..., 1] - ap[..., 1] * d[..., 0]) / denominator
+    hits = (denominator != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    t_enter = np.where(hits, t, np.inf).min(axis=1)
+
+    # p1 is inside, when a horizontal ray from it crosses the edges an odd number of times
+    y1, y2 = edges[None, :, 1], edges[None, :, 3]
+    px, py = p1[:, 0:1], p1[:, 1:2]
+    straddles = (y1 > py) != (y2 > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing_x = edges[None, :, 0] + (py - y1) / (y2 - y1) * (edges[None, :, 2] - edges[None, :, 0])
+    inside = np.count_nonzero(straddles & (crossing_x > px), axis=1) % 2 == 1
+
+    t_enter[inside] = 0.0
+    t_enter[np.isinf(t_enter)] = np.nan
+    return t_enter
+
+
+def _enter_edge_list(x:float, y:float, dx:float, dy:float, edges:Sequence[Tuple[float, float, float, float]])->float|None:
+    """_enter_edges for a single segment, without the numpy overhead for few edges"""
+    t_enter = math.inf
+    inside = False
+    for ax, ay, bx, by in edges:
+        ex, ey = bx - ax, by - ay
+        denominator = dx * ey - dy * ex
+        if denominator != 0:
+            px, py = ax - x, ay - y
+            t = (px * ey - py * ex) / denominator
+            u = (px * dy - py * dx) / denominator
+            if 0 <= t <= 1 and 0 <= u <= 1 and t < t_enter:
+                t_enter = t
+        if (ay > y) != (by > y) and ax + (y - ay) / (by - ay) * ex > x:
+            inside = not inside
+    if inside:
+        return 0.0
+    return None if t_enter == math.inf else t_enter
+
+
+def _polygon_edges(polygons:Iterable[Sequence[Tuple[float, float]]])->np.ndarray:
+    """the closing edges of the polygons, as an (E, 4) array"""
+    edges = []
+    for vertices in polygons:
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        if len(vertices) > 1:
+            edges.append(np.hstack([vertices, np.roll(vertices, -1, axis=0)]))
+    return np.vstack(edges) if edges else np.empty((0, 4))
+
+
+def intersect_segments_with_rectangles(p1:np.ndarray, p2:np.ndarray, rects:np.ndarray)->np.ndarray:
+    """
+    Intersects many segments with axis-aligned rectangles at once.
+
+    Args:
+        p1, p2: (N, 2) start and end points
+        rects: (N, 4) or (4,) as left, top, right, bottom
+
+    Returns:
+        (N, 2) the points where the segments enter the rectangles, p1 when it
+        is inside, nan where a segment misses.
+    """
+    p1, p2 = np.asarray(p1, dtype=np.float64), np.asarray(p2, dtype=np.float64)
+    rects = np.broadcast_to(np.asarray(rects, dtype=np.float64), (len(p1), 4))
+    d = p2 - p1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t0 = (rects[:, 0:2] - p1) / d
+        t1 = (rects[:, 2:4] - p1) / d
+    parallel = d == 0
+    outside = parallel & ((p1 < rects[:, 0:2]) | (p1 > rects[:, 2:4]))
+    t_near = np.where(parallel, -np.inf, np.minimum(t0, t1))
+    t_far = np.where(parallel, np.inf, np.maximum(t0, t1))
+    t_min = np.maximum(t_near.max(axis=1), 0.0)
+    t_max = np.minimum(t_far.min(axis=1), 1.0)
+    miss = (t_min > t_max) | outside.any(axis=1)
+    points = p1 + t_min[:, None] * d
+    points[miss] = np.nan
+    return points
+
+
+def intersect_segments_with_polygon(p1:np.ndarray, p2:np.ndarray, vertices:np.ndarray)->np.ndarray:
+    """
+    Intersects many segments with a polygon at once.
+
+    Args:
+        p1, p2: (N, 2) start and end points
+        vertices: (V, 2) the polygon, closed implicitly. filled with the odd-even rule.
+
+    Returns:
+        (N, 2) the points where the segments enter the polygon, p1 when it
+        is inside, nan where a segment misses.
+    """
+    p1, p2 = np.asarray(p1, dtype=np.float64), np.asarray(p2, dtype=np.float64)
+    t = _enter_edges(p1, p2, _polygon_edges([vertices]))
+    return p1 + t[:, None] * (p2 - p1)
+
+
+def _is_convex(vertices:Sequence[Tuple[float, float]])->float:
+    """the orientation of a convex polygon, 1 or -1, and 0 when it is not convex"""
+    orientation = 0.0
+    direction_changes = 0
+    n = len(vertices)
+    for i in range(n):
+        (ax, ay), (bx, by), (cx, cy) = vertices[i], vertices[(i+1)%n], vertices[(i+2)%n]
+        cross = (bx - ax) * (cy - by) - (by - ay) * (cx - bx)
+        if cross != 0:
+            if orientation == 0:
+                orientation = math.copysign(1.0, cross)
+            elif math.copysign(1.0, cross) != orientation:
+                return 0.0
+        if (bx - ax) * (cx - bx) < 0:
+            direction_changes += 1
+    # a star turns the same way at every vertex, but goes back and forth more than twice
+    return orientation if direction_changes <= 2 else 0.0
+
+
+_PATH_SHAPE_CACHE_SIZE = 1024
+_SCALAR_EDGES_LIMIT = 256 # flattened paths with more edges are intersected with numpy
+_path_shapes:Dict[bytes, tuple] = dict() # serialized path -> shape
+
+def _path_shape(path:QPainterPath)->tuple:
+    """
+    the analytic shape of a path:
+    ('rect', left, top, right, bottom), ('rounded_rect', left, top, right, bottom, rx, ry),
+    ('ellipse', cx, cy, rx, ry), ('convex', vertices, orientation),
+    or ('edges', (E, 4) array, list of edges) of the flattened path.
+    QPainterPath is not hashable, shapes are cached by the serialized path,
+    that is a single call instead of reading each element.
+    """
+    data = QByteArray()
+    QDataStream(data, QIODevice.OpenModeFlag.WriteOnly) << path
+    key = data.data()
+    if shape := _path_shapes.get(key):
+        return shape
+
+    shape = _classify_path(path)
+    if len(_path_shapes) >= _PATH_SHAPE_CACHE_SIZE:
+        del _path_shapes[next(iter(_path_shapes))]
+    _path_shapes[key] = shape
+    return shape
+
+
+def _classify_path(path:QPainterPath)->tuple:
+    elements = [
+        (element.type, element.x, element.y)
+        for element in (path.elementAt(i) for i in range(path.elementCount()))
+    ]
+    rect = path.boundingRect()
+    types = [element_type for element_type, x, y in elements]
+    MoveTo = QPainterPath.ElementType.MoveToElement
+    LineTo = QPainterPath.ElementType.LineToElement
+
+    if types.count(MoveTo) == 1 and types[0] == MoveTo and all(t == LineTo for t in types[1:]):
+        vertices = [(x, y) for t, x, y in elements]
+        if len(vertices) > 1 and vertices[-1] == vertices[0]:
+            vertices.pop()
+        is_axis_aligned = all(
+            ax == bx or ay == by
+            for (ax, ay), (bx, by) in zip(vertices, [*vertices[1:], vertices[0]])
+        )
+        if len(vertices) == 4 and is_axis_aligned:
+            return ('rect', rect.left(), rect.top(), rect.right(), rect.bottom())
+        if len(vertices) >= 3 and (orientation := _is_convex(vertices)):
+            return ('convex', vertices, orientation)
+
+    elif len(elements) == 13:
+        ellipse = QPainterPath()
+        ellipse.addEllipse(rect)
+        if ellipse == path:
+            return ('ellipse', rect.center().x(), rect.center().y(), rect.width() / 2, rect.height() / 2)
+
+    elif len(elements) == 17:
+        # starts at the left, below the top left corner
+        rx, ry = elements[3][1] - rect.left(), elements[0][2] - rect.top()
+        rounded_rect = QPainterPath()
+        rounded_rect.addRoundedRect(rect, rx, ry)
+        if rounded_rect == path:
+            return ('rounded_rect', rect.left(), rect.top(), rect.right(), rect.bottom(), rx, ry)
+
+    polygons = [[(point.x(), point.y()) for point in polygon] for polygon in path.toFillPolygons()]
+    edges = _polygon_edges(polygons)
+    return ('edges', edges, [tuple(edge) for edge in edges.tolist()])
+
+
+def _enter_path_shape(x:float, y:float, dx:float, dy:float, shape:tuple)->float|None:
+    match shape:
+        case ('rect', left, top, right, bottom):
+            return _enter_rectangle(x, y, dx, dy, left, top, right, bottom)
+        case ('rounded_rect', left, top, right, bottom, rx, ry):
+            return _enter_rounded_rectangle(x, y, dx, dy, left, top, right, bottom, rx, ry)
+        case ('ellipse', cx, cy, rx, ry):
+            return _enter_ellipse(x, y, dx, dy, cx, cy, rx, ry)
+        case ('convex', vertices, orientation):
+            return _enter_convex_polygon(x, y, dx, dy, vertices, orientation)
+        case ('edges', edges, edge_list) if len(edge_list) <= _SCALAR_EDGES_LIMIT:
+            return _enter_edge_list(x, y, dx, dy, edge_list)
+        case ('edges', edges, edge_list):
+            t = _enter_edges(np.array([[x, y]]), np.array([[x + dx, y + dy]]), edges)[0]
+            return None if np.isnan(t) else float(t)
+        case _:
+            raise ValueError(f"unknown shape: {shape[0]}")
+
+
+def intersect_line_with_path(
+    p1: QPointF,
+    p2: QPointF,
+    path: QPainterPath,
+    tolerance: float = 1.0
+) -> QPointF|None:
+    """
+    Finds the point where the line segment from p1 to p2 enters a QPainterPath.
+
+    rectangles, rounded rectangles, ellipses and convex polygons are intersected
+    analytically, other paths are flattened to polygons once, and cached.
+
+    Args:
+        p1: Start point of the ray
+        p2: End point of the ray
+        path: QPainterPath to intersect with
+        tolerance: unused, the intersection is exact. kept for compatibility
+
+    Returns:
+        The intersection point as QPointF, p1 when it is inside the path,
+        or None if no intersection is found
+    """
+    if path.isEmpty():
+        return None
+    x, y = p1.x(), p1.y()
+    dx, dy = p2.x() - x, p2.y() - y
+    if dx * dx + dy * dy < 1e-12:  # Protect against zero-length rays
+        return None
+
+    t = _enter_path_shape(x, y, dx, dy, _path_shape(path))
+    if t is None:
+        return None
+    return QPointF(x + t * dx, y + t * dy)
+
+
 def getShapeRight(shape:QGraphicsItem | QPainterPath | QRectF | QPointF)->QPointF:
     """return scene position"""
     match shape:
@@ -265,7 +585,11 @@ def getShapeCenter(shape: QPointF | QRectF | QPainterPath | QGraphicsItem):
         case QPainterPath():
             return shape.boundingRect().center()
         case QGraphicsItem():
-            sceneShape = shape.sceneTransform().map(shape.shape())
+            transform = shape.sceneTransform()
+            if transform.isAffine() and not transform.isRotating():
+                # the bounding rect maps to the bounding rect, without mapping the path
+                return transform.map(shape.shape().boundingRect().center())
+            sceneShape = transform.map(shape.shape())
             return sceneShape.boundingRect().center()
         case _:
             raise ValueError
@@ -274,8 +598,12 @@ def getShapeCenter(shape: QPointF | QRectF | QPainterPath | QGraphicsItem):
 def makeLineToShape(
     origin: QPointF, shape: QPointF | QRectF | QPainterPath | QGraphicsItem
 ):
-    center = getShapeCenter(shape)
+    return _makeLineToShape(origin, shape, getShapeCenter(shape))
 
+
+def _makeLineToShape(
+    origin: QPointF, shape: QPointF | QRectF | QPainterPath | QGraphicsItem, center: QPointF
+):
     match shape:
         case QPointF():
             intersection = center
@@ -296,18 +624,18 @@ def makeLineToShape(
                 intersection = center
 
         case QPainterPath():
-            if P := intersect_line_with_path(
-                origin, center, shape
-            ):  # TODO: use intersect_ray_with_polygon
+            if P := intersect_line_with_path(origin, center, shape):
                 intersection = P
             else:
                 intersection = center
         case QGraphicsItem():
-            sceneShape = shape.sceneTransform().map(shape.shape())
-            if P := intersect_line_with_path(
-                origin, center, sceneShape
-            ):  # TODO: use intersect_ray_with_polygon
-                intersection = P
+            # intersect the local shape, it stays the same when the item moves, so its analysis is cached
+            transform = shape.sceneTransform()
+            inverted, is_invertible = transform.inverted()
+            if is_invertible and (P := intersect_line_with_path(
+                inverted.map(origin), inverted.map(center), shape.shape()
+            )):
+                intersection = transform.map(P)
             else:
                 intersection = center
         case _:
@@ -324,8 +652,8 @@ def makeLineBetweenShapes(
     Ac = getShapeCenter(A)
     Bc = getShapeCenter(B)
 
-    I2 = makeLineToShape(Ac, B).p2()
-    I1 = makeLineToShape(Bc, A).p2()
+    I2 = _makeLineToShape(Ac, B, Bc).p2()
+    I1 = _makeLineToShape(Bc, A, Ac).p2()
 
     line = QLineF(I1, I2)
     length = line.length()
@@ -99,3 +99,7 @@ def hiearchical_layout_with_nx(G:nx.DiGraph, scale=100)->dict[Any, tuple[float,
         pos[n] = p[0] * scale, p[1] * scale
     return pos
 
+
+def hiearchical_layout_with_sugiyama(G:nx.DiGraph, scale=100)->dict[Any, tuple[float, float]]:
+    from pylive.utils.layered_layout import LayeredLayout
+    return LayeredLayout(layer_spacing=scale, node_spacing=scale).layout(G)
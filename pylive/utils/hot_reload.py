@@ -0,0 +1,355 @@
+# ########## #
+# Hot Reload #
+# ########## #
+
+"""
+Reload python modules when their files are saved.
+
+One HotReloader watches all files with a single watcher thread, and handles
+the changes in debounced batches.
+
+- when only function bodies changed, the functions are patched in place:
+  their code objects are swapped, so module state and every reference to
+  the functions (eg.: `from solver import solve`) stay valid.
+- any other change reloads the module, and the watched modules depending on it,
+  in import order.
+
+usage:
+    from pylive.utils.hot_reload import HotReloader
+    reloader = HotReloader.shared()
+    reloader.watch(solver)
+    reloader.start()
+"""
+
+from typing import *
+from types import ModuleType, FunctionType, CodeType
+from dataclasses import dataclass, field
+from pathlib import Path
+import importlib
+import importlib.util
+import threading
+import inspect
+import time
+import ast
+import sys
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReloadReport:
+    patched: list[str] = field(default_factory=list) # qualified function names
+    reloaded: list[str] = field(default_factory=list) # module names, in reload order
+    errors: list[tuple[str, Exception]] = field(default_factory=list) # module name, error
+    elapsed: float = 0.0 # seconds
+
+
+### Function level diff ###
+FunctionNode = ast.FunctionDef | ast.AsyncFunctionDef
+
+
+def _function_nodes(tree: ast.Module) -> dict[str, FunctionNode]:
+    """module level functions and class methods by qualified name"""
+    functions = dict()
+
+    def visit(body: list[ast.stmt], prefix: str):
+        for node in body:
+            match node:
+                case ast.FunctionDef() | ast.AsyncFunctionDef():
+                    functions[prefix + node.name] = node
+                case ast.ClassDef():
+                    visit(node.body, f"{prefix}{node.name}.")
+    visit(tree.body, "")
+    return functions
+
+
+def _skeleton(source: str) -> str:
+    """the module without function bodies. equal skeletons: only function bodies changed"""
+    tree = ast.parse(source)
+    for node in _function_nodes(tree).values():
+        node.body = [ast.Pass()]
+    return ast.dump(tree)
+
+
+def changed_functions(old_source: str, new_source: str) -> list[str] | None:
+    """
+    qualified names of the functions whose body changed or moved.
+    None if anything else changed, and the module must be reloaded.
+    raises SyntaxError if new_source does not parse.
+    """
+    if _skeleton(old_source) != _skeleton(new_source):
+        return None
+    old_functions = _function_nodes(ast.parse(old_source))
+    new_functions = _function_nodes(ast.parse(new_source))
+    return [
+        name for name, node in new_functions.items()
+        # compare with line numbers, so tracebacks of moved functions stay correct
+        if ast.dump(node, include_attributes=True) != ast.dump(old_functions[name], include_attributes=True)
+    ]
+
+
+def _code_objects(code: CodeType) -> Iterator[CodeType]:
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield const
+            yield from _code_objects(const)
+
+
+def _live_function(module: ModuleType, qualname: str) -> FunctionType | None:
+    """the function object behind a qualified name, through classes and decorators"""
+    target: Any = module
+    for part in qualname.split("."):
+        namespace = target.__dict__ if isinstance(target, (type, ModuleType)) else {}
+        if part not in namespace:
+            return None
+        target = namespace[part]
+    match target:
+        case staticmethod() | classmethod():
+            target = target.__func__
+        case property():
+            target = target.fget
+    target = inspect.unwrap(target) if callable(target) else target
+    return target if isinstance(target, FunctionType) else None
+
+
+### Import graph ###
+def _imports(module: ModuleType, names: Collection[str]) -> set[str]:
+    """which of the named modules module refers to, as a module or through imported objects"""
+    imported = set()
+    for value in list(module.__dict__.values()):
+        if isinstance(value, ModuleType):
+            name = value.__name__
+        else:
+            name = getattr(value, "__module__", None)
+        if name in names and name != module.__name__:
+            imported.add(name)
+    return imported
+
+
+def import_order(modules: Collection[ModuleType]) -> list[ModuleType]:
+    """modules ordered so that every module comes after the modules it imports"""
+    by_name = {module.__name__: module for module in modules}
+    dependencies = {name: _imports(module, by_name) for name, module in by_name.items()}
+    ordered: list[ModuleType] = []
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(name: str):
+        if name in done or name in visiting: # import cycle: keep the order found so far
+            return
+        visiting.add(name)
+        for dependency in sorted(dependencies[name]):
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+        ordered.append(by_name[name])
+
+    for name in by_name:
+        visit(name)
+    return ordered
+
+
+class HotReloader:
+    """
+    Watches module files, patches changed functions in place, and reloads modules otherwise.
+
+    reload callbacks run on the watcher thread, unless a dispatch function is given,
+    eg.: dispatch=lambda fn: QTimer.singleShot(0, app, fn) to run them on the gui thread.
+    """
+    _shared: Optional['HotReloader'] = None
+
+    @staticmethod
+    def shared() -> 'HotReloader':
+        """the reloader shared by the application"""
+        if HotReloader._shared is None:
+            HotReloader._shared = HotReloader()
+        return HotReloader._shared
+
+    def __init__(self, modules: Iterable[ModuleType] = (), debounce: int = 50, dispatch: Callable[[Callable[[], None]], None] | None = None):
+        self._debounce = debounce # milliseconds
+        self._dispatch = dispatch
+        self._lock = threading.RLock()
+        self._modules: dict[Path, ModuleType] = dict() # by file path
+        self._sources: dict[Path, str] = dict() # the source the module currently runs
+        self._callbacks: list[Callable[[ReloadReport], None]] = []
+
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+
+        for module in modules:
+            self.watch(module)
+
+    ### Modules ###
+    def watch(self, module: ModuleType):
+        """watch a module. watching a package also watches its loaded submodules"""
+        modules = [module]
+        if hasattr(module, "__path__"):
+            prefix = module.__name__ + "."
+            modules += [submodule for name, submodule in list(sys.modules.items()) if name.startswith(prefix) and submodule]
+
+        changed = False
+        with self._lock:
+            for module in modules:
+                if not getattr(module, "__file__", None) or not module.__file__.endswith(".py"):
+                    continue
+                path = Path(module.__file__).resolve()
+                if path in self._modules:
+                    continue
+                self._modules[path] = module
+                self._sources[path] = path.read_text(encoding="utf-8")
+                changed = True
+
+        if changed and self.isRunning():
+            self._restartWatcher()
+
+    def modules(self) -> list[ModuleType]:
+        with self._lock:
+            return list(self._modules.values())
+
+    def onReload(self, callback: Callable[[ReloadReport], None]):
+        self._callbacks.append(callback)
+
+    ### Watcher ###
+    def start(self):
+        if self.isRunning():
+            return
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._watch, args=(self._stop_event,), daemon=True, name="hot-reloader")
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def isRunning(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _restartWatcher(self):
+        self.stop()
+        self.start()
+
+    def _watch(self, stop_event: threading.Event):
+        import watchfiles
+        with self._lock:
+            paths = set(self._modules)
+        if not paths:
+            return
+        # watch the folders, editors often save by replacing the file
+        folders = {path.parent for path in paths}
+        for changes in watchfiles.watch(
+            *folders,
+            watch_filter=lambda change, path: Path(path) in paths,
+            debounce=self._debounce,
+            step=10,
+            stop_event=stop_event,
+            recursive=False
+        ):
+            changed_paths = {Path(path) for change, path in changes if change != watchfiles.Change.deleted}
+            if not changed_paths:
+                continue
+            if self._dispatch:
+                self._dispatch(lambda changed_paths=changed_paths: self.reloadFiles(changed_paths))
+            else:
+                self.reloadFiles(changed_paths)
+
+    ### Reload ###
+    def reloadFiles(self, paths: Iterable[Path | str]) -> ReloadReport:
+        """apply the saved changes of the watched files. called by the watcher with each batch of changes"""
+        start_time = time.perf_counter()
+        report = ReloadReport()
+        with self._lock:
+            to_reload: list[ModuleType] = []
+            for path in {Path(path).resolve() for path in paths}:
+                if not (module := self._modules.get(path)):
+                    continue
+                source = path.read_text(encoding="utf-8")
+                if source == self._sources[path]:
+                    continue # touched, not changed
+                try:
+                    patched = self._patch(module, self._sources[path], source)
+                except SyntaxError as err:
+                    report.errors.append((module.__name__, err))
+                    continue
+                if patched is None:
+                    to_reload.append(module)
+                else:
+                    report.patched += patched
+                self._sources[path] = source
+
+            if to_reload:
+                self._reload(to_reload, report)
+
+        report.elapsed = time.perf_counter() - start_time
+        if report.patched:
+            logger.info(f"patched {', '.join(report.patched)} in {report.elapsed*1000:.1f}ms")
+        if report.reloaded:
+            logger.info(f"reloaded {', '.join(report.reloaded)} in {report.elapsed*1000:.1f}ms")
+        for name, err in report.errors:
+            logger.error(f"error reloading {name}: {err}")
+
+        if report.patched or report.reloaded or report.errors:
+            for callback in self._callbacks:
+                callback(report)
+        return report
+
+    def _patch(self, module: ModuleType, old_source: str, new_source: str) -> list[str] | None:
+        """swap the code of the changed functions. None if the module must be reloaded instead"""
+        names = changed_functions(old_source, new_source)
+        if names is None:
+            return None
+
+        module_code = compile(new_source, module.__file__ or "<string>", "exec")
+        codes = {code.co_qualname: code for code in _code_objects(module_code)}
+        patches: list[tuple[FunctionType, CodeType]] = []
+        for name in names:
+            function = _live_function(module, name)
+            code = codes.get(name)
+            if function is None or code is None or code.co_freevars != function.__code__.co_freevars:
+                # eg.: decorated by a wrapper that hides the function, or the closure changed
+                return None
+            patches.append((function, code))
+
+        for function, code in patches:
+            function.__code__ = code
+        return [f"{module.__name__}.{name}" for name in names]
+
+    def _reload(self, modules: list[ModuleType], report: ReloadReport):
+        """reload modules, and the watched modules importing them, in import order"""
+        watched = list(self._modules.values())
+        dirty = {module.__name__ for module in modules}
+        for module in import_order(watched):
+            if module.__name__ not in dirty and not (_imports(module, dirty)):
+                continue
+            dirty.add(module.__name__)
+            if module.__name__ == "__main__":
+                # the running script keeps its state, rebind what it imported instead
+                self._rebind(module, dirty)
+                continue
+            try:
+                try:
+                    importlib.reload(module)
+                except ImportError:
+                    if not (module.__spec__ and module.__spec__.loader):
+                        raise
+                    # loaded from a file location, not importable by name.
+                    # an import error of the module itself is raised again here
+                    module.__spec__.loader.exec_module(module)
+                report.reloaded.append(module.__name__)
+            except Exception as err:
+                report.errors.append((module.__name__, err))
+            finally:
+                if module.__file__:
+                    path = Path(module.__file__).resolve()
+                    self._sources[path] = path.read_text(encoding="utf-8")
+
+    def _rebind(self, module: ModuleType, reloaded: Collection[str]):
+        """point names imported from the reloaded modules to the new objects"""
+        for name, value in list(module.__dict__.items()):
+            if isinstance(value, ModuleType) or getattr(value, "__module__", None) not in reloaded:
+                continue
+            source = sys.modules.get(value.__module__)
+            if source and (new_value := getattr(source, getattr(value, "__name__", name), None)) is not None:
+                module.__dict__[name] = new_value
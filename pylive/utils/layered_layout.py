@@ -0,0 +1,1036 @@
+"""
+Layered (Sugiyama) layout for directed graphs.
+
+The pipeline follows Gansner et al. 'A Technique for Drawing Directed Graphs' (1993)
+and Brandes & Köpf 'Fast and Simple Horizontal Coordinate Assignment' (2001):
+
+1. break cycles, by reversing the back edges of a depth first search
+2. assign layers with network simplex, minimizing the total edge length
+3. split edges spanning multiple layers with dummy nodes
+4. order the layers with median/barycenter sweeps,
+   keeping the order with the fewest crossings
+5. assign x coordinates with Brandes-Köpf
+
+Each weakly connected component is laid out on its own.
+LayeredLayout remembers the components it has laid out,
+so updating the layout after an edit only lays out the components that changed.
+A small edit of a component patches its layout: the new nodes are ranked with the
+nodes around them fixed, and inserted into their layers, the other nodes keep their positions.
+"""
+
+from typing import *
+from collections import defaultdict, Counter
+from dataclasses import dataclass
+from bisect import bisect_left
+from itertools import chain
+import math
+import networkx as nx
+import numpy as np
+
+
+Hashable_T = TypeVar('Hashable_T', bound=Hashable)
+
+
+### Crossings
+def count_inversions(values:np.ndarray)->int:
+    """number of pairs i<j where values[i] > values[j].
+    bottom up merge count, each level is a single vectorized sort"""
+    values = np.asarray(values)
+    n = len(values)
+    if n < 2:
+        return 0
+    index = np.arange(n)
+    total = 0
+    width = 1
+    while width < n:
+        # pairs first separated at this level: i in the left half, j in the right half of the same block
+        block = index // (2*width)
+        is_left = (index // width) % 2 == 0
+        # within each block sort by value, left elements first on ties, so equal values dont count.
+        # the left elements sorted after a right element are the ones greater than it
+        order = np.lexsort((~is_left, values, block))
+        left_sorted = is_left[order]
+        block_sorted = block[order]
+        left_before = np.cumsum(left_sorted) - left_sorted
+        block_start = np.searchsorted(block_sorted, block_sorted, side='left')
+        left_before_in_block = left_before - left_before[block_start]
+        left_in_block = np.bincount(block, weights=is_left)[block_sorted]
+        total += int(np.sum((left_in_block - left_before_in_block)[~left_sorted]))
+        width *= 2
+    return total
+
+
+def count_crossings(upper_positions:np.ndarray, lower_positions:np.ndarray)->int:
+    """number of crossings between the edges of two adjacent layers.
+    edge i connects upper_positions[i] to lower_positions[i]"""
+    if len(upper_positions) < 2:
+        return 0
+    order = np.lexsort((lower_positions, upper_positions))
+    return count_inversions(lower_positions[order])
+
+
+### Cycles
+def _break_cycles(n:int, edges:list[tuple[int, int]])->list[tuple[int, int]]:
+    """reverse the back edges of a depth first search, and drop self loops"""
+    successors = [[] for _ in range(n)]
+    for u, v in edges:
+        successors[u].append(v)
+
+    state = [0] * n # 0: unvisited, 1: on stack, 2: done
+    back_edges = set()
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            u, it = stack[-1]
+            for v in it:
+                if state[v] == 0:
+                    state[v] = 1
+                    stack.append((v, iter(successors[v])))
+                    break
+                elif state[v] == 1:
+                    back_edges.add((u, v))
+            else:
+                state[u] = 2
+                stack.pop()
+
+    return [(v, u) if (u, v) in back_edges else (u, v) for u, v in edges if u != v]
+
+
+### Layering
+def _topological_order(n:int, src:np.ndarray, dst:np.ndarray)->tuple[list[int], list[list[int]], list[list[int]]]:
+    """return the topological order, the predecessors and the successors of each node"""
+    predecessors = [[] for _ in range(n)]
+    successors = [[] for _ in range(n)]
+    indegree = [0] * n
+    for u, v in zip(src.tolist(), dst.tolist()):
+        predecessors[v].append(u)
+        successors[u].append(v)
+        indegree[v] += 1
+    order = [u for u in range(n) if indegree[u] == 0]
+    for u in order:
+        for v in successors[u]:
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                order.append(v)
+    return order, predecessors, successors
+
+
+def _longest_path_ranks(n:int, src:np.ndarray, dst:np.ndarray)->np.ndarray:
+    """place every node as close to the sinks as possible"""
+    order, _, successors = _topological_order(n, src, dst)
+    rank = [0] * n
+    for u in reversed(order):
+        if successors[u]:
+            rank[u] = min(rank[v] for v in successors[u]) - 1
+    return np.array(rank, dtype=np.int64)
+
+
+def _warm_ranks(n:int, src:np.ndarray, dst:np.ndarray, previous:Sequence[int|None])->np.ndarray:
+    """a feasible ranking close to the previous ranks.
+    nodes are pushed down below their predecessors where the edit requires it,
+    new nodes without ranked predecessors are placed right above their successors"""
+    order, predecessors, successors = _topological_order(n, src, dst)
+    rank:list[int|None] = list(previous)
+    for v in order:
+        above = [rank[u] + 1 for u in predecessors[v] if rank[u] is not None]
+        if above:
+            rank[v] = max(above + ([rank[v]] if rank[v] is not None else []))
+    for u in reversed(order):
+        if rank[u] is None:
+            rank[u] = min((rank[v] - 1 for v in successors[u]), default=0)
+    return np.array(rank, dtype=np.int64)
+
+
+def network_simplex_ranks(n:int, src:np.ndarray, dst:np.ndarray, weight:np.ndarray, max_iterations:int|None=None, initial_rank:np.ndarray|None=None, initial_tree:np.ndarray|None=None, minlen:np.ndarray|None=None)->tuple[np.ndarray, np.ndarray]:
+    """rank the nodes of a connected DAG, minimizing the weighted sum of edge lengths.
+    every edge spans at least one rank, or _minlen_ ranks, which may be negative.
+    see Gansner et al. section 2.3
+
+    a warm start takes a feasible _initial_rank_, and a mask of the edges of the previous spanning tree.
+    the spanning tree is rebuilt from the previous tree edges where they are still tight,
+    so an optimal tree only needs a few exchanges after a small edit.
+    return the ranks, and the mask of the spanning tree edges"""
+    assert initial_rank is not None or minlen is None, "edges with a minimum length need a feasible initial rank"
+    rank = initial_rank.copy() if initial_rank is not None else _longest_path_ranks(n, src, dst)
+    m = len(src)
+    minlen = minlen if minlen is not None else np.ones(m, dtype=np.int64)
+    if m == 0:
+        return rank - rank.min(), np.zeros(0, dtype=bool)
+
+    src_list, dst_list, minlen_list = src.tolist(), dst.tolist(), minlen.tolist()
+    hint = initial_tree.tolist() if initial_tree is not None else [False] * m
+    incident = [[] for _ in range(n)]
+    hinted_incident = [[] for _ in range(n)]
+    for e, (u, v) in enumerate(zip(src_list, dst_list)):
+        incident[u].append(e)
+        incident[v].append(e)
+        if hint[e]:
+            hinted_incident[u].append(e)
+            hinted_incident[v].append(e)
+
+    ## feasible tree
+    # grow a tree of tight edges, and shift the tree towards the nearest non tree node until it spans the graph
+    in_tree = np.zeros(n, dtype=bool)
+    is_tree_edge = np.zeros(m, dtype=bool)
+    tree_incident = [[] for _ in range(n)]
+    rank_list = rank.tolist()
+
+    def add_to_tree(e:int, w:int):
+        in_tree[w] = True
+        is_tree_edge[e] = True
+        tree_incident[src_list[e]].append(e)
+        tree_incident[dst_list[e]].append(e)
+
+    def grow(start:int):
+        # follow the previous tree edges first, then any tight edge
+        hinted = [start]
+        scanned = [start]
+        while hinted or scanned:
+            if hinted:
+                u = hinted.pop()
+                edges = hinted_incident[u]
+            else:
+                u = scanned.pop()
+                edges = incident[u]
+            for e in edges:
+                w = dst_list[e] if src_list[e] == u else src_list[e]
+                if not in_tree[w] and rank_list[dst_list[e]] - rank_list[src_list[e]] == minlen_list[e]:
+                    add_to_tree(e, w)
+                    hinted.append(w)
+                    scanned.append(w)
+
+    in_tree[0] = True
+    grow(0)
+    while not in_tree.all():
+        slack = rank[dst] - rank[src] - minlen
+        boundary = in_tree[src] != in_tree[dst]
+        e = int(np.argmin(np.where(boundary, slack, np.iinfo(np.int64).max)))
+        delta = slack[e] if in_tree[src[e]] else -slack[e]
+        rank[in_tree] += delta
+        rank_list = rank.tolist()
+        tight = np.nonzero(boundary & (rank[dst] - rank[src] == minlen))[0]
+        for e in tight.tolist():
+            w = dst_list[e] if in_tree[src_list[e]] else src_list[e]
+            if not in_tree[w]:
+                add_to_tree(e, w)
+                grow(w)
+
+    ## cut values
+    # cutting a tree edge splits the tree in the subtree below it and the rest.
+    # the cut value is the weight of the edges crossing in the direction of the tree edge,
+    # minus the weight crossing back. edges inside the subtree cancel out,
+    # so it is the sum of out-weight minus in-weight over the subtree, up to the sign.
+    net = np.bincount(src, weights=weight, minlength=n) - np.bincount(dst, weights=weight, minlength=n)
+    low = np.zeros(n, dtype=np.int64)
+    lim = np.zeros(n, dtype=np.int64)
+    parent_edge = np.full(n, -1, dtype=np.int64)
+
+    parent_edge_list = [-1] * n
+
+    def init_low_lim(root:int):
+        # postorder numbering: the subtree of v is lim in [low[v], lim[v]].
+        # renumbers the subtree of root, keeping its range.
+        # walks with python lists, and writes the numbers back to the arrays at once
+        next_lim = int(low[root])
+        nodes, lows, lims = [], [], []
+        stack = [(root, next_lim, iter(tree_incident[root]))]
+        while stack:
+            u, u_low, it = stack[-1]
+            for e in it:
+                if e == parent_edge_list[u]:
+                    continue
+                w = dst_list[e] if src_list[e] == u else src_list[e]
+                parent_edge_list[w] = e
+                stack.append((w, next_lim, iter(tree_incident[w])))
+                break
+            else:
+                nodes.append(u)
+                lows.append(u_low)
+                lims.append(next_lim)
+                next_lim += 1
+                stack.pop()
+        low[nodes] = lows
+        lim[nodes] = lims
+        parent_edge[nodes] = [parent_edge_list[u] for u in nodes]
+
+    def cut_values()->np.ndarray:
+        postorder = np.empty(n, dtype=np.int64)
+        postorder[lim-1] = np.arange(n)
+        prefix = np.concatenate(([0.0], np.cumsum(net[postorder])))
+        subtree_net = prefix[lim] - prefix[low-1]
+        cut = np.zeros(m)
+        children = np.nonzero(parent_edge >= 0)[0]
+        edges = parent_edge[children]
+        cut[edges] = np.where(src[edges] == children, subtree_net[children], -subtree_net[children])
+        return cut
+
+    ## iterate: replace a tree edge with negative cut value, with the tightest non tree edge crossing the cut
+    root = int(np.argmin(np.abs(rank - np.median(rank))))
+    low[root] = 1
+    init_low_lim(root)
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        cut = cut_values()
+        e = int(np.argmin(np.where(is_tree_edge, cut, np.inf)))
+        if cut[e] >= 0:
+            break
+        u, v = src_list[e], dst_list[e]
+        child, parent = (u, v) if lim[u] < lim[v] else (v, u)
+        in_subtree = (low[child] <= lim) & (lim <= lim[child])
+        if child == u:
+            # the subtree is the tail component, find an edge pointing into it
+            candidates = ~in_subtree[src] & in_subtree[dst]
+        else:
+            candidates = in_subtree[src] & ~in_subtree[dst]
+        slack = rank[dst] - rank[src] - minlen
+        f = int(np.argmin(np.where(candidates, slack, np.iinfo(np.int64).max)))
+        rank[in_subtree] += -slack[f] if child == u else slack[f]
+
+        # the subtree moves under the outside end of f.
+        # only the common ancestor of the old and the new parent needs renumbering
+        outside = src_list[f] if child == u else dst_list[f]
+        ancestor = outside
+        while not (low[ancestor] <= lim[parent] <= lim[ancestor]):
+            pe = parent_edge_list[ancestor]
+            ancestor = dst_list[pe] if src_list[pe] == ancestor else src_list[pe]
+
+        # exchange
+        is_tree_edge[e] = False
+        tree_incident[u].remove(e)
+        tree_incident[v].remove(e)
+        is_tree_edge[f] = True
+        tree_incident[src_list[f]].append(f)
+        tree_incident[dst_list[f]].append(f)
+        init_low_lim(ancestor)
+        iterations += 1
+
+    return rank - rank.min(), is_tree_edge
+
+
+### Ordering
+class _LayerGraph(NamedTuple):
+    layers:list[np.ndarray]    # node ids in order, for each layer
+    upper:list[np.ndarray]     # edges between layer i and i+1: upper endpoint
+    lower:list[np.ndarray]     # ... and lower endpoint
+    src:np.ndarray             # all edges, sorted by rank
+    dst:np.ndarray
+    edge_rank:np.ndarray
+    is_dummy:np.ndarray
+
+
+def _make_proper(rank:np.ndarray, edges:list[tuple[int, int]])->tuple[np.ndarray, list[tuple[int, int]], list[tuple[int, int]]]:
+    """split edges spanning multiple ranks into chains of dummy nodes.
+    dummy nodes are numbered after the real nodes.
+    return the ranks of all nodes, the unit length edges, and the original edge of each dummy"""
+    ranks = rank.tolist()
+    proper = []
+    dummy_edges = []
+    for u, v in edges:
+        previous = u
+        for r in range(ranks[u]+1, ranks[v]):
+            ranks.append(r)
+            dummy_edges.append((u, v))
+            proper.append((previous, len(ranks)-1))
+            previous = len(ranks)-1
+        proper.append((previous, v))
+    return np.array(ranks, dtype=np.int64), proper, dummy_edges
+
+
+def _initial_order(ranks:np.ndarray, proper:list[tuple[int, int]])->list[list[int]]:
+    """depth first from the sources, so connected nodes start close to each other"""
+    total = len(ranks)
+    successors = [[] for _ in range(total)]
+    has_predecessor = [False] * total
+    for u, v in proper:
+        successors[u].append(v)
+        has_predecessor[v] = True
+    layers = [[] for _ in range(int(ranks.max())+1)]
+    visited = [False] * total
+    for root in range(total):
+        if visited[root] or has_predecessor[root]:
+            continue
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            if visited[u]:
+                continue
+            visited[u] = True
+            layers[ranks[u]].append(u)
+            stack.extend(reversed(successors[u]))
+    return layers
+
+
+def _sweep(layers:list[np.ndarray], pos:np.ndarray, free:np.ndarray, fixed:np.ndarray, layer:int):
+    """reorder layer by the median position of each node's neighbours in the fixed layer.
+    ties are broken by the barycenter, nodes without neighbours keep their position"""
+    nodes = layers[layer]
+    count = len(nodes)
+    local = pos[free]
+    fixed_pos = pos[fixed].astype(np.float64)
+    order = np.lexsort((fixed_pos, local))
+    sorted_pos = fixed_pos[order]
+    degree = np.bincount(local, minlength=count)
+    start = np.cumsum(degree) - degree
+    has = degree > 0
+    lo = np.where(has, start + (degree-1)//2, 0)
+    hi = np.where(has, start + degree//2, 0)
+    current = np.arange(count, dtype=np.float64)
+    if len(sorted_pos):
+        median = np.where(has, (sorted_pos[lo] + sorted_pos[hi]) / 2, current)
+        barycenter = np.where(has, np.bincount(local, weights=fixed_pos, minlength=count) / np.maximum(degree, 1), current)
+    else:
+        median = barycenter = current
+    new_order = np.lexsort((current, barycenter, median))
+    layers[layer] = nodes[new_order]
+    pos[layers[layer]] = np.arange(count)
+
+
+def _total_crossings(graph:_LayerGraph, pos:np.ndarray)->int:
+    """crossings between all adjacent layers, counted in a single pass.
+    lower positions are offset by layer, so edges of different layers never count as inversions"""
+    if len(graph.src) < 2:
+        return 0
+    upper, lower = pos[graph.src], pos[graph.dst]
+    order = np.lexsort((lower, upper, graph.edge_rank))
+    offset = graph.edge_rank * (int(pos.max()) + 1)
+    return count_inversions((lower + offset)[order])
+
+
+def _order_layers(graph:_LayerGraph, sweeps:int)->np.ndarray:
+    """alternate down and up sweeps, and return the node positions with the fewest crossings"""
+    pos = np.zeros(len(graph.is_dummy), dtype=np.int64)
+    for layer in graph.layers:
+        pos[layer] = np.arange(len(layer))
+    best_pos = pos.copy()
+    best = _total_crossings(graph, pos)
+    layers = list(graph.layers)
+    stale = 0
+    for i in range(sweeps):
+        if best == 0 or stale >= 2:
+            break
+        if i % 2 == 0:
+            for r in range(1, len(layers)):
+                _sweep(layers, pos, graph.lower[r-1], graph.upper[r-1], r)
+        else:
+            for r in range(len(layers)-2, -1, -1):
+                _sweep(layers, pos, graph.upper[r], graph.lower[r], r)
+        crossings = _total_crossings(graph, pos)
+        if crossings < best:
+            best = crossings
+            best_pos = pos.copy()
+            stale = 0
+        else:
+            stale += 1
+    return best_pos
+
+
+### Coordinates
+def _brandes_koepf(layers:list[list[int]], predecessors:list[list[int]], successors:list[list[int]], is_dummy:list[bool], widths:list[float], node_spacing:float, edge_spacing:float)->list[float]:
+    """horizontal coordinates, with long edges kept as straight as possible.
+    the four vertical/horizontal alignments are compacted and balanced"""
+    total = len(is_dummy)
+
+    ## type 1 conflicts: inner segments (dummy to dummy) win over other edges
+    conflicts = set()
+    pos = [0] * total
+    for layer in layers:
+        for i, v in enumerate(layer):
+            pos[v] = i
+    for r in range(1, len(layers)):
+        layer = layers[r]
+        previous_length = len(layers[r-1])
+        k0 = 0
+        scan = 0
+        for i, v in enumerate(layer):
+            inner = None
+            if is_dummy[v]:
+                for u in predecessors[v]:
+                    if is_dummy[u]:
+                        inner = u
+                        break
+            k1 = pos[inner] if inner is not None else previous_length
+            if inner is not None or i == len(layer)-1:
+                for w in layer[scan:i+1]:
+                    for u in predecessors[w]:
+                        if (pos[u] < k0 or k1 < pos[u]) and not (is_dummy[u] and is_dummy[w]):
+                            conflicts.add((u, w) if u < w else (w, u))
+                scan = i+1
+                k0 = k1
+
+    def separation(u:int, v:int)->float:
+        return (widths[u] + widths[v]) / 2 + ((edge_spacing if is_dummy[u] else node_spacing) + (edge_spacing if is_dummy[v] else node_spacing)) / 2
+
+    def vertical_alignment(layering:list[list[int]], neighbours:list[list[int]]):
+        root = list(range(total))
+        align = list(range(total))
+        pos = [0] * total
+        for layer in layering:
+            for i, v in enumerate(layer):
+                pos[v] = i
+        for layer in layering:
+            previous = -1
+            for v in layer:
+                ws = neighbours[v]
+                if not ws:
+                    continue
+                ws = sorted(ws, key=lambda w: pos[w])
+                mp = (len(ws)-1) / 2
+                for i in range(int(mp), int(mp + 0.5) + 1):
+                    w = ws[i]
+                    if align[v] == v and previous < pos[w] and ((v, w) if v < w else (w, v)) not in conflicts:
+                        align[w] = v
+                        align[v] = root[v] = root[w]
+                        previous = pos[w]
+        return root, align
+
+    def horizontal_compaction(layering:list[list[int]], root:list[int])->list[float]:
+        # the blocks form a DAG, with an edge from each block to the block right of it
+        block_edges:dict[tuple[int, int], float] = dict()
+        for layer in layering:
+            for u, v in zip(layer, layer[1:]):
+                key = (root[u], root[v])
+                block_edges[key] = max(block_edges.get(key, 0.0), separation(u, v))
+        block_predecessors = defaultdict(list)
+        block_successors = defaultdict(list)
+        indegree = defaultdict(int)
+        for (u, v), sep in block_edges.items():
+            block_predecessors[v].append((u, sep))
+            block_successors[u].append((v, sep))
+            indegree[v] += 1
+        blocks = [v for v in range(total) if root[v] == v]
+        order = [v for v in blocks if indegree[v] == 0]
+        for u in order:
+            for v, _ in block_successors[u]:
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    order.append(v)
+
+        xs = [0.0] * total
+        # place each block as far left as its left neighbours allow
+        for v in order:
+            xs[v] = max((xs[u] + sep for u, sep in block_predecessors[v]), default=0.0)
+        # then pull blocks right towards their right neighbours, to close the gaps
+        for v in reversed(order):
+            right = min((xs[w] - sep for w, sep in block_successors[v]), default=None)
+            if right is not None:
+                xs[v] = max(xs[v], right)
+        return [xs[root[v]] for v in range(total)]
+
+    alignments = []
+    for vertical in ('up', 'down'):
+        layering = layers if vertical == 'up' else layers[::-1]
+        neighbours = predecessors if vertical == 'up' else successors
+        for horizontal in ('left', 'right'):
+            adjusted = layering if horizontal == 'left' else [layer[::-1] for layer in layering]
+            root, align = vertical_alignment(adjusted, neighbours)
+            xs = horizontal_compaction(adjusted, root)
+            if horizontal == 'right':
+                xs = [-x for x in xs]
+            alignments.append((horizontal, np.array(xs)))
+
+    ## align to the narrowest, and take the average median of the four
+    half = np.array(widths) / 2
+    def extent(xs:np.ndarray)->tuple[float, float]:
+        return float(np.min(xs - half)), float(np.max(xs + half))
+    narrowest = min((xs for _, xs in alignments), key=lambda xs: extent(xs)[1] - extent(xs)[0])
+    left, right = extent(narrowest)
+    aligned = []
+    for horizontal, xs in alignments:
+        lo, hi = extent(xs)
+        aligned.append(xs + (left - lo if horizontal == 'left' else right - hi))
+    stacked = np.sort(np.stack(aligned), axis=0)
+    return ((stacked[1] + stacked[2]) / 2).tolist()
+
+
+### Components
+@dataclass(frozen=True)
+class _Dummy:
+    """the bend of a long edge in the layer _rank_"""
+    edge:tuple
+    rank:int
+
+
+class ComponentLayout(NamedTuple):
+    positions:dict  # node -> (x, rank), x starting at 0
+    crossings:int
+    tree:frozenset  # (u, v) edges of the network simplex spanning tree, to warm start the next layout
+    oriented:dict   # edge -> (u, v) as laid out, reversed when it closed a cycle. without self loops
+    layers:dict     # rank -> the nodes and _Dummy bends of the layer, left to right
+    dummies:dict    # _Dummy -> x
+    layer_crossings:dict # rank -> crossings between the layer and the next
+    widths:dict     # node -> width
+
+
+class _Component(NamedTuple):
+    nodes:frozenset
+    edges:frozenset
+    widths:tuple
+    layout:ComponentLayout
+    width:float
+
+
+def layout_component(nodes:Sequence[Hashable_T], edges:Iterable[tuple[Hashable_T, Hashable_T]], widths:Sequence[float], node_spacing:float=1.0, edge_spacing:float=0.5, sweeps:int=8, max_iterations:int|None=None, previous:Mapping[Hashable_T, tuple[float, int]]|None=None, previous_tree:Collection[tuple[Hashable_T, Hashable_T]]=())->ComponentLayout:
+    """lay out a weakly connected graph.
+    the _previous_ (x, rank) positions and spanning tree warm start the layering and the ordering,
+    so an edited graph converges quickly, and keeps its shape."""
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+    edges = [(u, v) for u, v in edges if u != v]
+    int_edges = _break_cycles(n, [(index[u], index[v]) for u, v in edges])
+
+    ## merge parallel edges
+    weights:dict[tuple[int, int], int] = defaultdict(int)
+    for e in int_edges:
+        weights[e] += 1
+    src = np.fromiter((u for u, v in weights), dtype=np.int64, count=len(weights))
+    dst = np.fromiter((v for u, v in weights), dtype=np.int64, count=len(weights))
+    weight = np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+
+    previous = previous or dict()
+    initial_rank = None
+    if any(node in previous for node in nodes):
+        initial_rank = _warm_ranks(n, src, dst, [previous[node][1] if node in previous else None for node in nodes])
+    initial_tree = None
+    if previous_tree:
+        initial_tree = np.fromiter(((nodes[u], nodes[v]) in previous_tree for u, v in weights), dtype=bool, count=len(weights))
+    rank, is_tree_edge = network_simplex_ranks(n, src, dst, weight, max_iterations=max_iterations, initial_rank=initial_rank, initial_tree=initial_tree)
+    ranks, proper, dummy_edges = _make_proper(rank, list(weights.keys()))
+    total = len(ranks)
+    is_dummy = np.arange(total) >= n
+
+    layer_lists = _initial_order(ranks, proper)
+    if initial_rank is not None:
+        # start from the previous order: new nodes go next to their neighbours, dummies between their ends
+        keys = [previous[node][0] if node in previous else None for node in nodes]
+        neighbours = [[] for _ in range(n)]
+        for u, v in weights:
+            neighbours[u].append(v)
+            neighbours[v].append(u)
+        for v in range(n):
+            if keys[v] is None:
+                known = [previous[nodes[w]][0] for w in neighbours[v] if nodes[w] in previous]
+                keys[v] = sum(known) / len(known) if known else math.inf
+        for u, v in dummy_edges:
+            ends = [keys[w] for w in (u, v) if keys[w] != math.inf]
+            keys.append(sum(ends) / len(ends) if ends else math.inf)
+        layer_lists = [sorted(layer, key=lambda v: keys[v]) for layer in layer_lists]
+    proper_src = np.array([u for u, v in proper], dtype=np.int64)
+    proper_dst = np.array([v for u, v in proper], dtype=np.int64)
+    edge_rank = ranks[proper_src] if len(proper) else np.zeros(0, dtype=np.int64)
+    by_rank = np.argsort(edge_rank, kind='stable')
+    proper_src, proper_dst, edge_rank = proper_src[by_rank], proper_dst[by_rank], edge_rank[by_rank]
+    splits = np.searchsorted(edge_rank, np.arange(1, len(layer_lists)-1))
+    graph = _LayerGraph(
+        layers=[np.array(layer, dtype=np.int64) for layer in layer_lists],
+        upper=np.split(proper_src, splits) if len(layer_lists) > 1 else [],
+        lower=np.split(proper_dst, splits) if len(layer_lists) > 1 else [],
+        src=proper_src,
+        dst=proper_dst,
+        edge_rank=edge_rank,
+        is_dummy=is_dummy
+    )
+    pos = _order_layers(graph, sweeps)
+    layer_crossings = {r: count_crossings(pos[upper], pos[lower]) for r, (upper, lower) in enumerate(zip(graph.upper, graph.lower))}
+
+    ordered = [layer[np.argsort(pos[layer])].tolist() for layer in graph.layers]
+    predecessors = [[] for _ in range(total)]
+    successors = [[] for _ in range(total)]
+    for u, v in proper:
+        predecessors[v].append(u)
+        successors[u].append(v)
+    all_widths = list(widths) + [0.0] * (total - n)
+    xs = _brandes_koepf(ordered, predecessors, successors, is_dummy.tolist(), all_widths, node_spacing, edge_spacing)
+
+    left = min(xs[i] - all_widths[i] / 2 for i in range(n)) if n else 0.0
+    ranks_list = ranks.tolist()
+    def key(i:int)->Hashable:
+        if i < n:
+            return nodes[i]
+        u, v = dummy_edges[i-n]
+        return _Dummy((nodes[u], nodes[v]), ranks_list[i])
+    return ComponentLayout(
+        positions={node: (xs[i] - left, int(rank[i])) for i, node in enumerate(nodes)},
+        crossings=sum(layer_crossings.values()),
+        tree=frozenset((nodes[u], nodes[v]) for (u, v), is_tree in zip(weights, is_tree_edge.tolist()) if is_tree),
+        oriented={e: (nodes[u], nodes[v]) for e, (u, v) in zip(edges, int_edges)},
+        layers={r: [key(i) for i in layer] for r, layer in enumerate(ordered)},
+        dummies={key(i): xs[i] - left for i in range(n, total)},
+        layer_crossings=layer_crossings,
+        widths=dict(zip(nodes, widths))
+    )
+
+
+# an edit touching more nodes than this fraction of its component lays the component out again
+_PATCH_LIMIT = 0.1
+
+
+def _reaches(successors:Mapping[Hashable, Iterable[Hashable]], start:Hashable, target:Hashable)->bool:
+    stack = [start]
+    visited = {start}
+    while stack:
+        u = stack.pop()
+        if u == target:
+            return True
+        for v in successors.get(u, ()):
+            if v not in visited:
+                visited.add(v)
+                stack.append(v)
+    return False
+
+
+def _free_ranks(free:set, rank:Mapping, predecessors:Mapping, successors:Mapping)->tuple[dict, list]:
+    """feasible ranks for the free nodes, between their fixed neighbours.
+    return the ranks, and the free nodes squeezed between their fixed neighbours, that have no feasible rank"""
+    indegree = {v: sum(1 for u in predecessors[v] if u in free) for v in free}
+    order = [v for v in free if indegree[v] == 0]
+    for u in order:
+        for v in successors[u]:
+            if v in free:
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    order.append(v)
+
+    lower:dict[Hashable, int|None] = dict()
+    for v in order:
+        bounds = [(lower[u] if u in free else rank[u]) + 1 for u in predecessors[v] if u not in free or lower[u] is not None]
+        lower[v] = max(bounds, default=None)
+    upper:dict[Hashable, int|None] = dict()
+    for u in reversed(order):
+        bounds = [(upper[v] if v in free else rank[v]) - 1 for v in successors[u] if v not in free or upper[v] is not None]
+        upper[u] = min(bounds, default=None)
+    squeezed = [v for v in order if lower[v] is not None and upper[v] is not None and lower[v] > upper[v]]
+
+    # as low as the predecessors allow, sources right above their successors
+    result = dict()
+    for u in reversed(order):
+        if (r := lower[u]) is None:
+            r = min((result[v] if v in free else rank[v]) for v in successors[u]) - 1
+        result[u] = r
+    return result, squeezed
+
+
+def _insert(layer:list, xs:dict, v:Hashable, x:float, separation:Callable[[Hashable, Hashable], float]):
+    """insert v into the layer near x. when there is no room, the nodes on the side
+    where fewer nodes are in the way are pushed aside"""
+    i = bisect_left([xs[w] for w in layer], x)
+
+    def push(x:float, side:int)->dict:
+        # the new x of the nodes pushed on the side, -1 left, 1 right
+        shifted = dict()
+        previous, j = v, (i if side > 0 else i-1)
+        while 0 <= j < len(layer):
+            w = layer[j]
+            bound = x + side * separation(previous, w)
+            if (xs[w] - bound) * side >= 0:
+                break
+            shifted[w] = x = bound
+            previous, j = w, j + side
+        return shifted
+
+    x_right = max(x, xs[layer[i-1]] + separation(layer[i-1], v)) if i > 0 else x
+    x_left = min(x, xs[layer[i]] - separation(v, layer[i])) if i < len(layer) else x
+    right, left = push(x_right, 1), push(x_left, -1)
+    x, shifted = (x_right, right) if len(right) <= len(left) else (x_left, left)
+    xs.update(shifted)
+    xs[v] = x
+    layer.insert(i, v)
+
+
+def _patch_component(old:ComponentLayout, nodes:Sequence[Hashable_T], edges:Sequence[tuple[Hashable_T, Hashable_T]], widths:Sequence[float], node_spacing:float=1.0, edge_spacing:float=0.5, sweeps:int=2, max_iterations:int|None=None)->tuple[float, ComponentLayout]|None:
+    """patch the layout of an edited component, the nodes away from the edit keep their positions.
+    the new nodes are ranked by network simplex, with the nodes around them fixed.
+    nodes are pushed down only where an edge needs it.
+    the new and moved nodes and bends are inserted into their layers next to their neighbours,
+    and moved to the median of their neighbours by a few sweeps over the touched layers.
+    return the x shift of the component and its layout, or None when the edit is too large"""
+    limit = max(8, int(_PATCH_LIMIT * len(nodes)))
+    width_of = dict(zip(nodes, widths))
+    old_rank = {node: rank for node, (_, rank) in old.positions.items()}
+    new_nodes = [node for node in nodes if node not in old_rank]
+    removed = old_rank.keys() - width_of.keys()
+    edges = [(u, v) for u, v in edges if u != v]
+    added = [e for e in edges if e not in old.oriented]
+    if len(new_nodes) + len(added) > limit or len(removed) == len(old_rank):
+        return None
+
+    ## orient the new edges, reversed when they close a cycle
+    oriented = {e: old.oriented[e] for e in edges if e in old.oriented}
+    reachable = defaultdict(set)
+    for u, v in oriented.values():
+        reachable[u].add(v)
+    for e in added:
+        u, v = e
+        # ranks increase along the edges, a node can not reach a node of a lower rank
+        if not (u in old_rank and v in old_rank and old_rank[u] < old_rank[v]) and _reaches(reachable, v, u):
+            u, v = v, u
+        oriented[e] = (u, v)
+        reachable[u].add(v)
+
+    weights = Counter(oriented.values())
+    predecessors = defaultdict(list)
+    successors = defaultdict(list)
+    incident = defaultdict(list)
+    for u, v in weights:
+        predecessors[v].append(u)
+        successors[u].append(v)
+        incident[u].append((u, v))
+        incident[v].append((u, v))
+
+    ## rank the new nodes, and the nodes that must move down, with the other nodes fixed
+    rank = {node: r for node, r in old_rank.items() if node not in removed}
+    free = set(new_nodes) | {v for u, v in (oriented[e] for e in added) if u in rank and v in rank and rank[v] <= rank[u]}
+    while True:
+        initial, squeezed = _free_ranks(free, rank, predecessors, successors)
+        if not squeezed:
+            break
+        free.update(v for u in squeezed for v in successors[u])
+        if len(free) > limit:
+            return None
+
+    tree = {e for e in old.tree if e in weights and e[0] not in free and e[1] not in free}
+    if free:
+        # the fixed nodes are merged into an anchor at rank 0, edges to them keep their length with minlen
+        local = list(free)
+        anchor = len(local)
+        index = {node: i for i, node in enumerate(local)}
+        local_edges = []
+        for (u, v), weight in weights.items():
+            if u in free and v in free:
+                local_edges.append((index[u], index[v], 1, weight, (u, v)))
+            elif v in free:
+                local_edges.append((anchor, index[v], rank[u] + 1, weight, (u, v)))
+            elif u in free:
+                local_edges.append((index[u], anchor, 1 - rank[v], weight, (u, v)))
+        src, dst, minlen, weight, pairs = zip(*local_edges)
+        local_rank, is_tree_edge = network_simplex_ranks(anchor + 1,
+            np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64), np.array(weight, dtype=np.float64),
+            max_iterations=max_iterations,
+            initial_rank=np.array([initial[node] for node in local] + [0], dtype=np.int64),
+            minlen=np.array(minlen, dtype=np.int64))
+        local_rank = (local_rank - local_rank[anchor]).tolist()
+        for node, r in zip(local, local_rank):
+            rank[node] = r
+        tree.update(pair for pair, is_tree in zip(pairs, is_tree_edge.tolist()) if is_tree)
+
+    ## take the moved nodes, and the bends of their edges out of the layers
+    moved = {node for node in free if old_rank.get(node) != rank[node]}
+    reinserted = moved | {node for node in width_of if node in old.widths and old.widths[node] != width_of[node]}
+    old_pairs = set(old.oriented.values())
+    def is_stale(pair:tuple)->bool:
+        return pair[0] in moved or pair[1] in moved
+    stale_pairs = [pair for pair in old_pairs if pair not in weights or is_stale(pair)]
+    new_pairs = [pair for pair in weights if pair not in old_pairs or is_stale(pair)]
+    stale = [_Dummy(pair, r) for pair in stale_pairs for r in range(old_rank[pair[0]]+1, old_rank[pair[1]])]
+    taken = {node: old_rank[node] for node in chain(removed, reinserted) if node in old_rank}
+    taken.update((dummy, dummy.rank) for dummy in stale)
+
+    layers = dict(old.layers)
+    xs = {node: x for node, (x, _) in old.positions.items()}
+    xs.update(old.dummies)
+    for r in set(taken.values()):
+        layers[r] = [v for v in layers[r] if v not in taken]
+    for v in taken:
+        del xs[v]
+
+    def separation(u:Hashable, v:Hashable)->float:
+        def half(w:Hashable)->float:
+            return edge_spacing / 2 if isinstance(w, _Dummy) else (width_of[w] + node_spacing) / 2
+        return half(u) + half(v)
+
+    def vertex_at(pair:tuple, r:int)->Hashable|None:
+        """the node or the bend of the edge in the layer r"""
+        u, v = pair
+        if r == rank[u]:
+            return u
+        if r == rank[v]:
+            return v
+        if rank[u] < r < rank[v]:
+            return _Dummy(pair, r)
+        return None
+
+    ## insert the nodes next to their neighbours, then the bends between their ends
+    inserted = defaultdict(list)
+    def insert(v:Hashable, r:int, x:float):
+        if r not in taken.values() and r not in inserted:
+            layers[r] = list(layers.get(r, [])) # the other layers are shared with the old layout
+        _insert(layers[r], xs, v, x, separation)
+        inserted[r].append(v)
+
+    desired = dict()
+    pending = list(reinserted)
+    while pending:
+        rest = []
+        for node in pending:
+            known = [xs[w] if w in xs else desired[w] for pair in incident[node] for w in pair if w != node and (w in xs or w in desired)]
+            if known:
+                desired[node] = sum(known) / len(known)
+            elif node in old.positions:
+                desired[node] = old.positions[node][0]
+            else:
+                rest.append(node)
+        if len(rest) == len(pending):
+            desired.update((node, 0.0) for node in rest)
+            break
+        pending = rest
+    for node in sorted(reinserted, key=lambda node: desired[node]):
+        insert(node, rank[node], desired[node])
+    for u, v in new_pairs:
+        for r in range(rank[u]+1, rank[v]):
+            insert(_Dummy((u, v), r), r, xs[u] + (xs[v] - xs[u]) * (r - rank[u]) / (rank[v] - rank[u]))
+
+    ## local sweeps, the inserted nodes move to the median of their neighbours in the layer above, then below
+    for i in range(sweeps):
+        step = -1 if i % 2 == 0 else 1
+        for r in sorted(inserted, reverse=step > 0):
+            for v in inserted[r]:
+                pairs = incident[v] if not isinstance(v, _Dummy) else [v.edge]
+                neighbours = sorted(xs[w] for pair in pairs if (w := vertex_at(pair, r + step)) is not None)
+                if not neighbours:
+                    continue
+                median = (neighbours[(len(neighbours)-1)//2] + neighbours[len(neighbours)//2]) / 2
+                layers[r].remove(v)
+                del xs[v]
+                _insert(layers[r], xs, v, median, separation)
+
+    ## recount the crossings around the touched layers, and between the ends of the changed edges
+    touched = set(taken.values()) | inserted.keys()
+    for r in [r for r in touched if not layers.get(r)]:
+        del layers[r]
+    gaps = touched | {r-1 for r in touched}
+    gaps.update(r for u, v in stale_pairs for r in range(old_rank[u], old_rank[v]))
+    gaps.update(r for u, v in new_pairs for r in range(rank[u], rank[v]))
+    layer_crossings = dict(old.layer_crossings)
+    for r in gaps:
+        if r not in layers or r+1 not in layers:
+            layer_crossings.pop(r, None)
+            continue
+        lower_pos = {v: i for i, v in enumerate(layers[r+1])}
+        upper, lower = [], []
+        for i, v in enumerate(layers[r]):
+            for pair in (incident[v] if not isinstance(v, _Dummy) else [v.edge]):
+                if (w := vertex_at(pair, r+1)) is not None:
+                    upper.append(i)
+                    lower.append(lower_pos[w])
+        layer_crossings[r] = count_crossings(np.array(upper, dtype=np.int64), np.array(lower, dtype=np.int64))
+
+    left = min(xs[node] - width_of[node] / 2 for node in nodes)
+    return left, ComponentLayout(
+        positions={node: (xs[node] - left, rank[node]) for node in nodes},
+        crossings=sum(layer_crossings.values()),
+        tree=frozenset(tree),
+        oriented=oriented,
+        layers=layers,
+        dummies={v: x - left for v, x in xs.items() if isinstance(v, _Dummy)},
+        layer_crossings=layer_crossings,
+        widths=width_of
+    )
+
+
+class LayeredLayout:
+    """Lays out a graph top to bottom in layers, and keeps the result.
+
+    _update_ lays out only the weakly connected components that have changed
+    since the last layout, the others keep their positions.
+    a small edit of a component patches its layout, the nodes away from the edit keep their positions.
+    other changed components are warm started from their previous layout.
+    components are placed side by side, left to right.
+
+    _max_iterations_ limits the network simplex exchanges per component, like dot's nslimit.
+    the ranks are feasible at any point, further exchanges only shorten the edges.
+    """
+    def __init__(self, layer_spacing:float=1.0, node_spacing:float=1.0, edge_spacing:float|None=None, component_spacing:float|None=None, sweeps:int=8, max_iterations:int|None=200):
+        self.layer_spacing = layer_spacing
+        self.node_spacing = node_spacing
+        self.edge_spacing = edge_spacing if edge_spacing is not None else node_spacing / 2
+        self.component_spacing = component_spacing if component_spacing is not None else node_spacing
+        self.sweeps = sweeps
+        self.max_iterations = max_iterations
+        self._components:list[tuple[float, _Component]] = [] # (x offset, component)
+
+    def crossings(self)->int:
+        """edge crossings of the current layout"""
+        return sum(component.layout.crossings for _, component in self._components)
+
+    def clear(self):
+        self._components = []
+
+    def layout(self, G:nx.DiGraph, widths:Mapping[Hashable, float]|None=None)->dict[Hashable, tuple[float, float]]:
+        """lay out the whole graph from scratch"""
+        self.clear()
+        return self.update(G, widths)
+
+    def update(self, G:nx.DiGraph, widths:Mapping[Hashable, float]|None=None)->dict[Hashable, tuple[float, float]]:
+        """lay out the components that changed since the last layout.
+        return the position (x, y) of every node in G, where x is the center of the node"""
+        previous = {(component.nodes, component.edges, component.widths): (x, component) for x, component in self._components}
+
+        ## group nodes and edges by component, keeping the order of G
+        component_of = dict()
+        for i, nodes in enumerate(nx.weakly_connected_components(G)):
+            for node in nodes:
+                component_of[node] = i
+        component_nodes = defaultdict(list)
+        for node in G.nodes:
+            component_nodes[component_of[node]].append(node)
+        component_edges = defaultdict(list)
+        for u, v in G.edges():
+            component_edges[component_of[u]].append((u, v))
+
+        kept:list[tuple[float, _Component]] = []
+        changed:list[tuple[float|None, _Component]] = []
+        for i, nodes in component_nodes.items():
+            edges = component_edges[i]
+            node_widths = tuple(widths.get(node, 0.0) if widths else 0.0 for node in nodes)
+            key = (frozenset(nodes), frozenset(edges), node_widths)
+            if key in previous:
+                kept.append(previous[key])
+                continue
+
+            old_components = [(x, old) for x, old in self._components if not old.nodes.isdisjoint(nodes)]
+            # try to put an edited component back where it was
+            x = min((x for x, _ in old_components), default=None)
+
+            # patch a small edit of a component
+            patched = None
+            if len(old_components) == 1 and all(component_of.get(node, i) == i for node in old_components[0][1].nodes):
+                patched = _patch_component(old_components[0][1].layout, nodes, edges, node_widths,
+                    node_spacing=self.node_spacing,
+                    edge_spacing=self.edge_spacing,
+                    max_iterations=self.max_iterations)
+            if patched:
+                shift, layout = patched
+                x += shift
+            else:
+                # warm start from the components this one was made of
+                old_positions = {node: (offset + x, rank) for offset, old in old_components for node, (x, rank) in old.layout.positions.items()}
+                old_tree = frozenset().union(*(old.layout.tree for _, old in old_components))
+                layout = layout_component(nodes, edges, node_widths,
+                    node_spacing=self.node_spacing,
+                    edge_spacing=self.edge_spacing,
+                    sweeps=self.sweeps,
+                    max_iterations=self.max_iterations,
+                    previous=old_positions,
+                    previous_tree=old_tree)
+            width = max((x + w / 2 for (x, _), w in zip(layout.positions.values(), node_widths)), default=0.0)
+            changed.append((x, _Component(*key, layout, width)))
+
+        ## place the changed components in the gaps left by the kept ones, or to the right
+        placed = list(kept)
+        right = max((x + component.width + self.component_spacing for x, component in placed), default=0.0)
+        def is_free(x:float, width:float)->bool:
+            return all(x + width + self.component_spacing <= other_x or other_x + other.width + self.component_spacing <= x for other_x, other in placed)
+        for x, component in changed:
+            if x is None or not is_free(x, component.width):
+                x = right
+            placed.append((x, component))
+            right = max(right, x + component.width + self.component_spacing)
+        self._components = placed
+
+        return {
+            node: (offset + x, rank * self.layer_spacing)
+            for offset, component in self._components
+            for node, (x, rank) in component.layout.positions.items()
+        }
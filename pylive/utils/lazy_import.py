@@ -0,0 +1,35 @@
+"""
+Lazy imports for heavy, optional subsystems.
+
+    nx = lazy_import("networkx")
+
+returns the module right away, and executes it on the first attribute access.
+Annotations are evaluated when a function is defined, so annotate with strings
+(eg.: 'nx.DiGraph') to keep the import lazy.
+
+Use lazy modules from a single thread. In worker threads, import inside the function instead.
+"""
+
+from types import ModuleType
+import importlib.util
+import sys
+
+
+def lazy_import(name:str)->ModuleType:
+    if module := sys.modules.get(name):
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def is_loaded(name:str)->bool:
+    """whether the module is imported, and executed"""
+    module = sys.modules.get(name)
+    return module is not None and not isinstance(module, importlib.util._LazyModule) # type: ignore
@@ -0,0 +1,69 @@
+import unittest
+import random
+
+from pylive.utils.bilist import bilist
+
+
+class TestBilist(unittest.TestCase):
+    def setUp(self):
+        # small blocks, to exercise splits and merges
+        self._load = bilist.LOAD
+        bilist.LOAD = 4
+
+    def tearDown(self):
+        bilist.LOAD = self._load
+
+    def test_list_operations(self):
+        items = bilist(["a", "b", "c"])
+        items.append("d")
+        items.insert(0, "z")
+        self.assertEqual(list(items), ["z", "a", "b", "c", "d"])
+        self.assertEqual(items.index("c"), 3)
+        self.assertEqual(items[-1], "d")
+        items.remove("a")
+        self.assertEqual(items.pop(0), "z")
+        self.assertEqual(list(items), ["b", "c", "d"])
+        self.assertIn("b", items)
+        self.assertNotIn("a", items)
+
+    def test_unique(self):
+        items = bilist(["a"])
+        with self.assertRaises(ValueError):
+            items.append("a")
+        with self.assertRaises(ValueError):
+            bilist(["a", "a"])
+
+    def test_random_operations_match_list(self):
+        rng = random.Random(0)
+        expected = []
+        items = bilist()
+        next_item = 0
+        for _ in range(2000):
+            match rng.choice(['insert', 'insert', 'pop', 'remove', 'delslice']):
+                case 'insert':
+                    row = rng.randint(0, len(expected))
+                    expected.insert(row, next_item)
+                    items.insert(row, next_item)
+                    next_item += 1
+                case 'pop' if expected:
+                    row = rng.randrange(len(expected))
+                    self.assertEqual(items.pop(row), expected.pop(row))
+                case 'remove' if expected:
+                    item = rng.choice(expected)
+                    expected.remove(item)
+                    items.remove(item)
+                case 'delslice' if expected:
+                    start = rng.randrange(len(expected))
+                    stop = rng.randint(start, min(len(expected), start + 10))
+                    del expected[start:stop]
+                    del items[start:stop]
+            self.assertEqual(len(items), len(expected))
+
+        self.assertEqual(list(items), expected)
+        for row, item in enumerate(expected):
+            self.assertEqual(items.index(item), row)
+            self.assertEqual(items[row], item)
+
+
+if __name__ == "__main__":
+    unittest.main()
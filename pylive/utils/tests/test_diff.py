@@ -1,6 +1,6 @@
 import unittest
 from typing import *
-from pylive.utils.diff import Change, diff_dict, diff_list, patch_list, patch_dict
+from pylive.utils.diff import Change, ListChange, ListRun, diff_dict, diff_list, patch_list, patch_dict
 
 class TestDiff(unittest.TestCase):
 	def test_dictdiff(self):
@@ -23,12 +23,35 @@ class TestDiff(unittest.TestCase):
 
 		diff = diff_list(list_a, list_b)
 		
-		self.assertEqual(diff, Change(
-			added={1: 3, 2: 5, 4: 6}, 
-			removed={1: 2, 2: 3}, 
-			changed={}, 
-			unchanged={0: 1, 3: 4}
-		))
+		self.assertEqual(diff, ListChange([
+			ListRun("equal",  0,  0, [1]),
+			ListRun("delete", 1,  1, [2]),
+			ListRun("equal",  2,  1, [3]),
+			ListRun("insert", -1, 2, [5]),
+			ListRun("equal",  3,  3, [4]),
+			ListRun("insert", -1, 4, [6]),
+		]))
+
+	def test_dictdiff_non_dict_values(self):
+		diff = diff_dict({"a": 1, "b": [1]}, {"a": 1, "b": [2]})
+		self.assertEqual(diff.unchanged, {"a": 1})
+		self.assertEqual(diff.changed, {"b": ([1], [2])})
+
+	def test_insert_at_front(self):
+		"""one insertion is a single run, the rest is unchanged"""
+		diff = diff_list(list(range(100)), [-1] + list(range(100)))
+		self.assertEqual([run.kind for run in diff.runs], ["insert", "equal"])
+
+	def test_move(self):
+		diff = diff_list(list("abcdef"), list("abdecf"))
+		self.assertEqual(diff.moved(), [ListRun("move", 2, 4, ["c"])])
+		self.assertEqual(diff.deleted(), [])
+		self.assertEqual(diff.inserted(), [])
+
+	def test_key(self):
+		a, b = object(), object()
+		diff = diff_list([a, b], [b, a], key=id)
+		self.assertEqual(patch_list([a, b], diff), [b, a])
 
 class TestPatch(unittest.TestCase):
 	def test_dictpatch(self):
@@ -51,5 +74,6 @@ class TestPatch(unittest.TestCase):
 		updated = patch_list(list_a, diff)
 		self.assertEqual(list_b, updated)
 
+
 if __name__ == "__main__":
 	unittest.main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import unittest
+from typing import *
+
+import pytest
+pytest.importorskip("hypothesis") # a dev dependency
+from hypothesis import given, settings, strategies as st
+
+from pylive.utils.diff import diff_dict, diff_list, patch_list, patch_dict
+
+
+class TestRoundTrip(unittest.TestCase):
+	@given(st.lists(st.integers(0, 8)), st.lists(st.integers(0, 8)))
+	def test_list_small_alphabet(self, a, b):
+		self.assertEqual(patch_list(a, diff_list(a, b)), b)
+
+	@given(st.lists(st.text(max_size=3), max_size=50), st.data())
+	def test_list_edits(self, a, data):
+		"""shuffled, deleted and inserted items"""
+		b = data.draw(st.permutations(a))
+		b = [item for item in b if data.draw(st.booleans())] + data.draw(st.lists(st.text(max_size=3), max_size=5))
+		diff = diff_list(a, b)
+		self.assertEqual(patch_list(a, diff), b)
+		for run in diff.runs:
+			match run.kind:
+				case "equal" | "move":
+					self.assertEqual(a[run.prev_index:run.prev_index+len(run.items)], run.items)
+					self.assertEqual(b[run.current_index:run.current_index+len(run.items)], run.items)
+				case "delete":
+					self.assertEqual(a[run.prev_index:run.prev_index+len(run.items)], run.items)
+				case "insert":
+					self.assertEqual(b[run.current_index:run.current_index+len(run.items)], run.items)
+
+	@given(
+		st.dictionaries(st.text(max_size=2), st.one_of(st.integers(), st.lists(st.integers(), max_size=2))),
+		st.dictionaries(st.text(max_size=2), st.one_of(st.integers(), st.lists(st.integers(), max_size=2)))
+	)
+	def test_dict(self, a, b):
+		self.assertEqual(patch_dict(a, diff_dict(a, b)), b)
+
+
+	@settings(max_examples=30)
+	@given(st.randoms(use_true_random=False), st.sampled_from([10, 1000, 100_000]), st.integers(0, 20))
+	def test_large_list_edits(self, rng, alphabet, edits):
+		"""lists long enough to be walked along their equal runs"""
+		a = [rng.randrange(alphabet) for _ in range(rng.randrange(1000, 3000))]
+		b = list(a)
+		for _ in range(edits):
+			match rng.choice(["insert", "delete", "move"]):
+				case "insert":
+					b.insert(rng.randrange(len(b)+1), rng.randrange(alphabet))
+				case "delete":
+					b.pop(rng.randrange(len(b)))
+				case "move":
+					b.insert(rng.randrange(len(b)), b.pop(rng.randrange(len(b))))
+		self.assertEqual(patch_list(a, diff_list(a, b)), b)
+
+
+if __name__ == "__main__":
+	unittest.main()
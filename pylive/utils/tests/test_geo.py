@@ -0,0 +1,133 @@
+import unittest
+from typing import *
+from PySide6.QtGui import *
+from PySide6.QtCore import *
+from PySide6.QtWidgets import *
+
+import math
+import numpy as np
+
+from pylive.utils import geo
+from pylive.utils.geo import (
+    intersect_line_with_path,
+    intersect_segments_with_rectangles,
+    intersect_segments_with_polygon,
+    makeLineToShape,
+)
+
+app = QApplication.instance() or QApplication([])
+
+CENTER = QPointF(300, 200) # the stroker misses when a point is (0, 0)
+
+
+def make_shapes()->Dict[str, QPainterPath]:
+    shapes = dict()
+    path = QPainterPath()
+    path.addRect(QRectF(-40, -20, 80, 40))
+    shapes['rect'] = path
+
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(-40, -20, 80, 40), 10, 8)
+    shapes['rounded_rect'] = path
+
+    path = QPainterPath()
+    path.addEllipse(QRectF(-40, -20, 80, 40))
+    shapes['ellipse'] = path
+
+    path = QPainterPath()
+    path.addPolygon(QPolygonF([QPointF(0, -30), QPointF(30, 0), QPointF(0, 30), QPointF(-30, 0), QPointF(0, -30)]))
+    shapes['convex'] = path
+
+    star = [QPointF(math.cos(i*math.pi/5) * (40 if i%2 == 0 else 15), math.sin(i*math.pi/5) * (40 if i%2 == 0 else 15)) for i in range(10)]
+    path = QPainterPath()
+    path.addPolygon(QPolygonF(star + [star[0]]))
+    shapes['edges'] = path
+    return {name: path.translated(CENTER) for name, path in shapes.items()}
+
+
+def rays(count:int=64, radius:float=150)->Iterable[QPointF]:
+    for i in range(count):
+        angle = math.radians(i * 360 / count + 1.3)
+        yield CENTER + QPointF(math.cos(angle) * radius, math.sin(angle) * radius)
+
+
+class TestIntersectLineWithPath(unittest.TestCase):
+    def test_shapes_are_recognized(self):
+        for name, path in make_shapes().items():
+            self.assertEqual(geo._path_shape(path)[0], name)
+
+        rotated = QTransform().rotate(30).map(make_shapes()['rect'])
+        self.assertEqual(geo._path_shape(rotated)[0], 'convex')
+
+    def test_matches_stroker(self):
+        """the stroke of the ray is one unit wide"""
+        for name, path in make_shapes().items():
+            if name == 'edges':
+                continue # the stroke catches the tips of the star, before the line reaches them
+            for origin in rays():
+                P = intersect_line_with_path(origin, CENTER, path)
+                expected = geo._intersect_line_with_path_stroked(origin, CENTER, path)
+                assert P and expected
+                self.assertLess(QLineF(P, expected).length(), 1.5, name)
+
+    def test_point_on_the_boundary(self):
+        for name, path in make_shapes().items():
+            for origin in rays():
+                P = intersect_line_with_path(origin, CENTER, path)
+                assert P
+                direction = QLineF(origin, CENTER).unitVector()
+                step = QPointF(direction.dx(), direction.dy()) * 0.05 # bezier ellipses are within 0.03% of the true ellipse
+                self.assertFalse(path.contains(P - step), name)
+                self.assertTrue(path.contains(P + step), name)
+
+    def test_origin_inside(self):
+        for name, path in make_shapes().items():
+            origin = CENTER + QPointF(2, 1)
+            self.assertEqual(intersect_line_with_path(origin, CENTER + QPointF(200, 0), path), origin, name)
+
+    def test_miss(self):
+        for name, path in make_shapes().items():
+            self.assertIsNone(intersect_line_with_path(QPointF(0, 0), QPointF(0, 500), path), name)
+            self.assertIsNone(intersect_line_with_path(CENTER + QPointF(200, 0), CENTER + QPointF(100, 0), path), name)
+
+    def test_graphics_item(self):
+        item = QGraphicsRectItem(-40, -20, 80, 40)
+        item.setPos(CENTER)
+        item.setRotation(30)
+        scene_shape = item.sceneTransform().map(item.shape())
+        for origin in rays():
+            line = makeLineToShape(origin, item)
+            expected = geo._intersect_line_with_path_stroked(origin, CENTER, scene_shape)
+            assert expected
+            self.assertLess(QLineF(line.p2(), expected).length(), 1.5)
+
+
+class TestVectorised(unittest.TestCase):
+    def setUp(self) -> None:
+        self.origins = np.array([(p.x(), p.y()) for p in rays()])
+        self.targets = np.tile([CENTER.x(), CENTER.y()], (len(self.origins), 1))
+
+    def assertMatchesScalar(self, points:np.ndarray, path:QPainterPath):
+        for origin, point in zip(self.origins, points):
+            P = intersect_line_with_path(QPointF(*origin), CENTER, path)
+            assert P
+            np.testing.assert_allclose(point, (P.x(), P.y()), atol=1e-6)
+
+    def test_rectangles(self):
+        points = intersect_segments_with_rectangles(self.origins, self.targets, [260, 180, 340, 220])
+        self.assertMatchesScalar(points, make_shapes()['rect'])
+
+    def test_rectangles_miss(self):
+        points = intersect_segments_with_rectangles([[0, 0], [0, 0]], [[0, 500], [100, 0]], [[260, 180, 340, 220], [-10, -10, 10, 10]])
+        self.assertTrue(np.isnan(points[0]).all())
+        np.testing.assert_allclose(points[1], (0, 0))
+
+    def test_polygon(self):
+        path = make_shapes()['edges']
+        vertices = [(point.x(), point.y()) for point in path.toFillPolygon()]
+        points = intersect_segments_with_polygon(self.origins, self.targets, vertices)
+        self.assertMatchesScalar(points, path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+from pylive.utils.hot_reload import HotReloader, changed_functions
+
+import unittest
+import tempfile
+import importlib
+import threading
+import textwrap
+import sys
+import os
+from pathlib import Path
+
+
+class TestChangedFunctions(unittest.TestCase):
+    def test_body_changes(self):
+        old = "x = 1\ndef f():\n    return 1\nclass C:\n    def m(self):\n        return 1\n"
+        new = "x = 1\ndef f():\n    return 2\nclass C:\n    def m(self):\n        return 1\n"
+        self.assertEqual(changed_functions(old, new), ["f"])
+
+    def test_moved_functions(self):
+        old = "def f():\n    return 1\ndef g():\n    return 1\n"
+        new = "def f():\n    x = 1\n    return x\ndef g():\n    return 1\n"
+        self.assertEqual(changed_functions(old, new), ["f", "g"])
+
+    def test_module_changes(self):
+        self.assertIsNone(changed_functions("x = 1\n", "x = 2\n"))
+        self.assertIsNone(changed_functions("def f(a): pass\n", "def f(a, b): pass\n"))
+        self.assertIsNone(changed_functions("def f(): pass\n", "def f(): pass\ndef g(): pass\n"))
+
+
+class TestHotReloader(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.root = Path(self.folder.name)
+        sys.path.insert(0, self.folder.name)
+        self.write("hot_solver", """\
+            state = []
+
+            def solve(x):
+                return x + 1
+
+            class Solver:
+                def run(self, x):
+                    return solve(x) * 10
+            """)
+        self.write("hot_app", """\
+            from hot_solver import solve, Solver
+            import hot_solver
+            """)
+        importlib.invalidate_caches()
+        import hot_solver, hot_app
+        self.solver, self.app = hot_solver, hot_app
+        self.reloader = HotReloader([hot_solver, hot_app])
+
+    def tearDown(self):
+        self.reloader.stop()
+        sys.path.remove(self.folder.name)
+        for name in ("hot_solver", "hot_app"):
+            sys.modules.pop(name, None)
+        self.folder.cleanup()
+
+    def write(self, name:str, source:str):
+        path = self.root / f"{name}.py"
+        path.write_text(textwrap.dedent(source))
+        # a new mtime, so the import system does not use the cached bytecode
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_patch_functions_in_place(self):
+        self.solver.state.append("document")
+        solve = self.app.solve
+        self.write("hot_solver", """\
+            state = []
+
+            def solve(x):
+                return x + 2
+
+            class Solver:
+                def run(self, x):
+                    return solve(x) * 100
+            """)
+        report = self.reloader.reloadFiles([self.root / "hot_solver.py"])
+        self.assertEqual(report.patched, ["hot_solver.solve", "hot_solver.Solver.run"])
+        self.assertEqual(report.reloaded, [])
+        self.assertIs(self.app.solve, solve)
+        self.assertEqual(self.app.solve(1), 3)
+        self.assertEqual(self.app.Solver().run(1), 300)
+        self.assertEqual(self.solver.state, ["document"])
+
+    def test_reload_dependents_in_order(self):
+        self.write("hot_solver", """\
+            state = []
+            SCALE = 3
+
+            def solve(x):
+                return x * SCALE
+
+            class Solver:
+                def run(self, x):
+                    return solve(x)
+            """)
+        report = self.reloader.reloadFiles([self.root / "hot_solver.py"])
+        self.assertEqual(report.reloaded, ["hot_solver", "hot_app"])
+        self.assertEqual(self.app.solve(2), 6)
+
+    def test_syntax_error_keeps_module(self):
+        self.write("hot_solver", "def solve(x):\n    return (\n")
+        report = self.reloader.reloadFiles([self.root / "hot_solver.py"])
+        self.assertEqual(len(report.errors), 1)
+        self.assertEqual(self.app.solve(1), 2)
+
+    def test_watcher(self):
+        patched = threading.Event()
+        self.reloader.onReload(lambda report: patched.set())
+        self.reloader.start()
+        threading.Event().wait(0.2) # let the watcher start
+        self.write("hot_solver", """\
+            state = []
+
+            def solve(x):
+                return x + 5
+
+            class Solver:
+                def run(self, x):
+                    return solve(x) * 10
+            """)
+        self.assertTrue(patched.wait(5))
+        self.assertEqual(self.app.solve(1), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import itertools
+import random
+import networkx as nx
+import numpy as np
+
+from pylive.utils.layered_layout import (
+    count_inversions,
+    count_crossings,
+    network_simplex_ranks,
+    LayeredLayout
+)
+
+
+def make_random_dag(count:int, seed:int=0)->nx.DiGraph:
+    rng = random.Random(seed)
+    G = nx.DiGraph()
+    G.add_nodes_from(range(count))
+    for i in range(1, count):
+        for _ in range(rng.choice([1, 2])):
+            G.add_edge(rng.randrange(max(0, i-10), i), i)
+    return G
+
+
+class TestCrossings(unittest.TestCase):
+    def test_count_inversions(self):
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            values = rng.integers(0, 10, size=rng.integers(0, 40))
+            expected = sum(1 for i, j in itertools.combinations(range(len(values)), 2) if values[i] > values[j])
+            self.assertEqual(count_inversions(values), expected)
+
+    def test_count_crossings(self):
+        # a-x and b-y cross, edges sharing an endpoint dont
+        self.assertEqual(count_crossings(np.array([0, 1]), np.array([1, 0])), 1)
+        self.assertEqual(count_crossings(np.array([0, 0]), np.array([1, 0])), 0)
+        self.assertEqual(count_crossings(np.array([0, 1]), np.array([0, 0])), 0)
+
+
+class TestNetworkSimplex(unittest.TestCase):
+    def test_minimal_edge_length(self):
+        # brute force the optimal ranking of a small graph
+        edges = [(0, 1), (1, 2), (2, 3), (0, 3), (4, 3), (4, 1)]
+        src = np.array([u for u, v in edges])
+        dst = np.array([v for u, v in edges])
+        weight = np.ones(len(edges))
+        rank, tree = network_simplex_ranks(5, src, dst, weight)
+        length = int(np.sum(rank[dst] - rank[src]))
+        optimal = min(
+            sum(r[v] - r[u] for u, v in edges)
+            for r in itertools.product(range(5), repeat=5)
+            if all(r[v] - r[u] >= 1 for u, v in edges)
+        )
+        self.assertEqual(length, optimal)
+        self.assertTrue(np.all(rank[dst] - rank[src] >= 1))
+        self.assertEqual(int(tree.sum()), 4, "spanning tree of 5 nodes")
+
+
+class TestLayeredLayout(unittest.TestCase):
+    def test_edges_point_down(self):
+        G = make_random_dag(200)
+        pos = LayeredLayout().layout(G)
+        for u, v in G.edges:
+            self.assertLess(pos[u][1], pos[v][1])
+
+    def test_cycles_and_self_loops(self):
+        G = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "a"), ("c", "c")])
+        pos = LayeredLayout().layout(G)
+        self.assertEqual(set(pos.keys()), {"a", "b", "c"})
+        self.assertEqual(len({y for x, y in pos.values()}), 3)
+
+    def test_nodes_dont_overlap(self):
+        G = make_random_dag(200)
+        widths = {node: 1.0 + (node % 3) for node in G.nodes}
+        layout = LayeredLayout(node_spacing=1.0)
+        pos = layout.layout(G, widths)
+        layers = dict()
+        for node, (x, y) in pos.items():
+            layers.setdefault(y, []).append(node)
+        for nodes in layers.values():
+            nodes = sorted(nodes, key=lambda node: pos[node][0])
+            for a, b in zip(nodes, nodes[1:]):
+                self.assertGreaterEqual(pos[b][0] - pos[a][0], (widths[a] + widths[b]) / 2 + 1.0 - 1e-9)
+
+    def test_reduces_crossings(self):
+        # a tree is drawn without crossings
+        G = nx.bfs_tree(nx.balanced_tree(3, 4), 0)
+        G = nx.relabel_nodes(G, {node: (node * 37) % len(G) for node in G.nodes})
+        layout = LayeredLayout()
+        layout.layout(G)
+        self.assertEqual(layout.crossings(), 0)
+
+    def test_update_keeps_unchanged_components(self):
+        G = nx.disjoint_union(make_random_dag(50, seed=1), make_random_dag(50, seed=2))
+        layout = LayeredLayout()
+        before = layout.layout(G)
+
+        # add a node to the second component
+        G.add_edge(60, "new")
+        after = layout.update(G)
+        for node in range(50):
+            self.assertEqual(before[node], after[node])
+        self.assertIn("new", after)
+        self.assertLess(after[60][1], after["new"][1])
+
+    def test_update_keeps_distant_nodes(self):
+        # a single connected component
+        G = make_random_dag(200)
+        self.assertTrue(nx.is_weakly_connected(G))
+        layout = LayeredLayout()
+        before = layout.layout(G)
+
+        G.add_edge(150, "new")
+        after = layout.update(G)
+        self.assertEqual(after["new"][1], before[150][1] + 1.0)
+        # only the nodes of the new node's layer may be pushed aside
+        moved = [node for node in G.nodes if node != "new" and after[node] != before[node]]
+        self.assertTrue(all(after[node][1] == after["new"][1] for node in moved))
+        self.assertLess(len(moved), 10)
+
+    def test_patched_edits(self):
+        rng = random.Random(0)
+        G = make_random_dag(100)
+        widths = {node: 1.0 for node in G.nodes}
+        layout = LayeredLayout(node_spacing=1.0)
+        layout.layout(G, widths)
+        for i in range(20):
+            nodes = list(G.nodes)
+            G.add_edge(rng.choice(nodes), f"new{i}")
+            widths[f"new{i}"] = 2.0
+            G.add_edge(f"new{i}", rng.choice(nodes)) # may close a cycle, or push nodes down
+            G.remove_node(rng.choice(nodes))
+            pos = layout.update(G, widths)
+
+            acyclic = [(u, v) for u, v in G.edges if not G.has_edge(v, u) and u != v]
+            self.assertEqual(set(pos.keys()), set(G.nodes))
+            layers = dict()
+            for node, (x, y) in pos.items():
+                layers.setdefault(y, []).append(node)
+            for nodes in layers.values():
+                nodes = sorted(nodes, key=lambda node: pos[node][0])
+                for a, b in zip(nodes, nodes[1:]):
+                    self.assertGreaterEqual(pos[b][0] - pos[a][0], (widths[a] + widths[b]) / 2 + 1.0 - 1e-9)
+            self.assertTrue(all(pos[u][1] != pos[v][1] for u, v in acyclic))
+
+        fresh = LayeredLayout(node_spacing=1.0)
+        fresh.layout(G, widths)
+        self.assertLess(layout.crossings(), 2 * fresh.crossings() + 10)
+
+    def test_update_without_changes(self):
+        G = make_random_dag(100)
+        layout = LayeredLayout()
+        self.assertEqual(layout.layout(G), layout.update(G))
+
+
+if __name__ == "__main__":
+    unittest.main()
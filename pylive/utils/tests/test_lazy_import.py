@@ -0,0 +1,43 @@
+from pylive.utils.lazy_import import lazy_import, is_loaded
+
+import unittest
+import tempfile
+import textwrap
+import sys
+from pathlib import Path
+
+
+class TestLazyImport(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        sys.path.insert(0, self.folder.name)
+        (Path(self.folder.name) / "lazy_heavy.py").write_text(textwrap.dedent("""\
+            import builtins
+            builtins.lazy_heavy_executed = True
+            value = 42
+            """))
+
+    def tearDown(self):
+        sys.path.remove(self.folder.name)
+        sys.modules.pop("lazy_heavy", None)
+        import builtins
+        if hasattr(builtins, "lazy_heavy_executed"):
+            del builtins.lazy_heavy_executed
+        self.folder.cleanup()
+
+    def test_executes_on_first_use(self):
+        import builtins
+        module = lazy_import("lazy_heavy")
+        self.assertFalse(hasattr(builtins, "lazy_heavy_executed"))
+        self.assertFalse(is_loaded("lazy_heavy"))
+        self.assertEqual(module.value, 42)
+        self.assertTrue(is_loaded("lazy_heavy"))
+        self.assertIs(lazy_import("lazy_heavy"), module)
+
+    def test_missing_module(self):
+        with self.assertRaises(ModuleNotFoundError):
+            lazy_import("lazy_missing_module")
+
+
+if __name__ == "__main__":
+    unittest.main()
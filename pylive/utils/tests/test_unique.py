@@ -1,4 +1,4 @@
-from pylive.utils.unique import make_unique_id, make_unique_name
+from pylive.utils.unique import make_unique_id, make_unique_name, NameRegistry
 
 import unittest
 
@@ -35,5 +35,69 @@ class TestUniqueName(unittest.TestCase):
     #     self.assertEqual(unique_name, "name2")
 
 
+class TestNameRegistry(unittest.TestCase):
+    def test_reserve(self):
+        names = NameRegistry()
+        self.assertEqual([names.reserve("node") for _ in range(3)], ["node", "node1", "node2"])
+        self.assertEqual(names.reserve("node1"), "node3")
+        self.assertEqual(len(names), 4)
+
+    def test_reserve_skips_taken_names(self):
+        names = NameRegistry(["node", "node2"])
+        self.assertEqual(names.reserve("node"), "node1")
+        self.assertEqual(names.reserve("node"), "node3")
+
+    def test_unique_does_not_reserve(self):
+        names = NameRegistry(["node"])
+        self.assertEqual(names.unique("node"), "node1")
+        self.assertEqual(names.unique("node"), "node1")
+        self.assertNotIn("node1", names)
+
+    def test_release(self):
+        names = NameRegistry()
+        for _ in range(4):
+            names.reserve("node")
+        names.release("node2")
+        names.release("node1")
+        self.assertNotIn("node1", names)
+        self.assertEqual(names.reserve("node"), "node1", "the lowest released number is reused")
+        self.assertEqual(names.reserve("node"), "node2")
+        self.assertEqual(names.reserve("node"), "node4")
+        with self.assertRaises(KeyError):
+            names.release("node5")
+
+    def test_released_name_reserved_directly(self):
+        names = NameRegistry(["node", "node1", "node2"])
+        names.reserve("node")
+        names.release("node1")
+        names.reserve("node1")
+        self.assertEqual(names.reserve("node"), "node4")
+
+    def test_rename(self):
+        names = NameRegistry(["a", "b"])
+        self.assertEqual(names.rename("a", "b"), "b1")
+        self.assertEqual(set(names), {"b", "b1"})
+        self.assertEqual(names.rename("b1", "b1"), "b1")
+        with self.assertRaises(KeyError):
+            names.rename("a", "c")
+
+    def test_same_names_as_make_unique_name(self):
+        import random
+        rng = random.Random(0)
+        names = NameRegistry()
+        taken = set()
+        for _ in range(500):
+            if taken and rng.random() < 0.4:
+                name = rng.choice(sorted(taken))
+                names.release(name)
+                taken.remove(name)
+            else:
+                name = rng.choice(["node", "node1", "node07", "item3"])
+                expected = make_unique_name(name, taken)
+                self.assertEqual(names.reserve(name), expected)
+                taken.add(expected)
+        self.assertEqual(set(names), taken)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 import random
 import string
 import re
+import heapq
 
 from typing import *
 
@@ -12,18 +13,85 @@ def make_unique_id(length:int=8)->str:
 
 
 def make_unique_name(name:str, names:Iterable[str])->str:
-    # Regex to extract the name part (without trailing digits)
-    names = set(_ for _ in names)
-    match = re.search(r"(.*?)(\d*)$", name)
-    if match:
-        # Name part without digits
-        name_part = match.group(1)
-
-        # Loop to find a unique name
-        digit = 1
-        while name in names:
-            # Append the current digit to the name part
-            name = f"{name_part}{digit}"
-            digit += 1
-
-    return name
+    """
+    name, or name with the lowest free number in place of its trailing digits.
+    builds a NameRegistry of all the names, hold one to make many unique names.
+    """
+    return NameRegistry(names).unique(name)
+
+
+_NAME_NUMBER = re.compile(r"(.*?)(\d*)$")
+
+def _split_number(name:str)->Tuple[str, int]:
+    """the name part and the trailing number, 0 when the digits are not a plain number"""
+    match = _NAME_NUMBER.match(name)
+    assert match
+    name_part, digits = match.groups()
+    if digits and digits == str(int(digits)):
+        return name_part, int(digits)
+    return name_part, 0
+
+
+class NameRegistry:
+    """
+    a set of taken names, that makes new names unique in amortised O(1).
+
+    like make_unique_name, the trailing digits of a taken name are replaced
+    with the lowest free number: node, node1, node2...
+    each name part keeps a counter, the numbers below it are all taken, or
+    were released into a heap.
+    """
+    def __init__(self, names:Iterable[str]=()):
+        self._taken:Set[str] = set(names)
+        self._counters:Dict[str, int] = dict() # name part -> next number to try
+        self._released:Dict[str, List[int]] = dict() # name part -> heap of released numbers below the counter
+
+    def __contains__(self, name:object)->bool:
+        return name in self._taken
+
+    def __len__(self)->int:
+        return len(self._taken)
+
+    def __iter__(self)->Iterator[str]:
+        return iter(self._taken)
+
+    def unique(self, name:str)->str:
+        """the name, or a free numbered name. the name is not reserved"""
+        if name not in self._taken:
+            return name
+
+        name_part, _ = _split_number(name)
+        released = self._released.get(name_part)
+        while released:
+            candidate = f"{name_part}{released[0]}"
+            if candidate not in self._taken:
+                return candidate
+            heapq.heappop(released) # reserved since it was released
+
+        number = self._counters.get(name_part, 1)
+        while f"{name_part}{number}" in self._taken:
+            number += 1
+        self._counters[name_part] = number
+        return f"{name_part}{number}"
+
+    def reserve(self, name:str)->str:
+        """reserve and return the unique name for name"""
+        name = self.unique(name)
+        self._taken.add(name)
+        return name
+
+    def release(self, name:str)->None:
+        """free a reserved name. raise KeyError, if the name is not reserved"""
+        self._taken.remove(name)
+        name_part, number = _split_number(name)
+        if 0 < number < self._counters.get(name_part, 1):
+            heapq.heappush(self._released.setdefault(name_part, []), number)
+
+    def rename(self, old_name:str, new_name:str)->str:
+        """release old_name, and reserve the unique name for new_name"""
+        if old_name not in self._taken:
+            raise KeyError(old_name)
+        if new_name == old_name:
+            return old_name
+        self.release(old_name)
+        return self.reserve(new_name)